@@ -0,0 +1,96 @@
+"""
+차트용 다운샘플링
+시간 순 데이터를 화면 픽셀 구간 단위로 줄여 피크(최소/최대)를 보존한 채 전송 점 수를 제한합니다.
+"""
+import numpy as np
+
+# 차트 한 계열당 최대 전송 점 수 (약 2000 픽셀 폭 x 버킷당 최소/최대 2점)
+DEFAULT_MAX_POINTS = 4000
+
+METHOD_LABELS = {
+    'minmax': '최소/최대 포락선 (피크 보존)',
+    'lttb': 'LTTB (형상 보존)'
+}
+
+
+def window_slice(x, start=None, end=None):
+    """정렬된 x 에서 [start, end] 구간의 슬라이스 (이진 탐색, 데이터 복사 없음)"""
+    lo = 0 if start is None else int(np.searchsorted(x, start, side='left'))
+    hi = len(x) if end is None else int(np.searchsorted(x, end, side='right'))
+    return slice(lo, max(lo, hi))
+
+
+def _bucket_starts(x, n_buckets):
+    """x 범위를 같은 폭으로 나눈 버킷의 시작 인덱스 (빈 버킷 제외)"""
+    edges = np.linspace(x[0], x[-1], n_buckets + 1)[:-1]
+    starts = np.unique(np.searchsorted(x, edges, side='left'))
+    return starts[starts < len(x)]
+
+
+def _first_match(y, bucket_values, starts):
+    """버킷마다 값이 bucket_values 와 같은 첫 인덱스"""
+    counts = np.diff(np.append(starts, len(y)))
+    bucket_ids = np.repeat(np.arange(len(starts)), counts)
+    hits = np.flatnonzero(y == bucket_values[bucket_ids])
+    _, first = np.unique(bucket_ids[hits], return_index=True)
+    return hits[first]
+
+
+def minmax_indices(x, y, max_points=DEFAULT_MAX_POINTS):
+    """시간 폭이 같은 버킷마다 최솟값/최댓값 샘플과 양 끝점의 인덱스 (정렬, 중복 제거)
+
+    모든 버킷의 극값을 남기므로 한 샘플짜리 저크 스파이크도 사라지지 않습니다.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n <= max_points:
+        return np.arange(n)
+
+    starts = _bucket_starts(x, max(1, (max_points - 2) // 2))
+    lows = _first_match(y, np.fmin.reduceat(y, starts), starts)
+    highs = _first_match(y, np.fmax.reduceat(y, starts), starts)
+    return np.unique(np.concatenate([[0, n - 1], lows, highs]))
+
+
+def lttb_indices(x, y, max_points=DEFAULT_MAX_POINTS):
+    """Largest-Triangle-Three-Buckets 선택 인덱스
+
+    샘플 수가 같은 버킷마다 이전 선택점과 다음 버킷 평균점이 이루는 삼각형 넓이가 최대인 샘플을 고릅니다.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n <= max_points or max_points < 3:
+        return np.arange(n)
+
+    # 양 끝점을 제외한 구간을 max_points - 2 개 버킷으로 분할
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    counts = np.diff(np.append(edges, n))
+    mean_x = np.add.reduceat(x, edges) / counts
+    mean_y = np.add.reduceat(y, edges) / counts
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    anchor = 0
+    for k in range(max_points - 2):
+        lo, hi = edges[k], edges[k + 1]
+        area = np.abs((x[anchor] - mean_x[k + 1]) * (y[lo:hi] - y[anchor])
+                      - (x[anchor] - x[lo:hi]) * (mean_y[k + 1] - y[anchor]))
+        anchor = lo + int(np.argmax(area))
+        selected[k + 1] = anchor
+    return selected
+
+
+METHODS = {
+    'minmax': minmax_indices,
+    'lttb': lttb_indices
+}
+
+
+def downsample_indices(x, series, max_points=DEFAULT_MAX_POINTS, method='minmax'):
+    """여러 계열에서 선택한 인덱스의 합집합 (산점도/3D 처럼 한 점에 여러 값을 표시할 때)"""
+    select = METHODS[method]
+    per_series = max(3, max_points // max(1, len(series)))
+    indices = [select(x, y, per_series) for y in series]
+    return np.unique(np.concatenate(indices)) if indices else np.arange(len(x))
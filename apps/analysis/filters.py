@@ -0,0 +1,250 @@
+"""
+평활화/미분 필터
+이동 평균, Savitzky-Golay(해석적 미분), 영위상 Butterworth 를 축 0 방향 벡터화 합성곱으로 계산합니다.
+모든 필터는 유한 길이 커널(halo = 커널 반폭)이므로 FilterStream 으로 청크 단위 계산이 가능합니다.
+"""
+from math import factorial
+
+import numpy as np
+
+# 이 길이 이하의 커널은 직접 합성곱(np.convolve), 더 긴 커널은 overlap-save FFT 합성곱
+DIRECT_KERNEL_LIMIT = 64
+FFT_BLOCK = 1 << 16
+
+SMOOTHING_METHODS = {
+    'none': '사용 안 함',
+    'moving_average': '이동 평균',
+    'savgol': 'Savitzky-Golay (해석적 미분)',
+    'butterworth': 'Butterworth 영위상'
+}
+
+
+def correlate_valid(values, kernel):
+    """축 0 방향 'valid' 상관 (out[i] = Σ kernel[j] · values[i + j])"""
+    values = np.asarray(values, dtype=float)
+    kernel = np.asarray(kernel, dtype=float)
+    n, width = len(values), len(kernel)
+    count = n - width + 1
+    if count <= 0:
+        raise ValueError(f"데이터({n:,} 샘플)가 필터 길이({width:,} 샘플)보다 짧습니다.")
+
+    if width <= DIRECT_KERNEL_LIMIT:
+        # 짧은 커널은 채널(열)별 np.convolve 직접 합성곱
+        columns = values.reshape(n, -1)
+        out = np.empty((count, columns.shape[1]))
+        for k in range(columns.shape[1]):
+            out[:, k] = np.convolve(columns[:, k], kernel[::-1], mode='valid')
+        return out.reshape((count,) + values.shape[1:])
+
+    # overlap-save: 블록마다 FFT 곱으로 선형 합성곱을 구하고 순환 겹침 구간(앞 width-1 개) 제외
+    nfft = 1 << int(np.ceil(np.log2(max(4 * width, FFT_BLOCK))))
+    step = nfft - width + 1
+    spectrum = np.fft.rfft(kernel[::-1], nfft).reshape((-1,) + (1,) * (values.ndim - 1))
+    out = np.empty((count,) + values.shape[1:])
+    for start in range(0, count, step):
+        size = min(step, count - start)
+        block = np.fft.irfft(np.fft.rfft(values[start:start + nfft], nfft, axis=0) * spectrum, nfft, axis=0)
+        out[start:start + size] = block[width - 1:width - 1 + size]
+    return out
+
+
+class MovingAverage:
+    """중심 이동 평균 (양 끝은 rolling(center=True, min_periods=1) 과 같은 부분 구간 평균)"""
+
+    def __init__(self, window=5):
+        if window < 1 or window % 2 == 0:
+            raise ValueError("이동 평균 윈도우 크기는 홀수여야 합니다.")
+        self.window = window
+        self.halo = window // 2
+
+    def apply(self, values):
+        values = np.asarray(values, dtype=float)
+        n, h = len(values), self.halo
+        if n <= 2 * h:
+            # 창보다 짧으면 모든 샘플이 부분 구간 평균
+            sums = np.cumsum(np.concatenate([np.zeros((1,) + values.shape[1:]), values]), axis=0)
+            hi = np.minimum(np.arange(n) + h + 1, n)
+            lo = np.maximum(np.arange(n) - h, 0)
+            return (sums[hi] - sums[lo]) / (hi - lo).reshape((-1,) + (1,) * (values.ndim - 1))
+
+        out = np.empty_like(values)
+        out[h:n - h] = correlate_valid(values, np.full(self.window, 1.0 / self.window))
+        if h:
+            counts = np.arange(h + 1, 2 * h + 1).reshape((-1,) + (1,) * (values.ndim - 1))
+            out[:h] = np.cumsum(values[:2 * h], axis=0)[h:] / counts
+            out[n - h:] = (np.cumsum(values[::-1][:2 * h], axis=0)[h:] / counts)[::-1]
+        return out
+
+
+class SavitzkyGolay:
+    """Savitzky-Golay 평활화/해석적 미분 (등간격 샘플 가정)
+
+    창 안의 샘플에 다항식을 최소제곱 적합한 계수를 합성곱 커널로 사용하고,
+    양 끝 halo 구간은 첫/마지막 창의 적합 다항식을 해당 위치에서 평가합니다 (scipy 'interp' 모드).
+    """
+
+    def __init__(self, window=21, polyorder=3):
+        if window % 2 == 0 or window < 3:
+            raise ValueError("Savitzky-Golay 창 크기는 3 이상의 홀수여야 합니다.")
+        if not 0 <= polyorder < window:
+            raise ValueError("다항식 차수는 창 크기보다 작아야 합니다.")
+        self.window = window
+        self.polyorder = polyorder
+        self.halo = window // 2
+        offsets = np.arange(-self.halo, self.halo + 1)
+        # (차수+1, 창) 최소제곱 해 행렬: 행 j 는 적합 다항식의 j 차 계수
+        self.solver = np.linalg.pinv(np.vander(offsets, polyorder + 1, increasing=True))
+
+    def _evaluation_matrix(self, positions, deriv):
+        """positions(창 중심 기준 위치)에서 적합 다항식의 deriv 차 미분값을 주는 (위치, 창) 행렬"""
+        powers = np.zeros((len(positions), self.polyorder + 1))
+        for j in range(deriv, self.polyorder + 1):
+            powers[:, j] = factorial(j) / factorial(j - deriv) * positions.astype(float) ** (j - deriv)
+        return powers @ self.solver
+
+    def apply(self, values, deriv=0, delta=1.0):
+        """deriv 차 미분 (delta: 샘플 간격)"""
+        values = np.asarray(values, dtype=float)
+        n, h = len(values), self.halo
+        if n < self.window:
+            raise ValueError(f"데이터({n:,} 샘플)가 Savitzky-Golay 창({self.window} 샘플)보다 짧습니다.")
+        out = np.empty_like(values)
+        if deriv > self.polyorder:
+            out[:] = 0.0
+            return out
+
+        center = self._evaluation_matrix(np.zeros(1), deriv)[0]
+        out[h:n - h] = correlate_valid(values, center)
+        out[:h] = self._evaluation_matrix(np.arange(-h, 0), deriv) @ values[:self.window]
+        out[n - h:] = self._evaluation_matrix(np.arange(1, h + 1), deriv) @ values[n - self.window:]
+        return out / delta ** deriv if deriv else out
+
+
+def butterworth_kernel(cutoff_hz, sample_rate, order=4, tolerance=1e-10):
+    """영위상(전진-후진) Butterworth 의 등가 대칭 FIR 커널
+
+    쌍선형 변환 Butterworth 를 앞뒤로 적용한 응답은 |H|² = 1 / (1 + (tan(ω/2) / tan(ωc/2))^(2·차수)) 이므로,
+    이를 역 FFT 하여 최댓값 대비 tolerance 이상인 구간만 남깁니다.
+    """
+    nyquist = sample_rate / 2
+    if not 0 < cutoff_hz < nyquist:
+        raise ValueError(f"차단 주파수는 0 과 나이퀴스트 주파수({nyquist:g} Hz) 사이여야 합니다.")
+    warped = np.tan(np.pi * cutoff_hz / sample_rate)
+
+    size = 4096
+    while True:
+        omega = np.linspace(0, np.pi, size // 2 + 1)
+        with np.errstate(over='ignore'):
+            response = 1.0 / (1.0 + (np.tan(omega / 2) / warped) ** (2 * order))
+        kernel = np.fft.fftshift(np.fft.irfft(response, size))
+        # 커널 양 끝 1/8 구간이 충분히 작아지면 (순환 겹침 무시 가능) 중단
+        if np.abs(kernel[:size // 8]).max() < tolerance * kernel.max() or size >= 1 << 24:
+            break
+        size *= 2
+
+    center = size // 2
+    significant = np.flatnonzero(np.abs(kernel) >= tolerance * kernel.max())
+    half = max(center - significant[0], significant[-1] - center)
+    kernel = kernel[center - half:center + half + 1]
+    # FFT 반올림 오차를 없애 정확한 대칭(영위상)과 직류 이득 1 을 보장
+    kernel = (kernel + kernel[::-1]) / 2
+    return kernel / kernel.sum()
+
+
+class Butterworth:
+    """영위상 Butterworth 저역 통과 필터 (filtfilt 와 같은 홀수 대칭 확장으로 양 끝 처리)"""
+
+    def __init__(self, cutoff_hz, sample_rate, order=4):
+        self.cutoff_hz = cutoff_hz
+        self.sample_rate = sample_rate
+        self.order = order
+        self.kernel = butterworth_kernel(cutoff_hz, sample_rate, order)
+        self.halo = len(self.kernel) // 2
+
+    def apply(self, values):
+        values = np.asarray(values, dtype=float)
+        n, h = len(values), self.halo
+        if n <= h:
+            raise ValueError(f"데이터({n:,} 샘플)가 필터 응답 길이({h:,} 샘플)보다 짧습니다. 차단 주파수를 높이세요.")
+        head = 2 * values[0] - values[h:0:-1]
+        tail = 2 * values[-1] - values[-2:-h - 2:-1]
+        return correlate_valid(np.concatenate([head, values, tail]), self.kernel)
+
+
+def make_smoother(smoothing, sample_rate=None):
+    """스무딩 설정 사전으로 필터 생성 (사용 안 함이면 None)
+
+    smoothing: {'method', 'window', 'polyorder', 'cutoff_hz', 'order'}
+    """
+    method = (smoothing or {}).get('method', 'none')
+    if method == 'moving_average':
+        return MovingAverage(smoothing['window'])
+    if method == 'savgol':
+        return SavitzkyGolay(smoothing['window'], smoothing['polyorder'])
+    if method == 'butterworth':
+        if not sample_rate:
+            raise ValueError("Butterworth 필터에는 샘플링 주파수가 필요합니다.")
+        return Butterworth(smoothing['cutoff_hz'], sample_rate, smoothing['order'])
+    return None
+
+
+def derivative_filter(smoothing):
+    """운동학 계산(미분)에 사용할 Savitzky-Golay 필터 (다른 방식이면 None)"""
+    if (smoothing or {}).get('method') == 'savgol':
+        return make_smoother(smoothing)
+    return None
+
+
+def sample_rate_of(time):
+    """시간 배열의 샘플링 주파수 (간격 중앙값 기준, Hz)"""
+    spacing = np.median(np.diff(time)) if len(time) > 1 else 0.0
+    if spacing <= 0:
+        raise ValueError("샘플링 주파수를 구할 수 없습니다 (시간 간격이 0 입니다).")
+    return 1.0 / spacing
+
+
+class FilterStream:
+    """청크 단위 필터링 (시간 배열을 같은 지연으로 함께 출력)
+
+    이전 청크의 마지막 샘플(halo 개 미출력 + halo + 1 개 문맥)을 다음 청크 앞에 붙여 계산하므로
+    청크 경계의 출력이 전체 배열에 필터를 적용한 값과 같습니다.
+    """
+
+    def __init__(self, smoother):
+        self.smoother = smoother
+        self.halo = smoother.halo
+        self.time = np.empty(0)
+        self.values = np.empty(0)
+        self.pending = 0
+
+    def update(self, time, values, final=False):
+        """청크 반영 후 값이 확정된 (시간, 필터 출력) 반환"""
+        t = np.concatenate([self.time, np.asarray(time, dtype=float)])
+        v = np.concatenate([self.values, np.asarray(values, dtype=float)])
+        stop = len(t) if final else len(t) - self.halo
+        if stop <= self.pending or (not final and len(t) < 2 * self.halo + 1) or len(t) == 0:
+            self.time, self.values = t, v
+            return np.empty(0), np.empty(0)
+
+        filtered = self.smoother.apply(v)
+        output = t[self.pending:stop], filtered[self.pending:stop]
+        # 마지막 경계 계산에도 창 전체(2 x halo + 1)가 남도록 문맥을 하나 더 보관
+        keep = max(stop - self.halo - 1, 0)
+        self.time, self.values = t[keep:], v[keep:]
+        self.pending = stop - keep
+        return output
+
+    def finish(self):
+        return self.update(np.empty(0), np.empty(0), final=True)
+
+
+def iter_filtered(chunks, smoother):
+    """(시간, 값) 청크 반복자를 필터 출력 청크 반복자로 변환"""
+    stream = FilterStream(smoother)
+    for time, values in chunks:
+        output = stream.update(time, values)
+        if len(output[0]):
+            yield output
+    output = stream.finish()
+    if len(output[0]):
+        yield output
@@ -0,0 +1,296 @@
+"""
+형상 공차(GD&T) 최소제곱 적합
+평면(평면도), 원(진원도), 원통(원통도) 특징을 여러 개 한 번에 일괄 적합합니다.
+"""
+import re
+
+import numpy as np
+
+from apps.analysis.linearity_engine import COORD_SUFFIXES
+
+# 특징 이름 규칙 (예: PLANE1_x, CIRCLE_A_y, CYL2_z) → 특징 종류
+FEATURE_PATTERN = re.compile(r'^((PLANE|CIRCLE|CYL)\w*?)_([xyz])$', re.IGNORECASE)
+FEATURE_TYPES = {'PLANE': 'plane', 'CIRCLE': 'circle', 'CYL': 'cylinder'}
+FORM_ERROR_NAMES = {'plane': 'flatness', 'circle': 'roundness', 'cylinder': 'cylindricity'}
+MIN_POINTS = {'plane': 3, 'circle': 3, 'cylinder': 6}
+
+MAX_ITERATIONS = 50
+# 원통 초기 축 후보 3개를 비교하기 전 개선 반복 수
+SCREEN_ITERATIONS = 4
+TOLERANCE = 1e-10
+
+
+def feature_columns(name):
+    """특징 이름에 해당하는 좌표 컬럼 목록"""
+    return [f"{name}_{suffix}" for suffix in COORD_SUFFIXES]
+
+
+def discover_features(columns):
+    """컬럼 목록에서 x, y, z 좌표가 모두 있는 형상 특징 탐색 {이름: 종류}"""
+    columns = list(columns)
+    available = set(columns)
+    features = {}
+    for column in columns:
+        match = FEATURE_PATTERN.match(str(column))
+        if match is None:
+            continue
+        name, prefix = match.group(1), match.group(2).upper()
+        if name not in features and all(col in available for col in feature_columns(name)):
+            features[name] = FEATURE_TYPES[prefix]
+    return features
+
+
+def extract_feature_points(data, features=None):
+    """특징별 점군 {이름: (종류, (n, 3) 배열)} (누락 좌표 행 제외)"""
+    features = discover_features(data.columns) if features is None else features
+    feature_points = {}
+    for name, kind in features.items():
+        points = data[feature_columns(name)].dropna().to_numpy(dtype=float)
+        if len(points) >= MIN_POINTS[kind]:
+            feature_points[name] = (kind, points)
+    return feature_points
+
+
+def _pad(point_sets):
+    """점 개수가 다른 특징들을 (B, n, 3) 배열과 가중치 (B, n) 로 쌓기"""
+    length = max(len(points) for points in point_sets)
+    padded = np.zeros((len(point_sets), length, 3))
+    weights = np.zeros((len(point_sets), length))
+    for k, points in enumerate(point_sets):
+        padded[k, :len(points)] = points
+        weights[k, :len(points)] = 1.0
+    return padded, weights
+
+
+def _masked_range(values, weights):
+    """가중치가 있는 원소의 최대-최소 (B,)"""
+    valid = weights > 0
+    return np.where(valid, values, -np.inf).max(axis=1) - np.where(valid, values, np.inf).min(axis=1)
+
+
+def _weighted_rms(values, weights):
+    return np.sqrt(np.einsum('bn,bn->b', weights, values ** 2) / weights.sum(axis=1))
+
+
+def _principal_frames(points, weights):
+    """특징별 가중 평균과 산포 행렬 고유값 분해 (오름차순)"""
+    total = weights.sum(axis=1)
+    mean = np.einsum('bn,bni->bi', weights, points) / total[:, None]
+    centered = (points - mean[:, None]) * weights[..., None]
+    scatter = np.matmul(centered.transpose(0, 2, 1), centered)
+    eigenvalues, eigenvectors = np.linalg.eigh(scatter)
+    return mean, eigenvalues, eigenvectors
+
+
+def _fix_sign(vectors):
+    """방향 벡터 부호 고정 (절댓값이 가장 큰 성분이 양수)"""
+    largest = np.take_along_axis(vectors, np.abs(vectors).argmax(axis=1)[:, None], axis=1)
+    return vectors * np.where(largest < 0, -1.0, 1.0)
+
+
+def _solve(normal_matrix, rhs):
+    """배치 정규방정식 풀이 (특이 행렬은 작은 감쇠 추가)"""
+    damping = 1e-12 * np.trace(normal_matrix, axis1=1, axis2=2)[:, None, None] + 1e-300
+    eye = np.eye(normal_matrix.shape[-1])
+    return np.linalg.solve(normal_matrix + damping * eye, rhs[..., None])[..., 0]
+
+
+def _gauss_newton_step(jacobian, residual, weights):
+    """배치 가중 Gauss-Newton 증분 (J: (B, n, k), 잔차/가중치: (B, n))"""
+    weighted = (jacobian * weights[..., None]).transpose(0, 2, 1)
+    return _solve(np.matmul(weighted, jacobian), -np.matmul(weighted, residual[..., None])[..., 0])
+
+
+def _fit_circles_2d(uv, weights, iterations=MAX_ITERATIONS):
+    """2D 원 일괄 적합 (Kasa 대수 적합 → Gauss-Newton 기하 적합, 수렴한 원은 제외)"""
+    design = np.concatenate([uv, np.ones(uv.shape[:2] + (1,))], axis=2)
+    weighted = (design * weights[..., None]).transpose(0, 2, 1)
+    solution = _solve(np.matmul(weighted, design), np.matmul(weighted, (uv ** 2).sum(axis=2)[..., None])[..., 0])
+    center = solution[:, :2] / 2
+    radius = np.sqrt(np.maximum(solution[:, 2] + (center ** 2).sum(axis=1), 0.0))
+
+    active = np.arange(len(uv))
+    for _ in range(iterations):
+        diff = uv[active] - center[active, None]
+        distance = np.maximum(np.linalg.norm(diff, axis=2), 1e-300)
+        jacobian = np.concatenate([-diff / distance[..., None], -np.ones(distance.shape + (1,))], axis=2)
+        step = _gauss_newton_step(jacobian, distance - radius[active, None], weights[active])
+        center[active] += step[:, :2]
+        radius[active] += step[:, 2]
+        active = active[np.abs(step).max(axis=1) > TOLERANCE * np.maximum(1.0, np.abs(radius[active]))]
+        if not len(active):
+            break
+
+    residual = np.linalg.norm(uv - center[:, None], axis=2) - radius[:, None]
+    return center, radius, residual
+
+
+def fit_planes(point_sets):
+    """평면 일괄 최소제곱 적합 (최소 고유값 방향 = 법선) 및 평면도"""
+    points, weights = _pad(point_sets)
+    mean, _, eigenvectors = _principal_frames(points, weights)
+    normal = _fix_sign(eigenvectors[:, :, 0])
+    distances = np.einsum('bni,bi->bn', points - mean[:, None], normal)
+
+    flatness = _masked_range(distances, weights)
+    rms = _weighted_rms(distances, weights)
+    return [
+        {'center': mean[k], 'normal': normal[k], 'form_error': float(flatness[k]),
+         'rms': float(rms[k]), 'count': len(point_sets[k])}
+        for k in range(len(point_sets))
+    ]
+
+
+def fit_circles(point_sets):
+    """3D 원 일괄 적합 (최소제곱 평면에 사영 후 2D 원 적합) 및 진원도"""
+    points, weights = _pad(point_sets)
+    mean, _, eigenvectors = _principal_frames(points, weights)
+    normal = _fix_sign(eigenvectors[:, :, 0])
+    basis = eigenvectors[:, :, 1:]
+    centered = points - mean[:, None]
+    uv = np.matmul(centered, basis)
+
+    center, radius, residual = _fit_circles_2d(uv, weights)
+    roundness = _masked_range(residual, weights)
+    rms = _weighted_rms(residual, weights)
+    out_of_plane = _masked_range(np.einsum('bni,bi->bn', centered, normal), weights)
+    center_3d = mean + np.einsum('bij,bj->bi', basis, center)
+    return [
+        {'center': center_3d[k], 'normal': normal[k], 'radius': float(radius[k]),
+         'form_error': float(roundness[k]), 'rms': float(rms[k]),
+         'flatness': float(out_of_plane[k]), 'count': len(point_sets[k])}
+        for k in range(len(point_sets))
+    ]
+
+
+def _cylinder_frame(direction, reference):
+    """축 방향과 그에 수직인 두 단위 벡터로 이루어진 좌표계 (B, 3, 3) [축, e2, e3]"""
+    e2 = reference - np.einsum('bi,bi->b', reference, direction)[:, None] * direction
+    e2 /= np.linalg.norm(e2, axis=1, keepdims=True)
+    return np.stack([direction, e2, np.cross(direction, e2)], axis=2)
+
+
+def _cylinder_state(points, axis_point, frame, radius):
+    """축 좌표계의 점 좌표 (B, n, 3) 와 반경 방향 잔차 (B, n)"""
+    local = np.matmul(points - axis_point[:, None], frame)
+    radial = np.maximum(np.hypot(local[..., 1], local[..., 2]), 1e-300)
+    return local, radial, radial - radius[:, None]
+
+
+def _cylinder_step(axis_point, frame, radius, step):
+    """매개변수 증분(축 위치 2, 축 기울기 2, 반지름)으로 원통 갱신 후 좌표계 재구성"""
+    axis_point = axis_point + np.einsum('bij,bj->bi', frame[:, :, 1:], step[:, 0:2])
+    direction = frame[:, :, 0] + np.einsum('bij,bj->bi', frame[:, :, 1:], step[:, 2:4])
+    direction /= np.linalg.norm(direction, axis=1, keepdims=True)
+    return axis_point, _cylinder_frame(direction, frame[:, :, 1]), radius + step[:, 4]
+
+
+def _refine_cylinders(points, weights, mean, axis_point, frame, radius, iterations):
+    """원통 기하 최소제곱 일괄 개선 (Gauss-Newton, 해석적 야코비안, 백트래킹)
+
+    매 반복 현재 축 좌표계에서 선형화하므로 야코비안은
+    [-y/r, -z/r, -x·y/r, -x·z/r, -1] 로 닫힌 형태입니다.
+    수렴한 특징은 배치에서 제외하고 나머지만 계속 갱신합니다.
+    """
+    axis_point, frame, radius = axis_point.copy(), frame.copy(), radius.copy()
+    active = np.arange(len(points))
+    for _ in range(iterations):
+        p, w, m = points[active], weights[active], mean[active]
+        direction = frame[active, :, 0]
+        # 축 위치를 점군 중심 근처로 옮겨 축 방향 좌표(x)를 작게 유지 (수치 안정성)
+        state = (axis_point[active] + np.einsum('bi,bi->b', m - axis_point[active], direction)[:, None] * direction,
+                 frame[active], radius[active])
+        local, radial, residual = _cylinder_state(p, *state)
+        cost = np.einsum('bn,bn->b', w, residual ** 2)
+
+        x, y, z = local[..., 0], local[..., 1] / radial, local[..., 2] / radial
+        jacobian = np.stack([-y, -z, -x * y, -x * z, -np.ones_like(x)], axis=2)
+        step = _gauss_newton_step(jacobian, residual, w)
+
+        # 비용이 늘어나는 특징만 걸음을 절반씩 줄여 재시도
+        alpha = np.ones(len(step))
+        for _ in range(10):
+            candidate = _cylinder_step(*state, alpha[:, None] * step)
+            worse = np.einsum('bn,bn->b', w, _cylinder_state(p, *candidate)[2] ** 2) > cost
+            if not worse.any():
+                break
+            alpha = np.where(worse, alpha / 2, alpha)
+
+        accept = ~worse
+        axis_point[active] = np.where(accept[:, None], candidate[0], state[0])
+        frame[active] = np.where(accept[:, None, None], candidate[1], state[1])
+        radius[active] = np.where(accept, candidate[2], state[2])
+
+        moved = np.abs(alpha[:, None] * step).max(axis=1)
+        tolerance = TOLERANCE * np.maximum(1.0, np.abs(radius[active]))
+        active = active[accept & (moved > tolerance)]
+        if not len(active):
+            break
+    return axis_point, frame, radius
+
+
+def fit_cylinders(point_sets, iterations=MAX_ITERATIONS):
+    """원통 일괄 최소제곱 적합 (Gauss-Newton) 및 원통도
+
+    짧은 원통은 축 방향 고유값이 반경 방향과 비슷해 초기 축을 고르기 어려우므로
+    세 주성분 방향을 모두 초기 축으로 삼아(축에 수직인 평면의 원 적합으로 위치/반지름 초기화)
+    몇 번 개선해 본 뒤 잔차 제곱합이 가장 작은 후보만 끝까지 개선합니다.
+    """
+    points, weights = _pad(point_sets)
+    mean, _, eigenvectors = _principal_frames(points, weights)
+    count = len(point_sets)
+
+    # 특징 × 초기 축 3개를 하나의 배치로 구성
+    candidates = np.repeat(np.arange(count), 3)
+    order = np.array([[0, 1, 2], [1, 2, 0], [2, 0, 1]])
+    frame = np.stack([eigenvectors[:, :, row] for row in order], axis=1).reshape(count * 3, 3, 3)
+
+    uv = np.matmul(points[candidates] - mean[candidates, None], frame[:, :, 1:])
+    center, radius, _ = _fit_circles_2d(uv, weights[candidates], iterations=0)
+    axis_point = mean[candidates] + np.einsum('bij,bj->bi', frame[:, :, 1:], center)
+    axis_point, frame, radius = _refine_cylinders(points[candidates], weights[candidates], mean[candidates],
+                                                  axis_point, frame, radius, SCREEN_ITERATIONS)
+
+    residual = _cylinder_state(points[candidates], axis_point, frame, radius)[2]
+    cost = np.einsum('bn,bn->b', weights[candidates], residual ** 2).reshape(count, 3)
+    best = np.arange(count) * 3 + np.where(np.isfinite(cost), cost, np.inf).argmin(axis=1)
+    axis_point, frame, radius = _refine_cylinders(points, weights, mean, axis_point[best], frame[best],
+                                                  radius[best], iterations)
+
+    residual = _cylinder_state(points, axis_point, frame, radius)[2]
+    direction = _fix_sign(frame[:, :, 0])
+    cylindricity = _masked_range(residual, weights)
+    rms = _weighted_rms(residual, weights)
+    return [
+        {'axis_point': axis_point[k], 'axis_direction': direction[k], 'radius': float(abs(radius[k])),
+         'form_error': float(cylindricity[k]), 'rms': float(rms[k]), 'count': len(point_sets[k])}
+        for k in range(count)
+    ]
+
+
+FITTERS = {'plane': fit_planes, 'circle': fit_circles, 'cylinder': fit_cylinders}
+
+
+def fit_features(feature_points):
+    """특징별 형상 적합 (같은 종류끼리 묶어 일괄 계산)
+
+    feature_points: {이름: (종류, 점군)} → {이름: 적합 결과 + 'type'}
+    """
+    results = {}
+    for kind, fitter in FITTERS.items():
+        names = [name for name, (feature_kind, _) in feature_points.items() if feature_kind == kind]
+        if not names:
+            continue
+        for name, fit in zip(names, fitter([feature_points[name][1] for name in names])):
+            results[name] = dict(fit, type=kind)
+    return {name: results[name] for name in feature_points if name in results}
+
+
+def form_metrics(form_results):
+    """형상 적합 결과를 지표 그룹 {이름: {'form_error', 'rms', ['radius']}} 으로 변환"""
+    metrics = {}
+    for name, fit in form_results.items():
+        metrics[name] = {'form_error': fit['form_error'], 'rms': fit['rms']}
+        if 'radius' in fit:
+            metrics[name]['radius'] = fit['radius']
+    return metrics
@@ -1,12 +1,46 @@
+import os
+import time
+from datetime import datetime
 import pandas as pd
 import numpy as np
-from sklearn.decomposition import PCA
 import plotly.graph_objs as go
 import streamlit as st
 
 # 공통 유틸리티 임포트
 from utils.ui_components import tool_header, error_handler, success_message, info_message
-from utils.data_processing import safe_operation, preprocess_excel_data
+from utils.data_processing import DATA_DIR, safe_operation, resolve_data_path
+from utils.performance import BoundedCache, content_digest
+from apps.analysis.linearity_engine import (
+    AXIS_NAMES, axis_columns, line_distances, voxel_downsample
+)
+from apps.analysis.form_fitting import (
+    FORM_ERROR_NAMES, discover_features, feature_columns
+)
+from apps.analysis.linearity_stream import DEFAULT_CHUNKSIZE, stream_linearity_analysis
+from apps.analysis.linearity_bootstrap import DEFAULT_RESAMPLES
+from apps.analysis.linearity_store import LinearityStore, drift_summary
+from apps.analysis.linearity_live import (
+    DEFAULT_PORT, DEFAULT_WINDOW, CsvTailSource, LiveLineFit, SocketSource
+)
+from apps.analysis.robust_fit import DEFAULT_MAX_HYPOTHESES
+from apps.analysis.linearity_batch import (
+    BATCH_METRICS, analyze_frame, batch_comparison_table, batch_long_table, expand_inputs, read_measurement,
+    run_batch
+)
+from apps.analysis.registration import align_to_reference
+
+# 업로드 내용 해시 + 처리 옵션 기준 분석 파이프라인 캐시 (세션 간 공유, LRU 제거)
+_PIPELINE_CACHE = BoundedCache(max_entries=8, max_bytes=1024 * 1024 * 1024)
+
+# 3D 시각화 축별 기본 표시 점 예산
+DEFAULT_POINT_BUDGET = 20_000
+
+# NaN 처리 방법 표시 이름 → preprocess_excel_data 전략
+FILL_STRATEGY_MAP = {
+    "평균으로 대체": "mean",
+    "0으로 대체": "zero",
+    "해당 행 제거": "drop"
+}
 
 @safe_operation
 def linearity_analysis():
@@ -20,8 +54,10 @@ def linearity_analysis():
         "3차원 데이터의 진직도, 평행도, 수직도를 평가하고 PCA 주성분 분석을 통해 시각화합니다. 제조업 품질관리 및 정밀 측정에 활용할 수 있습니다."
     )
 
-    # 탭 구성: 입력, 평가방법, 결과 탭으로 구분
-    input_tab, method_tab, result_tab = st.tabs(["📁 데이터 입력", "📊 평가 방법", "📈 분석 결과"])
+    # 탭 구성: 입력, 평가방법, 결과, 이력 추세 탭으로 구분
+    input_tab, method_tab, result_tab, history_tab = st.tabs(
+        ["📁 데이터 입력", "📊 평가 방법", "📈 분석 결과", "📉 이력 추세"]
+    )
 
     # 세션 상태 초기화
     if 'linearity_data' not in st.session_state:
@@ -37,10 +73,35 @@ def linearity_analysis():
     with result_tab:
         display_result_section()
 
+    with history_tab:
+        display_history_section()
+
 def display_input_section():
     """데이터 입력 섹션 표시"""
     st.header("📁 데이터 입력")
     
+    # 처리 모드 선택
+    processing_mode = st.radio(
+        "처리 모드:",
+        options=["일반 (엑셀)", "스트리밍 (대용량 CSV/Parquet)", "배치 (다중 파일/ZIP)", "실시간 (소켓/CSV)"],
+        horizontal=True,
+        help="스트리밍 모드는 파일을 청크 단위로 읽어 파일 크기와 무관한 메모리로 분석합니다. "
+             "배치 모드는 여러 측정 회차를 병렬로 분석하여 비교합니다. "
+             "실시간 모드는 측정 장비에서 들어오는 점마다 직선 적합을 갱신합니다."
+    )
+    
+    if processing_mode.startswith("스트리밍"):
+        display_streaming_input()
+        return
+    
+    if processing_mode.startswith("배치"):
+        display_batch_input()
+        return
+    
+    if processing_mode.startswith("실시간"):
+        display_live_input()
+        return
+    
     # 파일 업로드 영역
     col1, col2 = st.columns([3, 1])
     
@@ -62,221 +123,523 @@ def display_input_section():
     with col1:
         fill_strategy = st.selectbox(
             "NaN 값 처리 방법:",
-            options=["평균으로 대체", "0으로 대체", "해당 행 제거"],
+            options=list(FILL_STRATEGY_MAP),
             index=0,
             help="누락된 데이터의 처리 방법을 선택합니다."
         )
     
     with col2:
-        outlier_removal = st.checkbox(
-            "이상치 제거 (3σ 기준)",
-            value=False,
-            help="3 시그마 기준을 벗어나는 이상치를 제거합니다."
+        outlier_removal = st.selectbox(
+            "이상치 처리 방법:",
+            options=["제거 안 함", "3σ 기준 (좌표별)", "강건 적합 (RANSAC, 직선 거리 기준)"],
+            index=0,
+            help="3σ 기준은 좌표 컬럼별로, 강건 적합은 적합 직선까지의 거리로 이상치를 제거합니다."
+        )
+    
+    robust_options = None
+    if outlier_removal.startswith("강건"):
+        col1, col2 = st.columns(2)
+        with col1:
+            max_hypotheses = st.number_input(
+                "최대 가설 수",
+                min_value=64,
+                max_value=100_000,
+                value=DEFAULT_MAX_HYPOTHESES,
+                step=256,
+                help="RANSAC에서 평가할 최대 직선 가설 수입니다."
+            )
+        with col2:
+            time_budget = st.number_input(
+                "축별 시간 제한 (초)",
+                min_value=0.05,
+                max_value=60.0,
+                value=2.0,
+                step=0.5,
+                help="축 하나의 가설 탐색에 사용할 최대 시간입니다."
+            )
+        robust_options = {'max_hypotheses': int(max_hypotheses), 'time_budget': float(time_budget)}
+
+    # 평가 옵션
+    st.subheader("📐 평가 옵션")
+    min_zone = st.checkbox(
+        "최소 영역 진직도 (ISO 1101) 계산",
+        value=False,
+        help="모든 점을 포함하는 최소 지름 원통으로 진직도를 평가하여 PCA 기준 값과 함께 표시합니다."
+    )
+    bootstrap = 0
+    if st.checkbox(
+        "방향/각도 부트스트랩 95% 신뢰구간 계산",
+        value=False,
+        help="측정점을 재표본화하여 축 방향과 평행도/수직도 각도의 불확도를 추정합니다."
+    ):
+        bootstrap = int(st.number_input(
+            "재표본 수",
+            min_value=500,
+            max_value=100_000,
+            value=DEFAULT_RESAMPLES,
+            step=500,
+            help="재표본 수가 많을수록 구간 추정이 안정적입니다 (10,000회 기준 약 1초)."
+        ))
+
+    registration = display_registration_options("linearity_registration")
+
+    with st.expander("🗄️ 분석 캐시"):
+        st.caption(
+            f"캐시 항목 {len(_PIPELINE_CACHE)}개, 약 {_PIPELINE_CACHE.total_bytes / 1024 ** 2:.1f} MB "
+            f"(적중 {_PIPELINE_CACHE.hits}회 / 미적중 {_PIPELINE_CACHE.misses}회)"
         )
+        if st.button("🧹 캐시 비우기", help="저장된 파싱 데이터와 분석 결과를 모두 제거합니다."):
+            _PIPELINE_CACHE.clear()
 
     # 파일 처리
     if uploaded_file:
-        process_uploaded_file(uploaded_file, fill_strategy, outlier_removal)
+        process_uploaded_file(
+            uploaded_file, fill_strategy, outlier_removal, min_zone, robust_options, bootstrap, registration
+        )
     else:
         display_data_format_guide()
 
-def process_uploaded_file(uploaded_file, fill_strategy, outlier_removal):
-    """업로드된 파일 처리"""
-    try:
-        with st.spinner("📊 데이터를 분석하는 중..."):
-            # 엑셀 파일 읽기
-            data = pd.read_excel(uploaded_file, sheet_name=0)
-            
-            # 필수 컬럼 확인
-            required_columns = ['X1_x', 'X1_y', 'X1_z', 'X2_x', 'X2_y', 'X2_z', 
-                              'Y_x', 'Y_y', 'Y_z', 'Z_x', 'Z_y', 'Z_z']
-            
-            available_columns = [col for col in required_columns if col in data.columns]
-            
-            if len(available_columns) < 3:
-                error_handler("최소 하나의 축에 대한 3D 좌표 데이터(x, y, z)가 필요합니다.")
+def display_registration_options(key, allow_first_run=False):
+    """좌표 정합 옵션 표시 (정합하지 않으면 None 반환)
+
+    반환값: {'file': 기준/공칭 점 파일 또는 None(첫 번째 회차), 'iterations': 재정합 반복 수}
+    """
+    with st.expander("🧭 좌표 정합 (Kabsch)"):
+        st.caption("트래커 위치가 다른 측정을 같은 행·같은 축의 점을 대응점으로 하여 기준 좌표계에 강체 정합합니다.")
+        sources = ["정합 안 함", "기준/공칭 점 파일"] + (["첫 번째 회차"] if allow_first_run else [])
+        source = st.radio("정합 기준:", sources, horizontal=True, key=f"{key}_source")
+        if source == "정합 안 함":
+            return None
+        
+        reference_file = None
+        if source == "기준/공칭 점 파일":
+            reference_file = st.file_uploader(
+                "기준 회차 또는 공칭(CAD) 점 파일",
+                type=["xlsx", "xls", "csv", "parquet"],
+                key=f"{key}_file",
+                help="측정 파일과 같은 X1_x … Z_z 컬럼 형식이어야 합니다."
+            )
+            if reference_file is None:
+                return None
+        
+        iterations = st.number_input(
+            "재정합 반복 수",
+            min_value=0,
+            max_value=10,
+            value=2,
+            help="정합 잔차가 3σ를 넘는 대응점(이동·파손된 목표점)을 제외하고 다시 정합하는 횟수입니다.",
+            key=f"{key}_iterations"
+        )
+    return {'file': reference_file, 'iterations': int(iterations)}
+
+def display_live_input():
+    """실시간 측정 입력 섹션 표시"""
+    st.subheader("📡 실시간 측정")
+    st.caption(
+        "심 조정 중 측정점을 받으면서 축별 직선을 점마다 갱신합니다. "
+        "측정 장비 대신 scripts/live_measurement_simulator.py 로 CSV 파일이나 소켓에 측정점을 보낼 수 있습니다."
+    )
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        source_type = st.radio(
+            "측정점 입력:",
+            ["증가하는 CSV 파일", "로컬 TCP 소켓"],
+            horizontal=True,
+            key="linearity_live_source"
+        )
+    with col2:
+        if source_type == "증가하는 CSV 파일":
+            path = st.text_input("CSV 파일 경로", value="live_measurement.csv",
+                                 help=f"데이터 디렉토리({os.path.realpath(DATA_DIR)}) 안의 X1_x … Z_z 헤더가 있는 "
+                                      "CSV 파일로, 새 행이 추가되는 즉시 반영합니다.")
+        else:
+            port = st.number_input("포트 (127.0.0.1)", min_value=1024, max_value=65535, value=DEFAULT_PORT,
+                                   help="장비가 'AXIS,x,y,z' 형식의 줄을 전송할 TCP 포트입니다.")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        window = st.number_input(
+            "축별 적합 구간 (최근 점 수)",
+            min_value=100,
+            max_value=1_000_000,
+            value=DEFAULT_WINDOW,
+            step=1000,
+            help="구간을 넘어선 오래된 점은 적합에서 제외되어 조정 결과가 빠르게 반영됩니다."
+        )
+    with col2:
+        refresh = st.slider("표시 갱신 주기 (초)", min_value=0.1, max_value=2.0, value=0.3, step=0.1)
+    
+    session = st.session_state.get('linearity_live')
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if st.button("▶️ 시작"):
+            stop_live_session(session)
+            try:
+                if source_type == "증가하는 CSV 파일":
+                    source = CsvTailSource(resolve_data_path(path))
+                else:
+                    source = SocketSource(int(port))
+            except (OSError, ValueError) as e:
+                error_handler(f"측정 입력을 열 수 없습니다: {str(e)}")
                 return
-            
-            # 데이터 전처리
-            fill_strategy_map = {
-                "평균으로 대체": "mean",
-                "0으로 대체": "zero",
-                "해당 행 제거": "drop"
+            session = {'source': source, 'fit': LiveLineFit(int(window)), 'history': [], 'started': time.time()}
+            st.session_state.linearity_live = session
+    with col2:
+        if st.button("⏹️ 중지"):
+            stop_live_session(session)
+    with col3:
+        if st.button("🔄 초기화", help="누적된 측정점을 지우고 조정 후 새로 측정합니다.") and session:
+            session['fit'].reset()
+            session['history'] = []
+    
+    if session:
+        display_live_readout(session, refresh)
+
+def stop_live_session(session):
+    """실시간 측정 입력 닫기 (적합 결과는 유지)"""
+    if session and session['source'] is not None:
+        session['source'].close()
+        session['source'] = None
+
+def display_live_readout(session, refresh):
+    """실시간 지표 표시 (지원되는 경우 해당 영역만 주기적으로 다시 실행)"""
+    fragment = getattr(st, 'fragment', None)
+    if fragment is None or session['source'] is None:
+        render_live_readout(session)
+        return
+    fragment(run_every=refresh)(render_live_readout)(session)
+
+def render_live_readout(session):
+    """새 측정점 반영 후 진직도/각도 표시"""
+    if session['source'] is not None:
+        try:
+            session['fit'].push_many(session['source'].poll())
+        except Exception as e:
+            error_handler(f"측정점 수신 중 오류가 발생했습니다: {str(e)}")
+            stop_live_session(session)
+    
+    snapshot = session['fit'].snapshot()
+    linearity = snapshot['linearity_metrics']['linearity']
+    if not linearity:
+        info_message("측정점을 기다리는 중입니다...")
+        return
+    
+    # 축별 진직도
+    columns = st.columns(len(linearity))
+    for column, (axis, values) in zip(columns, linearity.items()):
+        with column:
+            st.metric(
+                f"{axis} 진직도 (최대 거리)",
+                f"{values['max_distance']:.4f}",
+                help=f"구간 점 {snapshot['point_counts'][axis]:,}개 / 누적 {snapshot['total_points'][axis]:,}개, "
+                     f"평균 거리 {values['mean_distance']:.4f}"
+            )
+    
+    # 축 간 각도
+    metrics = snapshot['linearity_metrics']
+    if metrics['parallelism']:
+        angle_table = pd.DataFrame([
+            {
+                '축 쌍': pair,
+                '평행도 각도 (도)': f"{metrics['parallelism'][pair]['angle_deg']:.4f}",
+                '수직도 각도 (도)': f"{metrics['perpendicularity'][pair]['angle_deg']:.4f}"
             }
-            
-            data = preprocess_excel_data(data, fill_strategy=fill_strategy_map[fill_strategy])
-            
-            # 이상치 제거
-            if outlier_removal:
-                data = remove_outliers(data, available_columns)
-            
-            # 세션에 저장
-            st.session_state.linearity_data = data
-            
-            success_message(f"데이터가 성공적으로 로드되었습니다. ({len(data)} 행, {len(available_columns)} 컬럼)")
-            
-            # 데이터 미리보기
-            display_data_preview(data, available_columns)
-            
-            # 분석 실행
-            perform_linearity_analysis(data, available_columns)
+            for pair in metrics['parallelism']
+        ])
+        st.dataframe(angle_table, use_container_width=True, hide_index=True)
+    
+    # 진직도 추이 (최근 600회 갱신)
+    history = session['history']
+    history.append({'경과 시간 (초)': time.time() - session['started'],
+                    **{axis: values['max_distance'] for axis, values in linearity.items()}})
+    del history[:-600]
+    st.line_chart(pd.DataFrame(history).set_index('경과 시간 (초)'), height=250)
+    
+    status = "수신 중" if session['source'] is not None else "중지됨"
+    st.caption(f"📡 {status} · 누적 측정점 {sum(snapshot['total_points'].values()):,}개")
+
+def display_streaming_input():
+    """스트리밍 모드 입력 섹션 표시"""
+    st.subheader("🌊 스트리밍 분석")
+    info_message("NaN이 포함된 점은 축별로 제외되며, 시각화에는 축별 균등 표본이 사용됩니다.")
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        uploaded_file = st.file_uploader(
+            "📊 CSV/Parquet 파일을 업로드하세요",
+            type=["csv", "parquet"],
+            key="linearity_stream_upload",
+            help="업로드 크기 제한을 넘는 파일은 아래에 로컬 경로를 입력하세요."
+        )
+        local_path = st.text_input(
+            "또는 서버 로컬 파일 경로:",
+            value="",
+            help=f"데이터 디렉토리({os.path.realpath(DATA_DIR)}) 안의 대용량 CSV/Parquet 파일 경로를 입력합니다."
+        )
+    with col2:
+        chunksize = st.number_input(
+            "청크 크기 (행)",
+            min_value=10_000,
+            max_value=5_000_000,
+            value=DEFAULT_CHUNKSIZE,
+            step=50_000,
+            help="한 번에 읽을 행 수입니다. 최대 메모리 사용량을 결정합니다."
+        )
+    
+    source = local_path.strip() or uploaded_file
+    if source and st.button("🚀 스트리밍 분석 실행"):
+        try:
+            source = resolve_data_path(source) if isinstance(source, str) else source
+        except ValueError as e:
+            error_handler(str(e))
+            return
+        process_streaming_source(source, int(chunksize))
+
+def process_streaming_source(source, chunksize):
+    """CSV/Parquet 파일 스트리밍 분석"""
+    try:
+        with st.spinner("🌊 청크 단위로 데이터를 분석하는 중..."):
+            results = stream_linearity_analysis(source, chunksize=chunksize)
+        results['source'] = os.path.basename(source) if isinstance(source, str) else source.name
+        
+        st.session_state.linearity_data = None
+        st.session_state.analysis_results = results
+        
+        counts = ", ".join(f"{axis}: {count:,}" for axis, count in results['point_counts'].items())
+        success_message(f"스트리밍 분석이 완료되었습니다. (축별 점 개수 - {counts}) '분석 결과' 탭에서 확인하세요.")
+        
+    except Exception as e:
+        error_handler(f"스트리밍 분석 중 오류가 발생했습니다: {str(e)}")
+
+def display_batch_input():
+    """배치 모드 입력 섹션 표시"""
+    st.subheader("🗂️ 다중 측정 배치 분석")
+    
+    uploaded_files = st.file_uploader(
+        "📊 측정 파일 또는 ZIP 압축 파일을 업로드하세요",
+        type=["xlsx", "xls", "csv", "parquet", "zip"],
+        accept_multiple_files=True,
+        key="linearity_batch_upload",
+        help="회차별 측정 파일을 여러 개 선택하거나 하나의 ZIP 파일로 묶어 업로드합니다."
+    )
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        fill_strategy = st.selectbox(
+            "NaN 값 처리 방법:",
+            options=list(FILL_STRATEGY_MAP),
+            index=0,
+            key="linearity_batch_fill"
+        )
+    with col2:
+        max_workers = st.slider(
+            "병렬 프로세스 수",
+            min_value=1,
+            max_value=os.cpu_count() or 1,
+            value=os.cpu_count() or 1,
+            help="동시에 분석할 파일 수입니다. CPU 코어 수에 비례하여 처리 시간이 줄어듭니다."
+        )
+    with col3:
+        min_zone = st.checkbox(
+            "최소 영역 진직도 포함",
+            value=False,
+            key="linearity_batch_min_zone"
+        )
+    
+    registration = display_registration_options("linearity_batch_registration", allow_first_run=True)
+    
+    if uploaded_files and st.button("🚀 배치 분석 실행"):
+        process_batch_files(uploaded_files, FILL_STRATEGY_MAP[fill_strategy], min_zone, max_workers, registration)
+
+def process_batch_files(uploaded_files, fill_strategy, min_zone, max_workers, registration=None):
+    """업로드된 측정 파일 배치 분석 (registration 이 주어지면 기준 좌표계로 일괄 정합)"""
+    try:
+        inputs = expand_inputs([(f.name, f.getvalue()) for f in uploaded_files])
+        if not inputs:
+            error_handler("분석할 측정 파일(xlsx, xls, csv, parquet)이 없습니다.")
+            return
+        
+        batch_registration = None
+        if registration is not None:
+            reference_file = registration['file']
+            batch_registration = {
+                'reference': 0 if reference_file is None
+                else read_measurement(reference_file.name, reference_file.getvalue()),
+                'iterations': registration['iterations']
+            }
+        
+        with st.spinner(f"🗂️ {len(inputs)}개 측정 파일을 병렬로 분석하는 중..."):
+            results = run_batch(inputs, fill_strategy, min_zone, max_workers, registration=batch_registration)
+        
+        st.session_state.linearity_batch_results = results
+        
+        failed = [r for r in results if r['error']]
+        success_message(f"배치 분석이 완료되었습니다. ({len(results) - len(failed)}/{len(results)}개 성공) "
+                        "'분석 결과' 탭에서 확인하세요.")
+        for result in failed:
+            error_handler(f"{result['run']}: {result['error']}")
+        
+    except Exception as e:
+        error_handler(f"배치 분석 중 오류가 발생했습니다: {str(e)}")
+
+def upload_digest(uploaded_file):
+    """업로드 파일 내용 해시 (같은 업로드는 재실행 시 다시 해시하지 않음)"""
+    digests = st.session_state.setdefault('linearity_upload_digests', {})
+    upload_id = getattr(uploaded_file, 'file_id', None) or (uploaded_file.name, uploaded_file.size)
+    if upload_id not in digests:
+        if len(digests) >= 8:
+            digests.clear()
+        digests[upload_id] = content_digest(uploaded_file.getvalue())
+    return digests[upload_id]
+
+def process_uploaded_file(uploaded_file, fill_strategy, outlier_removal, min_zone=False, robust_options=None,
+                          bootstrap=0, registration=None):
+    """업로드된 파일 처리
+
+    업로드 내용 해시와 전처리/분석 옵션을 키로 파싱된 데이터와 분석 결과를 캐시하여,
+    위젯 조작으로 인한 재실행에서는 파일을 다시 읽거나 분석하지 않습니다.
+    """
+    try:
+        cache_key = (
+            upload_digest(uploaded_file), uploaded_file.name, fill_strategy, outlier_removal, min_zone,
+            tuple(sorted(robust_options.items())) if robust_options else None, bootstrap,
+            (upload_digest(registration['file']), registration['iterations']) if registration else None
+        )
+        entry = _PIPELINE_CACHE.get(cache_key)
+        
+        if entry is None:
+            with st.spinner("📊 데이터를 분석하는 중..."):
+                entry = run_linearity_pipeline(
+                    uploaded_file, fill_strategy, outlier_removal, min_zone, robust_options, bootstrap,
+                    registration
+                )
+            if entry is None:
+                return
+            _PIPELINE_CACHE.put(cache_key, entry)
+        
+        # 세션에 저장
+        st.session_state.linearity_data = entry['data']
+        st.session_state.analysis_results = entry['results']
+        
+        data = entry['data']
+        available_columns = entry['available_columns']
+        success_message(f"데이터가 성공적으로 로드되었습니다. ({len(data)} 행, {len(available_columns)} 컬럼)")
+        for note in entry['notes']:
+            info_message(note)
+        
+        # 데이터 미리보기
+        display_data_preview(data, available_columns, entry['preview'])
+        
+        if entry['results'] is not None:
+            success_message("선형성 분석이 완료되었습니다. '분석 결과' 탭에서 확인하세요.")
             
     except Exception as e:
         error_handler(f"파일 처리 중 오류가 발생했습니다: {str(e)}")
 
-def remove_outliers(data, columns):
-    """3σ 기준 이상치 제거"""
-    original_len = len(data)
+def run_linearity_pipeline(uploaded_file, fill_strategy, outlier_removal, min_zone=False, robust_options=None,
+                           bootstrap=0, registration=None):
+    """파일 읽기 → 전처리 → 선형성 분석 (캐시 항목 생성)"""
+    # 엑셀 파일 읽기
+    data = pd.read_excel(uploaded_file, sheet_name=0)
+    
+    # 필수 컬럼 확인
+    required_columns = [col for axis in AXIS_NAMES for col in axis_columns(axis)]
     
-    for col in columns:
-        if col in data.columns:
-            mean = data[col].mean()
-            std = data[col].std()
-            data = data[abs(data[col] - mean) <= 3 * std]
+    available_columns = [col for col in required_columns if col in data.columns]
     
-    removed_count = original_len - len(data)
-    if removed_count > 0:
-        info_message(f"이상치 {removed_count}개 행이 제거되었습니다.")
+    # 형상 특징 컬럼 (PLANE1_x, CIRCLE_A_x, CYL1_x …)
+    available_columns += [col for name in discover_features(data.columns) for col in feature_columns(name)]
     
-    return data
+    if len(available_columns) < 3:
+        error_handler("최소 하나의 축 또는 형상 특징에 대한 3D 좌표 데이터(x, y, z)가 필요합니다.")
+        return None
+    
+    notes = []
+    
+    # 좌표 정합 (누락값 보간 전 원본 좌표로 대응점 구성)
+    registration_summary = None
+    if registration is not None:
+        reference_file = registration['file']
+        reference = read_measurement(reference_file.name, reference_file.getvalue())
+        data, registration_summary = align_to_reference(data, reference, registration['iterations'])
+        notes.append(
+            f"기준 좌표계로 정합되었습니다. (대응점 {registration_summary['matched']}개, "
+            f"RMS {registration_summary['rms']:.4f}, 회전 {registration_summary['rotation_deg']:.3f}°)"
+        )
+    
+    # 전처리 → 이상치 제거 → 분석 (배치/명령줄 도구와 같은 analyze_frame 파이프라인)
+    results = perform_linearity_analysis(data, fill_strategy, outlier_removal, min_zone, robust_options, bootstrap)
+    if results is not None:
+        data = results.pop('data')
+        results['source'] = uploaded_file.name
+        if results['outliers_removed']:
+            notes.append(f"이상치 {results['outliers_removed']}개 행이 제거되었습니다.")
+    if results is not None and registration_summary is not None:
+        results['registration'] = registration_summary
+    if results is not None and 'robust_summary' in results:
+        removed = ", ".join(f"{axis}: {values['removed']}개" for axis, values in results['robust_summary'].items())
+        notes.append(f"강건 적합으로 이상치가 제거되었습니다. ({removed})")
+    
+    return {
+        'data': data,
+        'available_columns': available_columns,
+        'preview': build_data_preview(data, available_columns),
+        'results': results,
+        'notes': notes
+    }
+
+def build_data_preview(data, available_columns):
+    """미리보기용 요약 (상위 행, 누락값 수, 기술 통계) 계산"""
+    return {
+        'head': data[available_columns].head(10),
+        'missing': int(data[available_columns].isnull().sum().sum()),
+        'describe': data[available_columns].describe()
+    }
 
-def display_data_preview(data, available_columns):
+def display_data_preview(data, available_columns, preview=None):
     """데이터 미리보기 표시"""
     st.subheader("📋 데이터 미리보기")
     
+    if preview is None:
+        preview = build_data_preview(data, available_columns)
+    
     # 통계 정보
     col1, col2, col3, col4 = st.columns(4)
     with col1:
         st.metric("총 행 수", len(data))
     with col2:
-        st.metric("사용 가능한 축", len(set([col.split('_')[0] for col in available_columns])))
+        st.metric("사용 가능한 축", len(set([col.rsplit('_', 1)[0] for col in available_columns])))
     with col3:
         st.metric("총 컬럼 수", len(available_columns))
     with col4:
-        st.metric("누락값", data[available_columns].isnull().sum().sum())
+        st.metric("누락값", preview['missing'])
     
     # 데이터 테이블
-    st.dataframe(data[available_columns].head(10), use_container_width=True)
+    st.dataframe(preview['head'], use_container_width=True)
     
     # 기본 통계 정보
     with st.expander("📊 기본 통계 정보"):
-        st.dataframe(data[available_columns].describe(), use_container_width=True)
+        st.dataframe(preview['describe'], use_container_width=True)
 
-def perform_linearity_analysis(data, available_columns):
-    """선형성 분석 수행"""
+def perform_linearity_analysis(data, fill_strategy, outlier_removal, min_zone=False, robust_options=None,
+                               bootstrap=0):
+    """선형성 분석 수행 (실패 시 None 반환)
+    
+    누락값 처리, 3σ 이상치 제거, 강건 적합, 직선 적합, 지표/형상 공차 계산은
+    linearity_batch.analyze_frame 에서 배치 분석/명령줄 도구와 동일하게 수행합니다.
+    """
     try:
-        # 데이터 점 추출
-        data_points = extract_data_points(data, available_columns)
-        
-        # PCA 분석
-        pca_results = perform_pca_analysis(data_points)
-        
-        # 선형성 지표 계산
-        linearity_metrics = calculate_linearity_metrics(data_points, pca_results)
+        results = analyze_frame(data, FILL_STRATEGY_MAP[fill_strategy], outlier_removal.startswith("3σ"),
+                                min_zone, robust_options, bootstrap)
         
         # 결과 저장
-        st.session_state.analysis_results = {
-            'data_points': data_points,
-            'pca_results': pca_results,
-            'linearity_metrics': linearity_metrics
-        }
-        
-        success_message("선형성 분석이 완료되었습니다. '분석 결과' 탭에서 확인하세요.")
+        st.session_state.analysis_results = results
+        return results
         
     except Exception as e:
         error_handler(f"분석 중 오류가 발생했습니다: {str(e)}")
-
-def extract_data_points(data, available_columns):
-    """각 축별 데이터 점 추출"""
-    data_points = {}
-    
-    # 축별로 그룹화
-    axes = set([col.split('_')[0] for col in available_columns])
-    
-    for axis in axes:
-        axis_columns = [f"{axis}_x", f"{axis}_y", f"{axis}_z"]
-        if all(col in data.columns for col in axis_columns):
-            points = data[axis_columns].dropna().values
-            if len(points) > 0:
-                data_points[axis] = points
-    
-    return data_points
-
-def perform_pca_analysis(data_points):
-    """PCA 분석 수행"""
-    pca_results = {}
-    
-    for axis, points in data_points.items():
-        if len(points) >= 2:  # PCA를 위해 최소 2개 점 필요
-            pca = PCA(n_components=1)
-            pca.fit(points)
-            
-            pca_results[axis] = {
-                'direction_vector': pca.components_[0],
-                'point_on_line': pca.mean_,
-                'explained_variance_ratio': pca.explained_variance_ratio_[0],
-                'singular_values': pca.singular_values_[0]
-            }
-    
-    return pca_results
-
-def calculate_linearity_metrics(data_points, pca_results):
-    """선형성 지표 계산"""
-    metrics = {
-        'linearity': {},  # 진직도
-        'parallelism': {},  # 평행도  
-        'perpendicularity': {}  # 수직도
-    }
-    
-    # 진직도 계산
-    for axis, points in data_points.items():
-        if axis in pca_results:
-            pca_result = pca_results[axis]
-            direction_vector = pca_result['direction_vector']
-            point_on_line = pca_result['point_on_line']
-            
-            # 각 점에서 주성분 직선까지의 거리 계산
-            distances = []
-            for point in points:
-                # 점에서 직선까지의 거리 계산
-                proj = point_on_line + np.dot(point - point_on_line, direction_vector) * direction_vector
-                distance = np.linalg.norm(point - proj)
-                distances.append(distance)
-            
-            metrics['linearity'][axis] = {
-                'mean_distance': np.mean(distances),
-                'max_distance': np.max(distances),
-                'std_distance': np.std(distances)
-            }
-    
-    # 평행도 및 수직도 계산
-    axes = list(pca_results.keys())
-    for i in range(len(axes)):
-        for j in range(i + 1, len(axes)):
-            axis1, axis2 = axes[i], axes[j]
-            vector1 = pca_results[axis1]['direction_vector']
-            vector2 = pca_results[axis2]['direction_vector']
-            
-            # 두 벡터 사이의 각도 계산
-            dot_product = np.clip(np.dot(vector1, vector2) / 
-                                (np.linalg.norm(vector1) * np.linalg.norm(vector2)), -1.0, 1.0)
-            angle_deg = np.degrees(np.arccos(np.abs(dot_product)))
-            
-            # 평행도 (0도에 가까울수록 평행)
-            parallelism_score = 90 - min(angle_deg, 180 - angle_deg)
-            metrics['parallelism'][f"{axis1}_{axis2}"] = {
-                'angle_deg': min(angle_deg, 180 - angle_deg),
-                'parallelism_score': parallelism_score
-            }
-            
-            # 수직도 (90도에 가까울수록 수직)
-            perpendicularity_score = 90 - abs(90 - angle_deg)
-            metrics['perpendicularity'][f"{axis1}_{axis2}"] = {
-                'angle_deg': angle_deg,
-                'perpendicularity_score': perpendicularity_score
-            }
-    
-    return metrics
+        return None
 
 def display_method_section():
     """평가 방법 섹션 표시"""
@@ -299,6 +662,20 @@ def display_method_section():
         st.latex(r"L = \frac{1}{N} \sum_{i=1}^{N} d_i")
         st.markdown("여기서 $d_i$는 각 데이터 점에서 직선까지의 거리, $N$은 데이터 점의 개수입니다.")
     
+    with st.expander("🎯 최소 영역 진직도 (ISO 1101)"):
+        st.markdown("""
+        **최소 영역 진직도**는 모든 측정점을 포함하는 가장 가는 원통의 지름입니다.
+        최소제곱(PCA) 직선 기준 영역(2 × 최대 거리)보다 항상 작거나 같으며,
+        검사 규격의 형상 공차 판정에 사용됩니다.
+        
+        **계산 방법:**
+        1. PCA 직선 좌표계에서 축 기울기를 변수로 둡니다.
+        2. 기울기마다 점들을 축에 수직인 평면으로 사영하고, 볼록 껍질 꼭짓점의 최소 포함 원을 구합니다.
+        3. 최소 포함 원 반지름이 최소가 되는 기울기를 탐색합니다.
+        4. 후보 점으로 구한 원통을 전체 점으로 검증하고, 벗어난 점을 후보에 추가하여 반복합니다.
+        """)
+        st.latex(r"t_{MZ} = \min_{\text{axis}} \; 2 \max_i d_i")
+    
     with st.expander("📏 평행도 (Parallelism) 평가"):
         st.markdown("""
         **평행도**는 두 축의 주성분 벡터가 얼마나 평행한지를 평가합니다.
@@ -344,53 +721,287 @@ def display_method_section():
         st.latex(r"C = \\frac{1}{N-1} X_{centered}^T X_{centered}")
         st.latex(r"C \\vec{v} = \\lambda \\vec{v}")
         st.markdown("여기서 $C$는 공분산 행렬, $\\vec{v}$는 고유벡터, $\\lambda$는 고유값입니다.")
+    
+    with st.expander("🎲 부트스트랩 신뢰구간"):
+        st.markdown("""
+        측정점을 복원 추출로 반복 재표본화하여 방향 벡터와 축 간 각도의 분포를 추정합니다.
+        
+        **계산 방법:**
+        1. 축별 측정점을 무작위 블록으로 묶고 블록별 합과 2차 모멘트를 계산합니다.
+        2. 재표본마다 블록 선택 횟수로 3×3 산포 행렬을 한 번에 구성합니다.
+        3. 모든 재표본의 산포 행렬을 일괄 고유값 분해하여 방향 벡터를 구합니다.
+        4. 재표본 각도의 2.5% ~ 97.5% 백분위를 95% 신뢰구간으로 사용합니다.
+        
+        **해석:** 신뢰구간이 허용 각도를 포함하면 측정된 어긋남이 잡음과 구분되지 않습니다.
+        방향 CI는 재표본 방향이 기준 방향에서 벗어나는 각도의 95% 상한입니다.
+        """)
+    
+    with st.expander("📐 형상 공차 (평면도/진원도/원통도)"):
+        st.markdown("""
+        PLANE, CIRCLE, CYL 접두어 특징의 측정점에 최소제곱 형상을 적합하고 잔차 범위를 형상 공차로 계산합니다.
+        
+        **계산 방법:**
+        1. **평면**: 산포 행렬의 최소 고유값 방향을 법선으로 사용, 평면도 = 부호 있는 거리의 최대 - 최소
+        2. **원**: 최소제곱 평면에 사영한 뒤 대수적 원 적합을 초기값으로 기하 거리 최소화, 진원도 = 반경 잔차 범위
+        3. **원통**: 세 주성분 방향을 초기 축 후보로 Gauss-Newton 반경 잔차 최소화, 원통도 = 반경 잔차 범위
+        
+        같은 종류의 특징은 한 번에 묶어 일괄(배치) 계산합니다.
+        최소제곱 기준이므로 최소 영역(ISO 1101) 값보다 약간 클 수 있습니다.
+        """)
 
 def display_result_section():
     """분석 결과 섹션 표시"""
     st.header("📈 분석 결과")
     
-    if st.session_state.analysis_results is None:
+    batch_results = st.session_state.get('linearity_batch_results')
+    if st.session_state.analysis_results is None and not batch_results:
         info_message("먼저 '데이터 입력' 탭에서 데이터를 업로드하고 분석을 수행하세요.")
         return
     
-    results = st.session_state.analysis_results
+    if st.session_state.analysis_results is not None:
+        results = st.session_state.analysis_results
+        
+        # 3D 시각화
+        display_3d_visualization(results)
+        
+        # 정량적 결과 표시
+        display_quantitative_results(results)
+        
+        # 분석 리포트
+        display_analysis_report(results)
+        
+        # 측정 이력 저장
+        display_history_save(results)
+    
+    # 배치 분석 결과
+    if batch_results:
+        display_batch_results(batch_results)
+
+def display_batch_results(batch_results):
+    """배치 분석 회차별 비교 표시"""
+    st.subheader("🗂️ 회차별 비교")
+    
+    comparison = batch_comparison_table(batch_results)
+    if comparison.empty:
+        info_message("비교할 수 있는 분석 결과가 없습니다.")
+        return
+    
+    st.dataframe(comparison.style.format("{:.4f}"), use_container_width=True)
+    
+    # 회차별 추세 그래프
+    metric = st.selectbox(
+        "추세 지표:",
+        options=list(BATCH_METRICS),
+        format_func=lambda key: BATCH_METRICS[key][2],
+        key="linearity_batch_metric"
+    )
+    
+    long_table = batch_long_table(batch_results)
+    selected = long_table[long_table['metric'] == metric]
+    
+    fig = go.Figure()
+    for target, group in selected.groupby('target', sort=False):
+        fig.add_trace(go.Scatter(
+            x=group['run'], y=group['value'],
+            mode='lines+markers',
+            name=target
+        ))
+    
+    fig.update_layout(
+        title=f"회차별 {BATCH_METRICS[metric][2]} 추세",
+        xaxis_title="측정 회차",
+        yaxis_title=BATCH_METRICS[metric][2],
+        height=450
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+def display_history_save(results):
+    """분석 결과를 측정 이력 저장소에 추가"""
+    st.subheader("💾 측정 이력 저장")
+    
+    now = datetime.now().replace(microsecond=0)
+    with st.form("linearity_history_form"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            machine_id = st.text_input("장비 ID", value=st.session_state.get('linearity_machine_id', ''))
+        with col2:
+            measured_date = st.date_input("측정 일자", value=now.date())
+        with col3:
+            measured_time = st.time_input("측정 시각", value=now.time())
+        include_lines = st.checkbox("적합 직선(점, 방향 벡터) 함께 저장", value=True)
+        submitted = st.form_submit_button("💾 이력에 저장")
+    
+    if not submitted:
+        return
+    if not machine_id.strip():
+        error_handler("장비 ID를 입력하세요.")
+        return
+    
+    try:
+        run_id = LinearityStore().record_run(
+            machine_id.strip(),
+            results['linearity_metrics'],
+            results['pca_results'] if include_lines else None,
+            measured_at=datetime.combine(measured_date, measured_time),
+            source=results.get('source')
+        )
+        st.session_state.linearity_machine_id = machine_id.strip()
+        success_message(f"측정 이력에 저장되었습니다. (장비 {machine_id.strip()}, 회차 #{run_id})")
+    except Exception as e:
+        error_handler(f"이력 저장 중 오류가 발생했습니다: {str(e)}")
+
+def display_history_section():
+    """장비별 측정 이력 추세 표시"""
+    st.header("📉 이력 추세")
+    
+    try:
+        # 저장소 파일은 처음 저장할 때 만들어지므로 조회만으로는 만들지 않음
+        store = LinearityStore.open()
+        machines = store.machines() if store is not None else []
+    except Exception as e:
+        error_handler(f"이력 저장소를 열 수 없습니다: {str(e)}")
+        return
+    
+    if not machines:
+        info_message("저장된 측정 이력이 없습니다. '분석 결과' 탭에서 결과를 이력에 저장하세요.")
+        return
+    
+    default_machine = st.session_state.get('linearity_machine_id')
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        machine_id = st.selectbox(
+            "장비 ID",
+            options=machines,
+            index=machines.index(default_machine) if default_machine in machines else 0
+        )
+    with col2:
+        months = st.number_input("조회 기간 (최근 개월)", min_value=1, max_value=120, value=6, step=1)
+    with col3:
+        metric = st.selectbox(
+            "추세 지표:",
+            options=list(BATCH_METRICS),
+            format_func=lambda key: BATCH_METRICS[key][2],
+            key="linearity_history_metric"
+        )
+    
+    group, key, label = BATCH_METRICS[metric]
+    history = store.query_drift(machine_id, metrics=[key], groups=[group], months=months)
+    if history.empty:
+        info_message(f"최근 {months}개월 동안 저장된 측정 이력이 없습니다.")
+        return
     
-    # 3D 시각화
-    display_3d_visualization(results)
+    fig = go.Figure()
+    for target, values in history.groupby('target', sort=False):
+        fig.add_trace(go.Scatter(
+            x=values['measured_at'], y=values['value'],
+            mode='lines+markers',
+            name=target,
+            text=values['source'],
+            hovertemplate="%{x}<br>%{y:.4f}<br>%{text}<extra>" + target + "</extra>"
+        ))
     
-    # 정량적 결과 표시
-    display_quantitative_results(results)
+    fig.update_layout(
+        title=f"{machine_id} {label} 추세 (최근 {months}개월)",
+        xaxis_title="측정 시각",
+        yaxis_title=label,
+        height=450
+    )
+    st.plotly_chart(fig, use_container_width=True)
     
-    # 분석 리포트
-    display_analysis_report(results)
+    # 대상별 변화량 및 월간 추세
+    summary = drift_summary(history).drop(columns=['metric_group', 'metric']).rename(columns={
+        'target': '대상',
+        'runs': '회차 수',
+        'first': '최초 값',
+        'last': '최근 값',
+        'change': '변화량',
+        'slope_per_month': '월간 추세'
+    })
+    st.dataframe(summary.style.format("{:.4f}", subset=['최초 값', '최근 값', '변화량', '월간 추세']),
+                 use_container_width=True)
+    st.caption(f"저장소: {store.path} · 회차 {history['run_id'].nunique()}개")
 
 def display_3d_visualization(results):
-    """3D 시각화 표시"""
+    """3D 시각화 표시 (축별 복셀 다운샘플링 LOD 렌더링)"""
     st.subheader("🎯 3D 시각화")
     
     data_points = results['data_points']
     pca_results = results['pca_results']
     
+    # LOD 옵션
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        point_budget = st.select_slider(
+            "축별 표시 점 예산",
+            options=[1_000, 2_000, 5_000, 10_000, 20_000, 50_000, 100_000, 200_000],
+            value=DEFAULT_POINT_BUDGET,
+            help="브라우저에 전송할 축별 최대 점 개수입니다. 지표는 항상 전체 점으로 계산됩니다."
+        )
+    with col2:
+        keep_worst = st.number_input(
+            "최대 잔차 점 유지 개수",
+            min_value=0,
+            max_value=10_000,
+            value=500,
+            step=100,
+            help="직선에서 가장 먼 점들은 다운샘플링과 무관하게 항상 표시합니다."
+        )
+    with col3:
+        color_by_residual = st.checkbox("잔차로 색상 표시", value=True)
+    
     fig = go.Figure()
     
     # 색상 정의
     colors = {'X1': 'blue', 'X2': 'green', 'Y': 'orange', 'Z': 'purple'}
     line_colors = {'X1': 'red', 'X2': 'cyan', 'Y': 'yellow', 'Z': 'magenta'}
+    symbols = {'X1': 'circle', 'X2': 'diamond', 'Y': 'square', 'Z': 'cross'}
     
-    # 데이터 점 시각화
+    # 축별 LOD 표본 (옵션별로 세션에 저장하여 재실행 시 재사용)
+    # 결과 사전은 파이프라인 캐시 항목이므로 직접 추가하면 캐시 크기 추정이 어긋나 세션에 따로 보관
+    lod_state = st.session_state.get('linearity_lod')
+    if lod_state is None or lod_state['results'] is not results:
+        lod_state = st.session_state.linearity_lod = {'results': results, 'samples': {}}
+    lod_cache = lod_state['samples']
+    displayed = {}
     for axis, points in data_points.items():
+        key = (axis, point_budget, int(keep_worst))
+        if key not in lod_cache:
+            residuals = None
+            if axis in pca_results:
+                fit = pca_results[axis]
+                residuals = line_distances(points, fit['point_on_line'], fit['direction_vector'])
+            index = voxel_downsample(points, point_budget, residuals, keep_worst=int(keep_worst))
+            lod_cache[key] = (index, None if residuals is None else residuals[index])
+        displayed[axis] = lod_cache[key]
+    
+    residual_max = max(
+        (r.max() for _, r in displayed.values() if r is not None and len(r)), default=0.0
+    )
+    
+    # 데이터 점 시각화
+    for k, (axis, (index, residuals)) in enumerate(displayed.items()):
+        points = data_points[axis][index]
+        if color_by_residual and residuals is not None:
+            marker = dict(
+                size=3, color=residuals, colorscale='Viridis', cmin=0, cmax=residual_max,
+                symbol=symbols.get(axis, 'circle'), opacity=0.8,
+                colorbar=dict(title="직선 거리") if k == 0 else None, showscale=(k == 0)
+            )
+        else:
+            marker = dict(size=3, color=colors.get(axis, 'gray'), opacity=0.7)
         fig.add_trace(go.Scatter3d(
             x=points[:, 0], y=points[:, 1], z=points[:, 2],
             mode='markers',
-            marker=dict(size=5, color=colors.get(axis, 'gray'), opacity=0.7),
-            name=f'{axis} 데이터 점'
+            marker=marker,
+            name=f'{axis} 데이터 점 ({len(index):,}/{len(data_points[axis]):,})'
         ))
     
     # 주성분 직선 시각화
     if pca_results:
         # 전체 데이터 범위 계산
-        all_points = np.vstack([points for points in data_points.values()])
-        max_range = np.ptp(all_points, axis=0).max()
+        lower = np.min([points.min(axis=0) for points in data_points.values()], axis=0)
+        upper = np.max([points.max(axis=0) for points in data_points.values()], axis=0)
+        max_range = (upper - lower).max()
         max_range = max_range if max_range > 0 else 50
         
         t_vals = np.linspace(-0.5 * max_range, 0.5 * max_range, 100)
@@ -418,11 +1029,21 @@ def display_3d_visualization(results):
         ),
         title="3D 데이터 점과 주성분 분석 결과",
         showlegend=True,
+        legend=dict(x=0, y=1),
         width=800,
         height=600
     )
     
     st.plotly_chart(fig, use_container_width=True)
+    
+    # 전송량 표시
+    total_points = sum(len(points) for points in data_points.values())
+    shown_points = sum(len(index) for index, _ in displayed.values())
+    payload_kb = len(fig.to_json()) / 1024
+    st.caption(
+        f"📦 표시 점 {shown_points:,} / 전체 {total_points:,} "
+        f"({shown_points / max(total_points, 1):.1%}), 차트 페이로드 약 {payload_kb:,.0f} KB"
+    )
 
 def display_quantitative_results(results):
     """정량적 결과 표시"""
@@ -430,17 +1051,39 @@ def display_quantitative_results(results):
     
     metrics = results['linearity_metrics']
     
+    # 좌표 정합 요약
+    if 'registration' in results:
+        registration = results['registration']
+        st.write("**🧭 좌표 정합 결과**")
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("대응점 수", f"{registration['matched']:,}")
+        with col2:
+            st.metric("정합 RMS", f"{registration['rms']:.4f}")
+        with col3:
+            st.metric("회전 각도", f"{registration['rotation_deg']:.3f}°")
+        with col4:
+            st.metric("이동 거리", f"{registration['translation']:.3f}")
+    
     # 진직도 결과
     if metrics['linearity']:
         st.write("**🎯 진직도 (Linearity) 결과**")
         linearity_data = []
         for axis, values in metrics['linearity'].items():
-            linearity_data.append({
+            row = {
                 '축': axis,
                 '평균 거리': f"{values['mean_distance']:.4f}",
                 '최대 거리': f"{values['max_distance']:.4f}",
                 '표준편차': f"{values['std_distance']:.4f}"
-            })
+            }
+            if 'min_zone_straightness' in values:
+                row['PCA 영역 (2×최대 거리)'] = f"{values['pca_zone']:.4f}"
+                row['최소 영역 진직도 (ISO 1101)'] = f"{values['min_zone_straightness']:.4f}"
+            if 'direction_ci_deg' in values:
+                direction = results['pca_results'][axis]['direction_vector']
+                row['방향 벡터'] = f"({direction[0]:.5f}, {direction[1]:.5f}, {direction[2]:.5f})"
+                row['방향 95% CI (±°)'] = f"{values['direction_ci_deg']:.4f}"
+            linearity_data.append(row)
         
         linearity_df = pd.DataFrame(linearity_data)
         st.dataframe(linearity_df, use_container_width=True)
@@ -451,12 +1094,15 @@ def display_quantitative_results(results):
         parallelism_data = []
         for axes, values in metrics['parallelism'].items():
             axis1, axis2 = axes.split('_')
-            parallelism_data.append({
+            row = {
                 '기준 축': axis1,
                 '측정 축': axis2,
                 '각도 (도)': f"{values['angle_deg']:.2f}°",
                 '평행도 점수': f"{values['parallelism_score']:.1f}/90"
-            })
+            }
+            if 'angle_ci_low' in values:
+                row['각도 95% CI'] = format_angle_interval(values)
+            parallelism_data.append(row)
         
         parallelism_df = pd.DataFrame(parallelism_data)
         st.dataframe(parallelism_df, use_container_width=True)
@@ -467,15 +1113,47 @@ def display_quantitative_results(results):
         perpendicularity_data = []
         for axes, values in metrics['perpendicularity'].items():
             axis1, axis2 = axes.split('_')
-            perpendicularity_data.append({
+            row = {
                 '기준 축': axis1,
                 '측정 축': axis2,
                 '각도 (도)': f"{values['angle_deg']:.2f}°",
                 '수직도 점수': f"{values['perpendicularity_score']:.1f}/90"
-            })
+            }
+            if 'angle_ci_low' in values:
+                row['각도 95% CI'] = format_angle_interval(values)
+            perpendicularity_data.append(row)
         
         perpendicularity_df = pd.DataFrame(perpendicularity_data)
         st.dataframe(perpendicularity_df, use_container_width=True)
+    
+    # 형상 공차 결과
+    display_form_results(results.get('form_results'))
+
+def display_form_results(form_results):
+    """평면도/진원도/원통도 결과 표시"""
+    if not form_results:
+        return
+    
+    st.write("**📐 형상 공차 (Form) 결과**")
+    type_labels = {'plane': '평면', 'circle': '원', 'cylinder': '원통'}
+    error_labels = {'flatness': '평면도', 'roundness': '진원도', 'cylindricity': '원통도'}
+    form_data = []
+    for name, fit in form_results.items():
+        direction = fit['normal'] if 'normal' in fit else fit['axis_direction']
+        form_data.append({
+            '특징': name,
+            '종류': type_labels[fit['type']],
+            '점 수': fit['count'],
+            '형상 공차': f"{fit['form_error']:.4f} ({error_labels[FORM_ERROR_NAMES[fit['type']]]})",
+            'RMS 잔차': f"{fit['rms']:.4f}",
+            '반지름': f"{fit['radius']:.4f}" if 'radius' in fit else '-',
+            '법선/축 방향': f"({direction[0]:.5f}, {direction[1]:.5f}, {direction[2]:.5f})"
+        })
+    st.dataframe(pd.DataFrame(form_data), use_container_width=True)
+
+def format_angle_interval(values):
+    """부트스트랩 각도 신뢰구간 표시 문자열"""
+    return f"[{values['angle_ci_low']:.4f}°, {values['angle_ci_high']:.4f}°]"
 
 def display_analysis_report(results):
     """분석 리포트 표시"""
@@ -558,11 +1236,13 @@ def display_data_format_guide():
     | X2_x, X2_y, X2_z | X2축의 3D 좌표 | 11.1, 21.2, 31.3 |
     | Y_x, Y_y, Y_z | Y축의 3D 좌표 | 12.1, 22.2, 32.3 |
     | Z_x, Z_y, Z_z | Z축의 3D 좌표 | 13.1, 23.2, 33.3 |
+    | PLANE1_x, CIRCLE1_x, CYL1_x … (_y, _z) | 평면/원/원통 형상 특징의 3D 좌표 (선택) | 14.1, 24.2, 34.3 |
     
     **참고사항:**
     - 모든 축의 데이터가 필요하지 않습니다. 분석하고자 하는 축만 포함하면 됩니다.
     - 최소 하나의 축에 대한 3D 좌표 데이터가 필요합니다.
     - 각 축마다 최소 2개 이상의 데이터 점이 있어야 합니다.
+    - 형상 특징은 이름 접두어(PLANE, CIRCLE, CYL)로 종류를 구분하며 평면도/진원도/원통도를 계산합니다.
     """)
 
 def create_template_download():
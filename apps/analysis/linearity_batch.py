@@ -0,0 +1,299 @@
+"""
+다중 측정 파일 선형성 배치 평가
+여러 측정 파일(또는 ZIP 압축 파일)을 프로세스 풀에서 병렬로 분석하고 회차별로 비교합니다.
+"""
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from apps.analysis.linearity_engine import (
+    axis_columns, compute_linearity_metrics, discover_axes, fit_lines
+)
+from apps.analysis.form_fitting import discover_features, extract_feature_points, fit_features, form_metrics
+from apps.analysis.registration import (
+    frame_keys, frame_points, line_alignment_metrics, register_batch, registration_frame, transform_lines
+)
+
+MEASUREMENT_SUFFIXES = ('.xlsx', '.xls', '.csv', '.parquet')
+
+# 추세 비교용 지표 정의: (지표 그룹, 값 키, 표시 이름)
+BATCH_METRICS = {
+    'mean_distance': ('linearity', 'mean_distance', '진직도 평균 거리'),
+    'max_distance': ('linearity', 'max_distance', '진직도 최대 거리'),
+    'parallel_angle': ('parallelism', 'angle_deg', '평행도 각도 (도)'),
+    'perpendicular_angle': ('perpendicularity', 'angle_deg', '수직도 각도 (도)'),
+    'direction_deviation': ('alignment', 'direction_deviation_deg', '기준 대비 방향 편차 (도)'),
+    'line_offset': ('alignment', 'line_offset', '기준 대비 직선 위치 편차'),
+    'registration_rms': ('registration', 'rms', '좌표 정합 RMS'),
+    'form_error': ('form', 'form_error', '형상 공차 (평면도/진원도/원통도)')
+}
+
+
+def natural_key(name):
+    """숫자를 고려한 파일 이름 정렬 키 (run_2 < run_10)"""
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', name)]
+
+
+def expand_inputs(files):
+    """(이름, 바이트) 목록에서 ZIP 파일을 측정 파일 항목으로 펼치기"""
+    inputs = []
+    for name, payload in files:
+        if name.lower().endswith('.zip'):
+            with zipfile.ZipFile(BytesIO(payload)) as archive:
+                members = [m for m in archive.namelist()
+                           if m.lower().endswith(MEASUREMENT_SUFFIXES) and not m.startswith('__MACOSX')]
+                for member in sorted(members, key=natural_key):
+                    inputs.append((member, archive.read(member)))
+        elif name.lower().endswith(MEASUREMENT_SUFFIXES):
+            inputs.append((name, payload))
+    return inputs
+
+
+def collect_measurement_paths(paths):
+    """파일/디렉토리 경로 목록을 측정 파일 경로 목록으로 펼치기 (디렉토리는 하위 파일 포함)"""
+    collected = []
+    for path in paths:
+        if os.path.isdir(path):
+            found = []
+            for root, _, names in os.walk(path):
+                found.extend(os.path.join(root, name) for name in names
+                             if name.lower().endswith(MEASUREMENT_SUFFIXES) and not name.startswith('~$'))
+            collected.extend(sorted(found, key=natural_key))
+        elif os.path.isfile(path):
+            collected.append(path)
+        else:
+            raise FileNotFoundError(f"경로를 찾을 수 없습니다: {path}")
+    return collected
+
+
+def read_measurement(name, payload):
+    """파일 형식에 맞게 측정 데이터 읽기 (payload: 파일 바이트 또는 경로)"""
+    suffix = os.path.splitext(name)[1].lower()
+    buffer = BytesIO(payload) if isinstance(payload, bytes) else payload
+    if suffix == '.csv':
+        return pd.read_csv(buffer)
+    if suffix == '.parquet':
+        return pd.read_parquet(buffer)
+    return pd.read_excel(buffer, sheet_name=0)
+
+
+def remove_sigma_outliers(data, columns, sigma_level=3.0):
+    """좌표 컬럼별 평균에서 sigma_level·표준편차를 넘게 벗어난 행 제거 (컬럼 순서대로 차례로 적용)"""
+    for col in columns:
+        if col in data.columns:
+            mean = data[col].mean()
+            std = data[col].std()
+            data = data[abs(data[col] - mean) <= sigma_level * std]
+    return data
+
+
+def analyze_frame(data, fill_strategy='mean', sigma_outliers=False, min_zone=False, robust_options=None,
+                  bootstrap=0):
+    """측정 DataFrame 선형성 분석 (UI 단일 분석, 배치 작업, CLI 가 함께 쓰는 파이프라인)
+
+    형상 특징 점군은 원본 좌표로 추출하고, 누락값 처리와 3σ 이상치 제거(sigma_outliers)는 축 측정 컬럼에만
+    적용합니다. robust_options 가 주어지면 RANSAC 으로 직선 거리 기준 이상치를 제거한 뒤 직선 적합,
+    진직도/평행도/수직도 지표, 평면/원/원통 형상 공차('form' 그룹)를 계산합니다.
+    반환: {'data', 'data_points', 'pca_results', 'linearity_metrics', 'outliers_removed'}
+          (+ 'form_results', 'robust_summary')
+    """
+    from utils.data_processing import preprocess_excel_data
+
+    axes = discover_axes(data.columns)
+    features = discover_features(data.columns)
+    if not axes and not features:
+        raise ValueError("최소 하나의 축 또는 형상 특징에 대한 3D 좌표 데이터(x, y, z)가 필요합니다.")
+
+    feature_points = extract_feature_points(data, features) if features else {}
+    columns = [col for axis in axes for col in axis_columns(axis)]
+    data = preprocess_excel_data(data, fill_strategy=fill_strategy, columns=columns)
+    rows = len(data)
+    if sigma_outliers:
+        data = remove_sigma_outliers(data, columns)
+
+    data_points = {}
+    for axis in axes:
+        points = data[axis_columns(axis)].dropna().to_numpy(dtype=float)
+        if len(points) > 0:
+            data_points[axis] = points
+
+    robust_summary = None
+    if robust_options is not None:
+        from apps.analysis.robust_fit import robust_filter_points
+        data_points, robust_summary = robust_filter_points(data_points, **robust_options)
+
+    pca_results = fit_lines(data_points, min_points=2)
+    metrics = compute_linearity_metrics(data_points, pca_results, min_zone=min_zone, bootstrap=bootstrap)
+    result = {
+        'data': data,
+        'data_points': data_points,
+        'pca_results': pca_results,
+        'linearity_metrics': metrics,
+        'outliers_removed': rows - len(data)
+    }
+    if feature_points:
+        result['form_results'] = fit_features(feature_points)
+        metrics['form'] = form_metrics(result['form_results'])
+    if robust_summary is not None:
+        result['robust_summary'] = robust_summary
+    return result
+
+
+def analyze_measurement(name, payload, fill_strategy='mean', min_zone=False, robust_options=None,
+                        bootstrap=0, keep_frame=False, sigma_outliers=False):
+    """단일 측정 파일 분석 (프로세스 풀 작업 단위)
+
+    UI 단일 분석과 같은 analyze_frame 파이프라인으로 처리하며, 결과 전송량을 줄이기 위해
+    점군 대신 지표만 반환합니다. sigma_outliers/robust_options 는 UI의 3σ/강건 적합 이상치 옵션과 같습니다.
+    keep_frame=True 이면 좌표 정합에 사용할 목표점 ID/좌표 컬럼과 적합 직선을 함께 반환합니다.
+    평면/원/원통 특징 컬럼(PLANE1_x 등)이 있으면 형상 공차를 'form' 그룹으로 추가합니다.
+    """
+    try:
+        data = read_measurement(name, payload)
+        frame = registration_frame(data) if keep_frame else None
+        analysis = analyze_frame(data, fill_strategy, sigma_outliers, min_zone, robust_options, bootstrap)
+        result = {
+            'run': name,
+            'rows': len(analysis['data']),
+            'linearity_metrics': analysis['linearity_metrics'],
+            'error': None
+        }
+        if keep_frame:
+            result['registration_frame'] = frame
+            result['pca_results'] = analysis['pca_results']
+        return result
+    except Exception as e:
+        return {'run': name, 'rows': 0, 'linearity_metrics': None, 'error': str(e)}
+
+
+def _analyze_item(args):
+    return analyze_measurement(*args)
+
+
+def run_batch(inputs, fill_strategy='mean', min_zone=False, max_workers=None, robust_options=None,
+              bootstrap=0, registration=None, sigma_outliers=False):
+    """측정 파일 목록을 프로세스 풀에서 병렬 분석 (입력 순서 유지, sigma_outliers: 3σ 이상치 행 제거)
+
+    registration={'reference': 기준 회차 인덱스 또는 공칭 점 DataFrame, 'iterations': 반복 수}
+    이면 분석 후 모든 회차를 기준 좌표계에 일괄 정합합니다.
+    """
+    keep_frame = registration is not None
+    tasks = [(name, payload, fill_strategy, min_zone, robust_options, bootstrap, keep_frame, sigma_outliers)
+             for name, payload in inputs]
+    if not tasks:
+        return []
+
+    workers = min(max_workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        results = [_analyze_item(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_analyze_item, tasks))
+
+    if registration is not None:
+        register_runs(results, **registration)
+    return results
+
+
+def register_runs(results, reference=0, iterations=0):
+    """배치 결과를 기준 회차(인덱스) 또는 공칭 점(DataFrame)에 일괄 정합
+
+    회차별로 정합 요약('registration')과 기준 직선 대비 방향/위치 편차('alignment')를
+    지표에 추가합니다. 진직도·평행도·수직도는 강체 변환에 불변이므로 다시 계산하지 않습니다.
+    대응점은 목표점 ID 컬럼(없으면 행 번호)과 기준의 축 순서로 맞추며, 기준과 ID 컬럼 유무가
+    다르면 ValueError 입니다.
+    """
+    valid = [result for result in results if result['error'] is None and 'registration_frame' in result]
+    if isinstance(reference, pd.DataFrame):
+        reference_frame = reference
+        nominal = {}
+        for axis in discover_axes(reference.columns):
+            points = reference[axis_columns(axis)].dropna().to_numpy(dtype=float)
+            if len(points) > 0:
+                nominal[axis] = points
+        reference_lines = fit_lines(nominal)
+    else:
+        if not 0 <= reference < len(results) or not any(result is results[reference] for result in valid):
+            raise ValueError("기준 회차를 정합에 사용할 수 없습니다 (분석 오류 또는 범위 밖).")
+        reference_frame = results[reference]['registration_frame']
+        reference_lines = results[reference]['pca_results']
+
+    if valid:
+        axes = discover_axes(reference_frame.columns)
+        keys = frame_keys(reference_frame)
+        reference_points = frame_points(reference_frame, axes, keys)
+        sources = np.stack([frame_points(result['registration_frame'], axes, keys) for result in valid])
+        registered = register_batch(sources, reference_points, iterations=iterations)
+
+        for k, result in enumerate(valid):
+            rotation, translation = registered['rotation'][k], registered['translation'][k]
+            aligned_lines = transform_lines(result['pca_results'], rotation, translation)
+            metrics = result['linearity_metrics']
+            metrics['alignment'] = line_alignment_metrics(aligned_lines, reference_lines)
+            metrics['registration'] = {'frame': {
+                'rms': float(registered['rms'][k]),
+                'rotation_deg': float(registered['rotation_deg'][k]),
+                'translation': float(np.linalg.norm(translation)),
+                'matched': int(registered['matched'][k])
+            }}
+
+    for result in results:
+        result.pop('registration_frame', None)
+        result.pop('pca_results', None)
+    return results
+
+
+def batch_long_table(results):
+    """회차별 지표를 (회차, 지표, 대상, 값) 형식의 긴 테이블로 변환"""
+    records = []
+    for order, result in enumerate(results):
+        metrics = result['linearity_metrics']
+        if metrics is None:
+            continue
+        for metric, (group, key, label) in BATCH_METRICS.items():
+            for target, values in metrics.get(group, {}).items():
+                records.append({
+                    'order': order,
+                    'run': result['run'],
+                    'metric': metric,
+                    'label': label,
+                    'target': target,
+                    'value': values[key]
+                })
+    return pd.DataFrame(records, columns=['order', 'run', 'metric', 'label', 'target', 'value'])
+
+
+def batch_comparison_table(results):
+    """회차별 비교 테이블 (행: 회차, 열: 지표 × 축/축 쌍)"""
+    long_table = batch_long_table(results)
+    if long_table.empty:
+        return pd.DataFrame()
+
+    long_table['column'] = long_table['label'] + ' ' + long_table['target']
+    table = long_table.pivot_table(index=['order', 'run'], columns='column', values='value', sort=False)
+    return table.reset_index(level='order', drop=True)
+
+
+def metrics_table(results):
+    """회차별 전체 지표를 (회차, 그룹, 대상, 지표, 값) 형식의 긴 테이블로 변환"""
+    records = []
+    for result in results:
+        metrics = result['linearity_metrics']
+        if metrics is None:
+            continue
+        for group, targets in metrics.items():
+            for target, values in targets.items():
+                for metric, value in values.items():
+                    records.append({
+                        'run': result['run'],
+                        'group': group,
+                        'target': target,
+                        'metric': metric,
+                        'value': float(value)
+                    })
+    return pd.DataFrame(records, columns=['run', 'group', 'target', 'metric', 'value'])
@@ -0,0 +1,118 @@
+"""
+축 방향 및 축 간 각도의 부트스트랩 신뢰구간
+재표본마다 3x3 산포 행렬을 일괄 구성하고 고유값 분해를 한 번에 수행합니다.
+"""
+import numpy as np
+
+DEFAULT_RESAMPLES = 10_000
+DEFAULT_CONFIDENCE = 0.95
+
+# 점을 무작위 블록으로 묶어 블록 합을 재표본화 (재표본 비용이 점 개수와 무관)
+MAX_BLOCKS = 512
+# 한 번에 처리할 재표본 수 × 블록 수 상한 (메모리 사용량 제한)
+CHUNK_ELEMENTS = 4_000_000
+
+
+def _block_moments(points, rng):
+    """점을 무작위 블록으로 나눈 블록별 (개수, 합, 2차 모멘트) 행렬 (m, 13)
+
+    측정 순서에 따른 추세가 블록에 섞이지 않도록 점을 무작위로 배정합니다.
+    블록 합은 서로 독립인 점 합이므로 블록 재표본화의 평균/산포 분산은 점 재표본화와 같습니다.
+    """
+    centered = points - points.mean(axis=0)
+    n = len(centered)
+    m = min(n, MAX_BLOCKS)
+    labels = rng.permutation(n) % m
+
+    moments = np.empty((n, 13))
+    moments[:, 0] = 1.0
+    moments[:, 1:4] = centered
+    moments[:, 4:] = np.einsum('ni,nj->nij', centered, centered).reshape(n, 9)
+
+    return np.column_stack([np.bincount(labels, weights=column, minlength=m) for column in moments.T])
+
+
+def _resample_counts(rng, size, m):
+    """재표본별 블록 선택 횟수 행렬 (size, m)"""
+    draws = rng.integers(0, m, (size, m)) + (np.arange(size) * m)[:, None]
+    return np.bincount(draws.ravel(), minlength=size * m).reshape(size, m).astype(float)
+
+
+def bootstrap_directions(points, reference, n_resamples=DEFAULT_RESAMPLES, seed=0):
+    """재표본별 주성분 방향 벡터 (n_resamples, 3)
+
+    재표본 가중치 행렬과 블록 모멘트의 행렬 곱으로 (B, 3, 3) 산포 텐서를 만들고
+    일괄 고유값 분해로 최대 고유벡터를 구합니다. 부호는 기준 방향에 맞춥니다.
+    """
+    rng = np.random.default_rng(seed)
+    blocks = _block_moments(np.asarray(points, dtype=float), rng)
+    m = len(blocks)
+    chunk = max(1, CHUNK_ELEMENTS // m)
+
+    directions = np.empty((n_resamples, 3))
+    for start in range(0, n_resamples, chunk):
+        stop = min(start + chunk, n_resamples)
+        sums = _resample_counts(rng, stop - start, m) @ blocks
+        count = sums[:, 0]
+        mean = sums[:, 1:4] / count[:, None]
+        scatter = sums[:, 4:].reshape(-1, 3, 3) - count[:, None, None] * np.einsum('bi,bj->bij', mean, mean)
+        _, eigenvectors = np.linalg.eigh(scatter)
+        directions[start:stop] = eigenvectors[:, :, -1]
+
+    signs = np.sign(np.einsum('bi,i->b', directions, reference))
+    signs[signs == 0] = 1.0
+    return directions * signs[:, None]
+
+
+def bootstrap_intervals(data_points, pca_results, n_resamples=DEFAULT_RESAMPLES,
+                        confidence=DEFAULT_CONFIDENCE, seed=0):
+    """방향 벡터와 축 쌍 각도의 백분위 부트스트랩 신뢰구간
+
+    반환값:
+        directions: 축별 {'cone_deg': 기준 방향과의 편차 각 상한, 'low'/'high': 성분별 구간}
+        angles: 축 쌍 'A_B' 별 {'perpendicular': (하한, 상한), 'parallel': (하한, 상한)}
+    """
+    alpha = (1 - confidence) / 2
+    axes = [axis for axis in pca_results if axis in data_points]
+
+    samples = {}
+    references = {}
+    directions = {}
+    for k, axis in enumerate(axes):
+        reference = references[axis] = np.asarray(pca_results[axis]['direction_vector'], dtype=float)
+        samples[axis] = bootstrap_directions(data_points[axis], reference, n_resamples, seed + k)
+        deviation = np.degrees(np.arccos(np.clip(samples[axis] @ reference, -1.0, 1.0)))
+        directions[axis] = {
+            'cone_deg': float(np.quantile(deviation, confidence)),
+            'low': np.quantile(samples[axis], alpha, axis=0),
+            'high': np.quantile(samples[axis], 1 - alpha, axis=0)
+        }
+
+    angles = {}
+    for i, axis1 in enumerate(axes):
+        for axis2 in axes[i + 1:]:
+            # 점 추정값(pairwise_angles)은 |cos| 로 0~90도 쪽 각도를 쓰므로, 기준 방향 내적의 부호를
+            # 모든 재표본에 곱해 같은 쪽 각도로 맞춤 (재표본마다 |cos| 를 쓰면 90도 부근 구간이 한쪽으로 접힘)
+            sign = -1.0 if references[axis1] @ references[axis2] < 0 else 1.0
+            cosines = np.clip(sign * np.einsum('bi,bi->b', samples[axis1], samples[axis2]), -1.0, 1.0)
+            angle = np.degrees(np.arccos(cosines))
+            parallel = np.minimum(angle, 180 - angle)
+            angles[f"{axis1}_{axis2}"] = {
+                'perpendicular': tuple(float(v) for v in np.quantile(angle, [alpha, 1 - alpha])),
+                'parallel': tuple(float(v) for v in np.quantile(parallel, [alpha, 1 - alpha]))
+            }
+
+    return {'directions': directions, 'angles': angles, 'n_resamples': n_resamples, 'confidence': confidence}
+
+
+def attach_intervals(metrics, intervals):
+    """선형성 지표에 신뢰구간 값을 추가 (진직도: 방향 편차 각, 평행도/수직도: 각도 구간)"""
+    for axis, values in intervals['directions'].items():
+        if axis in metrics['linearity']:
+            metrics['linearity'][axis]['direction_ci_deg'] = values['cone_deg']
+
+    for pair, values in intervals['angles'].items():
+        for group, key in (('parallelism', 'parallel'), ('perpendicularity', 'perpendicular')):
+            if pair in metrics[group]:
+                metrics[group][pair]['angle_ci_low'], metrics[group][pair]['angle_ci_high'] = values[key]
+    return metrics
@@ -0,0 +1,334 @@
+"""
+3D 선형성 분석 수치 엔진
+Streamlit/Plotly에 의존하지 않는 배열 기반 직선 적합 및 선형성 지표 계산
+"""
+import numpy as np
+
+# 축 이름 및 좌표 컬럼 규칙 (예: X1_x, X1_y, X1_z)
+AXIS_NAMES = ['X1', 'X2', 'Y', 'Z']
+COORD_SUFFIXES = ['x', 'y', 'z']
+
+
+def axis_columns(axis):
+    """축 이름에 해당하는 좌표 컬럼 목록"""
+    return [f"{axis}_{suffix}" for suffix in COORD_SUFFIXES]
+
+
+def discover_axes(columns):
+    """컬럼 목록에서 x, y, z 좌표가 모두 있는 축 탐색"""
+    columns = set(columns)
+    return [axis for axis in AXIS_NAMES if all(col in columns for col in axis_columns(axis))]
+
+
+def _line_fit_result(mean, eigenvalues, eigenvectors):
+    """고유값 분해 결과를 pca_results[axis] 구조로 변환"""
+    direction = eigenvectors[:, -1]
+
+    # 부호를 결정적으로 고정 (절댓값이 가장 큰 성분이 양수)
+    if direction[np.argmax(np.abs(direction))] < 0:
+        direction = -direction
+
+    eigenvalues = np.clip(eigenvalues, 0.0, None)
+    total = eigenvalues.sum()
+
+    return {
+        'direction_vector': direction,
+        'point_on_line': np.asarray(mean, dtype=float),
+        'explained_variance_ratio': eigenvalues[-1] / total if total > 0 else 1.0,
+        'singular_values': np.sqrt(eigenvalues[-1])
+    }
+
+
+def fit_line_from_moments(mean, scatter):
+    """평균과 3x3 산포 행렬로부터 직선 적합"""
+    eigenvalues, eigenvectors = np.linalg.eigh(scatter)
+    return _line_fit_result(mean, eigenvalues, eigenvectors)
+
+
+def fit_lines(data_points, min_points=2):
+    """축별 점군에 대한 직선 적합
+
+    축마다 3x3 산포 행렬(중심화된 X^T X)을 구한 뒤 (k, 3, 3) 배열로 쌓아
+    한 번의 일괄 고유값 분해로 모든 축의 주성분 방향을 계산합니다.
+    """
+    axes = [axis for axis, points in data_points.items() if len(points) >= min_points]
+    if not axes:
+        return {}
+
+    means = []
+    scatters = []
+    for axis in axes:
+        points = np.asarray(data_points[axis], dtype=float)
+        mean = points.mean(axis=0)
+        centered = points - mean
+        means.append(mean)
+        scatters.append(centered.T @ centered)
+
+    eigenvalues, eigenvectors = np.linalg.eigh(np.stack(scatters))
+
+    return {
+        axis: _line_fit_result(means[k], eigenvalues[k], eigenvectors[k])
+        for k, axis in enumerate(axes)
+    }
+
+
+def orthogonal_basis(direction_vector):
+    """방향 벡터에 수직인 정규직교 기저 (3, 2) 계산"""
+    q, _ = np.linalg.qr(np.asarray(direction_vector, dtype=float).reshape(3, 1), mode='complete')
+    return q[:, 1:]
+
+
+def line_distances(points, point_on_line, direction_vector):
+    """모든 점에서 직선까지의 거리를 한 번의 배열 연산으로 계산
+
+    직선에 수직인 두 기저 벡터로 점군을 한 번에 사영(n x 3 @ 3 x 2)하므로
+    점별 루프나 n x 3 임시 배열 없이 잔차를 구할 수 있습니다.
+    """
+    basis = orthogonal_basis(direction_vector)
+    residuals = np.asarray(points, dtype=float) @ basis
+    residuals -= np.asarray(point_on_line, dtype=float) @ basis
+    return np.hypot(residuals[:, 0], residuals[:, 1])
+
+
+class AxisMoments:
+    """병합 가능한 축별 누적 평균 및 산포 행렬
+
+    청크 단위로 갱신하거나 다른 누적값과 병합(Chan 병렬 분산 공식)할 수 있어
+    전체 점군을 메모리에 올리지 않고도 직선을 적합할 수 있습니다.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = np.zeros(3)
+        self.scatter = np.zeros((3, 3))
+
+    def update(self, points):
+        """점 배열 (n, 3) 반영"""
+        points = np.asarray(points, dtype=float)
+        if len(points) == 0:
+            return self
+        mean = points.mean(axis=0)
+        centered = points - mean
+        self._combine(len(points), mean, centered.T @ centered)
+        return self
+
+    def push(self, point):
+        """점 하나 추가 (랭크 1 갱신, Welford)"""
+        point = np.asarray(point, dtype=float)
+        self.count += 1
+        delta = point - self.mean
+        self.mean = self.mean + delta / self.count
+        self.scatter = self.scatter + np.outer(delta, point - self.mean)
+        return self
+
+    def remove(self, point):
+        """이전에 추가한 점 하나 제거 (랭크 1 역갱신, 이동 구간 적합용)"""
+        point = np.asarray(point, dtype=float)
+        if self.count <= 1:
+            self.__init__()
+            return self
+        previous_mean = (self.count * self.mean - point) / (self.count - 1)
+        self.scatter = self.scatter - np.outer(point - previous_mean, point - self.mean)
+        self.mean = previous_mean
+        self.count -= 1
+        return self
+
+    def merge(self, other):
+        """다른 누적값 병합"""
+        if other.count:
+            self._combine(other.count, other.mean, other.scatter)
+        return self
+
+    def _combine(self, count, mean, scatter):
+        total = self.count + count
+        delta = mean - self.mean
+        self.scatter = self.scatter + scatter + np.outer(delta, delta) * (self.count * count / total)
+        self.mean = self.mean + delta * (count / total)
+        self.count = total
+
+    def fit(self):
+        """누적값으로 직선 적합"""
+        return fit_line_from_moments(self.mean, self.scatter)
+
+
+class DistanceStats:
+    """병합 가능한 점-직선 거리 누적 통계 (평균, 최대, 표준편차)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.max = 0.0
+
+    def update(self, distances):
+        """거리 배열 반영"""
+        distances = np.asarray(distances, dtype=float)
+        if len(distances) == 0:
+            return self
+        mean = distances.mean()
+        m2 = np.sum((distances - mean) ** 2)
+        self._combine(len(distances), mean, m2, distances.max())
+        return self
+
+    def merge(self, other):
+        """다른 누적값 병합"""
+        if other.count:
+            self._combine(other.count, other.mean, other.m2, other.max)
+        return self
+
+    def _combine(self, count, mean, m2, maximum):
+        total = self.count + count
+        delta = mean - self.mean
+        self.m2 += m2 + delta ** 2 * self.count * count / total
+        self.mean += delta * count / total
+        self.max = max(self.max, maximum)
+        self.count = total
+
+    def metrics(self):
+        """진직도 지표 구조로 변환"""
+        return {
+            'mean_distance': float(self.mean),
+            'max_distance': float(self.max),
+            'std_distance': float(np.sqrt(self.m2 / self.count)) if self.count else 0.0
+        }
+
+
+def straightness_metrics(distances):
+    """점-직선 거리 배열로부터 진직도 지표 계산"""
+    return {
+        'mean_distance': float(np.mean(distances)),
+        'max_distance': float(np.max(distances)),
+        'std_distance': float(np.std(distances))
+    }
+
+
+def pairwise_angles(pca_results):
+    """축 방향 벡터 쌍별 사잇각(도) 계산
+
+    방향 벡터를 (k, 3) 행렬로 쌓아 내적 행렬 한 번으로 모든 쌍을 계산합니다.
+    """
+    axes = list(pca_results.keys())
+    if len(axes) < 2:
+        return {}
+
+    directions = np.stack([pca_results[axis]['direction_vector'] for axis in axes])
+    norms = np.linalg.norm(directions, axis=1)
+    cosines = np.clip((directions @ directions.T) / np.outer(norms, norms), -1.0, 1.0)
+    angles = np.degrees(np.arccos(np.abs(cosines)))
+
+    upper_i, upper_j = np.triu_indices(len(axes), k=1)
+    return {
+        (axes[i], axes[j]): float(angles[i, j]) for i, j in zip(upper_i, upper_j)
+    }
+
+
+def orientation_metrics(pca_results):
+    """평행도 및 수직도 지표 계산"""
+    parallelism = {}
+    perpendicularity = {}
+
+    for (axis1, axis2), angle_deg in pairwise_angles(pca_results).items():
+        # 평행도 (0도에 가까울수록 평행)
+        parallel_angle = min(angle_deg, 180 - angle_deg)
+        parallelism[f"{axis1}_{axis2}"] = {
+            'angle_deg': parallel_angle,
+            'parallelism_score': 90 - parallel_angle
+        }
+
+        # 수직도 (90도에 가까울수록 수직)
+        perpendicularity[f"{axis1}_{axis2}"] = {
+            'angle_deg': angle_deg,
+            'perpendicularity_score': 90 - abs(90 - angle_deg)
+        }
+
+    return parallelism, perpendicularity
+
+
+def compute_linearity_metrics(data_points, pca_results, min_zone=False, bootstrap=0):
+    """진직도, 평행도, 수직도 지표 일괄 계산
+
+    min_zone=True 이면 PCA 기준 지표 옆에 최소 영역(ISO 1101) 진직도를 함께 계산합니다.
+    bootstrap 이 0보다 크면 해당 재표본 수로 방향/각도의 95% 부트스트랩 신뢰구간을 추가합니다.
+    """
+    metrics = {
+        'linearity': {},  # 진직도
+        'parallelism': {},  # 평행도
+        'perpendicularity': {}  # 수직도
+    }
+
+    for axis, points in data_points.items():
+        if axis in pca_results:
+            fit = pca_results[axis]
+            distances = line_distances(points, fit['point_on_line'], fit['direction_vector'])
+            metrics['linearity'][axis] = straightness_metrics(distances)
+
+            if min_zone:
+                from apps.analysis.minimum_zone import minimum_zone_straightness
+                zone = minimum_zone_straightness(points, fit)
+                metrics['linearity'][axis]['pca_zone'] = 2 * metrics['linearity'][axis]['max_distance']
+                metrics['linearity'][axis]['min_zone_straightness'] = zone['min_zone_straightness']
+
+    metrics['parallelism'], metrics['perpendicularity'] = orientation_metrics(pca_results)
+
+    if bootstrap:
+        from apps.analysis.linearity_bootstrap import attach_intervals, bootstrap_intervals
+        attach_intervals(metrics, bootstrap_intervals(data_points, pca_results, n_resamples=bootstrap))
+
+    return metrics
+
+
+def _voxel_keys(points, voxel_size):
+    """점마다 속한 복셀의 1차원 키"""
+    keys = np.floor((points - points.min(axis=0)) / voxel_size).astype(np.int64)
+    spans = keys.max(axis=0) + 1
+    return (keys[:, 0] * spans[1] + keys[:, 1]) * spans[2] + keys[:, 2]
+
+
+def _voxel_representatives(points, voxel_size, priority):
+    """복셀마다 우선순위(잔차)가 가장 큰 대표 점 인덱스"""
+    flat = _voxel_keys(points, voxel_size)
+    order = np.lexsort((-priority, flat))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = flat[order[1:]] != flat[order[:-1]]
+    return order[first]
+
+
+def voxel_downsample(points, budget, residuals=None, keep_worst=0, sample_size=100_000, seed=0):
+    """시각화용 복셀 격자 다운샘플링 인덱스
+
+    점 예산(budget)에 맞도록 복셀 크기를 이분 탐색하고, 복셀마다 잔차가 가장 큰 점을
+    대표로 남깁니다. keep_worst 개의 최대 잔차 점은 복셀과 무관하게 항상 포함하므로
+    형상 오차가 축소 표시에서도 사라지지 않습니다.
+    """
+    points = np.asarray(points, dtype=float)
+    n = len(points)
+    if n <= budget:
+        return np.arange(n)
+
+    priority = np.zeros(n) if residuals is None else np.asarray(residuals, dtype=float)
+    keep_worst = min(keep_worst, budget) if residuals is not None else 0
+    worst = np.argpartition(priority, n - keep_worst)[n - keep_worst:] if keep_worst else np.empty(0, dtype=np.int64)
+    remaining = budget - len(worst)
+    if remaining <= 0:
+        return np.sort(worst)
+
+    # 복셀 크기 탐색은 표본에서 수행하고, 전체 점에서 예산을 넘는 대표 점은 복셀 순서대로 균등 추출
+    rng = np.random.default_rng(seed)
+    probe = points if n <= sample_size else points[rng.choice(n, sample_size, replace=False)]
+    extent = max(np.ptp(points, axis=0).max(), 1e-12)
+    low, high = extent * 1e-6, extent
+    for _ in range(30):
+        size = np.sqrt(low * high)
+        occupied = len(np.unique(_voxel_keys(probe, size)))
+        if occupied > remaining:
+            low = size
+        else:
+            high = size
+        if high / low < 1.05:
+            break
+
+    selected = _voxel_representatives(points, high, priority)
+    if len(selected) > remaining:
+        selected = selected[np.linspace(0, len(selected) - 1, remaining).astype(np.int64)]
+
+    return np.union1d(selected, worst)
@@ -0,0 +1,223 @@
+"""
+실시간 선형성 측정
+로컬 TCP 소켓 또는 증가하는 CSV 파일에서 측정점을 받아 점마다 직선 적합을 갱신합니다.
+"""
+import csv
+import os
+import socket
+import weakref
+
+import numpy as np
+
+from apps.analysis.linearity_engine import (
+    AXIS_NAMES, AxisMoments, line_distances, orientation_metrics, straightness_metrics
+)
+
+# 축별로 유지할 최근 측정점 수 (적합/진직도 계산 구간)
+DEFAULT_WINDOW = 50_000
+DEFAULT_PORT = 5757
+
+
+def parse_axis_line(line):
+    """'AXIS,x,y,z' 형식 한 줄을 (축, 점)으로 변환 (형식이 다르면 None)"""
+    parts = line.strip().split(',')
+    if len(parts) != 4 or parts[0] not in AXIS_NAMES:
+        return None
+    try:
+        point = np.array([float(value) for value in parts[1:]])
+    except ValueError:
+        return None
+    return (parts[0], point) if np.isfinite(point).all() else None
+
+
+class LiveLineFit:
+    """축별 실시간 직선 적합
+
+    점마다 누적 평균/산포 행렬을 랭크 1로 갱신하고, 구간(window)을 넘어선 오래된 점은
+    랭크 1 역갱신으로 제거하여 조정 직후의 최근 측정만 반영합니다.
+    진직도 거리는 표시 시점에 구간 점에 대해 일괄 계산합니다.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.window = window
+        self.moments = {}
+        self.buffers = {}
+        self.positions = {}
+        self.totals = {}
+
+    def push(self, axis, point):
+        """측정점 하나 반영"""
+        if axis not in self.moments:
+            self.moments[axis] = AxisMoments()
+            self.buffers[axis] = np.empty((self.window, 3))
+            self.positions[axis] = 0
+            self.totals[axis] = 0
+
+        moments, buffer = self.moments[axis], self.buffers[axis]
+        slot = self.positions[axis] % self.window
+        if self.totals[axis] >= self.window:
+            moments.remove(buffer[slot])
+        buffer[slot] = point
+        moments.push(point)
+
+        self.positions[axis] += 1
+        self.totals[axis] += 1
+        # 구간을 한 바퀴 돌 때마다 누적값을 구간 점으로 다시 계산하여 반올림 오차 누적 방지
+        if self.totals[axis] > self.window and slot == self.window - 1:
+            self.moments[axis] = AxisMoments().update(buffer)
+
+    def push_many(self, events):
+        """(축, 점) 목록 반영"""
+        for axis, point in events:
+            self.push(axis, point)
+        return len(events)
+
+    def reset(self):
+        """누적값 초기화 (조정 후 새로 측정)"""
+        self.__init__(self.window)
+
+    def window_points(self, axis):
+        """축의 현재 구간 측정점"""
+        count = min(self.totals[axis], self.window)
+        return self.buffers[axis][:count]
+
+    def snapshot(self):
+        """현재 적합 직선과 진직도/평행도/수직도 지표"""
+        pca_results = {}
+        linearity = {}
+        for axis, moments in self.moments.items():
+            if moments.count < 2:
+                continue
+            fit = moments.fit()
+            pca_results[axis] = fit
+            distances = line_distances(self.window_points(axis), fit['point_on_line'], fit['direction_vector'])
+            linearity[axis] = straightness_metrics(distances)
+
+        parallelism, perpendicularity = orientation_metrics(pca_results)
+        return {
+            'pca_results': pca_results,
+            'linearity_metrics': {
+                'linearity': linearity,
+                'parallelism': parallelism,
+                'perpendicularity': perpendicularity
+            },
+            'point_counts': {axis: moments.count for axis, moments in self.moments.items()},
+            'total_points': dict(self.totals)
+        }
+
+
+class CsvTailSource:
+    """증가하는 CSV 파일(X1_x … Z_z 헤더)의 새로 추가된 완전한 행 읽기"""
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+        self.columns = None
+        self.partial = b''
+
+    def poll(self, max_bytes=4 * 1024 * 1024):
+        """마지막 읽기 이후 추가된 측정점 목록 [(축, 점)]"""
+        if not os.path.exists(self.path):
+            return []
+        if os.path.getsize(self.path) < self.offset:
+            # 파일이 새로 작성됨 (측정 재시작)
+            self.offset, self.columns, self.partial = 0, None, b''
+
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            chunk = f.read(max_bytes)
+        self.offset += len(chunk)
+
+        lines = (self.partial + chunk).split(b'\n')
+        self.partial = lines.pop()
+
+        events = []
+        texts = (line.decode('utf-8-sig', errors='ignore').strip() for line in lines)
+        # 따옴표/공백이 포함된 헤더도 해석하도록 csv 모듈로 분할
+        for values in csv.reader((text for text in texts if text), skipinitialspace=True):
+            if self.columns is None:
+                self.columns = self._axis_positions(values)
+                continue
+            for axis, index in self.columns:
+                try:
+                    point = np.array([float(values[k]) for k in index])
+                except (IndexError, ValueError):
+                    continue
+                if np.isfinite(point).all():
+                    events.append((axis, point))
+        return events
+
+    @staticmethod
+    def _axis_positions(header):
+        header = [name.strip() for name in header]
+        positions = []
+        for axis in AXIS_NAMES:
+            names = [f"{axis}_{c}" for c in 'xyz']
+            if all(name in header for name in names):
+                positions.append((axis, [header.index(name) for name in names]))
+        return positions
+
+    def close(self):
+        pass
+
+
+class SocketSource:
+    """로컬 TCP 소켓으로 'AXIS,x,y,z' 줄 단위 측정점 수신 (논블로킹)"""
+
+    def __init__(self, port=DEFAULT_PORT, host='127.0.0.1'):
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind((host, port))
+        self.server.listen()
+        self.server.setblocking(False)
+        self.clients = {}
+        # 중지하지 않고 버려진 세션의 소스도 수집될 때 대기/클라이언트 소켓을 닫음
+        self._finalizer = weakref.finalize(self, _close_sockets, self.server, self.clients)
+
+    def poll(self, max_bytes=1024 * 1024):
+        """접속 대기 중인 장비를 받아들이고 수신된 측정점 목록 [(축, 점)] 반환"""
+        self._accept()
+        events = []
+        for client in list(self.clients):
+            for line in self._receive(client, max_bytes):
+                event = parse_axis_line(line.decode('utf-8', errors='ignore'))
+                if event is not None:
+                    events.append(event)
+        return events
+
+    def _accept(self):
+        while True:
+            try:
+                client, _ = self.server.accept()
+            except BlockingIOError:
+                return
+            client.setblocking(False)
+            self.clients[client] = b''
+
+    def _receive(self, client, max_bytes):
+        """클라이언트에서 받은 완전한 줄 목록 (연결이 끊기면 정리)"""
+        try:
+            data = client.recv(max_bytes)
+        except BlockingIOError:
+            return []
+        except OSError:
+            data = b''
+        if not data:
+            client.close()
+            del self.clients[client]
+            return []
+
+        lines = (self.clients[client] + data).split(b'\n')
+        self.clients[client] = lines.pop()
+        return lines
+
+    def close(self):
+        """대기 소켓과 접속한 장비 소켓 닫기 (여러 번 호출해도 안전)"""
+        self._finalizer()
+
+
+def _close_sockets(server, clients):
+    for client in clients:
+        client.close()
+    clients.clear()
+    server.close()
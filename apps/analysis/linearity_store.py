@@ -0,0 +1,204 @@
+"""
+선형성 측정 이력 저장소
+회차별 지표와 적합 직선을 SQLite 파일에 누적하고 장비/축/시각 인덱스로 추세를 조회합니다.
+"""
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_STORE_PATH = os.environ.get(
+    'LINEARITY_STORE_PATH',
+    os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'linearity_history.sqlite')
+)
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+DAYS_PER_MONTH = 30.44
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    machine_id TEXT NOT NULL,
+    measured_at TEXT NOT NULL,
+    source TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_machine_time ON runs (machine_id, measured_at);
+
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    machine_id TEXT NOT NULL,
+    measured_at TEXT NOT NULL,
+    metric_group TEXT NOT NULL,
+    target TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL
+);
+DROP INDEX IF EXISTS idx_metrics_lookup;
+CREATE INDEX IF NOT EXISTS idx_metrics_drift ON metrics (machine_id, metric, measured_at);
+CREATE INDEX IF NOT EXISTS idx_metrics_run ON metrics (run_id);
+
+CREATE TABLE IF NOT EXISTS lines (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    axis TEXT NOT NULL,
+    point_x REAL, point_y REAL, point_z REAL,
+    direction_x REAL, direction_y REAL, direction_z REAL,
+    PRIMARY KEY (run_id, axis)
+);
+"""
+
+
+def format_timestamp(value):
+    """datetime/문자열/None(현재 시각)을 저장용 문자열로 변환 (사전식 정렬 = 시간 순서)"""
+    if value is None:
+        value = datetime.now()
+    return pd.Timestamp(value).strftime(TIMESTAMP_FORMAT)
+
+
+class LinearityStore:
+    """장비 ID · 축 · 측정 시각으로 인덱싱된 선형성 지표 이력 저장소"""
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = os.path.abspath(path)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._connect() as connection:
+            # 측정 PC 야간 작업(쓰기)과 UI 조회(읽기)가 동시에 접근할 수 있도록 WAL 모드 사용
+            connection.execute('PRAGMA journal_mode = WAL')
+            connection.executescript(SCHEMA)
+
+    @classmethod
+    def open(cls, path=DEFAULT_STORE_PATH):
+        """이미 있는 저장소만 열기 (파일이 없으면 만들지 않고 None)"""
+        return cls(path) if os.path.exists(path) else None
+
+    @contextmanager
+    def _connect(self):
+        """트랜잭션 단위 연결 (정상 종료 시 커밋, 예외 시 롤백 후 닫기)"""
+        connection = sqlite3.connect(self.path)
+        try:
+            connection.execute('PRAGMA foreign_keys = ON')
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def record_run(self, machine_id, linearity_metrics, pca_results=None, measured_at=None, source=None):
+        """회차 지표(및 선택적으로 적합 직선)를 추가하고 run_id 반환"""
+        if not machine_id:
+            raise ValueError("장비 ID가 필요합니다.")
+        measured_at = format_timestamp(measured_at)
+
+        rows = [
+            (group, target, metric, float(value))
+            for group, targets in linearity_metrics.items()
+            for target, values in targets.items()
+            for metric, value in values.items()
+        ]
+
+        with self._connect() as connection:
+            cursor = connection.execute(
+                'INSERT INTO runs (machine_id, measured_at, source, created_at) VALUES (?, ?, ?, ?)',
+                (machine_id, measured_at, source, format_timestamp(None))
+            )
+            run_id = cursor.lastrowid
+            connection.executemany(
+                'INSERT INTO metrics (run_id, machine_id, measured_at, metric_group, target, metric, value) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(run_id, machine_id, measured_at) + row for row in rows]
+            )
+            if pca_results:
+                connection.executemany(
+                    'INSERT INTO lines VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    [(run_id, axis, *map(float, fit['point_on_line']), *map(float, fit['direction_vector']))
+                     for axis, fit in pca_results.items()]
+                )
+        return run_id
+
+    def delete_run(self, run_id):
+        """회차와 해당 지표/직선 삭제"""
+        with self._connect() as connection:
+            connection.execute('DELETE FROM runs WHERE run_id = ?', (int(run_id),))
+
+    def machines(self):
+        """저장된 장비 ID 목록"""
+        with self._connect() as connection:
+            return [row[0] for row in connection.execute('SELECT DISTINCT machine_id FROM runs ORDER BY machine_id')]
+
+    def runs(self, machine_id=None):
+        """회차 목록 (측정 시각 순)"""
+        query = 'SELECT run_id, machine_id, measured_at, source FROM runs'
+        params = ()
+        if machine_id is not None:
+            query += ' WHERE machine_id = ?'
+            params = (machine_id,)
+        with self._connect() as connection:
+            table = pd.read_sql_query(query + ' ORDER BY measured_at, run_id', connection, params=params)
+        table['measured_at'] = pd.to_datetime(table['measured_at'])
+        return table
+
+    def query_drift(self, machine_id, targets=None, metrics=None, groups=None, months=None, since=None, until=None):
+        """장비의 지표 이력 조회 (측정 시각 순 긴 테이블)
+
+        (machine_id, metric, measured_at) 복합 인덱스로 장비·지표의 조회 기간만 읽고,
+        대상/지표 그룹 조건은 읽은 행에서 거릅니다 (대상 조건이 없는 추세 조회도 같은 인덱스 사용).
+        months 를 지정하면 현재 시각 기준 최근 N개월을 조회합니다.
+        """
+        if months is not None:
+            since = datetime.now() - timedelta(days=DAYS_PER_MONTH * months)
+
+        clauses = ['m.machine_id = ?']
+        params = [machine_id]
+        for column, values in (('m.target', targets), ('m.metric', metrics), ('m.metric_group', groups)):
+            if values:
+                clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        if since is not None:
+            clauses.append('m.measured_at >= ?')
+            params.append(format_timestamp(since))
+        if until is not None:
+            clauses.append('m.measured_at <= ?')
+            params.append(format_timestamp(until))
+
+        query = (
+            'SELECT m.run_id, m.measured_at, r.source, m.metric_group, m.target, m.metric, m.value '
+            'FROM metrics m JOIN runs r ON r.run_id = m.run_id '
+            f"WHERE {' AND '.join(clauses)} ORDER BY m.measured_at, m.run_id"
+        )
+        with self._connect() as connection:
+            table = pd.read_sql_query(query, connection, params=params)
+        table['measured_at'] = pd.to_datetime(table['measured_at'])
+        return table
+
+    def lines(self, run_id):
+        """회차의 적합 직선 {축: {'point_on_line', 'direction_vector'}}"""
+        with self._connect() as connection:
+            rows = connection.execute('SELECT * FROM lines WHERE run_id = ? ORDER BY axis', (int(run_id),)).fetchall()
+        return {
+            row[1]: {'point_on_line': np.array(row[2:5]), 'direction_vector': np.array(row[5:8])}
+            for row in rows
+        }
+
+
+def drift_summary(history):
+    """지표/대상별 변화량과 월간 추세 기울기 (최소제곱)"""
+    records = []
+    for (group, target, metric), table in history.groupby(['metric_group', 'target', 'metric'], sort=False):
+        values = table['value'].to_numpy(dtype=float)
+        elapsed = (table['measured_at'] - table['measured_at'].iloc[0]).dt.total_seconds().to_numpy()
+        months = elapsed / (86400 * DAYS_PER_MONTH)
+        slope = np.polyfit(months, values, 1)[0] if len(values) > 1 and np.ptp(months) > 0 else np.nan
+        records.append({
+            'metric_group': group,
+            'target': target,
+            'metric': metric,
+            'runs': len(values),
+            'first': values[0],
+            'last': values[-1],
+            'change': values[-1] - values[0],
+            'slope_per_month': slope
+        })
+    return pd.DataFrame(records, columns=['metric_group', 'target', 'metric', 'runs', 'first', 'last',
+                                          'change', 'slope_per_month'])
@@ -0,0 +1,152 @@
+"""
+대용량 점군 스트리밍 선형성 분석
+CSV/Parquet 파일을 청크 단위로 읽어 파일 크기와 무관한 메모리로 직선을 적합합니다.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from apps.analysis.linearity_engine import (
+    AxisMoments, DistanceStats, axis_columns, discover_axes,
+    line_distances, orientation_metrics
+)
+
+DEFAULT_CHUNKSIZE = 200_000
+DEFAULT_SAMPLE_SIZE = 20_000
+
+STREAM_FORMATS = {
+    '.csv': 'csv',
+    '.txt': 'csv',
+    '.parquet': 'parquet',
+    '.pq': 'parquet'
+}
+
+
+def detect_format(source):
+    """경로 또는 업로드 파일 이름으로 파일 형식 판별"""
+    name = source if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', '')
+    suffix = os.path.splitext(str(name))[1].lower()
+    if suffix not in STREAM_FORMATS:
+        raise ValueError(f"스트리밍 모드는 CSV 또는 Parquet 파일만 지원합니다: {name}")
+    return STREAM_FORMATS[suffix]
+
+
+def _require_parquet():
+    """Parquet 읽기용 pyarrow 임포트 (선택 의존성)"""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet 파일을 읽으려면 pyarrow 패키지가 필요합니다: pip install pyarrow") from e
+    return pq
+
+
+def _rewind(source):
+    """파일 객체라면 처음 위치로 이동"""
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+
+def read_columns(source):
+    """데이터를 읽지 않고 컬럼 이름만 확인"""
+    _rewind(source)
+    if detect_format(source) == 'parquet':
+        columns = list(_require_parquet().ParquetFile(source).schema_arrow.names)
+    else:
+        columns = list(pd.read_csv(source, nrows=0).columns)
+    _rewind(source)
+    return columns
+
+
+def iter_frames(source, columns, chunksize=DEFAULT_CHUNKSIZE):
+    """지정한 컬럼만 청크 단위 DataFrame으로 읽기"""
+    _rewind(source)
+    if detect_format(source) == 'parquet':
+        parquet_file = _require_parquet().ParquetFile(source)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        dtypes = {col: 'float64' for col in columns}
+        yield from pd.read_csv(source, usecols=columns, dtype=dtypes, chunksize=chunksize)
+
+
+def iter_axis_chunks(source, axes, chunksize=DEFAULT_CHUNKSIZE):
+    """청크마다 축별 유효 점 배열 (NaN 포함 행 제외) 생성"""
+    columns = [col for axis in axes for col in axis_columns(axis)]
+    for frame in iter_frames(source, columns, chunksize):
+        values = frame[columns].to_numpy(dtype=float)
+        chunk = {}
+        for k, axis in enumerate(axes):
+            points = values[:, 3 * k:3 * k + 3]
+            chunk[axis] = points[~np.isnan(points).any(axis=1)]
+        yield chunk
+
+
+class PointReservoir:
+    """미리보기/시각화용 균등 표본 (bottom-k 저수지 표본추출)"""
+
+    def __init__(self, size=DEFAULT_SAMPLE_SIZE, seed=0):
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.points = np.empty((0, 3))
+        self.keys = np.empty(0)
+
+    def update(self, points):
+        """점 배열 반영 (표본 크기는 항상 size 이하)"""
+        if self.size <= 0 or len(points) == 0:
+            return
+        points = np.concatenate([self.points, points])
+        keys = np.concatenate([self.keys, self.rng.random(len(points) - len(self.points))])
+        if len(keys) > self.size:
+            keep = np.argpartition(keys, self.size)[:self.size]
+            points, keys = points[keep], keys[keep]
+        self.points, self.keys = points, keys
+
+
+def stream_linearity_analysis(source, chunksize=DEFAULT_CHUNKSIZE, sample_size=DEFAULT_SAMPLE_SIZE):
+    """2-패스 스트리밍 선형성 분석
+
+    1차 패스에서 축별 평균/산포 행렬을 누적해 직선을 적합하고,
+    2차 패스에서 점-직선 거리 통계를 누적합니다.
+    최대 메모리는 청크 크기와 표본 크기에만 비례합니다.
+    """
+    axes = discover_axes(read_columns(source))
+    if not axes:
+        raise ValueError("최소 하나의 축에 대한 3D 좌표 데이터(x, y, z)가 필요합니다.")
+
+    moments = {axis: AxisMoments() for axis in axes}
+    samples = {axis: PointReservoir(sample_size, seed=k) for k, axis in enumerate(axes)}
+
+    # 1차 패스: 누적 평균/공분산
+    for chunk in iter_axis_chunks(source, axes, chunksize):
+        for axis, points in chunk.items():
+            moments[axis].update(points)
+            samples[axis].update(points)
+
+    # PCA를 위해 최소 2개 점 필요
+    pca_results = {axis: m.fit() for axis, m in moments.items() if m.count >= 2}
+    if not pca_results:
+        raise ValueError("각 축마다 최소 2개 이상의 데이터 점이 있어야 합니다.")
+
+    # 2차 패스: 점-직선 거리 통계
+    distance_stats = {axis: DistanceStats() for axis in pca_results}
+    for chunk in iter_axis_chunks(source, list(pca_results), chunksize):
+        for axis, points in chunk.items():
+            fit = pca_results[axis]
+            distance_stats[axis].update(
+                line_distances(points, fit['point_on_line'], fit['direction_vector'])
+            )
+
+    parallelism, perpendicularity = orientation_metrics(pca_results)
+    linearity_metrics = {
+        'linearity': {axis: stats.metrics() for axis, stats in distance_stats.items()},
+        'parallelism': parallelism,
+        'perpendicularity': perpendicularity
+    }
+
+    return {
+        'data_points': {axis: samples[axis].points for axis in pca_results},
+        'pca_results': pca_results,
+        'linearity_metrics': linearity_metrics,
+        'point_counts': {axis: m.count for axis, m in moments.items()}
+    }
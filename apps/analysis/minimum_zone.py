@@ -0,0 +1,215 @@
+"""
+최소 영역(ISO 1101) 진직도 평가
+모든 측정점을 포함하는 최소 지름 원통으로 공간 진직도를 계산합니다.
+"""
+import numpy as np
+
+from apps.analysis.linearity_engine import line_distances, orthogonal_basis
+
+# Akl-Toussaint 사전 필터에 사용할 극점 탐색 방향 수 및 적용 최소 점 개수
+PREFILTER_DIRECTIONS = 16
+PREFILTER_MIN_POINTS = 2048
+
+
+def _prefilter_hull_candidates(points):
+    """극점 다각형 내부의 점을 제외한 볼록 껍질 후보 인덱스 (Akl-Toussaint)"""
+    scale = points.std(axis=0)
+    scale[scale == 0] = 1.0
+    normalized = (points - points.mean(axis=0)) / scale
+
+    angles = np.linspace(0, 2 * np.pi, PREFILTER_DIRECTIONS, endpoint=False)
+    directions = np.column_stack([np.cos(angles), np.sin(angles)])
+    extremes = np.argmax(normalized @ directions.T, axis=0)
+
+    # 방향 순서(반시계)대로 중복 없는 극점 다각형 구성
+    polygon = [idx for k, idx in enumerate(extremes) if idx != extremes[k - 1]]
+    if len(set(polygon)) < 3:
+        return np.arange(len(points))
+
+    vertices = normalized[polygon]
+    inside = np.ones(len(points), dtype=bool)
+    for start, end in zip(vertices, np.roll(vertices, -1, axis=0)):
+        edge = end - start
+        offset = normalized - start
+        inside &= (edge[0] * offset[:, 1] - edge[1] * offset[:, 0]) > 0
+
+    return np.flatnonzero(~inside)
+
+
+def convex_hull_2d(points):
+    """2D 볼록 껍질 꼭짓점 인덱스 (Andrew monotone chain, O(n log n))
+
+    극점 다각형 사전 필터로 내부 점을 일괄 제거한 뒤
+    남은 후보만 정렬하여 껍질을 구성합니다.
+    """
+    points = np.asarray(points, dtype=float)
+    if len(points) < 3:
+        return np.arange(len(points))
+
+    if len(points) >= PREFILTER_MIN_POINTS:
+        candidates = _prefilter_hull_candidates(points)
+    else:
+        candidates = np.arange(len(points))
+    order = candidates[np.lexsort((points[candidates, 1], points[candidates, 0]))]
+    coords = points[order].tolist()
+
+    def cross(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    def half_hull(indices):
+        chain = []
+        for i in indices:
+            while len(chain) >= 2 and cross(coords[chain[-2]], coords[chain[-1]], coords[i]) <= 0:
+                chain.pop()
+            chain.append(i)
+        return chain
+
+    positions = range(len(coords))
+    lower = half_hull(positions)
+    upper = half_hull(reversed(positions))
+    hull = lower[:-1] + upper[:-1]
+
+    return order[hull] if hull else order[:1]
+
+
+def _circle_two(a, b):
+    center = ((a[0] + b[0]) / 2, (a[1] + b[1]) / 2)
+    return center, np.hypot(a[0] - center[0], a[1] - center[1])
+
+
+def _circle_three(a, b, c):
+    d = 2 * (a[0] * (b[1] - c[1]) + b[0] * (c[1] - a[1]) + c[0] * (a[1] - b[1]))
+    if abs(d) < 1e-300:
+        # 공선점: 가장 먼 두 점의 원
+        return max((_circle_two(p, q) for p, q in ((a, b), (a, c), (b, c))), key=lambda x: x[1])
+    a2, b2, c2 = a[0] ** 2 + a[1] ** 2, b[0] ** 2 + b[1] ** 2, c[0] ** 2 + c[1] ** 2
+    ux = (a2 * (b[1] - c[1]) + b2 * (c[1] - a[1]) + c2 * (a[1] - b[1])) / d
+    uy = (a2 * (c[0] - b[0]) + b2 * (a[0] - c[0]) + c2 * (b[0] - a[0])) / d
+    return (ux, uy), np.hypot(a[0] - ux, a[1] - uy)
+
+
+def min_enclosing_circle(points, seed=0):
+    """최소 포함 원 (Welzl 무작위 증분 알고리즘, 기대 O(n))"""
+    coords = np.asarray(points, dtype=float)[np.random.default_rng(seed).permutation(len(points))].tolist()
+
+    def outside(p, circle):
+        (cx, cy), r = circle
+        return np.hypot(p[0] - cx, p[1] - cy) > r * (1 + 1e-12) + 1e-15
+
+    circle = (tuple(coords[0]), 0.0)
+    for i, p in enumerate(coords):
+        if not outside(p, circle):
+            continue
+        circle = (tuple(p), 0.0)
+        for j in range(i):
+            q = coords[j]
+            if not outside(q, circle):
+                continue
+            circle = _circle_two(p, q)
+            for k in range(j):
+                if outside(coords[k], circle):
+                    circle = _circle_three(p, q, coords[k])
+
+    return np.array(circle[0]), circle[1]
+
+
+def _nelder_mead(func, x0, step, max_iter=200, xtol=1e-6):
+    """2변수 Nelder-Mead 최소화 (볼록 최소최대 문제용)"""
+    simplex = np.array([x0, x0 + [step[0], 0.0], x0 + [0.0, step[1]]])
+    values = np.array([func(x) for x in simplex])
+
+    for _ in range(max_iter):
+        order = np.argsort(values)
+        simplex, values = simplex[order], values[order]
+        if np.all(np.abs(simplex[1:] - simplex[0]) <= xtol * np.abs(step)):
+            break
+
+        centroid = simplex[:-1].mean(axis=0)
+        reflected = centroid + (centroid - simplex[-1])
+        f_reflected = func(reflected)
+
+        if f_reflected < values[0]:
+            expanded = centroid + 2 * (centroid - simplex[-1])
+            f_expanded = func(expanded)
+            if f_expanded < f_reflected:
+                simplex[-1], values[-1] = expanded, f_expanded
+            else:
+                simplex[-1], values[-1] = reflected, f_reflected
+        elif f_reflected < values[-2]:
+            simplex[-1], values[-1] = reflected, f_reflected
+        else:
+            contracted = centroid + 0.5 * (simplex[-1] - centroid)
+            f_contracted = func(contracted)
+            if f_contracted < values[-1]:
+                simplex[-1], values[-1] = contracted, f_contracted
+            else:
+                simplex[1:] = simplex[0] + 0.5 * (simplex[1:] - simplex[0])
+                values[1:] = [func(x) for x in simplex[1:]]
+
+    best = np.argmin(values)
+    return simplex[best], values[best]
+
+
+def minimum_zone_straightness(points, line_fit, max_rounds=20, restarts=3):
+    """최소 영역 공간 진직도 (모든 점을 포함하는 최소 지름 원통)
+
+    PCA 직선 좌표계에서 축 기울기(2변수)에 대한 최소 포함 원 반지름을 최소화합니다.
+    기울기가 고정되면 원통 문제는 전단 사영된 점들의 최소 포함 원 문제가 되고,
+    이는 볼록 껍질 꼭짓점만으로 결정됩니다. 후보 점(볼록 껍질 + 잔차 상위 점)에
+    대해서만 최적화한 뒤 전체 점으로 검증하고, 벗어난 점의 껍질을 후보에 추가하여
+    반복합니다(회전 후보 집합).
+    """
+    points = np.asarray(points, dtype=float)
+    p0 = np.asarray(line_fit['point_on_line'], dtype=float)
+    d0 = np.asarray(line_fit['direction_vector'], dtype=float)
+    basis = orthogonal_basis(d0)
+
+    centered = points - p0
+    axial = centered @ d0
+    radial = centered @ basis
+
+    def sheared(slopes, index=slice(None)):
+        return radial[index] - axial[index, None] * slopes
+
+    # 초기 후보: 기울기 0 사영의 볼록 껍질 + 잔차 상위 점
+    residual = np.hypot(radial[:, 0], radial[:, 1])
+    top = np.argpartition(residual, -min(256, len(points)))[-min(256, len(points)):]
+    active = np.union1d(convex_hull_2d(radial), top)
+
+    def radius(slopes):
+        candidates = sheared(slopes, active)
+        return min_enclosing_circle(candidates[convex_hull_2d(candidates)])[1]
+
+    # 원통 반지름만큼 끝점을 움직이는 기울기를 탐색 단위로 사용
+    half_length = max(np.ptp(axial) / 2, 1e-12)
+    step = np.full(2, max(residual.max(), 1e-12) / half_length)
+    slopes = np.zeros(2)
+
+    for rounds in range(1, max_rounds + 1):
+        best = radius(slopes)
+        for _ in range(restarts):
+            slopes, value = _nelder_mead(radius, slopes, step)
+            if value >= best * (1 - 1e-9):
+                break
+            best = value
+
+        projected = sheared(slopes)
+        hull = convex_hull_2d(projected)
+        center, _ = min_enclosing_circle(projected[hull])
+        if np.isin(hull, active).all():
+            break
+        active = np.union1d(active, hull)
+
+    # 선형화 좌표를 3D 직선으로 변환하고 실제 수직 거리로 영역 계산
+    direction = d0 + basis @ slopes
+    direction /= np.linalg.norm(direction)
+    point_on_line = p0 + basis @ center
+    distances = line_distances(points, point_on_line, direction)
+
+    return {
+        'min_zone_straightness': float(2 * distances.max()),
+        'direction_vector': direction,
+        'point_on_line': point_on_line,
+        'candidate_count': int(len(active)),
+        'rounds': rounds
+    }
@@ -0,0 +1,93 @@
+"""
+운동 구간(세그먼트) 분석
+가속/감속/등속 상태 배열을 히스테리시스로 안정화한 뒤 런 길이 부호화하여 구간별 통계표를 만듭니다.
+"""
+import numpy as np
+import pandas as pd
+
+from apps.analysis.speed_engine import ACC_THRESHOLD
+
+# 상태 번호 (KinematicsSummary 의 상태 순서와 같음)
+ACCELERATING, DECELERATING, CONSTANT = 0, 1, 2
+STATE_LABELS = {ACCELERATING: '가속', DECELERATING: '감속', CONSTANT: '등속'}
+
+SEGMENT_COLUMNS = [
+    'state', 'start_index', 'end_index', 'start_time', 'end_time', 'duration', 'samples',
+    'velocity_change', 'peak_acceleration', 'rms_acceleration', 'peak_jerk', 'rms_jerk'
+]
+
+
+def latch(enter, leave):
+    """enter 샘플에서 켜지고 leave 샘플에서 꺼지는 상태 (그 사이는 직전 상태 유지, 벡터화 슈미트 트리거)"""
+    n = len(enter)
+    decisive = np.where(enter | leave, np.arange(n), -1)
+    last = np.maximum.accumulate(decisive) if n else decisive
+    return (last >= 0) & enter[np.maximum(last, 0)]
+
+
+def motion_states(acceleration, threshold=ACC_THRESHOLD, hysteresis=0.0):
+    """샘플별 운동 상태 (0: 가속, 1: 감속, 2: 등속)
+
+    |가속도| 가 threshold 를 넘으면 가속/감속 구간이 시작되고 threshold - hysteresis 이하로 내려가야 끝나므로
+    기준값 부근의 노이즈로 상태가 빠르게 바뀌는 현상(채터링)을 막습니다. hysteresis=0 이면 기존 판정과 같습니다.
+    """
+    acceleration = np.asarray(acceleration, dtype=float)
+    release = threshold - min(max(hysteresis, 0.0), threshold)
+    accelerating = latch(acceleration > threshold, acceleration <= release)
+    decelerating = latch(acceleration < -threshold, acceleration >= -release)
+    return np.where(accelerating, ACCELERATING, np.where(decelerating, DECELERATING, CONSTANT))
+
+
+def run_lengths(states):
+    """같은 값이 이어지는 구간의 (시작 인덱스, 끝 인덱스(미포함), 값)"""
+    states = np.asarray(states)
+    if len(states) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), states[:0]
+    changes = np.flatnonzero(states[1:] != states[:-1]) + 1
+    starts = np.concatenate([[0], changes])
+    ends = np.concatenate([changes, [len(states)]])
+    return starts, ends, states[starts]
+
+
+def _peak(values, starts):
+    """구간별 절댓값이 가장 큰 값 (부호 유지)"""
+    highs = np.maximum.reduceat(values, starts)
+    lows = np.minimum.reduceat(values, starts)
+    return np.where(highs >= -lows, highs, lows)
+
+
+def _rms(values, starts, counts):
+    return np.sqrt(np.add.reduceat(values * values, starts) / counts)
+
+
+def segment_table(frame, threshold=ACC_THRESHOLD, hysteresis=0.0):
+    """운동학 DataFrame 의 운동 구간표 (행: 구간, 열: SEGMENT_COLUMNS)
+
+    구간 경계는 다음 구간의 첫 샘플 시각이므로 구간들이 시간축을 빈틈없이 덮습니다.
+    모든 구간 통계는 reduceat 한 번씩으로 계산하여 구간 수와 무관하게 샘플 수에 선형입니다.
+    """
+    time = frame['Time_sec'].to_numpy(dtype=float)
+    velocity = frame['Velocity_m/s'].to_numpy(dtype=float)
+    acceleration = frame['Acceleration_m/s2'].to_numpy(dtype=float)
+    jerk = frame['Jerk_m/s3'].to_numpy(dtype=float)
+    if len(time) == 0:
+        return pd.DataFrame(columns=SEGMENT_COLUMNS)
+
+    starts, ends, states = run_lengths(motion_states(acceleration, threshold, hysteresis))
+    counts = ends - starts
+    start_time = time[starts]
+    end_time = time[np.minimum(ends, len(time) - 1)]
+    return pd.DataFrame({
+        'state': states,
+        'start_index': starts,
+        'end_index': ends,
+        'start_time': start_time,
+        'end_time': end_time,
+        'duration': end_time - start_time,
+        'samples': counts,
+        'velocity_change': velocity[ends - 1] - velocity[starts],
+        'peak_acceleration': _peak(acceleration, starts),
+        'rms_acceleration': _rms(acceleration, starts, counts),
+        'peak_jerk': _peak(jerk, starts),
+        'rms_jerk': _rms(jerk, starts, counts)
+    })
@@ -0,0 +1,164 @@
+"""
+백분위수 통계
+전체 데이터를 메모리에 두지 않고 청크 단위로 갱신/병합할 수 있는 KLL 분위수 스케치와
+속도/가속도/저크 백분위수(P50/P95/P99) 계산을 제공합니다.
+"""
+import numpy as np
+
+PERCENTILES = (50, 95, 99)
+PERCENTILE_COLUMNS = {
+    'velocity': 'Velocity_m/s',
+    'acceleration': 'Acceleration_m/s2',
+    'jerk': 'Jerk_m/s3'
+}
+
+# 최상위 단계 용량 (순위 오차는 대략 1/k 에 비례, 메모리는 약 3k 개 값)
+DEFAULT_K = 2048
+MIN_CAPACITY = 8
+CAPACITY_DECAY = 2 / 3
+
+
+class QuantileSketch:
+    """KLL 분위수 스케치 (병합 가능, 메모리 O(k))
+
+    단계 h 의 값은 가중치 2^h 를 갖습니다. 단계가 용량을 넘으면 정렬 후 한 칸 건너 하나씩(무작위 시작)
+    위 단계로 올려 개수를 절반으로 줄이며, 이때 모든 순위 질의의 오차는 해당 가중치 이하입니다.
+    청크 전체를 한 번에 압축하므로 샘플당 파이썬 연산이 없고, 위 단계는 항상 정렬 상태로 유지됩니다.
+    """
+
+    def __init__(self, k=DEFAULT_K, seed=0):
+        self.k = int(k)
+        self.levels = [np.empty(0)]
+        self.count = 0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+        self.rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(int(np.ceil(self.k * CAPACITY_DECAY ** depth)), MIN_CAPACITY)
+
+    def update(self, values):
+        """값 청크 반영 (NaN/무한대 제외)"""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return self
+        self.count += len(values)
+        self.minimum = min(self.minimum, values.min())
+        self.maximum = max(self.maximum, values.max())
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """다른 스케치(다른 청크/파일)의 값을 합침"""
+        if other.count == 0:
+            return self
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            if len(items):
+                self.levels[level] = np.sort(np.concatenate([self.levels[level], items]), kind='stable') \
+                    if level else np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self._compress()
+        return self
+
+    def _compress(self):
+        """용량을 넘은 가장 낮은 단계부터 압축 (단계가 늘면 아래 단계 용량이 줄어 다시 확인)"""
+        level = 0
+        while level < len(self.levels):
+            if len(self.levels[level]) <= self._capacity(level):
+                level += 1
+                continue
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            # 0 단계는 원본 순서, 위 단계는 정렬된 두 배열의 연결이므로 안정 정렬(병합)로 충분
+            items = np.sort(self.levels[level], kind='quicksort' if level == 0 else 'stable')
+            kept = items[:0]
+            if len(items) % 2:
+                # 홀수 개면 한쪽 끝 하나를 현재 단계에 남겨 가중치 합을 보존
+                if self.rng.integers(2):
+                    kept, items = items[-1:], items[:-1]
+                else:
+                    kept, items = items[:1], items[1:]
+            promoted = items[self.rng.integers(2)::2]
+            self.levels[level] = kept
+            self.levels[level + 1] = np.sort(np.concatenate([self.levels[level + 1], promoted]), kind='stable')
+            level = 0
+
+    def quantiles(self, q):
+        """분위수 (q: 0~1 배열, np.percentile 'linear' 와 같은 보간 - 압축 전에는 정확히 일치)"""
+        q = np.asarray(q, dtype=float)
+        if self.count == 0:
+            return np.full(q.shape, np.nan)
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        values, weights = values[order], weights[order]
+        # 각 값을 가중치 구간의 가운데 순위에 두고 선형 보간 (양 끝은 정확한 최솟값/최댓값으로 고정)
+        total = weights.sum()
+        centers = np.concatenate([[0.0], np.cumsum(weights) - weights / 2, [total]])
+        values = np.concatenate([[self.minimum], values, [self.maximum]])
+        result = np.interp(q * (total - 1) + 0.5, centers, values)
+        return np.where(q <= 0, self.minimum, np.where(q >= 1, self.maximum, result))
+
+    def percentiles(self, percentiles=PERCENTILES):
+        return dict(zip(percentiles, self.quantiles(np.asarray(percentiles) / 100.0)))
+
+    @property
+    def size(self):
+        """보관 중인 값 개수"""
+        return sum(len(items) for items in self.levels)
+
+
+def rank_error(k):
+    """k 에 따른 정규화 순위 오차 (단일 분위수 99% 신뢰 수준, Apache DataSketches KLL 경험식 2.296 / k^0.9723)"""
+    return 2.296 / k ** 0.9723
+
+
+def sketch_info(sketches):
+    """화면 표시용 스케치 요약 {'retained': 보관 값 개수, 'k': 가장 작은 k} (sketches: 물리량별 스케치)"""
+    return {'retained': sum(sketch.size for sketch in sketches.values()),
+            'k': min(sketch.k for sketch in sketches.values())}
+
+
+def percentile_table(values_by_name, percentiles=PERCENTILES):
+    """{물리량: {'p50': 값, ...}} 형식 (values_by_name: 물리량별 값 배열(정확한 값) 또는 스케치(근사값))"""
+    table = {}
+    for name, values in values_by_name.items():
+        if isinstance(values, QuantileSketch):
+            found = values.percentiles(percentiles)
+        else:
+            values = np.asarray(values, dtype=float)
+            values = values[np.isfinite(values)]
+            found = dict(zip(percentiles, np.percentile(values, percentiles) if len(values)
+                             else np.full(len(percentiles), np.nan)))
+        table[name] = {f"p{p}": float(found[p]) for p in percentiles}
+    return table
+
+
+def frame_percentiles(frame, percentiles=PERCENTILES):
+    """운동학 DataFrame 의 속도/가속도/저크 정확한 백분위수 (메모리 내 데이터)"""
+    return percentile_table({name: frame[column].to_numpy() for name, column in PERCENTILE_COLUMNS.items()},
+                            percentiles)
+
+
+def frame_sketches(frame, k=DEFAULT_K, seed=0):
+    """운동학 DataFrame 의 물리량별 스케치 (파일 간 병합용)"""
+    return {name: QuantileSketch(k, seed).update(frame[column].to_numpy())
+            for name, column in PERCENTILE_COLUMNS.items()}
+
+
+def merge_sketches(sketch_sets):
+    """물리량별 스케치 사전 목록을 하나로 병합"""
+    merged = {}
+    for sketches in sketch_sets:
+        for name, sketch in sketches.items():
+            if name not in merged:
+                merged[name] = QuantileSketch(sketch.k)
+            merged[name].merge(sketch)
+    return merged
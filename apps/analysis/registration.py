@@ -0,0 +1,201 @@
+"""
+측정 좌표계 강체 정합 (Kabsch/SVD)
+트래커 위치가 다른 반복 측정을 기준 회차 또는 공칭(CAD) 점에 일괄 정렬합니다.
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from apps.analysis.linearity_engine import axis_columns, discover_axes
+
+DEFAULT_SIGMA_LEVEL = 3.0
+# 회차 간 대응점을 맞출 목표점 ID 컬럼 이름 (대소문자 무관, 없으면 같은 행끼리 대응)
+TARGET_COLUMN_NAMES = ('target', 'target_id', 'point', 'point_id', 'position')
+
+
+def target_column(columns):
+    """목표점 ID 컬럼 이름 (없으면 None)"""
+    for column in columns:
+        if str(column).strip().lower() in TARGET_COLUMN_NAMES:
+            return column
+    return None
+
+
+def registration_frame(data):
+    """정합에 필요한 컬럼(목표점 ID, 축 좌표)만 남긴 측정 데이터 (전처리 전 원본 값)"""
+    key = target_column(data.columns)
+    columns = [col for axis in discover_axes(data.columns) for col in axis_columns(axis)]
+    return data[([key] if key is not None else []) + columns].copy()
+
+
+def frame_keys(data):
+    """대응점 키 (목표점 ID 컬럼 값, 없으면 행 번호) - 이름이 ID 컬럼 이름(행 번호면 None)인 Index"""
+    key = target_column(data.columns)
+    if key is None:
+        return pd.RangeIndex(len(data))
+    return pd.Index(data[key].dropna(), name=key).drop_duplicates()
+
+
+def frame_points(data, axes=None, keys=None):
+    """측정 데이터의 대응 목표점 배열 (키 × 축 순서, 누락 좌표는 NaN)
+
+    목표점 ID 컬럼이 있으면 같은 ID·같은 축의 점을, 없으면 같은 행·같은 축의 점을 회차 간 대응점으로
+    사용합니다. keys(기준 데이터의 frame_keys)를 주면 그 순서로 정렬하여 점 개수나 행 순서가 다른
+    회차도 기준과 같은 목표점끼리 비교합니다 (기준에만 있는 목표점은 NaN).
+    """
+    axes = discover_axes(data.columns) if axes is None else axes
+    columns = [col for axis in axes for col in axis_columns(axis)]
+    key = target_column(data.columns)
+    if keys is not None and (key is None) != (keys.name is None):
+        raise ValueError("기준 데이터와 측정 데이터 중 한쪽에만 목표점 ID 컬럼"
+                         f"({', '.join(TARGET_COLUMN_NAMES)})이 있어 대응점을 맞출 수 없습니다.")
+
+    if key is None:
+        frame = data.reset_index(drop=True)
+    else:
+        frame = data.dropna(subset=[key]).drop_duplicates(subset=key).set_index(key)
+    if keys is not None:
+        frame = frame.reindex(keys)
+    values = frame.reindex(columns=columns).to_numpy(dtype=float)
+    return values.reshape(len(frame) * len(axes), 3)
+
+
+def kabsch_batch(sources, targets, weights=None):
+    """가중 Kabsch 강체 변환 일괄 계산 (회전 R, 이동 t: R·source + t ≈ target)
+
+    sources: (R, n, 3), targets: (n, 3) 또는 (R, n, 3), weights: (R, n) 또는 None.
+    NaN 이 있는 대응점은 제외하며, 3x3 교차 공분산 R개를 한 번의 배치 SVD로 분해합니다.
+    """
+    sources = np.asarray(sources, dtype=float)
+    targets = np.broadcast_to(np.asarray(targets, dtype=float), sources.shape)
+
+    valid = np.isfinite(sources).all(axis=2) & np.isfinite(targets).all(axis=2)
+    w = valid.astype(float) if weights is None else np.where(valid, weights, 0.0)
+    src = np.where(valid[..., None], sources, 0.0)
+    tgt = np.where(valid[..., None], targets, 0.0)
+
+    total = w.sum(axis=1)
+    safe_total = np.where(total > 0, total, 1.0)
+    src_center = np.einsum('rn,rni->ri', w, src) / safe_total[:, None]
+    tgt_center = np.einsum('rn,rni->ri', w, tgt) / safe_total[:, None]
+
+    weighted = (src - src_center[:, None]) * w[..., None]
+    covariance = np.matmul(weighted.transpose(0, 2, 1), tgt - tgt_center[:, None])
+    u, _, vt = np.linalg.svd(covariance)
+
+    # 반사 행렬이 나오지 않도록 마지막 특이벡터 부호 보정
+    reflection = np.sign(np.linalg.det(np.einsum('rji,rkj->rik', vt, u)))
+    reflection[reflection == 0] = 1.0
+    vt[:, 2] *= reflection[:, None]
+    rotation = np.einsum('rji,rkj->rik', vt, u)
+    translation = tgt_center - np.einsum('rij,rj->ri', rotation, src_center)
+
+    return rotation, translation, w
+
+
+def transform_points(points, rotation, translation):
+    """강체 변환 적용 (points: (..., 3), 단일 변환)"""
+    return points @ rotation.T + translation
+
+
+def register_batch(sources, reference, iterations=0, sigma_level=DEFAULT_SIGMA_LEVEL):
+    """여러 회차 대응점을 기준 점에 일괄 정합
+
+    iterations > 0 이면 정합 잔차의 강건 표준편차(1.4826·중앙값) 기준으로
+    sigma_level 배를 넘는 대응점(이동·파손된 목표점)을 제외하고 다시 정합합니다.
+
+    반환값: rotation (R, 3, 3), translation (R, 3), rms (R,), rotation_deg (R,),
+            matched (R,) 사용된 대응점 수, weights (R, n)
+    """
+    sources = np.asarray(sources, dtype=float)
+    targets = np.broadcast_to(np.asarray(reference, dtype=float), sources.shape)
+
+    weights = None
+    for _ in range(iterations + 1):
+        rotation, translation, weights_used = kabsch_batch(sources, targets, weights)
+        aligned = np.matmul(sources, rotation.transpose(0, 2, 1)) + translation[:, None]
+        residuals = np.linalg.norm(aligned - targets, axis=2)
+
+        with warnings.catch_warnings():
+            # 대응점이 하나도 없는 회차는 NaN (아래에서 0 으로 처리)
+            warnings.simplefilter('ignore', RuntimeWarning)
+            scale = 1.4826 * np.nanmedian(np.where(weights_used > 0, residuals, np.nan), axis=1)
+        threshold = np.maximum(sigma_level * np.nan_to_num(scale), 1e-12)
+        weights = (np.isfinite(residuals) & (residuals <= threshold[:, None])).astype(float)
+
+    used = weights_used > 0
+    matched = used.sum(axis=1)
+    rms = np.sqrt(np.nansum(np.where(used, residuals, 0.0) ** 2, axis=1) / np.maximum(matched, 1))
+    cos_angle = np.clip((np.trace(rotation, axis1=1, axis2=2) - 1) / 2, -1.0, 1.0)
+
+    return {
+        'rotation': rotation,
+        'translation': translation,
+        'rms': np.where(matched >= 3, rms, np.nan),
+        'rotation_deg': np.degrees(np.arccos(cos_angle)),
+        'matched': matched,
+        'weights': weights_used
+    }
+
+
+def apply_registration(data, rotation, translation, axes=None):
+    """측정 데이터의 모든 축 좌표 컬럼에 강체 변환 적용 (새 DataFrame 반환)"""
+    axes = discover_axes(data.columns) if axes is None else axes
+    data = data.copy()
+    for axis in axes:
+        columns = axis_columns(axis)
+        points = data[columns].to_numpy(dtype=float)
+        data[columns] = pd.DataFrame(transform_points(points, rotation, translation),
+                                     index=data.index, columns=columns)
+    return data
+
+
+def transform_lines(pca_results, rotation, translation):
+    """적합 직선(점, 방향 벡터)을 정합 좌표계로 변환"""
+    return {
+        axis: dict(fit,
+                   point_on_line=transform_points(fit['point_on_line'], rotation, translation),
+                   direction_vector=rotation @ fit['direction_vector'])
+        for axis, fit in pca_results.items()
+    }
+
+
+def line_alignment_metrics(pca_results, reference_results):
+    """기준 직선 대비 축별 방향 편차(도)와 직선 간 거리 (정합 좌표계)"""
+    alignment = {}
+    for axis, fit in pca_results.items():
+        if axis not in reference_results:
+            continue
+        reference = reference_results[axis]
+        d_ref = np.asarray(reference['direction_vector'], dtype=float)
+        cosine = abs(float(np.dot(fit['direction_vector'], d_ref)))
+        offset = np.asarray(fit['point_on_line']) - np.asarray(reference['point_on_line'])
+        alignment[axis] = {
+            'direction_deviation_deg': float(np.degrees(np.arccos(min(1.0, cosine)))),
+            'line_offset': float(np.linalg.norm(offset - np.dot(offset, d_ref) * d_ref))
+        }
+    return alignment
+
+
+def align_to_reference(data, reference, iterations=0, sigma_level=DEFAULT_SIGMA_LEVEL):
+    """측정 데이터를 기준 회차/공칭 점 좌표계로 정합 (정합된 DataFrame, 정합 요약 반환)"""
+    axes = [axis for axis in discover_axes(data.columns) if axis in discover_axes(reference.columns)]
+    if not axes:
+        raise ValueError("측정 데이터와 기준 데이터에 공통 축이 없습니다.")
+
+    keys = frame_keys(reference)
+    reference_points = frame_points(reference, axes, keys)
+    sources = frame_points(data, axes, keys)[None]
+    registered = register_batch(sources, reference_points, iterations=iterations, sigma_level=sigma_level)
+    if registered['matched'][0] < 3:
+        raise ValueError("좌표 정합에는 기준 데이터와 대응되는 점이 최소 3개 필요합니다.")
+
+    rotation, translation = registered['rotation'][0], registered['translation'][0]
+    summary = {
+        'rms': float(registered['rms'][0]),
+        'rotation_deg': float(registered['rotation_deg'][0]),
+        'translation': float(np.linalg.norm(translation)),
+        'matched': int(registered['matched'][0])
+    }
+    return apply_registration(data, rotation, translation), summary
@@ -0,0 +1,141 @@
+"""
+강건 직선 적합 (LMedS 기반 RANSAC)
+측정 오류로 인한 큰 이상치를 직선까지의 거리 기준으로 한 번에 제거합니다.
+"""
+import time
+
+import numpy as np
+
+from apps.analysis.linearity_engine import fit_lines, line_distances
+
+DEFAULT_MAX_HYPOTHESES = 2048
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_SCORE_SAMPLE = 5000
+DEFAULT_SIGMA_LEVEL = 3.0
+# 정상점 거리 임계값의 하한 (점군 크기 대비 비율, 완전한 직선에서 임계값이 0이 되어 반올림 오차로 정상점을 버리지 않도록)
+THRESHOLD_FLOOR = 1e-9
+
+
+def _score_hypotheses(sample, origins, directions):
+    """가설 직선 묶음 (B개)에 대한 표본 점 (m개)의 제곱 거리 (B, m)
+
+    |c|^2 - (c·d)^2 를 두 번의 행렬 곱으로 전개하여 가설별 파이썬 루프 없이 계산합니다.
+    """
+    sample_sq = np.einsum('ij,ij->i', sample, sample)
+    origin_sq = np.einsum('ij,ij->i', origins, origins)
+    along = directions @ sample.T - np.einsum('ij,ij->i', origins, directions)[:, None]
+    squared = sample_sq[None, :] - 2 * (origins @ sample.T) + origin_sq[:, None] - along ** 2
+    return np.clip(squared, 0.0, None)
+
+
+def _inlier_threshold(best_score, sample_size, sigma_level, scale):
+    """최적 가설의 제곱 거리 중앙값으로 구한 강건 σ 와 정상점 거리 임계값 (임계값은 THRESHOLD_FLOOR·scale 이상)"""
+    sigma = 1.4826 * (1 + 5 / (sample_size - 2)) * np.sqrt(best_score)
+    return sigma, max(sigma_level * sigma, THRESHOLD_FLOOR * scale)
+
+
+def _required_hypotheses(inlier_ratio, confidence=0.999):
+    """정상점 비율에 따른 필요 가설 수 (2점 표본 기준)"""
+    good_pair = inlier_ratio ** 2
+    if good_pair >= 1.0:
+        return 1
+    if good_pair <= 0.0:
+        return np.inf
+    return np.log(1 - confidence) / np.log(1 - good_pair)
+
+
+def ransac_line(points, max_hypotheses=DEFAULT_MAX_HYPOTHESES, time_budget=None,
+                sigma_level=DEFAULT_SIGMA_LEVEL, batch_size=DEFAULT_BATCH_SIZE,
+                score_sample=DEFAULT_SCORE_SAMPLE, seed=0):
+    """LMedS 기준 RANSAC 직선 적합
+
+    두 점으로 만든 가설 직선을 묶음 단위로 생성하고, 표본 점에 대한 제곱 거리의
+    중앙값으로 일괄 평가합니다. 최적 가설의 중앙값으로 강건 표준편차를 추정하고,
+    직선 거리가 sigma_level·σ 이하인 점만 남기는 마스크를 전체 점에 한 번 적용한 뒤
+    정상점으로 최소제곱 직선을 다시 적합합니다.
+
+    max_hypotheses(가설 수)와 time_budget(초)으로 탐색 예산을 제한합니다.
+    """
+    points = np.asarray(points, dtype=float)
+    n = len(points)
+    if n < 3:
+        raise ValueError("강건 적합에는 최소 3개 이상의 데이터 점이 필요합니다.")
+
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+
+    # 수치 안정성을 위해 중심화한 좌표에서 평가
+    center = points.mean(axis=0)
+    centered = points - center
+    scale = float(np.sqrt(np.einsum('ij,ij->i', centered, centered).max()))
+    sample = centered[rng.choice(n, size=min(n, score_sample), replace=False)]
+
+    best_score = np.inf
+    best_origin = best_direction = None
+    tried = 0
+    needed = max_hypotheses
+
+    while tried < min(max_hypotheses, needed):
+        batch = min(batch_size, max_hypotheses - tried)
+        first = rng.integers(0, n, batch)
+        second = rng.integers(0, n, batch)
+        origins = centered[first]
+        directions = centered[second] - origins
+        lengths = np.linalg.norm(directions, axis=1)
+        valid = lengths > 0
+        tried += batch
+        if not valid.any():
+            continue
+
+        origins, directions = origins[valid], directions[valid] / lengths[valid, None]
+        scores = np.median(_score_hypotheses(sample, origins, directions), axis=1)
+        k = np.argmin(scores)
+        if scores[k] < best_score:
+            best_score, best_origin, best_direction = scores[k], origins[k], directions[k]
+
+            # 현재 최적 가설의 정상점 비율로 필요한 가설 수 갱신
+            _, threshold = _inlier_threshold(best_score, len(sample), sigma_level, scale)
+            squared = _score_hypotheses(sample, best_origin[None], best_direction[None])[0]
+            needed = _required_hypotheses(np.mean(squared <= threshold ** 2))
+
+        if time_budget is not None and time.perf_counter() - start >= time_budget:
+            break
+
+    if best_direction is None:
+        raise ValueError("유효한 직선 가설을 만들 수 없습니다 (모든 점이 동일).")
+
+    # 강건 표준편차 (Rousseeuw LMedS 척도) 및 단일 패스 정상점 마스크
+    sigma, threshold = _inlier_threshold(best_score, len(sample), sigma_level, scale)
+    inlier_mask = line_distances(centered, best_origin, best_direction) <= threshold
+    if inlier_mask.sum() < 2:
+        inlier_mask[:] = True
+
+    line_fit = fit_lines({'line': points[inlier_mask]})['line']
+
+    return {
+        'line_fit': line_fit,
+        'inlier_mask': inlier_mask,
+        'sigma': float(sigma),
+        'threshold': float(threshold),
+        'hypotheses': int(tried),
+        'elapsed': time.perf_counter() - start
+    }
+
+
+def robust_filter_points(data_points, **options):
+    """축별 강건 적합으로 이상치를 제거한 점군과 제거 요약 반환"""
+    filtered = {}
+    summary = {}
+    for axis, points in data_points.items():
+        if len(points) < 3:
+            filtered[axis] = points
+            continue
+        result = ransac_line(points, **options)
+        filtered[axis] = points[result['inlier_mask']]
+        summary[axis] = {
+            'removed': int((~result['inlier_mask']).sum()),
+            'threshold': result['threshold'],
+            'hypotheses': result['hypotheses'],
+            'elapsed': result['elapsed']
+        }
+    return filtered, summary
@@ -0,0 +1,222 @@
+"""
+진동 주파수 분석
+가속도/저크를 등간격으로 재표본화하여 청크 단위로 Welch PSD 와 STFT 스펙트로그램을 누적 계산합니다.
+메모리는 청크 크기와 스펙트로그램 열 수에만 비례하므로 수 시간 길이의 로그도 처리할 수 있습니다.
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+SPECTRAL_COLUMNS = ('Acceleration_m/s2', 'Jerk_m/s3')
+DEFAULT_NPERSEG = 1024
+DEFAULT_OVERLAP = 0.5
+# 스펙트로그램 이미지 최대 열(시간) 수 (초과 시 인접 열을 평균하여 절반으로 줄임)
+MAX_SPECTROGRAM_COLUMNS = 800
+SPECTRAL_CHUNKSIZE = 1_000_000
+
+
+class UniformResampler:
+    """시간 순 청크를 등간격 격자(1 / sample_rate)로 선형 보간 (청크 경계는 직전 샘플로 이어서 보간)"""
+
+    def __init__(self, sample_rate):
+        self.sample_rate = float(sample_rate)
+        self.start = None
+        self.index = 0
+        self.last_time = None
+        self.last_values = None
+
+    def update(self, time, values):
+        """청크 반영 후 새로 확정된 (격자 시각, (격자 수, 채널) 값)"""
+        time = np.asarray(time, dtype=float)
+        values = np.asarray(values, dtype=float).reshape(len(time), -1)
+        if len(time) == 0:
+            return np.empty(0), np.empty((0, values.shape[1]))
+        if self.start is None:
+            self.start = time[0]
+        else:
+            time = np.concatenate([[self.last_time], time])
+            values = np.concatenate([self.last_values, values])
+        self.last_time, self.last_values = time[-1], values[-1:]
+
+        # 격자 시각은 누적 오차가 없도록 시작 시각 + 번호 / 주파수로 계산
+        stop = int(np.floor((time[-1] - self.start) * self.sample_rate)) + 1
+        grid = self.start + np.arange(self.index, max(stop, self.index)) / self.sample_rate
+        self.index = max(stop, self.index)
+        resampled = np.column_stack([np.interp(grid, time, values[:, k]) for k in range(values.shape[1])])
+        return grid, resampled.reshape(len(grid), values.shape[1])
+
+
+class SpectralAccumulator:
+    """등간격 데이터 청크의 Welch PSD / 스펙트로그램 누적
+
+    Hann 창 세그먼트(평균 제거)를 overlap 비율만큼 겹쳐 FFT 하고, 세그먼트 전력을 PSD 합계와
+    스펙트로그램 열(열마다 frames_per_column 개 세그먼트 평균)에 더합니다.
+    """
+
+    def __init__(self, sample_rate, channels, nperseg=DEFAULT_NPERSEG, overlap=DEFAULT_OVERLAP,
+                 max_columns=MAX_SPECTROGRAM_COLUMNS):
+        self.sample_rate = float(sample_rate)
+        self.channels = channels
+        self.nperseg = int(nperseg)
+        self.step = max(1, int(round(self.nperseg * (1 - overlap))))
+        self.max_columns = max_columns
+        self.window = np.hanning(self.nperseg + 1)[:-1]  # 주기적 Hann 창
+        # 단측 전력 스펙트럼 밀도 척도 (직류와 나이퀴스트 성분은 두 배 하지 않음)
+        self.scale = np.full(self.nperseg // 2 + 1, 2.0 / (self.sample_rate * np.sum(self.window ** 2)))
+        self.scale[0] /= 2
+        if self.nperseg % 2 == 0:
+            self.scale[-1] /= 2
+
+        self.buffer = np.empty((0, channels))
+        self.consumed = 0
+        self.power_sum = np.zeros((channels, len(self.scale)))
+        self.frames = 0
+        self.frames_per_column = 1
+        self.columns = []
+        self.column_times = []
+        self.pending = (np.zeros((channels, len(self.scale))), 0, 0.0)
+
+    def update(self, values):
+        """등간격 (샘플, 채널) 값 청크 반영"""
+        data = np.concatenate([self.buffer, np.asarray(values, dtype=float).reshape(-1, self.channels)])
+        count = (len(data) - self.nperseg) // self.step + 1 if len(data) >= self.nperseg else 0
+        if count == 0:
+            self.buffer = data
+            return self
+
+        # (세그먼트, 채널, nperseg) 뷰에서 평균 제거 후 창 적용 FFT
+        segments = sliding_window_view(data, self.nperseg, axis=0)[:count * self.step:self.step]
+        segments = (segments - segments.mean(axis=-1, keepdims=True)) * self.window
+        power = np.abs(np.fft.rfft(segments, axis=-1)) ** 2 * self.scale
+        centers = (self.consumed + np.arange(count) * self.step + self.nperseg / 2) / self.sample_rate
+
+        self.power_sum += power.sum(axis=0)
+        self.frames += count
+        self._add_columns(power, centers)
+
+        used = count * self.step
+        self.buffer = data[used:]
+        self.consumed += used
+        return self
+
+    def _add_columns(self, power, centers):
+        """세그먼트 전력을 스펙트로그램 열로 묶음 (열이 너무 많으면 인접 열을 평균하여 병합)"""
+        pending_sum, pending_count, pending_time = self.pending
+        need = self.frames_per_column - pending_count
+        if len(power) < need:
+            self.pending = (pending_sum + power.sum(axis=0), pending_count + len(power),
+                            pending_time + centers.sum())
+            return
+
+        self.columns.append((pending_sum + power[:need].sum(axis=0)) / self.frames_per_column)
+        self.column_times.append((pending_time + centers[:need].sum()) / self.frames_per_column)
+        rest, rest_times = power[need:], centers[need:]
+        full = len(rest) // self.frames_per_column * self.frames_per_column
+        if full:
+            shape = (-1, self.frames_per_column) + power.shape[1:]
+            self.columns.extend(rest[:full].reshape(shape).mean(axis=1))
+            self.column_times.extend(rest_times[:full].reshape(-1, self.frames_per_column).mean(axis=1))
+        self.pending = (rest[full:].sum(axis=0), len(rest) - full, rest_times[full:].sum())
+
+        while len(self.columns) > self.max_columns:
+            self._merge_columns()
+
+    def _merge_columns(self):
+        """인접 두 열 평균으로 열 수를 절반으로 (홀수면 마지막 열은 미완성 열로 되돌림)"""
+        columns, times = np.array(self.columns), np.array(self.column_times)
+        pairs = len(columns) // 2
+        merged = (columns[0:2 * pairs:2] + columns[1:2 * pairs:2]) / 2
+        merged_times = (times[0:2 * pairs:2] + times[1:2 * pairs:2]) / 2
+        pending_sum, pending_count, pending_time = self.pending
+        if len(columns) % 2:
+            pending_sum = pending_sum + columns[-1] * self.frames_per_column
+            pending_count += self.frames_per_column
+            pending_time += times[-1] * self.frames_per_column
+        self.columns, self.column_times = list(merged), list(merged_times)
+        self.pending = (pending_sum, pending_count, pending_time)
+        self.frames_per_column *= 2
+
+    def result(self, start_time=0.0):
+        """주파수, 채널별 PSD, 스펙트로그램 (열 시각은 start_time 기준 절대 시각)"""
+        if self.frames == 0:
+            raise ValueError(f"주파수 분석에는 최소 {self.nperseg:,}개 등간격 샘플이 필요합니다.")
+        columns, times = list(self.columns), list(self.column_times)
+        pending_sum, pending_count, pending_time = self.pending
+        if pending_count:
+            columns.append(pending_sum / pending_count)
+            times.append(pending_time / pending_count)
+        return {
+            'sample_rate': self.sample_rate,
+            'frequencies': np.fft.rfftfreq(self.nperseg, 1.0 / self.sample_rate),
+            'psd': self.power_sum / self.frames,
+            'times': start_time + np.asarray(times),
+            'spectrogram': np.stack(columns, axis=-1),  # (채널, 주파수, 시간)
+            'segments': self.frames
+        }
+
+
+class SpectralAnalyzer:
+    """운동학 DataFrame 청크 → 등간격 재표본화 → Welch PSD / 스펙트로그램
+
+    sample_rate 를 주지 않으면 첫 청크의 샘플 간격 중앙값으로 정합니다.
+    """
+
+    def __init__(self, sample_rate=None, nperseg=DEFAULT_NPERSEG, overlap=DEFAULT_OVERLAP,
+                 columns=SPECTRAL_COLUMNS, max_columns=MAX_SPECTROGRAM_COLUMNS):
+        self.sample_rate = sample_rate
+        self.nperseg = nperseg
+        self.overlap = overlap
+        self.columns = list(columns)
+        self.max_columns = max_columns
+        self.resampler = None
+        self.accumulator = None
+
+    def update(self, frame):
+        if len(frame) == 0:
+            return self
+        time = frame['Time_sec'].to_numpy(dtype=float)
+        if self.resampler is None:
+            if not self.sample_rate:
+                spacing = np.median(np.diff(time)) if len(time) > 1 else 0.0
+                if spacing <= 0:
+                    raise ValueError("샘플링 주파수를 구할 수 없습니다 (시간 간격이 0 입니다).")
+                self.sample_rate = 1.0 / spacing
+            self.resampler = UniformResampler(self.sample_rate)
+            self.accumulator = SpectralAccumulator(self.sample_rate, len(self.columns), self.nperseg, self.overlap,
+                                                   self.max_columns)
+        _, values = self.resampler.update(time, frame[self.columns].to_numpy(dtype=float))
+        self.accumulator.update(values)
+        return self
+
+    def result(self):
+        if self.accumulator is None:
+            raise ValueError("주파수 분석할 데이터가 없습니다.")
+        spectra = self.accumulator.result(self.resampler.start)
+        spectra['columns'] = self.columns
+        return spectra
+
+
+def spectral_analysis(frame, chunksize=SPECTRAL_CHUNKSIZE, **settings):
+    """메모리 내 운동학 DataFrame 의 PSD / 스펙트로그램 (청크 단위로 계산하여 임시 메모리 제한)"""
+    analyzer = SpectralAnalyzer(**settings)
+    for start in range(0, len(frame), chunksize):
+        analyzer.update(frame.iloc[start:start + chunksize])
+    return analyzer.result()
+
+
+def dominant_peaks(frequencies, psd, count=5, min_frequency=0.0):
+    """PSD 의 국소 최대 중 큰 순서로 count 개 (주파수, 값)"""
+    interior = np.flatnonzero((psd[1:-1] > psd[:-2]) & (psd[1:-1] >= psd[2:])) + 1
+    interior = interior[frequencies[interior] > min_frequency]
+    order = interior[np.argsort(psd[interior])[::-1][:count]]
+    return frequencies[order], psd[order]
+
+
+def pooled_rows(image, max_rows):
+    """(주파수, 시간) 이미지의 행을 최대값으로 묶어 max_rows 이하로 축소 (좁은 공진 피크 보존)"""
+    factor = -(-image.shape[0] // max_rows)
+    if factor <= 1:
+        return image, 1
+    rows = -(-image.shape[0] // factor) * factor
+    padded = np.full((rows, image.shape[1]), -np.inf)
+    padded[:image.shape[0]] = image
+    return padded.reshape(-1, factor, image.shape[1]).max(axis=1), factor
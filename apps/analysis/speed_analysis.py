@@ -3,12 +3,93 @@ import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
+import plotly.colors as plotly_colors
 import streamlit as st
+import inspect
+import os
+import time
 from io import BytesIO
 
 # 공통 유틸리티 임포트
 from utils.ui_components import tool_header, error_handler, success_message, info_message
-from utils.data_processing import safe_operation, preprocess_excel_data, create_download_link
+from utils.data_processing import (
+    DATA_DIR, safe_operation, preprocess_excel_data, create_download_link, resolve_data_path
+)
+from utils.performance import BoundedCache, content_digest
+from apps.analysis.speed_engine import (
+    DEFAULT_CHUNKSIZE, TIME_COLUMN, VELOCITY_COLUMN, axis_frame, axis_statistics, compute_axes_kinematics,
+    compute_kinematics, preprocess_speed_data, stream_speed_analysis
+)
+from apps.analysis.downsampling import (
+    DEFAULT_MAX_POINTS, METHOD_LABELS, METHODS, downsample_indices, window_slice
+)
+from apps.analysis.speed_live import LiveKinematics, SpeedTailSource
+from apps.analysis.speed_io import RAW_DTYPES, detect_speed_format, load_channels, load_speed_log, read_speed_columns
+from apps.analysis.window_stats import WindowIndex
+from apps.analysis.filters import SMOOTHING_METHODS, derivative_filter
+from apps.analysis.motion_segments import STATE_LABELS, segment_table
+from apps.analysis.quantiles import PERCENTILES, frame_percentiles, rank_error
+from apps.analysis.spectral import DEFAULT_NPERSEG, dominant_peaks, pooled_rows, spectral_analysis
+from apps.analysis.speed_batch import (
+    CURVE_COLUMNS, DEFAULT_SETTLE_FRACTION, DEFAULT_START_FRACTION, RUN_METRICS, expand_run_inputs, open_run,
+    run_comparison
+)
+from apps.analysis.speed_export import EXCEL_MAX_ROWS, EXPORT_FORMATS, available_formats, export_bytes
+
+# 재실행 시 같은 로그를 다시 읽지 않도록 (파일 식별자, 컬럼 지정, 전처리 옵션) 별 전처리 결과 캐시
+_LOG_CACHE = BoundedCache(max_entries=4, max_bytes=1024 * 1024 * 1024)
+# 주파수 분석 결과 캐시 (분석 식별자, 분석 설정) - 재실행마다 분석 결과가 다시 만들어져도 재사용
+_SPECTRUM_CACHE = BoundedCache(max_entries=8, max_bytes=256 * 1024 * 1024)
+# 내보내기 파일 바이트 캐시 (분석 식별자, 형식) - 같은 분석을 다시 내려받을 때 파일을 다시 만들지 않음
+_EXPORT_CACHE = BoundedCache(max_entries=8, max_bytes=512 * 1024 * 1024)
+
+SPEED_UPLOAD_TYPES = ["xlsx", "xls", "csv", "txt", "parquet", "pq", "npy", "bin", "raw", "f32", "f64"]
+STREAM_UPLOAD_TYPES = [ext for ext in SPEED_UPLOAD_TYPES if ext not in ("xlsx", "xls")]
+NO_TIME_COLUMN = "(없음 - 샘플링 주파수로 생성)"
+
+# 축별 통계표에 표시할 항목
+AXIS_STAT_LABELS = {
+    'max_velocity': '최대 속도 (m/s)',
+    'avg_velocity': '평균 속도 (m/s)',
+    'total_distance': '이동거리 (m)',
+    'max_acceleration': '최대 가속도 (m/s²)',
+    'min_acceleration': '최소 가속도 (m/s²)',
+    'rms_acceleration': 'RMS 가속도 (m/s²)',
+    'max_jerk': '최대 저크 (m/s³)',
+    'min_jerk': '최소 저크 (m/s³)',
+    'rms_jerk': 'RMS 저크 (m/s³)',
+    'acceleration_p95': 'P95 가속도 (m/s²)',
+    'acceleration_p99': 'P99 가속도 (m/s²)',
+    'jerk_p99': 'P99 저크 (m/s³)',
+    'accelerating_time': '가속 시간 (초)',
+    'decelerating_time': '감속 시간 (초)',
+    'constant_speed_time': '등속 시간 (초)',
+    'velocity_std': '속도 표준편차 (m/s)'
+}
+# 운동 구간표 표시 항목과 최대 표시 행 수 (구간 수가 더 많으면 정렬 기준 상위 구간만 표시)
+SEGMENT_LABELS = {
+    'state': '상태',
+    'start_time': '시작 (초)',
+    'end_time': '종료 (초)',
+    'duration': '지속 시간 (초)',
+    'velocity_change': '속도 변화 (m/s)',
+    'peak_acceleration': '피크 가속도 (m/s²)',
+    'rms_acceleration': 'RMS 가속도 (m/s²)',
+    'peak_jerk': '피크 저크 (m/s³)',
+    'rms_jerk': 'RMS 저크 (m/s³)'
+}
+MAX_SEGMENT_ROWS = 10_000
+SPECTRAL_QUANTITIES = {'Acceleration_m/s2': '가속도', 'Jerk_m/s3': '저크'}
+NPERSEG_OPTIONS = [256, 512, 1024, 2048, 4096, 8192]
+MAX_SPECTROGRAM_ROWS = 256
+PERCENTILE_LABELS = {'velocity': '속도 (m/s)', 'acceleration': '가속도 (m/s²)', 'jerk': '저크 (m/s³)'}
+RUN_CURVE_LABELS = {'Velocity_m/s': '속도 (m/s)', 'Acceleration_m/s2': '가속도 (m/s²)', 'Jerk_m/s3': '저크 (m/s³)'}
+AXIS_QUANTITIES = {
+    'velocity': '속도 (m/s)',
+    'acceleration': '가속도 (m/s²)',
+    'distance': '이동거리 (m)',
+    'jerk': '저크 (m/s³)'
+}
 
 @safe_operation
 def speed_analysis():
@@ -31,6 +112,10 @@ def speed_analysis():
     if 'speed_data' not in st.session_state:
         st.session_state.speed_data = None
         st.session_state.analysis_results = None
+    if 'multi_axis_results' not in st.session_state:
+        st.session_state.multi_axis_results = None
+    if 'run_comparison' not in st.session_state:
+        st.session_state.run_comparison = None
 
     with input_tab:
         display_input_section()
@@ -48,21 +133,52 @@ def display_input_section():
     """데이터 입력 섹션"""
     st.header("📁 데이터 입력")
     
+    # 처리 모드 선택
+    processing_mode = st.radio(
+        "처리 모드:",
+        options=["일반 (전체 로드)", "스트리밍 (대용량 파일)", "실시간 (기록 중인 로그)", "다중 주행 비교 (여러 파일)"],
+        horizontal=True,
+        help="스트리밍 모드는 로그를 청크 단위로 읽어 파일 크기와 무관한 메모리로 분석합니다. "
+             "실시간 모드는 시험 중 기록되는 로그에 추가된 부분만 읽어 결과를 이어서 갱신합니다. "
+             "다중 주행 비교는 같은 동작의 여러 회차 로그를 병렬 분석하여 운동 시작 기준으로 겹쳐 비교합니다."
+    )
+    
+    if processing_mode.startswith("스트리밍"):
+        display_streaming_input()
+        return
+    if processing_mode.startswith("실시간"):
+        display_live_input()
+        return
+    if processing_mode.startswith("다중 주행"):
+        display_run_comparison_input()
+        return
+    
     # 파일 업로드 영역
     col1, col2 = st.columns([3, 1])
     
     with col1:
         uploaded_file = st.file_uploader(
-            "📊 엑셀 파일을 업로드하세요", 
-            type=["xlsx", "xls"],
+            "📊 속도 로그 파일을 업로드하세요", 
+            type=SPEED_UPLOAD_TYPES,
             key="speed_analysis",
-            help="시간과 속도 데이터가 포함된 엑셀 파일을 업로드합니다."
+            help="엑셀, CSV, Parquet, NumPy(.npy), 원시 float 배열(.bin/.raw/.f32/.f64) 파일을 지원합니다."
+        )
+        local_path = st.text_input(
+            "또는 서버 로컬 파일 경로:",
+            value="",
+            key="speed_local_path",
+            help=f"데이터 디렉토리({os.path.realpath(DATA_DIR)}) 안의 파일 경로를 입력합니다. "
+                 "업로드 크기 제한을 넘는 .npy/원시 배열 파일은 복사 없이 메모리 매핑으로 읽습니다."
         )
     
     with col2:
         if st.button("📋 템플릿 다운로드", help="데이터 입력 템플릿을 다운로드합니다."):
             create_template_download()
 
+    source = local_source(local_path, uploaded_file)
+    mapping = display_column_mapping(source, "speed") if source else None
+    axes = display_axis_selection(source, mapping) if mapping else None
+
     # 데이터 전처리 옵션
     st.subheader("⚙️ 데이터 전처리 옵션")
     
@@ -75,86 +191,480 @@ def display_input_section():
             help="누락된 데이터의 처리 방법을 선택합니다."
         )
     
-    with col2:
-        smooth_data = st.checkbox(
-            "데이터 스무딩",
-            value=False,
-            help="노이즈 제거를 위한 데이터 스무딩을 적용합니다."
-        )
-    
-    with col3:
-        if smooth_data:
-            smooth_window = st.slider(
-                "스무딩 윈도우 크기:",
-                min_value=3,
-                max_value=21,
-                value=5,
-                step=2,
-                help="스무딩에 사용할 윈도우 크기를 설정합니다."
-            )
-        else:
-            smooth_window = 5
+    smoothing = display_smoothing_options("speed", col2, col3)
 
     # 파일 처리
-    if uploaded_file:
-        process_uploaded_file(uploaded_file, fill_strategy, smooth_data, smooth_window)
+    if mapping and axes:
+        process_multi_axis_file(source, mapping, axes, fill_strategy, smoothing)
+    elif mapping:
+        process_uploaded_file(source, mapping, fill_strategy, smoothing)
     else:
         display_data_format_guide()
 
-def process_uploaded_file(uploaded_file, fill_strategy, smooth_data, smooth_window):
-    """업로드된 파일 처리"""
+def display_smoothing_options(key, method_column, parameter_column):
+    """스무딩 방식/설정 선택 (filters.make_smoother 설정 사전 반환)"""
+    with method_column:
+        method = st.selectbox(
+            "데이터 스무딩:",
+            options=list(SMOOTHING_METHODS),
+            format_func=SMOOTHING_METHODS.get,
+            key=f"{key}_smoothing",
+            help="Savitzky-Golay 는 가속도/저크를 적합 다항식의 해석적 미분으로 계산하여 미분 노이즈를 줄이고, "
+                 "Butterworth 는 위상 지연 없이(앞뒤 적용) 차단 주파수 이상의 노이즈를 제거합니다."
+        )
+    
+    smoothing = {'method': method}
+    with parameter_column:
+        if method == 'moving_average':
+            smoothing['window'] = st.slider("스무딩 윈도우 크기:", min_value=3, max_value=21, value=5, step=2,
+                                            key=f"{key}_smooth_window",
+                                            help="스무딩에 사용할 윈도우 크기를 설정합니다.")
+        elif method == 'savgol':
+            smoothing['window'] = st.slider("창 크기 (샘플):", min_value=5, max_value=201, value=21, step=2,
+                                            key=f"{key}_savgol_window")
+            smoothing['polyorder'] = st.selectbox("다항식 차수:", options=[2, 3, 4], index=1,
+                                                  key=f"{key}_savgol_order",
+                                                  help="저크(2차 미분)를 구하려면 2 이상이어야 합니다.")
+        elif method == 'butterworth':
+            smoothing['cutoff_hz'] = st.number_input("차단 주파수 (Hz):", min_value=0.001, value=10.0,
+                                                     key=f"{key}_butter_cutoff")
+            smoothing['order'] = st.slider("필터 차수:", min_value=1, max_value=8, value=4,
+                                           key=f"{key}_butter_order",
+                                           help="앞뒤로 두 번 적용하므로 감쇠 기울기는 차수의 두 배입니다.")
+    return smoothing
+
+def display_column_mapping(source, key):
+    """Time_sec / Velocity_m/s 로 사용할 컬럼 지정 (load_speed_log 인자 사전 반환, 실패 시 None)"""
     try:
-        with st.spinner("📊 데이터를 분석하는 중..."):
-            # 엑셀 파일 읽기
-            data = pd.read_excel(uploaded_file, sheet_name=0)
+        kind = detect_speed_format(source)
+        raw_dtype, raw_columns = 'float64', 2
+        if kind == 'raw':
+            col1, col2 = st.columns(2)
+            with col1:
+                raw_dtype = st.selectbox("원시 배열 자료형:", options=list(RAW_DTYPES), key=f"{key}_raw_dtype",
+                                         help="리틀 엔디언 float 배열로 읽습니다.")
+            with col2:
+                raw_columns = int(st.number_input("샘플당 값 개수 (열):", min_value=1, max_value=64, value=2,
+                                                  key=f"{key}_raw_columns"))
+        columns = read_speed_columns(source, raw_dtype, raw_columns)
+    except Exception as e:
+        error_handler(f"파일을 열 수 없습니다: {str(e)}")
+        return None
+    
+    if not columns:
+        error_handler("파일에 데이터 컬럼이 없습니다.")
+        return None
+    
+    # 이름이 맞으면 그대로, 배열 형식이면 앞의 두 열을 시간/속도로 기본 지정
+    time_options = [NO_TIME_COLUMN] + columns
+    time_index = time_options.index(TIME_COLUMN) if TIME_COLUMN in columns else int(len(columns) > 1)
+    velocity_default = VELOCITY_COLUMN if VELOCITY_COLUMN in columns else columns[min(1, len(columns) - 1)]
+    
+    with st.expander("🔗 컬럼 지정", expanded=TIME_COLUMN not in columns or VELOCITY_COLUMN not in columns):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            time_column = st.selectbox("시간 컬럼 (Time_sec):", options=time_options, index=time_index,
+                                       key=f"{key}_time_column")
+        with col2:
+            velocity_column = st.selectbox("속도 컬럼 (Velocity_m/s):", options=columns,
+                                           index=columns.index(velocity_default), key=f"{key}_velocity_column")
+        with col3:
+            sample_rate = None
+            if time_column == NO_TIME_COLUMN:
+                sample_rate = st.number_input("샘플링 주파수 (Hz):", min_value=0.001, value=1000.0,
+                                              key=f"{key}_sample_rate")
+    
+    return {
+        'time_column': None if time_column == NO_TIME_COLUMN else time_column,
+        'velocity_column': velocity_column,
+        'sample_rate': sample_rate,
+        'raw_dtype': raw_dtype,
+        'raw_columns': raw_columns
+    }
+
+def display_axis_selection(source, mapping):
+    """다축 분석 채널 선택 (다축 분석을 하지 않으면 None)"""
+    multi_axis = st.checkbox(
+        "🤖 다축 분석 (여러 속도/위치 채널)",
+        value=False,
+        key="speed_multi_axis",
+        help="갠트리/다관절 로봇처럼 한 파일에 여러 축 채널이 있으면 모든 축을 한 번에 분석합니다."
+    )
+    if not multi_axis:
+        return None
+    
+    columns = [
+        col for col in read_speed_columns(source, mapping['raw_dtype'], mapping['raw_columns'])
+        if col not in (mapping['time_column'], TIME_COLUMN)
+    ]
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        channels = st.multiselect("축 채널:", options=columns, default=columns, key="speed_axis_channels")
+    with col2:
+        channel_type = st.radio("채널 종류:", options=["속도", "위치"], key="speed_axis_type",
+                                help="위치 채널은 미분하여 속도를 구하고, 이동거리는 시작 위치 대비 변위입니다.")
+    
+    if not channels:
+        info_message("분석할 축 채널을 하나 이상 선택하세요.")
+        return None
+    return {'channels': channels, 'channel_type': 'position' if channel_type == "위치" else 'velocity'}
+
+def process_multi_axis_file(source, mapping, axes, fill_strategy, smoothing):
+    """다축 로그 처리 (모든 축 채널을 (샘플, 축) 2D 배열로 한 번에 분석)"""
+    try:
+        with st.spinner("🤖 다축 데이터를 분석하는 중..."):
+            channels = axes['channels']
+            # 채널 종류(속도/위치)에 따라 운동학이 달라지므로 파생 결과(스펙트럼/내보내기) 캐시 키에 포함
+            cache_key = (source_digest(source), tuple(sorted(mapping.items())), tuple(channels),
+                         axes['channel_type'], fill_strategy, tuple(sorted(smoothing.items())))
+            data = _LOG_CACHE.get(cache_key)
+            if data is None:
+                time_values, data = load_channels(source, mapping['time_column'], channels, mapping['sample_rate'],
+                                                  mapping['raw_dtype'], mapping['raw_columns'])
+                data.insert(0, TIME_COLUMN, time_values)
+                data = preprocess_speed_data(data, fill_strategy, smoothing, channels)
+                _LOG_CACHE.put(cache_key, data)
             
-            # 필수 컬럼 확인
-            required_columns = ['Time_sec', 'Velocity_m/s']
-            missing_columns = [col for col in required_columns if col not in data.columns]
+            st.session_state.speed_data = data
+            success_message(f"데이터가 성공적으로 로드되었습니다. ({len(data):,} 개 데이터 포인트, {len(channels)}개 축)")
+            st.dataframe(data.head(10), use_container_width=True)
             
-            if missing_columns:
-                error_handler(f"필수 컬럼이 누락되었습니다: {', '.join(missing_columns)}")
-                st.info("💡 필수 컬럼: Time_sec (시간, 초), Velocity_m/s (속도, m/s)")
-                return
+            perform_multi_axis_analysis(data, channels, axes['channel_type'], smoothing, cache_key)
             
-            # 데이터 전처리
-            data = preprocess_speed_data(data, fill_strategy, smooth_data, smooth_window)
+    except ValueError as e:
+        error_handler(str(e))
+    except Exception as e:
+        error_handler(f"파일 처리 중 오류가 발생했습니다: {str(e)}")
+
+def perform_multi_axis_analysis(data, channels, channel_type='velocity', smoothing=None, analysis_key=None):
+    """다축 운동학/통계 분석 (첫 번째 축은 기존 단일 축 화면에서도 표시)"""
+    kinematics = compute_axes_kinematics(data['Time_sec'].to_numpy(), data[channels].to_numpy(), channel_type,
+                                         derivative_filter(smoothing))
+    
+    st.session_state.multi_axis_results = {
+        'kinematics': kinematics,
+        'axes': list(channels),
+        'channel_type': channel_type,
+        'table': axis_statistics(kinematics, channels)
+    }
+    
+    reference = axis_frame(kinematics, 0)
+    st.session_state.analysis_results = {
+        'data': reference,
+        'statistics': calculate_statistics(reference),
+        'window_index': WindowIndex(reference),
+        'reference_axis': channels[0],
+        'analysis_key': analysis_key
+    }
+    
+    success_message(f"{len(channels)}개 축 분석이 완료되었습니다. 단일 축 화면은 기준 축 '{channels[0]}' 을 표시합니다.")
+
+def source_digest(source):
+    """로그 식별자 (로컬 경로는 경로/수정 시각/크기, 업로드는 내용 해시를 한 번만 계산)"""
+    if isinstance(source, str):
+        stat = os.stat(source)
+        return ('path', os.path.abspath(source), stat.st_mtime_ns, stat.st_size)
+    digests = st.session_state.setdefault('speed_upload_digests', {})
+    upload_id = getattr(source, 'file_id', None) or (source.name, source.getbuffer().nbytes)
+    if upload_id not in digests:
+        if len(digests) >= 8:
+            digests.clear()
+        digests[upload_id] = content_digest(source.getbuffer())
+    return ('upload', digests[upload_id])
+
+def process_uploaded_file(source, mapping, fill_strategy, smoothing):
+    """업로드 파일 또는 로컬 경로 처리
+
+    지정 컬럼만 읽어 Time_sec/Velocity_m/s 로 구성하고, 파일 식별자와 컬럼 지정/전처리 옵션을 키로
+    전처리 결과를 캐시하여 위젯 조작으로 인한 재실행에서는 파일을 다시 읽지 않습니다.
+    """
+    try:
+        with st.spinner("📊 데이터를 분석하는 중..."):
+            cache_key = (source_digest(source), tuple(sorted(mapping.items())),
+                         fill_strategy, tuple(sorted(smoothing.items())))
+            data = _LOG_CACHE.get(cache_key)
+            if data is None:
+                # 지정 컬럼 읽기 (누락 시 ValueError)
+                data = load_speed_log(source, **mapping)
+                
+                # 데이터 전처리
+                data = preprocess_speed_data(data, fill_strategy, smoothing)
+                _LOG_CACHE.put(cache_key, data)
             
             # 세션에 저장
             st.session_state.speed_data = data
             
-            success_message(f"데이터가 성공적으로 로드되었습니다. ({len(data)} 개 데이터 포인트)")
+            success_message(f"데이터가 성공적으로 로드되었습니다. ({len(data):,} 개 데이터 포인트)")
             
             # 데이터 미리보기
             display_data_preview(data)
             
             # 기본 분석 수행
-            perform_speed_analysis(data)
+            perform_speed_analysis(data, smoothing, cache_key)
             
+    except ValueError as e:
+        error_handler(str(e))
+        st.info("💡 필수 컬럼: Time_sec (시간, 초), Velocity_m/s (속도, m/s) - 이름이 다르면 컬럼 지정에서 선택하세요.")
     except Exception as e:
         error_handler(f"파일 처리 중 오류가 발생했습니다: {str(e)}")
 
-def preprocess_speed_data(data, fill_strategy, smooth_data, smooth_window):
-    """속도 데이터 전처리"""
-    # 기본 정렬 (시간 순)
-    data = data.sort_values('Time_sec').reset_index(drop=True)
+def local_source(local_path, uploaded_file):
+    """서버 로컬 경로(데이터 디렉토리 안으로 제한) 또는 업로드 파일 (경로가 범위 밖이면 오류 표시 후 None)"""
+    if not local_path.strip():
+        return uploaded_file
+    try:
+        return resolve_data_path(local_path)
+    except ValueError as e:
+        error_handler(str(e))
+        return None
+
+def display_streaming_input():
+    """스트리밍 모드 입력 섹션"""
+    st.subheader("🌊 스트리밍 분석")
+    info_message("시간 순으로 정렬된 로그를 가정하며, 시간/속도가 비어 있는 행은 제외됩니다. "
+                 "통계는 전체 샘플로 계산하고 시각화에는 등간격 표본이 사용됩니다.")
     
-    # 누락값 처리
-    if fill_strategy == "해당 행 제거":
-        data = data.dropna(subset=['Time_sec', 'Velocity_m/s'])
-    elif fill_strategy == "선형 보간":
-        data['Velocity_m/s'] = data['Velocity_m/s'].interpolate(method='linear')
-        data = data.dropna(subset=['Time_sec', 'Velocity_m/s'])
-    elif fill_strategy == "0으로 대체":
-        data[['Time_sec', 'Velocity_m/s']] = data[['Time_sec', 'Velocity_m/s']].fillna(0)
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        uploaded_file = st.file_uploader(
+            "📊 CSV/Parquet/배열 파일을 업로드하세요",
+            type=STREAM_UPLOAD_TYPES,
+            key="speed_stream_upload",
+            help="업로드 크기 제한을 넘는 파일은 아래에 로컬 경로를 입력하세요."
+        )
+        local_path = st.text_input(
+            "또는 서버 로컬 파일 경로:",
+            value="",
+            key="speed_stream_path",
+            help=f"데이터 디렉토리({os.path.realpath(DATA_DIR)}) 안의 대용량 로그 파일 경로를 입력합니다. "
+                 ".npy/원시 배열은 메모리 매핑으로 읽습니다."
+        )
+    with col2:
+        chunksize = st.number_input(
+            "청크 크기 (행)",
+            min_value=10_000,
+            max_value=10_000_000,
+            value=DEFAULT_CHUNKSIZE,
+            step=100_000,
+            key="speed_stream_chunksize",
+            help="한 번에 읽을 행 수입니다. 최대 메모리 사용량을 결정합니다."
+        )
     
-    # 데이터 스무딩
-    if smooth_data and len(data) > smooth_window:
-        data['Velocity_m/s'] = data['Velocity_m/s'].rolling(
-            window=smooth_window, center=True, min_periods=1
-        ).mean()
+    source = local_source(local_path, uploaded_file)
+    mapping = display_column_mapping(source, "speed_stream") if source else None
+    col1, col2 = st.columns(2)
+    smoothing = display_smoothing_options("speed_stream", col1, col2)
+    spectral = None
+    if st.checkbox("🎵 주파수 분석(PSD/스펙트로그램)도 함께 계산", value=False, key="speed_stream_spectral",
+                   help="스트리밍 결과의 시각화 표본은 솎아낸 데이터이므로, 주파수 분석은 읽는 동안 원본 해상도로 계산합니다."):
+        spectral = {'nperseg': st.selectbox("세그먼트 길이 (샘플):", options=NPERSEG_OPTIONS,
+                                            index=NPERSEG_OPTIONS.index(DEFAULT_NPERSEG),
+                                            key="speed_stream_nperseg")}
+    if mapping and st.button("🚀 스트리밍 분석 실행", key="speed_stream_run"):
+        process_streaming_source(source, int(chunksize), mapping, smoothing, spectral)
+
+def process_streaming_source(source, chunksize, mapping=None, smoothing=None, spectral=None):
+    """CSV/Parquet/배열 속도 로그 스트리밍 분석 (스무딩은 청크 경계를 겹쳐 전체 로드와 같은 결과)"""
+    try:
+        with st.spinner("🌊 청크 단위로 데이터를 분석하는 중..."):
+            results = stream_speed_analysis(source, chunksize=chunksize, mapping=mapping, smoothing=smoothing,
+                                            spectral=spectral)
+        
+        st.session_state.speed_data = None
+        st.session_state.multi_axis_results = None
+        st.session_state.analysis_results = results
+        
+        success_message(
+            f"스트리밍 분석이 완료되었습니다. ({results['sample_count']:,} 개 데이터 포인트, "
+            f"시각화 표본 {len(results['data']):,} 개) 다른 탭에서 결과를 확인하세요."
+        )
+        
+    except Exception as e:
+        error_handler(f"스트리밍 분석 중 오류가 발생했습니다: {str(e)}")
+
+def display_run_comparison_input():
+    """다중 주행 비교 입력 섹션 (모든 회차에 같은 컬럼 지정/전처리 적용)"""
+    st.subheader("🏁 다중 주행 비교")
+    
+    uploaded_files = st.file_uploader(
+        "📊 회차별 속도 로그 파일 또는 ZIP 압축 파일을 업로드하세요",
+        type=SPEED_UPLOAD_TYPES + ["zip"],
+        accept_multiple_files=True,
+        key="speed_runs_upload",
+        help="같은 동작을 반복 기록한 10~50개 로그를 한 번에 비교할 수 있습니다."
+    )
+    inputs = expand_run_inputs([(f.name, f.getvalue()) for f in uploaded_files or []])
+    if uploaded_files and not inputs:
+        error_handler("비교할 속도 로그 파일이 없습니다.")
+    
+    # 컬럼 지정은 첫 번째 회차 파일 기준
+    mapping = display_column_mapping(open_run(*inputs[0]), "speed_runs") if inputs else None
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        fill_strategy = st.selectbox("누락값 처리:", options=["해당 행 제거", "선형 보간", "0으로 대체"],
+                                     key="speed_runs_fill")
+    smoothing = display_smoothing_options("speed_runs", col2, col3)
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        align = st.checkbox("운동 시작 시점으로 정렬", value=True, key="speed_runs_align",
+                            help="회차마다 속도가 처음 변하기 시작한 시각을 0초로 맞춥니다. 끄면 기록 시작 시각 기준입니다.")
+        start_percent = st.number_input("운동 시작 판정 (최대 속도 변화 대비 %)", min_value=0.1, max_value=50.0,
+                                        value=DEFAULT_START_FRACTION * 100, key="speed_runs_start")
+    with col2:
+        settle_percent = st.number_input("정착 허용 범위 (최대 편차 대비 %)", min_value=0.1, max_value=50.0,
+                                         value=DEFAULT_SETTLE_FRACTION * 100, key="speed_runs_settle",
+                                         help="최종 속도와의 차이가 이 범위 안에 머물기 시작할 때까지를 정착 시간으로 봅니다.")
+    with col3:
+        max_workers = st.slider("병렬 프로세스 수", min_value=1, max_value=max(os.cpu_count() or 1, 2),
+                                value=os.cpu_count() or 1, key="speed_runs_workers",
+                                help="동시에 분석할 파일 수입니다. CPU 코어 수에 비례하여 처리 시간이 줄어듭니다.")
+    
+    if mapping and st.button("🚀 비교 분석 실행", key="speed_runs_run"):
+        options = {'align': align, 'start_fraction': start_percent / 100, 'settle_fraction': settle_percent / 100}
+        process_run_files(inputs, mapping, fill_strategy, smoothing, options, max_workers)
+
+def process_run_files(inputs, mapping, fill_strategy, smoothing, options, max_workers=None):
+    """회차 로그 병렬 분석 후 공통 시간축 비교 결과 저장 (다른 탭은 비교 결과를 표시)"""
+    try:
+        with st.spinner(f"🏁 {len(inputs)}개 회차를 병렬로 분석하는 중..."):
+            comparison = run_comparison(inputs, mapping, fill_strategy, smoothing, max_workers=max_workers,
+                                        **options)
+        
+        st.session_state.speed_data = None
+        st.session_state.multi_axis_results = None
+        st.session_state.analysis_results = None
+        st.session_state.run_comparison = comparison
+        
+        failed = [run for run in comparison['runs'] if run['error']]
+        success_message(f"비교 분석이 완료되었습니다. ({len(inputs) - len(failed)}/{len(inputs)}개 성공) "
+                        "'분석 설정'/'시각화' 탭에서 확인하세요.")
+        for run in failed:
+            error_handler(f"{run['run']}: {run['error']}")
+        
+    except Exception as e:
+        error_handler(f"비교 분석 중 오류가 발생했습니다: {str(e)}")
+
+def display_live_input():
+    """실시간 모드 입력 섹션"""
+    st.subheader("📡 실시간 분석")
+    st.caption(
+        "시험 중 기록되는 CSV/원시 바이너리 로그에 새로 추가된 부분만 읽어 속도, 가속도, 이동거리, 저크를 이어서 계산합니다. "
+        "시험 장비 대신 scripts/speed_log_simulator.py 로 로그 기록을 모사할 수 있습니다."
+    )
     
-    return data
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        path = st.text_input(
+            "기록 중인 로그 파일 경로:",
+            value="live_speed.csv",
+            key="speed_live_path",
+            help=f"데이터 디렉토리({os.path.realpath(DATA_DIR)}) 안의 CSV(헤더 포함) 또는 "
+                 "원시 float 배열(.bin/.raw/.f32/.f64) 파일입니다."
+        ).strip()
+    with col2:
+        refresh = st.slider("표시 갱신 주기 (초)", min_value=0.2, max_value=5.0, value=1.0, step=0.1,
+                            key="speed_live_refresh")
+    
+    try:
+        path = resolve_data_path(path) if path else path
+    except ValueError as e:
+        error_handler(str(e))
+        return
+    if not path or not os.path.exists(path):
+        info_message("로그 파일이 생성되기를 기다리는 중입니다. 기록을 시작한 뒤 컬럼을 지정하세요.")
+        return
+    mapping = display_column_mapping(path, "speed_live")
+    if not mapping:
+        return
+    
+    tail_seconds = st.number_input("차트 표시 구간 (최근 초, 0 = 전체)", min_value=0.0, value=0.0, step=10.0,
+                                   key="speed_live_tail")
+    
+    session = st.session_state.get('speed_live')
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if st.button("▶️ 시작", key="speed_live_start"):
+            stop_live_session(session)
+            try:
+                source = SpeedTailSource(path, **mapping)
+            except (OSError, ValueError) as e:
+                error_handler(f"로그 파일을 열 수 없습니다: {str(e)}")
+                return
+            session = {'source': source, 'kinematics': LiveKinematics(), 'started': time.time()}
+            st.session_state.speed_live = session
+    with col2:
+        if st.button("⏹️ 중지", key="speed_live_stop"):
+            stop_live_session(session)
+    with col3:
+        if st.button("🔄 처음부터 다시 읽기", key="speed_live_reset") and session and session['source']:
+            session['source'].close()
+            session['source'] = SpeedTailSource(path, **mapping)
+            session['kinematics'].reset()
+    
+    if session:
+        display_live_readout(session, refresh, tail_seconds)
+
+def stop_live_session(session):
+    """실시간 로그 추적 중지 (계산 결과는 유지)"""
+    if session and session['source'] is not None:
+        session['source'].close()
+        session['source'] = None
+
+def display_live_readout(session, refresh, tail_seconds):
+    """실시간 결과 표시 (지원되는 경우 해당 영역만 고정 주기로 다시 실행)"""
+    fragment = getattr(st, 'fragment', None)
+    if fragment is None or session['source'] is None:
+        render_live_readout(session, tail_seconds)
+        return
+    fragment(run_every=refresh)(render_live_readout)(session, tail_seconds)
+
+def render_live_readout(session, tail_seconds):
+    """추가된 샘플 반영 후 현재 지표와 통합 차트 표시"""
+    kinematics = session['kinematics']
+    if session['source'] is not None:
+        try:
+            time_values, velocity, restarted = session['source'].poll()
+            if restarted:
+                kinematics.reset()
+            kinematics.push(time_values, velocity)
+        except Exception as e:
+            error_handler(f"로그를 읽는 중 오류가 발생했습니다: {str(e)}")
+            stop_live_session(session)
+    
+    if kinematics.size == 0:
+        info_message("새 샘플을 기다리는 중입니다...")
+        return
+    
+    df = kinematics.frame()
+    statistics = kinematics.statistics()
+    latest = df.iloc[-1]
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("현재 속도", f"{latest['Velocity_m/s']:.2f} m/s")
+    with col2:
+        st.metric("현재 가속도", f"{latest['Acceleration_m/s2']:.2f} m/s²")
+    with col3:
+        st.metric("이동 거리", f"{latest['Distance_m']:.2f} m")
+    with col4:
+        st.metric("최대 저크", f"{statistics['basic']['max_jerk']:.2f} m/s³")
+    
+    # 최근 구간만 표시 (이진 탐색 슬라이스)
+    view = df
+    if tail_seconds:
+        view = df.iloc[window_slice(df['Time_sec'].to_numpy(), latest['Time_sec'] - tail_seconds)]
+    if len(view) >= 2:
+        display_combined_visualization(view, max_points=2000)
+    
+    # 다른 탭에서도 현재까지의 결과를 볼 수 있도록 저장
+    st.session_state.speed_data = None
+    st.session_state.multi_axis_results = None
+    st.session_state.analysis_results = {'data': df, 'statistics': statistics}
+    
+    status = "추적 중" if session['source'] is not None else "중지됨"
+    st.caption(f"📡 {status} · 확정 샘플 {kinematics.size:,}개 · 로그 시간 {statistics['basic']['total_time']:.2f}초")
 
 def display_data_preview(data):
     """데이터 미리보기"""
@@ -178,41 +688,23 @@ def display_data_preview(data):
     with st.expander("📊 기본 통계 정보"):
         st.dataframe(data.describe(), use_container_width=True)
 
-def perform_speed_analysis(data):
-    """속도 분석 수행"""
+def perform_speed_analysis(data, smoothing=None, analysis_key=None):
+    """속도 분석 수행 (analysis_key: 파일/전처리 옵션 식별자, 파생 결과 캐시 키로 사용)"""
     try:
-        time = data['Time_sec'].values
-        velocity = data['Velocity_m/s'].values
-        
-        # 가속도 계산 (속도의 시간 미분)
-        acceleration = np.gradient(velocity, time)
-        
-        # 이동거리 계산 (속도의 시간 적분)
-        # 사다리꼴 공식 사용
-        distance = np.zeros_like(time)
-        for i in range(1, len(time)):
-            dt = time[i] - time[i-1]
-            distance[i] = distance[i-1] + (velocity[i-1] + velocity[i]) * dt / 2
-        
-        # 저크(Jerk) 계산 (가속도의 시간 미분)
-        jerk = np.gradient(acceleration, time)
-        
-        # 결과 데이터프레임 생성
-        results_df = pd.DataFrame({
-            'Time_sec': time,
-            'Velocity_m/s': velocity,
-            'Acceleration_m/s2': acceleration,
-            'Distance_m': distance,
-            'Jerk_m/s3': jerk
-        })
+        # 가속도(미분), 이동거리(누적 사다리꼴 적분), 저크 일괄 계산
+        results_df = compute_kinematics(data['Time_sec'].values, data['Velocity_m/s'].values,
+                                        savgol=derivative_filter(smoothing))
         
         # 통계 분석
         statistics = calculate_statistics(results_df)
         
-        # 세션에 저장
+        # 세션에 저장 (시간 구간 통계 인덱스 포함)
+        st.session_state.multi_axis_results = None
         st.session_state.analysis_results = {
             'data': results_df,
-            'statistics': statistics
+            'statistics': statistics,
+            'window_index': WindowIndex(results_df),
+            'analysis_key': analysis_key
         }
         
         success_message("속도 분석이 완료되었습니다. 다른 탭에서 결과를 확인하세요.")
@@ -220,8 +712,21 @@ def perform_speed_analysis(data):
     except Exception as e:
         error_handler(f"분석 중 오류가 발생했습니다: {str(e)}")
 
-def calculate_statistics(df):
-    """통계 분석 계산"""
+def get_window_index(results):
+    """분석 결과의 시간 구간 통계 인덱스 (없으면 만들어 결과에 저장)"""
+    if results.get('window_index') is None:
+        results['window_index'] = WindowIndex(results['data'])
+    return results['window_index']
+
+def calculate_statistics(df, time_range=None, index=None):
+    """통계 분석 계산
+    
+    time_range(시작, 끝 초)가 주어지면 구간 통계 인덱스로 데이터 복사 없이 해당 구간 통계를 계산합니다.
+    """
+    if time_range is not None:
+        index = index if index is not None else WindowIndex(df)
+        return index.time_statistics(*time_range)
+    
     statistics = {}
     
     # 기본 통계
@@ -244,6 +749,9 @@ def calculate_statistics(df):
     # 성능 지표
     statistics['performance'] = calculate_performance_metrics(df)
     
+    # 백분위수 (메모리 내 데이터는 정확한 값)
+    statistics['percentiles'] = frame_percentiles(df)
+    
     return statistics
 
 def analyze_motion_states(df):
@@ -311,6 +819,9 @@ def display_analysis_section():
     st.header("📊 분석 설정 및 요약")
     
     if st.session_state.analysis_results is None:
+        if st.session_state.get('run_comparison'):
+            display_run_matrix(st.session_state.run_comparison)
+            return
         info_message("먼저 '데이터 입력' 탭에서 데이터를 업로드하세요.")
         return
     
@@ -318,19 +829,26 @@ def display_analysis_section():
     stats = results['statistics']
     
     # 기본 통계 표시
-    display_basic_statistics(stats['basic'])
+    display_basic_statistics(stats['basic'], stats.get('percentiles'), stats.get('sketch'))
     
     # 운동 상태 분석
     display_motion_analysis(stats['motion_states'])
     
+    # 운동 구간표
+    display_motion_segments(results)
+    
     # 성능 지표
     display_performance_metrics(stats['performance'])
     
+    # 다축 분석 시 축별 통계
+    if st.session_state.get('multi_axis_results'):
+        display_axis_statistics(st.session_state.multi_axis_results)
+    
     # 분석 설정
     display_analysis_settings()
 
-def display_basic_statistics(basic_stats):
-    """기본 통계 표시"""
+def display_basic_statistics(basic_stats, percentiles=None, sketch=None):
+    """기본 통계 표시 (percentiles: 물리량별 P50/P95/P99, sketch: 스트리밍 스케치 근사 정보)"""
     st.subheader("📈 기본 분석 결과")
     
     col1, col2, col3 = st.columns(3)
@@ -351,6 +869,94 @@ def display_basic_statistics(basic_stats):
         st.metric("최대 가속도", f"{basic_stats['max_acceleration']:.2f} m/s²")
         st.metric("평균 가속도", f"{basic_stats['avg_acceleration']:.2f} m/s²")
         st.metric("최대 저크", f"{basic_stats['max_jerk']:.2f} m/s³")
+    
+    if percentiles:
+        display_percentile_table(percentiles, sketch)
+
+def display_percentile_table(percentiles, sketch=None):
+    """물리량별 백분위수 표 (행: 속도/가속도/저크, 열: P50/P95/P99)"""
+    st.markdown("**📊 백분위수**")
+    table = pd.DataFrame(
+        [[percentiles[name][f"p{p}"] for p in PERCENTILES] for name in PERCENTILE_LABELS if name in percentiles],
+        index=[label for name, label in PERCENTILE_LABELS.items() if name in percentiles],
+        columns=[f"P{p}" for p in PERCENTILES]
+    )
+    st.dataframe(table.style.format("{:.3f}", na_rep="N/A"), use_container_width=True)
+    if sketch:
+        st.caption(f"전체 샘플 대신 KLL 분위수 스케치(k={sketch['k']:,}, 보관 값 {sketch['retained']:,}개)로 구한 "
+                   f"근사값입니다 (순위 오차 약 {rank_error(sketch['k']):.2%} 이내).")
+
+def display_run_matrix(comparison):
+    """회차 x 지표 행렬, 회차 간 편차, 지표별 z-점수 히트맵"""
+    st.subheader("🏁 회차별 지표 비교")
+    
+    matrix = comparison['matrix']
+    if matrix.empty:
+        info_message("비교할 수 있는 분석 결과가 없습니다.")
+        return
+    
+    table = matrix.rename(columns=RUN_METRICS)
+    st.dataframe(table.style.format("{:.4f}"), use_container_width=True)
+    st.markdown("**회차 간 편차**")
+    st.dataframe(table.agg(['mean', 'std', 'min', 'max']).style.format("{:.4f}"), use_container_width=True)
+    if comparison.get('percentiles'):
+        st.markdown("**전체 회차 통합**")
+        display_percentile_table(comparison['percentiles'], comparison.get('sketch'))
+    
+    # 지표별 표준화 점수 (회차 평균 대비 표준편차 배수, 이상 회차 식별)
+    if len(matrix) > 1:
+        spread = matrix.std().replace(0, np.nan)
+        scores = ((matrix - matrix.mean()) / spread).fillna(0.0)
+        fig = px.imshow(scores.to_numpy().T, x=[str(run) for run in matrix.index], y=list(table.columns),
+                        zmin=-3, zmax=3, color_continuous_scale='RdBu_r', aspect='auto',
+                        title="회차별 지표 z-점수 (평균 대비 표준편차 배수)")
+        fig.update_layout(height=150 + 40 * len(matrix.columns))
+        st.plotly_chart(fig, use_container_width=True)
+    
+    st.download_button(
+        label="📄 지표 행렬 CSV 다운로드",
+        data=table.to_csv().encode('utf-8'),
+        file_name='speed_run_comparison.csv',
+        mime='text/csv',
+        key="speed_runs_matrix_download"
+    )
+
+def display_run_overlay(comparison):
+    """공통 시간축에 재표본화한 회차별 곡선 겹쳐 보기 (평균 ± 표준편차 포함)"""
+    st.subheader("🏁 회차별 곡선 겹쳐 보기")
+    
+    if 'curves' not in comparison:
+        info_message("비교할 수 있는 분석 결과가 없습니다.")
+        return
+    
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        column = st.selectbox("비교 항목:", options=list(CURVE_COLUMNS), format_func=RUN_CURVE_LABELS.get,
+                              key="speed_runs_quantity")
+    with col2:
+        show_band = st.checkbox("평균 ± 표준편차 표시", value=True, key="speed_runs_band")
+    
+    grid, curves = comparison['time'], comparison['curves'][column]
+    fig = go.Figure()
+    for name, values in zip(comparison['names'], curves):
+        fig.add_trace(go.Scattergl(x=grid, y=values, mode='lines', name=str(name), line=dict(width=1),
+                                   opacity=0.6))
+    if show_band:
+        valid = ~np.isnan(curves)
+        count = valid.sum(axis=0)
+        mean = np.where(count > 0, np.where(valid, curves, 0.0).sum(axis=0) / np.maximum(count, 1), np.nan)
+        spread = np.sqrt(np.where(valid, (curves - mean) ** 2, 0.0).sum(axis=0) / np.maximum(count - 1, 1))
+        fig.add_trace(go.Scatter(x=np.concatenate([grid, grid[::-1]]),
+                                 y=np.concatenate([mean + spread, (mean - spread)[::-1]]),
+                                 fill='toself', fillcolor='rgba(0,0,0,0.12)', line=dict(width=0),
+                                 hoverinfo='skip', name='평균 ± 표준편차'))
+        fig.add_trace(go.Scatter(x=grid, y=mean, mode='lines', name='평균', line=dict(color='black', width=2.5)))
+    
+    fig.update_layout(title=f"회차별 {RUN_CURVE_LABELS[column]}", xaxis_title="운동 시작 기준 시간 (초)",
+                      yaxis_title=RUN_CURVE_LABELS[column], height=550, hovermode='x')
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(f"{len(comparison['names'])}개 회차 · 공통 시간축 {len(grid):,}점 "
+               f"(간격 {(grid[1] - grid[0]) * 1000 if len(grid) > 1 else 0:.2f} ms, 회차 기록 범위 밖은 표시하지 않음)")
 
 def display_motion_analysis(motion_states):
     """운동 상태 분석 표시"""
@@ -384,6 +990,91 @@ def display_motion_analysis(motion_states):
         )
         st.plotly_chart(fig, use_container_width=True)
 
+def get_motion_segments(results, hysteresis):
+    """분석 결과의 운동 구간표 (히스테리시스 값별로 결과에 저장하여 재실행 시 다시 계산하지 않음)"""
+    tables = results.setdefault('motion_segments', {})
+    if hysteresis not in tables:
+        if len(tables) >= 4:
+            tables.clear()
+        tables[hysteresis] = segment_table(results['data'], hysteresis=hysteresis)
+    return tables[hysteresis]
+
+def display_motion_segments(results):
+    """운동 구간표 (행을 선택하면 차트 표시 구간이 해당 구간으로 이동)"""
+    st.subheader("🧩 운동 구간")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        hysteresis = st.number_input("히스테리시스 (m/s²)", min_value=0.0, max_value=0.1, value=0.05, step=0.01,
+                                     key="speed_segment_hysteresis",
+                                     help="가속/감속 구간은 |가속도| 가 0.1 m/s² 를 넘으면 시작되고, "
+                                          "0.1 - 히스테리시스 이하로 내려가야 끝납니다. 기준값 부근의 상태 떨림을 막습니다.")
+    with col2:
+        states = st.multiselect("상태", options=list(STATE_LABELS), default=[0, 1], format_func=STATE_LABELS.get,
+                                key="speed_segment_states")
+    with col3:
+        min_duration = st.number_input("최소 지속 시간 (초)", min_value=0.0, value=0.0, step=0.1,
+                                       key="speed_segment_min_duration")
+    with col4:
+        sort_by = st.selectbox("정렬", options=['start_time', 'duration', 'peak_acceleration', 'peak_jerk'],
+                               format_func=SEGMENT_LABELS.get, key="speed_segment_sort")
+    
+    segments = get_motion_segments(results, float(hysteresis))
+    counts = segments['state'].value_counts()
+    st.caption(" · ".join(f"{label} {counts.get(state, 0):,}개" for state, label in STATE_LABELS.items())
+               + (" · 스트리밍 분석은 시각화 표본으로 구간을 계산합니다." if 'sample_count' in results else ""))
+    
+    view = segments[segments['state'].isin(states) & (segments['duration'] >= min_duration)]
+    if sort_by != 'start_time':
+        view = view.iloc[np.argsort(-view[sort_by].abs().to_numpy(), kind='stable')]
+    if len(view) > MAX_SEGMENT_ROWS:
+        st.caption(f"구간 {len(view):,}개 중 정렬 기준 상위 {MAX_SEGMENT_ROWS:,}개를 표시합니다.")
+        view = view.iloc[:MAX_SEGMENT_ROWS]
+    if view.empty:
+        info_message("조건에 맞는 구간이 없습니다.")
+        return
+    
+    table = view[list(SEGMENT_LABELS)].assign(state=view['state'].map(STATE_LABELS)).rename(columns=SEGMENT_LABELS)
+    rows = select_table_rows(table, view, key="speed_segment_table")
+    if rows:
+        segment = view.iloc[rows[0]]
+        select_segment_window(segment, results['data'])
+
+def select_table_rows(table, view, key):
+    """행 하나를 선택할 수 있는 표 표시 후 선택된 행 위치 반환
+    
+    표의 행 선택(on_select)은 Streamlit 1.35 이상에서만 지원되므로, 이전 버전에서는
+    표 아래 선택 상자로 구간을 고릅니다.
+    """
+    if 'on_select' in inspect.signature(st.dataframe).parameters:
+        event = st.dataframe(table, use_container_width=True, hide_index=True, on_select="rerun",
+                             selection_mode="single-row", key=key)
+        return event.selection.rows if event else []
+    
+    st.dataframe(table, use_container_width=True, hide_index=True)
+    labels = [f"{STATE_LABELS[state]} {start:.3f} ~ {end:.3f} 초"
+              for state, start, end in zip(view['state'], view['start_time'], view['end_time'])]
+    choice = st.selectbox("구간 선택", options=[None] + list(range(len(view))),
+                          format_func=lambda k: "선택 안 함" if k is None else labels[k], key=f"{key}_choice")
+    return [] if choice is None else [choice]
+
+def select_segment_window(segment, df):
+    """선택 구간(앞뒤 여유 포함)으로 차트 표시 구간 이동 후 미리보기"""
+    margin = max(segment['duration'] * 0.1, 1e-9)
+    view_range = (float(segment['start_time'] - margin), float(segment['end_time'] + margin))
+    
+    # 선택이 바뀐 경우에만 이동 (선택 유지 중 '전체 구간 보기' 를 누르면 다시 덮어쓰지 않도록)
+    selected = (int(segment['start_index']), int(segment['end_index']))
+    if st.session_state.get('speed_segment_selected') != selected:
+        st.session_state.speed_segment_selected = selected
+        st.session_state.speed_view_range = view_range
+    st.caption(f"📍 {STATE_LABELS[segment['state']]} 구간 {segment['start_time']:.3f} ~ {segment['end_time']:.3f} 초 "
+               "- 시각화 탭 차트도 이 구간을 표시합니다.")
+    
+    window = df.iloc[window_slice(df['Time_sec'].to_numpy(), *view_range)]
+    if len(window) >= 2:
+        display_combined_visualization(window, max_points=2000)
+
 def display_performance_metrics(performance):
     """성능 지표 표시"""
     st.subheader("🏆 성능 지표")
@@ -405,6 +1096,14 @@ def display_performance_metrics(performance):
     with col4:
         st.metric("속도 안정성", f"{100 - performance['velocity_std']:.1f}%")
 
+def display_axis_statistics(multi_axis):
+    """축별 통계표"""
+    st.subheader("🤖 축별 통계")
+    st.caption(f"{len(multi_axis['axes'])}개 축 · 위 요약은 기준 축 '{multi_axis['axes'][0]}' 기준입니다.")
+    
+    table = multi_axis['table'][list(AXIS_STAT_LABELS)].rename(columns=AXIS_STAT_LABELS)
+    st.dataframe(table.style.format("{:.3f}", na_rep="N/A"), use_container_width=True)
+
 def display_analysis_settings():
     """분석 설정"""
     st.subheader("⚙️ 고급 분석 설정")
@@ -429,19 +1128,53 @@ def display_analysis_settings():
                 help="시각화할 분석 항목을 선택합니다."
             )
         
+        # 선택 구간 통계 (인덱스 조회이므로 슬라이더 조작마다 즉시 갱신)
+        display_window_statistics(time_range)
+        
         if st.button("🔄 분석 업데이트"):
             update_analysis_with_filters(time_range, analysis_type)
 
+def display_window_statistics(time_range):
+    """선택 시간 구간 통계 표"""
+    results = st.session_state.analysis_results
+    try:
+        stats = calculate_statistics(results['data'], time_range, get_window_index(results))
+    except ValueError as e:
+        info_message(str(e))
+        return
+    
+    basic, motion, performance = stats['basic'], stats['motion_states'], stats['performance']
+    table = pd.DataFrame({
+        '항목': ['구간 시간', '평균 속도', '속도 범위', '가속도 범위', '저크 범위', 'RMS 가속도', '가속/감속/등속 시간'],
+        '값': [
+            f"{basic['total_time']:.3f} 초",
+            f"{basic['avg_velocity']:.3f} m/s",
+            f"{basic['min_velocity']:.3f} ~ {basic['max_velocity']:.3f} m/s",
+            f"{basic['min_acceleration']:.3f} ~ {basic['max_acceleration']:.3f} m/s²",
+            f"{basic['min_jerk']:.3f} ~ {basic['max_jerk']:.3f} m/s³",
+            f"{performance['rms_acceleration']:.3f} m/s²",
+            f"{motion['accelerating_time']:.2f} / {motion['decelerating_time']:.2f} / "
+            f"{motion['constant_speed_time']:.2f} 초"
+        ]
+    })
+    st.dataframe(table, use_container_width=True, hide_index=True)
+
 def update_analysis_with_filters(time_range, analysis_type):
     """필터가 적용된 분석 업데이트"""
     if st.session_state.analysis_results:
-        df = st.session_state.analysis_results['data']
+        results = st.session_state.analysis_results
+        index = get_window_index(results)
+        
+        # 시간 범위 필터링 (이진 탐색 슬라이스, 불리언 마스크 사본 없음)
+        window = index.window(*time_range)
         
-        # 시간 범위 필터링
-        mask = (df['Time_sec'] >= time_range[0]) & (df['Time_sec'] <= time_range[1])
-        filtered_df = df[mask]
+        try:
+            st.session_state.filtered_statistics = calculate_statistics(results['data'], time_range, index)
+        except ValueError as e:
+            error_handler(str(e))
+            return
         
-        st.session_state.filtered_data = filtered_df
+        st.session_state.filtered_data = results['data'].iloc[window]
         st.session_state.selected_analysis = analysis_type
         
         success_message("분석이 업데이트되었습니다.")
@@ -451,31 +1184,51 @@ def display_visualization_section():
     st.header("📈 시각화")
     
     if st.session_state.analysis_results is None:
+        if st.session_state.get('run_comparison'):
+            display_run_overlay(st.session_state.run_comparison)
+            return
         info_message("먼저 '데이터 입력' 탭에서 데이터를 업로드하세요.")
         return
     
     df = st.session_state.analysis_results['data']
+    if len(df) < 2:
+        info_message("시각화할 데이터가 부족합니다.")
+        return
     
     # 시각화 옵션
-    viz_options = display_visualization_options()
+    viz_options = display_visualization_options(df)
+    
+    # 선택 시간 구간 (원본 해상도에서 다시 다운샘플링)
+    window = df.iloc[window_slice(df['Time_sec'].to_numpy(), *viz_options['time_range'])]
+    if len(window) < 2:
+        info_message("선택한 시간 구간에 데이터가 부족합니다.")
+        return
     
     # 통합 시각화
     if viz_options['show_combined']:
-        display_combined_visualization(df)
+        display_combined_visualization(window, viz_options['max_points'], viz_options['method'])
     
     # 개별 시각화
     if viz_options['show_individual']:
-        display_individual_visualizations(df)
+        display_individual_visualizations(window, viz_options['max_points'], viz_options['method'])
     
     # 3D 시각화
     if viz_options['show_3d']:
-        display_3d_visualization(df)
+        display_3d_visualization(window, viz_options['max_points'], viz_options['method'])
+    
+    # 주파수 분석 (전체 구간)
+    if viz_options['show_spectral']:
+        display_spectral_analysis(st.session_state.analysis_results)
+    
+    # 다축 비교
+    if st.session_state.get('multi_axis_results'):
+        display_axis_comparison(st.session_state.multi_axis_results, viz_options)
 
-def display_visualization_options():
+def display_visualization_options(df):
     """시각화 옵션"""
     st.subheader("🎨 시각화 옵션")
     
-    col1, col2, col3 = st.columns(3)
+    col1, col2, col3, col4 = st.columns(4)
     
     with col1:
         show_combined = st.checkbox("통합 차트", value=True)
@@ -483,17 +1236,175 @@ def display_visualization_options():
         show_individual = st.checkbox("개별 차트", value=True)
     with col3:
         show_3d = st.checkbox("3D 궤적", value=False)
+    with col4:
+        show_spectral = st.checkbox("주파수 분석", value=False, key="speed_viz_spectral",
+                                    help="가속도/저크의 Welch PSD 와 스펙트로그램으로 공진 등 주기적 진동 성분을 확인합니다.")
+    
+    # 다운샘플링 및 확대 구간 (운동 구간표에서 선택한 구간이 있으면 그 구간부터 표시)
+    t_min, t_max = float(df['Time_sec'].iat[0]), float(df['Time_sec'].iat[-1])
+    start, end = st.session_state.get('speed_view_range') or (t_min, t_max)
+    start, end = min(max(start, t_min), t_max), min(max(end, t_min), t_max)
+    if start >= end:
+        start, end = t_min, t_max
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        time_range = st.slider(
+            "표시 시간 구간 (초)",
+            min_value=t_min,
+            max_value=t_max,
+            value=(start, end),
+            help="구간을 좁히면 해당 구간의 원본 샘플로 다시 다운샘플링하여 세부 파형을 표시합니다."
+        )
+        if (start, end) != (t_min, t_max) and st.button("↔️ 전체 구간 보기", key="speed_view_reset"):
+            st.session_state.speed_view_range = None
+            st.rerun()
+    with col2:
+        method = st.selectbox(
+            "다운샘플링 방식:",
+            options=list(METHOD_LABELS),
+            format_func=METHOD_LABELS.get,
+            key="speed_viz_method",
+            help="최소/최대 포락선은 픽셀 구간마다 극값을 남겨 저크 스파이크 같은 피크를 보존합니다."
+        )
+    with col3:
+        max_points = st.number_input(
+            "계열당 최대 점 수:",
+            min_value=500,
+            max_value=100_000,
+            value=DEFAULT_MAX_POINTS,
+            step=500,
+            key="speed_viz_max_points"
+        )
     
     return {
         'show_combined': show_combined,
         'show_individual': show_individual,
-        'show_3d': show_3d
+        'show_3d': show_3d,
+        'show_spectral': show_spectral,
+        'time_range': time_range,
+        'method': method,
+        'max_points': int(max_points)
     }
 
-def display_combined_visualization(df):
+def display_spectral_analysis(results):
+    """가속도/저크 Welch PSD 와 스펙트로그램"""
+    st.subheader("🎵 주파수 분석")
+    
+    streamed = 'sample_count' in results
+    if streamed:
+        spectra = next(iter(results.get('spectra', {}).values()), None)
+        if spectra is None:
+            info_message("스트리밍 모드에서는 '주파수 분석도 함께 계산' 을 선택하고 다시 실행하세요.")
+            return
+    else:
+        col1, col2 = st.columns(2)
+        with col1:
+            nperseg = st.selectbox("세그먼트 길이 (샘플):", options=NPERSEG_OPTIONS,
+                                   index=NPERSEG_OPTIONS.index(DEFAULT_NPERSEG), key="speed_spectral_nperseg",
+                                   help="길수록 주파수 분해능이 높아지고 시간 분해능은 낮아집니다.")
+        with col2:
+            time_values = results['data']['Time_sec'].to_numpy()
+            estimated = 1.0 / float(np.median(np.diff(time_values)))
+            sample_rate = st.number_input("재표본화 주파수 (Hz):", min_value=0.001, value=round(estimated, 3),
+                                          key="speed_spectral_rate",
+                                          help="불균일 샘플을 이 주파수의 등간격 격자로 선형 보간한 뒤 분석합니다.")
+        try:
+            with st.spinner("🎵 PSD/스펙트로그램을 계산하는 중..."):
+                spectra = get_spectra(results, {'nperseg': nperseg, 'sample_rate': float(sample_rate)})
+        except ValueError as e:
+            info_message(str(e))
+            return
+    
+    frequencies = spectra['frequencies']
+    resolution = frequencies[1] - frequencies[0]
+    st.caption(f"재표본화 {spectra['sample_rate']:.1f} Hz · 주파수 분해능 {resolution:.3f} Hz · "
+               f"세그먼트 {spectra['segments']:,}개 평균 (Hann 창, 50% 겹침)")
+    
+    display_psd_chart(spectra)
+    for k, column in enumerate(spectra['columns']):
+        display_spectrogram(spectra['times'], frequencies, spectra['spectrogram'][k], SPECTRAL_QUANTITIES[column])
+
+def get_spectra(results, settings):
+    """분석 결과의 PSD/스펙트로그램 (분석 식별자가 있으면 캐시, 없으면 결과 사전에 저장)"""
+    settings_key = tuple(sorted(settings.items()))
+    stored = results.setdefault('spectra', {})
+    if settings_key in stored:
+        return stored[settings_key]
+    
+    cache_key = (results['analysis_key'], results.get('reference_axis'), settings_key) \
+        if results.get('analysis_key') is not None else None
+    spectra = _SPECTRUM_CACHE.get(cache_key) if cache_key else None
+    if spectra is None:
+        spectra = spectral_analysis(results['data'], **settings)
+        if cache_key:
+            _SPECTRUM_CACHE.put(cache_key, spectra)
+    stored.clear()
+    stored[settings_key] = spectra
+    return spectra
+
+def display_psd_chart(spectra):
+    """물리량별 PSD (로그 축) 와 주요 피크 주파수"""
+    frequencies = spectra['frequencies']
+    columns = spectra['columns']
+    fig = make_subplots(rows=len(columns), cols=1, shared_xaxes=True, vertical_spacing=0.08,
+                        subplot_titles=[f"{SPECTRAL_QUANTITIES[c]} PSD" for c in columns])
+    peaks = []
+    for k, column in enumerate(columns):
+        psd = spectra['psd'][k]
+        fig.add_trace(go.Scatter(x=frequencies[1:], y=psd[1:], mode='lines', name=SPECTRAL_QUANTITIES[column]),
+                      row=k + 1, col=1)
+        peak_f, peak_p = dominant_peaks(frequencies, psd, count=5)
+        fig.add_trace(go.Scatter(x=peak_f, y=peak_p, mode='markers', marker=dict(size=8, symbol='x'),
+                                 name=f"{SPECTRAL_QUANTITIES[column]} 피크", showlegend=False), row=k + 1, col=1)
+        fig.update_yaxes(type='log', row=k + 1, col=1)
+        peaks.extend({'물리량': SPECTRAL_QUANTITIES[column], '주파수 (Hz)': f, 'PSD': p} for f, p in zip(peak_f, peak_p))
+    fig.update_xaxes(title_text="주파수 (Hz)", row=len(columns), col=1)
+    fig.update_layout(height=300 * len(columns), hovermode='x unified')
+    st.plotly_chart(fig, use_container_width=True)
+    
+    if peaks:
+        with st.expander("📌 주요 피크 주파수"):
+            st.dataframe(pd.DataFrame(peaks), use_container_width=True, hide_index=True)
+
+def display_spectrogram(times, frequencies, power, label):
+    """스펙트로그램 (dB, 주파수 방향 최대값 풀링 후 PNG 이미지로 전송)"""
+    db = 10 * np.log10(np.maximum(power, 1e-300))
+    db, factor = pooled_rows(db, MAX_SPECTROGRAM_ROWS)
+    finite = db[np.isfinite(db)]
+    low, high = np.percentile(finite, [5, 99.9]) if len(finite) else (0.0, 1.0)
+    levels = (np.clip((db - low) / max(high - low, 1e-12), 0, 1) * 255).astype(np.uint8)
+    
+    palette = np.array([plotly_colors.unlabel_rgb(color)
+                        for color in plotly_colors.sample_colorscale('Viridis', np.linspace(0, 1, 256))])
+    image = palette[levels].astype(np.uint8)
+    fig = px.imshow(image, x=times, y=frequencies[::factor][:len(db)], origin='lower', aspect='auto',
+                    binary_string=True, labels=dict(x="시간 (초)", y="주파수 (Hz)"))
+    fig.update_layout(title=f"{label} 스펙트로그램 ({low:.1f} ~ {high:.1f} dB)", height=350)
+    st.plotly_chart(fig, use_container_width=True)
+
+def downsample_frame(df, columns, max_points=DEFAULT_MAX_POINTS, method='minmax'):
+    """컬럼별 다운샘플링 결과 {컬럼: (시간, 값)} 와 표시 점 수 합계"""
+    time = df['Time_sec'].to_numpy()
+    series = {}
+    for column in columns:
+        values = df[column].to_numpy()
+        index = METHODS[method](time, values, max_points)
+        series[column] = (time[index], values[index])
+    return series, sum(len(x) for x, _ in series.values())
+
+def display_downsampling_note(shown, total):
+    """다운샘플링으로 생략된 점 수 표시"""
+    if shown < total:
+        st.caption(f"🔎 표시 {shown:,} 점 / 구간 {total:,} 점 ({total - shown:,} 점 생략, 구간 내 최소/최대 보존). "
+                   "시간 구간을 좁히면 원본 해상도로 다시 계산합니다.")
+
+def display_combined_visualization(df, max_points=DEFAULT_MAX_POINTS, method='minmax'):
     """통합 시각화"""
     st.subheader("📊 통합 시각화")
     
+    columns = ['Velocity_m/s', 'Acceleration_m/s2', 'Distance_m', 'Jerk_m/s3']
+    series, shown = downsample_frame(df, columns, max_points, method)
+    
     # 서브플롯 생성
     fig = make_subplots(
         rows=4, cols=1,
@@ -503,28 +1414,28 @@ def display_combined_visualization(df):
     
     # 속도
     fig.add_trace(
-        go.Scatter(x=df['Time_sec'], y=df['Velocity_m/s'], 
+        go.Scatter(x=series['Velocity_m/s'][0], y=series['Velocity_m/s'][1], 
                   name='속도', line=dict(color='blue')),
         row=1, col=1
     )
     
     # 가속도
     fig.add_trace(
-        go.Scatter(x=df['Time_sec'], y=df['Acceleration_m/s2'], 
+        go.Scatter(x=series['Acceleration_m/s2'][0], y=series['Acceleration_m/s2'][1], 
                   name='가속도', line=dict(color='red')),
         row=2, col=1
     )
     
     # 이동거리
     fig.add_trace(
-        go.Scatter(x=df['Time_sec'], y=df['Distance_m'], 
+        go.Scatter(x=series['Distance_m'][0], y=series['Distance_m'][1], 
                   name='이동거리', line=dict(color='green')),
         row=3, col=1
     )
     
     # 저크
     fig.add_trace(
-        go.Scatter(x=df['Time_sec'], y=df['Jerk_m/s3'], 
+        go.Scatter(x=series['Jerk_m/s3'][0], y=series['Jerk_m/s3'][1], 
                   name='저크', line=dict(color='orange')),
         row=4, col=1
     )
@@ -538,56 +1449,71 @@ def display_combined_visualization(df):
     fig.update_xaxes(title_text="시간 (초)", row=4, col=1)
     
     st.plotly_chart(fig, use_container_width=True)
+    display_downsampling_note(shown, len(df) * len(columns))
 
-def display_individual_visualizations(df):
+def display_individual_visualizations(df, max_points=DEFAULT_MAX_POINTS, method='minmax'):
     """개별 시각화"""
     st.subheader("📈 개별 분석 차트")
     
+    series, _ = downsample_frame(df, ['Velocity_m/s', 'Acceleration_m/s2'], max_points, method)
+    
     # 속도-시간 그래프
-    fig_velocity = px.line(df, x='Time_sec', y='Velocity_m/s', 
+    time, velocity = series['Velocity_m/s']
+    fig_velocity = px.line(x=time, y=velocity, 
                           title='속도-시간 그래프',
-                          labels={'Time_sec': '시간 (초)', 'Velocity_m/s': '속도 (m/s)'})
+                          labels={'x': '시간 (초)', 'y': '속도 (m/s)'})
     fig_velocity.update_traces(line=dict(color='blue', width=2))
     st.plotly_chart(fig_velocity, use_container_width=True)
+    display_downsampling_note(len(time), len(df))
     
     # 가속도-시간 그래프
-    fig_acceleration = px.line(df, x='Time_sec', y='Acceleration_m/s2',
+    time, acceleration = series['Acceleration_m/s2']
+    fig_acceleration = px.line(x=time, y=acceleration,
                               title='가속도-시간 그래프',
-                              labels={'Time_sec': '시간 (초)', 'Acceleration_m/s2': '가속도 (m/s²)'})
+                              labels={'x': '시간 (초)', 'y': '가속도 (m/s²)'})
     fig_acceleration.update_traces(line=dict(color='red', width=2))
     
     # 0선 추가
     fig_acceleration.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5)
     st.plotly_chart(fig_acceleration, use_container_width=True)
-    
-    # 속도-가속도 상관관계
-    fig_correlation = px.scatter(df, x='Velocity_m/s', y='Acceleration_m/s2',
+    display_downsampling_note(len(time), len(df))
+    
+    # 속도-가속도 상관관계 (속도/가속도 극값의 합집합)
+    index = downsample_indices(df['Time_sec'].to_numpy(),
+                               [df['Velocity_m/s'].to_numpy(), df['Acceleration_m/s2'].to_numpy()],
+                               max_points, method)
+    sample = df.iloc[index]
+    fig_correlation = px.scatter(sample, x='Velocity_m/s', y='Acceleration_m/s2',
                                 title='속도-가속도 상관관계',
                                 labels={'Velocity_m/s': '속도 (m/s)', 'Acceleration_m/s2': '가속도 (m/s²)'},
                                 color='Time_sec',
                                 color_continuous_scale='viridis')
     st.plotly_chart(fig_correlation, use_container_width=True)
+    display_downsampling_note(len(sample), len(df))
 
-def display_3d_visualization(df):
+def display_3d_visualization(df, max_points=DEFAULT_MAX_POINTS, method='minmax'):
     """3D 시각화"""
     st.subheader("🌐 3D 궤적 시각화")
     
+    index = downsample_indices(df['Time_sec'].to_numpy(),
+                               [df['Velocity_m/s'].to_numpy(), df['Acceleration_m/s2'].to_numpy()],
+                               max_points, method)
+    sample = df.iloc[index]
+    
     fig_3d = go.Figure(data=[go.Scatter3d(
-        x=df['Time_sec'],
-        y=df['Velocity_m/s'],
-        z=df['Acceleration_m/s2'],
+        x=sample['Time_sec'],
+        y=sample['Velocity_m/s'],
+        z=sample['Acceleration_m/s2'],
         mode='markers+lines',
         marker=dict(
             size=4,
-            color=df['Distance_m'],
+            color=sample['Distance_m'],
             colorscale='viridis',
             colorbar=dict(title="이동거리 (m)"),
             showscale=True
         ),
         line=dict(color='blue', width=2),
-        text=[f"시간: {t:.2f}s<br>속도: {v:.2f}m/s<br>가속도: {a:.2f}m/s²" 
-              for t, v, a in zip(df['Time_sec'], df['Velocity_m/s'], df['Acceleration_m/s2'])],
-        hovertemplate='%{text}<extra></extra>',
+        hovertemplate='시간: %{x:.2f}s<br>속도: %{y:.2f}m/s<br>가속도: %{z:.2f}m/s²<extra></extra>',
         name='운동 궤적'
     )])
     
@@ -603,22 +1529,80 @@ def display_3d_visualization(df):
     )
     
     st.plotly_chart(fig_3d, use_container_width=True)
+    display_downsampling_note(len(sample), len(df))
+
+def display_axis_comparison(multi_axis, viz_options):
+    """축 간 비교 (축별 파형 겹쳐 보기, 피크/RMS 비교, 가속도 상관)"""
+    st.subheader("🤖 축 간 비교")
+    kinematics, axes, table = multi_axis['kinematics'], multi_axis['axes'], multi_axis['table']
+    
+    quantity = st.selectbox("비교 항목:", options=list(AXIS_QUANTITIES), format_func=AXIS_QUANTITIES.get,
+                            key="speed_axis_quantity")
+    
+    # 축별 파형 (선택 시간 구간, 축마다 다운샘플링)
+    window = window_slice(kinematics['time'], *viz_options['time_range'])
+    time_values = kinematics['time'][window]
+    values = kinematics[quantity][window]
+    select = METHODS[viz_options['method']]
+    fig = go.Figure()
+    shown = 0
+    for k, axis in enumerate(axes):
+        index = select(time_values, values[:, k], viz_options['max_points'])
+        fig.add_trace(go.Scatter(x=time_values[index], y=values[index, k], name=str(axis), mode='lines'))
+        shown += len(index)
+    fig.update_layout(title=f"축별 {AXIS_QUANTITIES[quantity]}", xaxis_title="시간 (초)",
+                      yaxis_title=AXIS_QUANTITIES[quantity], height=450)
+    st.plotly_chart(fig, use_container_width=True)
+    display_downsampling_note(shown, len(time_values) * len(axes))
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # 축별 피크 가속도 / RMS 저크
+        peaks = pd.DataFrame({
+            '축': [str(axis) for axis in axes],
+            '피크 가속도 (m/s²)': np.maximum(table['max_acceleration'], -table['min_acceleration']).to_numpy(),
+            'RMS 저크 (m/s³)': table['rms_jerk'].to_numpy()
+        })
+        fig_peaks = make_subplots(rows=2, cols=1, subplot_titles=('피크 가속도 (m/s²)', 'RMS 저크 (m/s³)'),
+                                  vertical_spacing=0.15)
+        fig_peaks.add_trace(go.Bar(x=peaks['축'], y=peaks['피크 가속도 (m/s²)'], marker_color='red'), row=1, col=1)
+        fig_peaks.add_trace(go.Bar(x=peaks['축'], y=peaks['RMS 저크 (m/s³)'], marker_color='orange'), row=2, col=1)
+        fig_peaks.update_layout(title="축별 피크 가속도 / RMS 저크", showlegend=False, height=450)
+        st.plotly_chart(fig_peaks, use_container_width=True)
+    
+    with col2:
+        # 축 간 가속도 상관 계수
+        if len(axes) > 1:
+            correlation = np.corrcoef(kinematics['acceleration'], rowvar=False)
+            fig_corr = px.imshow(correlation, x=[str(a) for a in axes], y=[str(a) for a in axes],
+                                 zmin=-1, zmax=1, color_continuous_scale='RdBu_r', text_auto='.2f',
+                                 title="축 간 가속도 상관 계수")
+            fig_corr.update_layout(height=450)
+            st.plotly_chart(fig_corr, use_container_width=True)
 
 def display_report_section():
     """분석 리포트 섹션"""
     st.header("📋 분석 리포트")
     
     if st.session_state.analysis_results is None:
+        if st.session_state.get('run_comparison'):
+            info_message("다중 주행 비교 결과는 '분석 설정' 탭에서 지표 행렬 CSV 로 내려받을 수 있습니다.")
+            return
         info_message("먼저 '데이터 입력' 탭에서 데이터를 업로드하세요.")
         return
     
     results = st.session_state.analysis_results
     
+    if 'sample_count' in results:
+        info_message(f"스트리밍 분석 결과입니다. 통계는 전체 {results['sample_count']:,} 개 샘플 기준이며, "
+                     f"내보내기 데이터는 {results['preview_stride']} 샘플 간격 표본입니다.")
+    
     # 종합 분석 리포트
     display_comprehensive_report(results)
     
     # 데이터 내보내기
-    display_export_options(results['data'])
+    display_export_options(results)
 
 def display_comprehensive_report(results):
     """종합 분석 리포트"""
@@ -725,63 +1709,64 @@ def generate_recommendations(stats):
     
     return recommendations
 
-def display_export_options(df):
-    """데이터 내보내기 옵션"""
+def display_export_options(results):
+    """데이터 내보내기 옵션 (파일은 요청한 형식만 만들고 분석 식별자별로 캐시)"""
     st.subheader("📥 데이터 내보내기")
     
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        # Excel 내보내기
-        excel_buffer = create_excel_export(df)
-        st.download_button(
-            label="📊 Excel로 내보내기",
-            data=excel_buffer,
-            file_name='speed_analysis_results.xlsx',
-            mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            help="분석 결과를 Excel 파일로 다운로드합니다."
-        )
-    
-    with col2:
-        # CSV 내보내기
-        csv_data = df.to_csv(index=False).encode('utf-8')
-        st.download_button(
-            label="📄 CSV로 내보내기",
-            data=csv_data,
-            file_name='speed_analysis_results.csv',
-            mime='text/csv',
-            help="분석 결과를 CSV 파일로 다운로드합니다."
-        )
+    df = results['data']
+    key = export_key(results)
+    if len(df) > EXCEL_MAX_ROWS:
+        info_message(f"Excel 은 시트당 {EXCEL_MAX_ROWS:,} 행까지 기록되어 여러 시트로 나뉩니다. "
+                     "대용량 데이터는 Parquet 또는 gzip CSV 를 권장합니다.")
+    
+    formats = available_formats()
+    for column, fmt in zip(st.columns(len(formats)), formats):
+        spec = EXPORT_FORMATS[fmt]
+        with column:
+            payload = _EXPORT_CACHE.get((key, fmt))
+            if payload is None and st.button(f"{spec['label']} 파일 만들기", key=f"speed_export_{fmt}",
+                                             use_container_width=True):
+                payload = build_export(df, key, fmt)
+            if payload is not None:
+                st.download_button(
+                    label=f"{spec['label']} 다운로드 ({payload_size(payload)})",
+                    data=payload,
+                    file_name=spec['file_name'],
+                    mime=spec['mime'],
+                    key=f"speed_download_{fmt}",
+                    use_container_width=True
+                )
 
-def create_excel_export(df):
-    """Excel 내보내기 파일 생성"""
-    buffer = BytesIO()
-    with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
-        df.to_excel(writer, sheet_name='Analysis Results', index=False)
-        
-        # 워크시트 서식 지정
-        workbook = writer.book
-        worksheet = writer.sheets['Analysis Results']
-        
-        # 헤더 서식
-        header_format = workbook.add_format({
-            'bold': True,
-            'text_wrap': True,
-            'valign': 'top',
-            'fg_color': '#4472C4',
-            'font_color': 'white',
-            'border': 1
-        })
-        
-        # 헤더 적용
-        for col_num, value in enumerate(df.columns.values):
-            worksheet.write(0, col_num, value, header_format)
-        
-        # 열 너비 조정
-        worksheet.set_column('A:E', 15)
-    
-    buffer.seek(0)
-    return buffer
+def export_key(results):
+    """내보내기 캐시 키 (분석 식별자가 없으면 데이터 내용 해시)
+
+    분석 식별자에는 파일, 컬럼 지정, 다축 채널 종류(속도/위치), 전처리 옵션이 모두 포함됩니다.
+    """
+    if results.get('analysis_key') is not None:
+        return results['analysis_key'], results.get('reference_axis')
+    df = results['data']
+    values = np.ascontiguousarray(df.to_numpy(dtype=float))
+    return 'digest', tuple(df.columns), content_digest(values)
+
+def build_export(df, key, fmt):
+    """내보내기 파일 생성 후 캐시 (실패 시 None)"""
+    try:
+        with st.spinner(f"{EXPORT_FORMATS[fmt]['label']} 파일 생성 중... ({len(df):,} 행)"):
+            payload = export_bytes(df, fmt)
+    except Exception as e:
+        error_handler(f"내보내기 파일 생성 중 오류가 발생했습니다: {str(e)}")
+        return None
+    _EXPORT_CACHE.put((key, fmt), payload)
+    return payload
+
+def payload_size(payload):
+    """파일 크기 표시 문자열"""
+    size = len(payload)
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
 
 def display_data_format_guide():
     """데이터 형식 가이드"""
@@ -790,7 +1775,7 @@ def display_data_format_guide():
     st.markdown("""
     **필요한 데이터 형식:**
     
-    엑셀 파일에는 다음 컬럼이 포함되어야 합니다:
+    엑셀/CSV/Parquet 파일에는 다음 컬럼이 포함되어야 합니다 (이름이 다르면 '컬럼 지정'에서 선택):
     
     | 컬럼명 | 설명 | 단위 | 예시 |
     |--------|------|------|------|
@@ -801,6 +1786,17 @@ def display_data_format_guide():
     - 시간 데이터는 오름차순으로 정렬되어야 합니다.
     - 가속도, 이동거리, 저크는 자동으로 계산됩니다.
     - 최소 10개 이상의 데이터 포인트를 권장합니다.
+    - NumPy(.npy)와 원시 float 배열(.bin/.raw/.f32/.f64)은 열 번호(col_0, col_1, …)로 지정하며, 로컬 경로는 메모리 매핑으로 읽습니다.
+    - 시간 컬럼이 없는 로그는 샘플링 주파수(Hz)로 시간을 생성합니다.
+    - 여러 축 채널(속도 또는 위치)이 있는 로그는 '다축 분석'을 선택하면 모든 축을 한 번에 분석합니다.
+    - 노이즈가 큰 로그는 Savitzky-Golay 스무딩(가속도/저크를 해석적 미분으로 계산) 또는 영위상 Butterworth 를 선택하세요. Savitzky-Golay 는 등간격 샘플링을 가정합니다.
+    - '분석 설정' 탭의 운동 구간표에서 구간을 선택하면 시각화 차트가 해당 구간으로 이동합니다.
+    - '시각화' 탭의 주파수 분석은 가속도/저크를 등간격으로 재표본화하여 Welch PSD 와 스펙트로그램을 표시합니다.
+    - '분석 리포트' 탭의 내보내기 파일은 형식을 선택했을 때만 만들어지며, 대용량 결과는 Parquet 또는 gzip CSV 가 빠릅니다.
+    - 같은 동작을 여러 번 기록한 로그는 '다중 주행 비교' 모드에서 운동 시작 시점으로 정렬하여 겹쳐 보고 피크 가속도/RMS 저크/정착 시간을 비교합니다.
+    - 기본 통계의 P50/P95/P99 백분위수는 스트리밍/실시간 모드에서 분위수 스케치로 근사하여 로그 길이와 무관한 메모리로 계산합니다.
+    - 대용량 로그는 '스트리밍' 모드에서 청크 단위로 분석할 수 있습니다.
+    - 시험 중 기록되는 CSV/원시 바이너리 로그는 '실시간' 모드에서 추가된 부분만 읽어 결과를 갱신합니다.
     """)
 
 def create_template_download():
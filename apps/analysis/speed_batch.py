@@ -0,0 +1,281 @@
+"""
+다중 주행 비교
+같은 동작을 반복 기록한 여러 속도 로그를 프로세스 풀에서 병렬로 분석하고,
+운동 시작 시점으로 정렬한 공통 시간축에 재표본화하여 회차별로 겹쳐 비교합니다.
+"""
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from apps.analysis.downsampling import downsample_indices
+from apps.analysis.filters import derivative_filter
+from apps.analysis.linearity_batch import natural_key
+from apps.analysis.quantiles import frame_sketches, merge_sketches, percentile_table, sketch_info
+from apps.analysis.speed_engine import (
+    TIME_COLUMN, VELOCITY_COLUMN, compute_kinematics, mean_spacing, preprocess_speed_data
+)
+from apps.analysis.speed_io import SPEED_FORMATS, load_speed_log
+
+RUN_SUFFIXES = tuple(SPEED_FORMATS)
+CURVE_COLUMNS = (VELOCITY_COLUMN, 'Acceleration_m/s2', 'Jerk_m/s3')
+
+# 운동 시작: 첫 샘플 대비 속도 변화가 최대 변화량의 이 비율을 처음 넘는 시각
+DEFAULT_START_FRACTION = 0.05
+# 정착: 최종 속도와의 차이가 최대 편차의 이 비율 이내로 들어와 유지되기 시작하는 시각
+DEFAULT_SETTLE_FRACTION = 0.02
+# 최종 속도(정착 목표값)를 구할 마지막 구간 비율 (중앙값 사용)
+SETTLE_TAIL_FRACTION = 0.01
+# 회차별/공통 시간축 최대 점 수 (지표는 원본 해상도로 계산하고 겹쳐 그리기용 곡선만 줄임)
+MAX_RUN_POINTS = 4_000
+
+RUN_METRICS = {
+    'peak_acceleration': '피크 가속도 (m/s²)',
+    'peak_deceleration': '피크 감속도 (m/s²)',
+    'rms_jerk': 'RMS 저크 (m/s³)',
+    'settling_time': '정착 시간 (초)',
+    'max_velocity': '최대 속도 (m/s)',
+    'motion_start': '운동 시작 시각 (초)'
+}
+
+
+def expand_run_inputs(files):
+    """(이름, 바이트) 목록에서 ZIP 파일을 속도 로그 항목으로 펼치기"""
+    inputs = []
+    for name, payload in files:
+        if name.lower().endswith('.zip'):
+            with zipfile.ZipFile(BytesIO(payload)) as archive:
+                members = [m for m in archive.namelist()
+                           if m.lower().endswith(RUN_SUFFIXES) and not m.startswith('__MACOSX')]
+                for member in sorted(members, key=natural_key):
+                    inputs.append((member, archive.read(member)))
+        elif name.lower().endswith(RUN_SUFFIXES):
+            inputs.append((name, payload))
+    return inputs
+
+
+def open_run(name, payload):
+    """파일 바이트는 이름을 가진 버퍼로 (형식 판별용), 경로는 그대로"""
+    if not isinstance(payload, bytes):
+        return payload
+    buffer = BytesIO(payload)
+    buffer.name = name
+    return buffer
+
+
+def crossing_time(time, values, threshold):
+    """values 가 threshold 를 처음 넘는 시각 (인접 샘플 선형 보간, 넘지 않으면 None)"""
+    above = np.flatnonzero(values > threshold)
+    if len(above) == 0:
+        return None
+    k = above[0]
+    if k == 0:
+        return float(time[0])
+    fraction = (threshold - values[k - 1]) / (values[k] - values[k - 1])
+    return float(time[k - 1] + fraction * (time[k] - time[k - 1]))
+
+
+def motion_start(time, velocity, fraction=DEFAULT_START_FRACTION):
+    """운동 시작 시각 (첫 샘플 대비 속도 변화가 최대 변화량 x fraction 을 넘는 시각, 샘플 사이 보간)"""
+    excursion = np.abs(np.asarray(velocity, dtype=float) - velocity[0])
+    peak = excursion.max() if len(excursion) else 0.0
+    if peak <= 0:
+        return float(time[0])
+    return crossing_time(time, excursion, fraction * peak)
+
+
+def settling_time(time, velocity, start_time, fraction=DEFAULT_SETTLE_FRACTION):
+    """운동 시작부터 최종 속도의 허용 범위(최대 편차 x fraction) 안에 머물기 시작할 때까지의 시간
+
+    최종 속도는 마지막 SETTLE_TAIL_FRACTION 구간의 중앙값이며, 끝까지 범위를 벗어나면 NaN 입니다.
+    """
+    velocity = np.asarray(velocity, dtype=float)
+    tail = max(1, int(len(velocity) * SETTLE_TAIL_FRACTION))
+    deviation = np.abs(velocity - np.median(velocity[-tail:]))
+    outside = np.flatnonzero(deviation > fraction * deviation.max())
+    if len(outside) == 0:
+        return 0.0
+    if outside[-1] + 1 >= len(velocity):
+        return float('nan')
+    return max(float(time[outside[-1] + 1]) - start_time, 0.0)
+
+
+def run_metrics(frame, start_time, settle_fraction=DEFAULT_SETTLE_FRACTION):
+    """회차 비교 지표 (RUN_METRICS 키)"""
+    time = frame[TIME_COLUMN].to_numpy()
+    velocity = frame[VELOCITY_COLUMN].to_numpy()
+    acceleration = frame['Acceleration_m/s2'].to_numpy()
+    jerk = frame['Jerk_m/s3'].to_numpy()
+    return {
+        'peak_acceleration': float(acceleration.max()),
+        'peak_deceleration': float(acceleration.min()),
+        'rms_jerk': float(np.sqrt(np.mean(jerk * jerk))),
+        'settling_time': settling_time(time, velocity, start_time, settle_fraction),
+        'max_velocity': float(velocity.max()),
+        'motion_start': float(start_time)
+    }
+
+
+def interpolate_rows(time, values, grid):
+    """(샘플, 채널) 값을 grid 시각으로 선형 보간 (모든 채널을 한 번에, 시간 범위 밖은 NaN)
+
+    searchsorted 한 번으로 구한 구간 번호와 가중치를 모든 채널에 같이 적용합니다.
+    """
+    time = np.asarray(time, dtype=float)
+    values = np.asarray(values, dtype=float).reshape(len(time), -1)
+    grid = np.asarray(grid, dtype=float)
+    if len(time) < 2:
+        return np.full((len(grid), values.shape[1]), np.nan)
+
+    right = np.clip(np.searchsorted(time, grid, side='right'), 1, len(time) - 1)
+    left = right - 1
+    span = time[right] - time[left]
+    weight = np.divide(grid - time[left], span, out=np.zeros_like(grid), where=span > 0)
+    out = values[left] + weight[:, None] * (values[right] - values[left])
+    out[(grid < time[0]) | (grid > time[-1])] = np.nan
+    return out
+
+
+def peak_residuals(time, values):
+    """샘플별로 양옆 샘플을 잇는 직선에서 벗어난 정도 (부드러운 구간은 0에 가깝고 스파이크는 그 높이, 양 끝은 0)"""
+    residual = np.zeros_like(values)
+    if len(time) < 3:
+        return residual
+    span = time[2:] - time[:-2]
+    weight = np.divide(time[1:-1] - time[:-2], span, out=np.zeros_like(span), where=span > 0)[:, None]
+    residual[1:-1] = values[1:-1] - (values[:-2] + weight * (values[2:] - values[:-2]))
+    return residual
+
+
+def peak_rows(time, values, grid):
+    """등간격 grid 로 재표본화하되 격자 점 사이에 있던 피크 샘플을 보존
+
+    기본값은 선형 보간이고, 격자 점 중심 한 간격 안의 샘플이 양옆 샘플보다 튀어나온 정도가
+    그 샘플과 보간값 차이의 절반보다 크면(보간이 피크를 깎는 경우) 채널별로 가장 크게 튀어나온 샘플 값을 씁니다.
+    완만한 구간은 보간값을 유지하므로 격자 점으로 옮기는 시각 오차(최대 반 간격)는 피크에만 생깁니다.
+    """
+    time = np.asarray(time, dtype=float)
+    values = np.asarray(values, dtype=float).reshape(len(time), -1)
+    out = interpolate_rows(time, values, grid)
+    if len(grid) < 2 or len(time) < 3:
+        return out
+
+    bucket = np.clip(np.rint((time - grid[0]) / (grid[1] - grid[0])), -1, len(grid)).astype(np.int64)
+    inside = (bucket >= 0) & (bucket < len(grid))
+    # 회차 기록 범위 밖 격자 점(NaN)은 그대로 둠
+    inside[inside] = ~np.isnan(out[bucket[inside]]).all(axis=1)
+    residual = np.abs(peak_residuals(time, values))[inside]
+    bucket, samples = bucket[inside], values[inside]
+    clipped = 2 * residual > np.abs(samples - out[bucket])
+    for k in range(values.shape[1]):
+        # 구간별로 가장 크게 튀어나온 피크 샘플 (구간 번호, 편차 순 정렬의 각 구간 마지막 원소)
+        peaks = np.flatnonzero(clipped[:, k])
+        order = peaks[np.lexsort((residual[peaks, k], bucket[peaks]))]
+        last = order[np.diff(np.append(bucket[order], -1)) != 0]
+        out[bucket[last], k] = samples[last, k]
+    return out
+
+
+def aligned_grid(start, stop, step, origin=0.0):
+    """origin 기준 step 배수 시각 중 [start, stop] 구간 (정렬 기준 시각이 항상 격자 점)"""
+    first = int(np.ceil((start - origin) / step - 1e-9))
+    last = int(np.floor((stop - origin) / step + 1e-9))
+    return origin + np.arange(first, max(last + 1, first)) * step
+
+
+def analyze_run(name, payload, mapping=None, fill_strategy="해당 행 제거", smoothing=None, align=True,
+                start_fraction=DEFAULT_START_FRACTION, settle_fraction=DEFAULT_SETTLE_FRACTION,
+                max_points=MAX_RUN_POINTS):
+    """단일 회차 분석 (프로세스 풀 작업 단위)
+
+    일반 모드와 같은 전처리/운동학 계산 후 지표와 분위수 스케치는 원본 해상도로 구하고,
+    전송량을 줄이기 위해 운동 시작 시각 기준 상대 시간축의 곡선만 반환합니다.
+    곡선은 최소/최대 다운샘플링(약 max_points 점)으로 줄여 피크 샘플을 그대로 남깁니다.
+    """
+    try:
+        data = load_speed_log(open_run(name, payload), **(mapping or {}))
+        data = preprocess_speed_data(data, fill_strategy, smoothing)
+        if len(data) < 2:
+            raise ValueError("분석할 데이터가 2개 미만입니다.")
+        frame = compute_kinematics(data[TIME_COLUMN].to_numpy(), data[VELOCITY_COLUMN].to_numpy(),
+                                   savgol=derivative_filter(smoothing))
+        time = frame[TIME_COLUMN].to_numpy()
+        start = motion_start(time, frame[VELOCITY_COLUMN].to_numpy(), start_fraction) if align else time[0]
+
+        curves = frame[list(CURVE_COLUMNS)].to_numpy()
+        keep = downsample_indices(time, curves.T, max_points)
+        return {
+            'run': name,
+            'samples': len(frame),
+            'metrics': run_metrics(frame, start, settle_fraction),
+            'time': time[keep] - start,
+            'curves': curves[keep],
+            'step': max(mean_spacing(time), (time[-1] - time[0]) / max_points),
+            'sketches': frame_sketches(frame),
+            'error': None
+        }
+    except Exception as e:
+        return {'run': name, 'samples': 0, 'metrics': None, 'error': str(e)}
+
+
+def _analyze_item(args):
+    return analyze_run(*args)
+
+
+def common_time_base(runs, max_points=MAX_RUN_POINTS):
+    """회차 곡선을 하나의 상대 시간축으로 재표본화 (격자 구간마다 극값 샘플 보존, peak_rows)
+
+    격자 간격은 가장 성긴 회차 간격(점 수가 max_points 를 넘으면 배수로 늘림)이고 격자는 0(운동 시작)을 지납니다.
+    반환 곡선: (물리량, 회차, 시각) 배열이며 회차 기록 범위 밖은 NaN 입니다.
+    """
+    step = max(run['step'] for run in runs)
+    lo = min(run['time'][0] for run in runs)
+    hi = max(run['time'][-1] for run in runs)
+    step *= max(1, int(np.ceil((hi - lo) / step / max_points)))
+    grid = aligned_grid(lo, hi, step)
+    curves = np.stack([peak_rows(run['time'], run['curves'], grid) for run in runs])
+    return grid, np.moveaxis(curves, -1, 0)
+
+
+def run_comparison(inputs, mapping=None, fill_strategy="해당 행 제거", smoothing=None, align=True,
+                   start_fraction=DEFAULT_START_FRACTION, settle_fraction=DEFAULT_SETTLE_FRACTION,
+                   max_workers=None, max_points=MAX_RUN_POINTS):
+    """여러 회차를 프로세스 풀에서 병렬 분석하고 공통 시간축 곡선/지표 행렬 생성 (입력 순서 유지)
+
+    반환: {'runs': 회차별 결과, 'time': 공통 상대 시간축, 'curves': {컬럼: (회차, 시각) 배열},
+           'names': 성공한 회차 이름, 'matrix': 회차 x 지표 DataFrame,
+           'percentiles': 회차별 스케치를 병합한 전체 회차 백분위수}
+    """
+    tasks = [(name, payload, mapping, fill_strategy, smoothing, align, start_fraction, settle_fraction, max_points)
+             for name, payload in inputs]
+    if not tasks:
+        return None
+
+    workers = min(max_workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        runs = [_analyze_item(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            runs = list(executor.map(_analyze_item, tasks))
+
+    valid = [run for run in runs if run['error'] is None and len(run['time'])]
+    comparison = {'runs': runs, 'names': [run['run'] for run in valid], 'matrix': comparison_matrix(valid)}
+    if valid:
+        grid, curves = common_time_base(valid, max_points)
+        comparison['time'] = grid
+        comparison['curves'] = dict(zip(CURVE_COLUMNS, curves))
+        # 회차별 스케치를 병합한 전체 회차 백분위수
+        merged = merge_sketches([run['sketches'] for run in valid])
+        comparison['percentiles'] = percentile_table(merged)
+        comparison['sketch'] = sketch_info(merged)
+    return comparison
+
+
+def comparison_matrix(runs):
+    """회차(행) x 지표(열) DataFrame (RUN_METRICS 순서)"""
+    rows = [run['metrics'] for run in runs if run['error'] is None]
+    index = pd.Index([run['run'] for run in runs if run['error'] is None], name='run')
+    return pd.DataFrame(rows, index=index, columns=list(RUN_METRICS))
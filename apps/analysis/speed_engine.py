@@ -0,0 +1,543 @@
+"""
+속도/가속도 운동학 수치 엔진
+시간-속도 데이터의 가속도, 이동거리, 저크를 벡터화 연산과 청크 스트리밍으로 계산합니다.
+"""
+import numpy as np
+import pandas as pd
+
+from apps.analysis.filters import iter_filtered, make_smoother, sample_rate_of
+from apps.analysis.quantiles import PERCENTILE_COLUMNS, PERCENTILES, QuantileSketch, percentile_table, sketch_info
+
+TIME_COLUMN = 'Time_sec'
+VELOCITY_COLUMN = 'Velocity_m/s'
+RESULT_COLUMNS = ['Time_sec', 'Velocity_m/s', 'Acceleration_m/s2', 'Distance_m', 'Jerk_m/s3']
+
+DEFAULT_CHUNKSIZE = 1_000_000
+DEFAULT_PREVIEW_SIZE = 200_000
+
+# 가속/감속 판정 기준 (m/s²) 과 0-60km/h 목표 속도 (m/s)
+ACC_THRESHOLD = 0.1
+TARGET_SPEED = 16.67
+
+# 저크(i) 는 속도 v[i-2 .. i+2] 에 의존하므로 청크 경계 앞뒤로 2개 샘플을 겹쳐 계산
+HALO = 2
+
+
+def preprocess_speed_data(data, fill_strategy, smoothing=None, value_columns=(VELOCITY_COLUMN,)):
+    """속도 데이터 전처리 (value_columns: 속도 또는 다축 채널 컬럼)
+
+    fill_strategy 는 누락값 처리 방식("해당 행 제거", "선형 보간", "0으로 대체")이며,
+    이동 평균/Butterworth 스무딩은 여기서 채널 값에 적용하고 Savitzky-Golay 는 미분과 함께
+    운동학 계산 단계(filters.derivative_filter)에서 적용합니다.
+    """
+    value_columns = list(value_columns)
+    columns = [TIME_COLUMN] + value_columns
+
+    # 기본 정렬 (시간 순, 이미 정렬된 로그는 복사하지 않음)
+    if not data[TIME_COLUMN].is_monotonic_increasing:
+        data = data.sort_values(TIME_COLUMN).reset_index(drop=True)
+
+    # 누락값 처리 (누락값이 없으면 건너뜀)
+    if data[columns].isna().to_numpy().any():
+        if fill_strategy == "해당 행 제거":
+            data = data.dropna(subset=columns)
+        elif fill_strategy == "선형 보간":
+            data[value_columns] = data[value_columns].interpolate(method='linear')
+            data = data.dropna(subset=columns)
+        elif fill_strategy == "0으로 대체":
+            data[columns] = data[columns].fillna(0)
+
+    # 데이터 스무딩 (모든 채널을 한 번에)
+    method = (smoothing or {}).get('method', 'none')
+    if method in ('moving_average', 'butterworth') and len(data):
+        sample_rate = sample_rate_of(data[TIME_COLUMN].to_numpy()) if method == 'butterworth' else None
+        smoother = make_smoother(smoothing, sample_rate)
+        data[value_columns] = smoother.apply(data[value_columns].to_numpy())
+
+    return data
+
+
+def cumulative_trapezoid(values, time, initial=0.0):
+    """누적 사다리꼴 적분 (첫 값은 initial, 2D 배열은 축(열)별로 첫 번째 차원을 따라 적분)"""
+    result = np.empty(np.shape(values))
+    if len(values) == 0:
+        return result
+    dt = np.diff(time).reshape((-1,) + (1,) * (result.ndim - 1))
+    result[0] = initial
+    np.cumsum((values[1:] + values[:-1]) * dt / 2, axis=0, out=result[1:])
+    result[1:] += initial
+    return result
+
+
+def mean_spacing(time):
+    """평균 샘플 간격 (Savitzky-Golay 미분의 등간격 가정에 사용)"""
+    return (time[-1] - time[0]) / (len(time) - 1)
+
+
+def compute_kinematics(time, velocity, initial_distance=0.0, savgol=None, delta=None):
+    """가속도(속도 미분), 이동거리(사다리꼴 적분), 저크(가속도 미분) 일괄 계산
+
+    결과는 (n, 5) 배열 하나에 채워 DataFrame 으로 감싸므로 컬럼별 사본을 따로 만들지 않습니다.
+    savgol(filters.SavitzkyGolay) 을 주면 속도는 평활값, 가속도/저크는 적합 다항식의 1/2차 해석적 미분이며
+    delta(샘플 간격, 기본값은 평균 간격)를 미분 척도로 사용합니다.
+    """
+    time = np.asarray(time, dtype=float)
+    velocity = np.asarray(velocity, dtype=float)
+    if len(time) < 2:
+        raise ValueError("가속도 계산에는 최소 2개 이상의 데이터 포인트가 필요합니다.")
+
+    values = np.empty((len(time), len(RESULT_COLUMNS)))
+    values[:, 0] = time
+    if savgol is None:
+        values[:, 1] = velocity
+        values[:, 2] = np.gradient(velocity, time)
+        values[:, 4] = np.gradient(values[:, 2], time)
+    else:
+        delta = mean_spacing(time) if delta is None else delta
+        values[:, 1] = savgol.apply(velocity, 0)
+        values[:, 2] = savgol.apply(velocity, 1, delta)
+        values[:, 4] = savgol.apply(velocity, 2, delta)
+    values[:, 3] = cumulative_trapezoid(values[:, 1], time, initial_distance)
+    return pd.DataFrame(values, columns=RESULT_COLUMNS, copy=False)
+
+
+def compute_axes_kinematics(time, channels, channel_type='velocity', savgol=None):
+    """여러 축 채널 (n, 축) 의 속도/가속도/이동거리/저크 일괄 계산
+
+    channel_type 이 'position' 이면 채널을 위치로 보고 속도는 미분, 이동거리는 시작 위치 대비 변위입니다.
+    모든 축을 한 번의 배열 연산(axis=0)으로 처리합니다. savgol 을 주면 미분은 해석적 미분으로 계산합니다.
+    """
+    time = np.asarray(time, dtype=float)
+    values = np.asarray(channels, dtype=float)
+    if values.ndim == 1:
+        values = values.reshape(-1, 1)
+    if len(time) < 2:
+        raise ValueError("가속도 계산에는 최소 2개 이상의 데이터 포인트가 필요합니다.")
+
+    if savgol is not None:
+        return _savgol_axes_kinematics(time, values, channel_type, savgol)
+    if channel_type == 'position':
+        velocity = np.gradient(values, time, axis=0)
+        distance = values - values[0]
+    else:
+        velocity = values
+        distance = cumulative_trapezoid(values, time)
+    acceleration = np.gradient(velocity, time, axis=0)
+    return {
+        'time': time,
+        'velocity': velocity,
+        'acceleration': acceleration,
+        'distance': distance,
+        'jerk': np.gradient(acceleration, time, axis=0)
+    }
+
+
+def _savgol_axes_kinematics(time, values, channel_type, savgol):
+    """Savitzky-Golay 해석적 미분 기반 다축 운동학 (위치 채널은 1~3차 미분이 속도/가속도/저크)"""
+    delta = mean_spacing(time)
+    order = 1 if channel_type == 'position' else 0
+    smoothed = savgol.apply(values, order, delta)
+    if channel_type == 'position':
+        position = savgol.apply(values, 0)
+        distance = position - position[0]
+    else:
+        distance = cumulative_trapezoid(smoothed, time)
+    return {
+        'time': time,
+        'velocity': smoothed,
+        'acceleration': savgol.apply(values, order + 1, delta),
+        'distance': distance,
+        'jerk': savgol.apply(values, order + 2, delta)
+    }
+
+
+def axis_statistics(kinematics, axes):
+    """축별 통계표 (행: 축, 열: calculate_statistics 의 기본/운동 상태/성능 지표/백분위수 + RMS 저크)"""
+    time = kinematics['time']
+    velocity, acceleration, jerk = kinematics['velocity'], kinematics['acceleration'], kinematics['jerk']
+    dt = np.gradient(time)
+
+    accelerating = acceleration > ACC_THRESHOLD
+    decelerating = acceleration < -ACC_THRESHOLD
+    constant = np.abs(acceleration) <= ACC_THRESHOLD
+    reached = velocity >= TARGET_SPEED
+    mean_velocity = velocity.mean(axis=0)
+
+    table = {
+        'total_time': np.full(velocity.shape[1], time[-1] - time[0]),
+        'total_distance': kinematics['distance'][-1],
+        'max_velocity': velocity.max(axis=0),
+        'min_velocity': velocity.min(axis=0),
+        'avg_velocity': mean_velocity,
+        'max_acceleration': acceleration.max(axis=0),
+        'min_acceleration': acceleration.min(axis=0),
+        'avg_acceleration': acceleration.mean(axis=0),
+        'max_jerk': jerk.max(axis=0),
+        'min_jerk': jerk.min(axis=0),
+        'accelerating_time': dt @ accelerating,
+        'decelerating_time': dt @ decelerating,
+        'constant_speed_time': dt @ constant,
+        'accelerating_ratio': accelerating.mean(axis=0) * 100,
+        'decelerating_ratio': decelerating.mean(axis=0) * 100,
+        'constant_speed_ratio': constant.mean(axis=0) * 100,
+        'zero_to_60kmh_time': np.where(reached.any(axis=0), time[reached.argmax(axis=0)], np.nan),
+        'rms_acceleration': np.sqrt(np.mean(acceleration ** 2, axis=0)),
+        'rms_velocity': np.sqrt(np.mean(velocity ** 2, axis=0)),
+        'rms_jerk': np.sqrt(np.mean(jerk ** 2, axis=0)),
+        'efficiency_ratio': mean_velocity / velocity.max(axis=0) * 100,
+        'velocity_std': velocity.std(axis=0, ddof=1),
+        'acceleration_std': acceleration.std(axis=0, ddof=1)
+    }
+    # 백분위수 열 (velocity_p50 ...): 물리량별로 모든 축/백분위수를 한 번에 계산
+    for name in PERCENTILE_COLUMNS:
+        for p, values in zip(PERCENTILES, np.percentile(kinematics[name], PERCENTILES, axis=0)):
+            table[f"{name}_p{p}"] = values
+    return pd.DataFrame(table, index=pd.Index(list(axes), name='axis'))
+
+
+def axis_frame(kinematics, axis):
+    """축 하나의 운동학 DataFrame (compute_kinematics 와 같은 컬럼)"""
+    values = np.column_stack([kinematics['time']] + [kinematics[key][:, axis] for key in
+                                                     ('velocity', 'acceleration', 'distance', 'jerk')])
+    return pd.DataFrame(values, columns=RESULT_COLUMNS, copy=False)
+
+
+class KinematicsStream:
+    """청크 단위 운동학 계산
+
+    이전 청크의 마지막 샘플(halo 개 미출력 + halo + 1 개 문맥)을 다음 청크 앞에 붙여 계산하므로
+    np.gradient(또는 Savitzky-Golay 창)의 청크 경계 값이 전체 배열로 계산한 값과 정확히 같습니다.
+    이동거리는 직전 출력의 마지막 샘플부터 이어서 적분합니다.
+    메모리는 청크 크기에만 비례하고 전체 처리 시간은 샘플 수에 선형입니다.
+    """
+
+    def __init__(self, savgol=None, delta=None):
+        self.savgol = savgol
+        self.halo = HALO if savgol is None else savgol.halo
+        self.min_samples = 2 if savgol is None else savgol.window
+        self.delta = delta
+        self.time = np.empty(0)
+        self.velocity = np.empty(0)
+        self.last = None
+        self.pending = 0
+        self.count = 0
+
+    def update(self, time, velocity, final=False):
+        """청크 반영 후 값이 확정된 샘플의 운동학 DataFrame 반환 (아직 없으면 빈 DataFrame)"""
+        t = np.concatenate([self.time, np.asarray(time, dtype=float)])
+        v = np.concatenate([self.velocity, np.asarray(velocity, dtype=float)])
+        self.count += len(time)
+
+        if final and len(t) < 2:
+            if self.count:
+                raise ValueError("가속도 계산에는 최소 2개 이상의 데이터 포인트가 필요합니다.")
+            return pd.DataFrame(columns=RESULT_COLUMNS, dtype=float)
+
+        stop = len(t) if final else len(t) - self.halo
+        if stop <= self.pending or (not final and len(t) < self.min_samples):
+            self.time, self.velocity = t, v
+            return pd.DataFrame(columns=RESULT_COLUMNS, dtype=float)
+
+        if self.savgol is not None and self.delta is None:
+            # 전체 간격(delta)을 모르면 청크마다 미분 척도가 달라지지 않도록 첫 계산의 평균 간격으로 고정
+            self.delta = mean_spacing(t)
+        frame = compute_kinematics(t, v, savgol=self.savgol, delta=self.delta)
+        values = frame.to_numpy()[self.pending:stop].copy()
+        if self.last is not None:
+            # 문맥 구간의 평활 속도는 경계 처리 값이므로 이동거리는 직전 출력의 마지막 샘플부터 적분
+            last_time, last_velocity, last_distance = self.last
+            values[:, 3] = cumulative_trapezoid(np.r_[last_velocity, values[:, 1]],
+                                                np.r_[last_time, values[:, 0]], last_distance)[1:]
+        self.last = values[-1, [0, 1, 3]]
+        output = pd.DataFrame(values, columns=RESULT_COLUMNS)
+
+        # 다음 청크 계산에 필요한 문맥 (미출력 샘플 + 그 앞 halo + 1 개, Savitzky-Golay 창 전체 확보)
+        keep = max(stop - self.halo - 1, 0)
+        self.time, self.velocity = t[keep:], v[keep:]
+        self.pending = stop - keep
+        return output
+
+    def finish(self):
+        """남은 샘플 출력 (마지막 경계는 전체 계산과 같은 한쪽 차분)"""
+        return self.update(np.empty(0), np.empty(0), final=True)
+
+
+def iter_kinematics(chunks, savgol=None, delta=None):
+    """(시간, 속도) 청크 반복자를 운동학 DataFrame 청크 반복자로 변환 (delta: Savitzky-Golay 미분 샘플 간격)"""
+    stream = KinematicsStream(savgol, delta)
+    for time, velocity in chunks:
+        frame = stream.update(time, velocity)
+        if len(frame):
+            yield frame
+    frame = stream.finish()
+    if len(frame):
+        yield frame
+
+
+class _RunningMoments:
+    """평균/분산 청크 병합 (Chan 병렬 알고리즘)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.sum_squares = 0.0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+
+    def update(self, values):
+        if len(values) == 0:
+            return
+        count = len(values)
+        mean = values.mean()
+        m2 = ((values - mean) ** 2).sum()
+        total = self.count + count
+        delta = mean - self.mean
+        self.m2 += m2 + delta ** 2 * self.count * count / total
+        self.mean += delta * count / total
+        self.count = total
+        self.sum_squares += np.dot(values, values)
+        self.minimum = min(self.minimum, values.min())
+        self.maximum = max(self.maximum, values.max())
+
+    def std(self):
+        return np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan
+
+    def rms(self):
+        return np.sqrt(self.sum_squares / self.count) if self.count else np.nan
+
+
+class KinematicsSummary:
+    """운동학 청크를 누적하여 전체 데이터와 같은 통계(기본/운동 상태/성능 지표) 계산
+
+    백분위수는 물리량별 KLL 스케치로 근사하므로 메모리가 샘플 수와 무관합니다.
+    """
+
+    def __init__(self):
+        self.velocity = _RunningMoments()
+        self.acceleration = _RunningMoments()
+        self.jerk = _RunningMoments()
+        self.sketches = {name: QuantileSketch() for name in PERCENTILE_COLUMNS}
+        self.state_times = np.zeros(3)
+        self.state_counts = np.zeros(3, dtype=np.int64)
+        self.first_time = None
+        self.last_time = None
+        self.last_state = None
+        self.last_distance = 0.0
+        self.target_time = None
+        self.first_gap = None
+        self.last_gap = None
+
+    def update(self, frame):
+        """운동학 DataFrame 청크 반영"""
+        if len(frame) == 0:
+            return self
+        time = frame['Time_sec'].to_numpy()
+        velocity = frame['Velocity_m/s'].to_numpy()
+        acceleration = frame['Acceleration_m/s2'].to_numpy()
+
+        self.velocity.update(velocity)
+        self.acceleration.update(acceleration)
+        self.jerk.update(frame['Jerk_m/s3'].to_numpy())
+        for name, column in PERCENTILE_COLUMNS.items():
+            self.sketches[name].update(frame[column].to_numpy())
+        self._update_states(time, acceleration)
+
+        if self.target_time is None:
+            reached = np.flatnonzero(velocity >= TARGET_SPEED)
+            if len(reached):
+                self.target_time = time[reached[0]]
+
+        if self.first_time is None:
+            self.first_time = time[0]
+        self.last_time = time[-1]
+        self.last_distance = frame['Distance_m'].iat[-1]
+        return self
+
+    def _update_states(self, time, acceleration):
+        """가속(0)/감속(1)/등속(2) 상태별 시간 누적
+
+        np.gradient(time) 가중치와 같도록 인접 샘플 간격의 절반씩을 양쪽 샘플 상태에 배분하고,
+        첫/마지막 샘플에는 한쪽 간격 전체가 되도록 나머지 절반을 통계 계산 시 더합니다.
+        """
+        states = np.where(acceleration > ACC_THRESHOLD, 0, np.where(acceleration < -ACC_THRESHOLD, 1, 2))
+        self.state_counts += np.bincount(states, minlength=3)
+
+        if self.last_time is not None:
+            time = np.concatenate([[self.last_time], time])
+            states = np.concatenate([[self.last_state], states])
+        half_gaps = np.diff(time) / 2
+        self.state_times += np.bincount(states[:-1], weights=half_gaps, minlength=3)
+        self.state_times += np.bincount(states[1:], weights=half_gaps, minlength=3)
+        self.last_state = states[-1]
+        if len(half_gaps):
+            if self.first_gap is None:
+                self.first_gap = (half_gaps[0], states[0])
+            self.last_gap = (half_gaps[-1], states[-1])
+
+    def _state_times(self):
+        times = self.state_times.copy()
+        for gap in (self.first_gap, self.last_gap):
+            if gap is not None:
+                times[gap[1]] += gap[0]
+        return times
+
+    def statistics(self):
+        """calculate_statistics 와 같은 구조의 통계 사전"""
+        count = self.velocity.count
+        if count == 0:
+            raise ValueError("분석할 데이터가 없습니다.")
+        times = self._state_times()
+        ratios = self.state_counts / count * 100
+        return {
+            'basic': {
+                'total_time': self.last_time - self.first_time,
+                'total_distance': self.last_distance,
+                'max_velocity': self.velocity.maximum,
+                'min_velocity': self.velocity.minimum,
+                'avg_velocity': self.velocity.mean,
+                'max_acceleration': self.acceleration.maximum,
+                'min_acceleration': self.acceleration.minimum,
+                'avg_acceleration': self.acceleration.mean,
+                'max_jerk': self.jerk.maximum,
+                'min_jerk': self.jerk.minimum
+            },
+            'motion_states': {
+                'accelerating_time': times[0],
+                'decelerating_time': times[1],
+                'constant_speed_time': times[2],
+                'accelerating_ratio': ratios[0],
+                'decelerating_ratio': ratios[1],
+                'constant_speed_ratio': ratios[2]
+            },
+            'performance': {
+                'zero_to_60kmh_time': self.target_time,
+                'rms_acceleration': self.acceleration.rms(),
+                'rms_velocity': self.velocity.rms(),
+                'efficiency_ratio': self.velocity.mean / self.velocity.maximum * 100,
+                'velocity_std': self.velocity.std(),
+                'acceleration_std': self.acceleration.std()
+            },
+            'percentiles': percentile_table(self.sketches),
+            # 백분위수가 스케치 근사값임을 표시 (보관 중인 값 개수와 오차를 정하는 k)
+            'sketch': sketch_info(self.sketches)
+        }
+
+
+class DecimatedBuffer:
+    """시각화용 등간격 솎아내기 표본 (크기 초과 시 간격을 두 배로 늘려 절반 제거)"""
+
+    def __init__(self, max_samples=DEFAULT_PREVIEW_SIZE):
+        self.max_samples = max_samples
+        self.stride = 1
+        self.offset = 0
+        self.frames = []
+        self.size = 0
+
+    def update(self, frame):
+        """청크 반영 (전체 샘플 번호가 stride 의 배수인 샘플만 유지)"""
+        start = (-self.offset) % self.stride
+        self.offset += len(frame)
+        sample = frame.iloc[start::self.stride]
+        self.frames.append(sample)
+        self.size += len(sample)
+        while self.size > self.max_samples:
+            self._halve()
+
+    def _halve(self):
+        data = self.data()
+        # 전체 샘플 번호 기준 짝수 번째 표본만 남기도록 (첫 표본은 항상 번호 0)
+        self.frames = [data.iloc[::2]]
+        self.size = len(self.frames[0])
+        self.stride *= 2
+
+    def data(self):
+        if not self.frames:
+            return pd.DataFrame(columns=RESULT_COLUMNS, dtype=float)
+        return pd.concat(self.frames, ignore_index=True)
+
+
+def stream_spacing(chunks):
+    """(시간, 값) 청크 반복자 전체의 (평균 샘플 간격, 간격 중앙값)
+
+    전체 로드 경로의 mean_spacing(Savitzky-Golay 미분 척도)과 sample_rate_of(Butterworth 샘플링 주파수)에
+    대응하는 값이며, 간격 중앙값은 간격 분위수 스케치로 구합니다 (메모리 O(k)).
+    """
+    first = last = None
+    count = 0
+    gaps = QuantileSketch()
+    for time, _ in chunks:
+        if len(time) == 0:
+            continue
+        # 청크 경계 간격(직전 청크 마지막 샘플 → 첫 샘플)도 포함
+        gaps.update(np.diff(time) if last is None else np.diff(np.r_[last, time]))
+        first = time[0] if first is None else first
+        last = time[-1]
+        count += len(time)
+    if count < 2:
+        raise ValueError("샘플 간격을 구하려면 최소 2개 이상의 데이터 포인트가 필요합니다.")
+    return (last - first) / (count - 1), float(gaps.quantiles([0.5])[0])
+
+
+def _smoothed_chunks(chunks, smoothing, spacing=None):
+    """스무딩 설정을 청크 반복자에 적용
+
+    Savitzky-Golay 는 운동학 계산에서 처리하므로 필터와 미분 간격을 함께 반환합니다.
+    spacing 은 stream_spacing 으로 구한 전체 스트림의 (평균 간격, 간격 중앙값)입니다.
+    """
+    method = (smoothing or {}).get('method', 'none')
+    if method == 'none':
+        return chunks, None, None
+    mean_gap, median_gap = spacing if spacing is not None else (None, None)
+    sample_rate = None
+    if method == 'butterworth':
+        if not median_gap or median_gap <= 0:
+            raise ValueError("샘플링 주파수를 구할 수 없습니다 (시간 간격이 0 입니다).")
+        sample_rate = 1.0 / median_gap
+    smoother = make_smoother(smoothing, sample_rate)
+    if method == 'savgol':
+        return chunks, smoother, mean_gap
+    return iter_filtered(chunks, smoother), None, None
+
+
+def stream_speed_analysis(source, chunksize=DEFAULT_CHUNKSIZE, preview_size=DEFAULT_PREVIEW_SIZE, mapping=None,
+                          smoothing=None, spectral=None):
+    """대용량 속도 로그(CSV/Parquet/.npy/원시 배열) 스트리밍 분석
+
+    시간 순으로 정렬된 로그를 청크 단위로 읽어 운동학을 계산하고 통계를 누적합니다.
+    시간 또는 속도가 비어 있는 샘플은 제외하며, 시각화에는 등간격 표본만 보관합니다.
+    mapping 은 speed_io.iter_speed_chunks 의 컬럼 지정 인자(time_column, velocity_column 등),
+    smoothing 은 filters.make_smoother 의 스무딩 설정, spectral 은 spectral.SpectralAnalyzer 설정이며
+    spectral 을 주면 같은 읽기 과정에서 원본 해상도의 PSD/스펙트로그램도 누적합니다.
+    Savitzky-Golay/Butterworth 스무딩은 청크마다 간격이 달라도 전체 로드와 같은 척도를 쓰도록
+    시간 컬럼을 한 번 먼저 읽어 전체 스트림의 샘플 간격을 구합니다.
+    """
+    from apps.analysis.speed_io import iter_speed_chunks
+
+    spacing = None
+    if (smoothing or {}).get('method') in ('savgol', 'butterworth'):
+        spacing = stream_spacing(iter_speed_chunks(source, chunksize=chunksize, **(mapping or {})))
+    chunks = iter_speed_chunks(source, chunksize=chunksize, **(mapping or {}))
+    chunks, savgol, delta = _smoothed_chunks(chunks, smoothing, spacing)
+
+    summary = KinematicsSummary()
+    preview = DecimatedBuffer(preview_size)
+    analyzer = None
+    if spectral is not None:
+        from apps.analysis.spectral import SpectralAnalyzer
+        analyzer = SpectralAnalyzer(**spectral)
+    for frame in iter_kinematics(chunks, savgol, delta):
+        summary.update(frame)
+        preview.update(frame)
+        if analyzer is not None:
+            analyzer.update(frame)
+
+    results = {
+        'data': preview.data(),
+        'statistics': summary.statistics(),
+        'sample_count': summary.velocity.count,
+        'preview_stride': preview.stride
+    }
+    if analyzer is not None and analyzer.accumulator is not None and analyzer.accumulator.frames:
+        results['spectra'] = {tuple(sorted(spectral.items())): analyzer.result()}
+    return results
@@ -0,0 +1,143 @@
+"""
+분석 결과 내보내기
+Excel(상수 메모리 xlsxwriter), gzip CSV, Parquet 파일을 청크 단위로 만들어 전체 사본 없이 바이트로 반환합니다.
+"""
+import gzip
+from io import BytesIO
+
+# 청크당 행 수 (CSV 문자열/Parquet 행 그룹/Excel 행 쓰기 단위)
+EXPORT_CHUNKSIZE = 100_000
+# Excel 시트당 최대 데이터 행 수 (헤더 1행 제외, 초과 시 다음 시트로 이어서 기록)
+EXCEL_MAX_ROWS = 1_048_575
+EXCEL_SHEET_NAME = 'Analysis Results'
+
+EXPORT_FORMATS = {
+    'excel': {
+        'label': '📊 Excel',
+        'file_name': 'speed_analysis_results.xlsx',
+        'mime': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    },
+    'csv': {
+        'label': '📄 CSV',
+        'file_name': 'speed_analysis_results.csv',
+        'mime': 'text/csv'
+    },
+    'csv_gzip': {
+        'label': '🗜️ CSV (gzip)',
+        'file_name': 'speed_analysis_results.csv.gz',
+        'mime': 'application/gzip'
+    },
+    'parquet': {
+        'label': '🧱 Parquet',
+        'file_name': 'speed_analysis_results.parquet',
+        'mime': 'application/vnd.apache.parquet'
+    }
+}
+
+HEADER_FORMAT = {
+    'bold': True,
+    'text_wrap': True,
+    'valign': 'top',
+    'fg_color': '#4472C4',
+    'font_color': 'white',
+    'border': 1
+}
+
+
+def parquet_available():
+    """Parquet 쓰기용 pyarrow 설치 여부 (선택 의존성)"""
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def available_formats():
+    """현재 환경에서 만들 수 있는 내보내기 형식"""
+    return [fmt for fmt in EXPORT_FORMATS if fmt != 'parquet' or parquet_available()]
+
+
+def excel_bytes(df, chunksize=EXPORT_CHUNKSIZE, max_rows=EXCEL_MAX_ROWS):
+    """상수 메모리 모드 xlsxwriter 로 Excel 파일 생성
+
+    constant_memory 모드는 행을 한 줄씩 임시 파일로 내보내므로 메모리가 행 수와 무관하고,
+    Excel 행 제한(max_rows)을 넘는 데이터는 'Analysis Results 2', '... 3' 시트로 이어서 기록합니다.
+    """
+    import xlsxwriter
+
+    buffer = BytesIO()
+    workbook = xlsxwriter.Workbook(buffer, {'constant_memory': True, 'nan_inf_to_errors': True})
+    header_format = workbook.add_format(HEADER_FORMAT)
+    header = [str(col) for col in df.columns]
+
+    sheet_count = max(1, -(-len(df) // max_rows))
+    for sheet in range(sheet_count):
+        name = EXCEL_SHEET_NAME if sheet == 0 else f"{EXCEL_SHEET_NAME} {sheet + 1}"
+        worksheet = workbook.add_worksheet(name)
+        worksheet.set_column(0, len(header) - 1, 15)
+        worksheet.write_row(0, 0, header, header_format)
+
+        row = 1
+        stop = min((sheet + 1) * max_rows, len(df))
+        for start in range(sheet * max_rows, stop, chunksize):
+            chunk = df.iloc[start:min(start + chunksize, stop)]
+            for values in chunk.to_numpy(dtype=object).tolist():
+                worksheet.write_row(row, 0, values)
+                row += 1
+
+    workbook.close()
+    return buffer.getvalue()
+
+
+def _write_csv(df, stream, chunksize):
+    """청크 단위 CSV 를 바이너리 스트림에 이어 쓰기 (CSV 전체 문자열을 메모리에 만들지 않음)"""
+    for start in range(0, max(len(df), 1), chunksize):
+        text = df.iloc[start:start + chunksize].to_csv(index=False, header=start == 0)
+        stream.write(text.encode('utf-8'))
+
+
+def csv_bytes(df, chunksize=EXPORT_CHUNKSIZE):
+    buffer = BytesIO()
+    _write_csv(df, buffer, chunksize)
+    return buffer.getvalue()
+
+
+def csv_gzip_bytes(df, chunksize=EXPORT_CHUNKSIZE, compresslevel=6):
+    """gzip 압축 CSV (mtime=0 으로 같은 데이터는 항상 같은 바이트)"""
+    buffer = BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode='wb', compresslevel=compresslevel, mtime=0) as stream:
+        _write_csv(df, stream, chunksize)
+    return buffer.getvalue()
+
+
+def parquet_bytes(df, chunksize=EXPORT_CHUNKSIZE):
+    """행 그룹(chunksize 행) 단위로 Parquet 파일 쓰기 (Arrow 변환도 청크 단위)"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet 파일로 내보내려면 pyarrow 패키지가 필요합니다: pip install pyarrow") from e
+
+    buffer = BytesIO()
+    schema = pa.Schema.from_pandas(df.iloc[:0], preserve_index=False)
+    with pq.ParquetWriter(buffer, schema, compression='snappy') as writer:
+        for start in range(0, len(df), chunksize):
+            chunk = df.iloc[start:start + chunksize]
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+    return buffer.getvalue()
+
+
+EXPORT_WRITERS = {
+    'excel': excel_bytes,
+    'csv': csv_bytes,
+    'csv_gzip': csv_gzip_bytes,
+    'parquet': parquet_bytes
+}
+
+
+def export_bytes(df, fmt):
+    """형식 이름(EXPORT_FORMATS 키)으로 내보내기 파일 바이트 생성"""
+    if fmt not in EXPORT_WRITERS:
+        raise ValueError(f"지원하지 않는 내보내기 형식입니다: {fmt}")
+    return EXPORT_WRITERS[fmt](df)
@@ -0,0 +1,228 @@
+"""
+속도 로그 입력 (CSV/Parquet/Excel/NumPy/원시 바이너리)
+컬럼 지정으로 Time_sec/Velocity_m/s 를 구성하고, 로컬 대용량 파일은 복사 없이 메모리 매핑합니다.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from apps.analysis.speed_engine import DEFAULT_CHUNKSIZE, TIME_COLUMN, VELOCITY_COLUMN
+
+SPEED_FORMATS = {
+    '.xlsx': 'excel',
+    '.xls': 'excel',
+    '.csv': 'csv',
+    '.txt': 'csv',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.npy': 'npy',
+    '.bin': 'raw',
+    '.raw': 'raw',
+    '.f32': 'raw',
+    '.f64': 'raw'
+}
+RAW_DTYPES = {'float64': '<f8', 'float32': '<f4'}
+
+
+def detect_speed_format(source):
+    """경로 또는 업로드 파일 이름으로 속도 로그 형식 판별"""
+    name = source if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', '')
+    suffix = os.path.splitext(str(name))[1].lower()
+    if suffix not in SPEED_FORMATS:
+        raise ValueError(f"지원하지 않는 파일 형식입니다: {name}")
+    return SPEED_FORMATS[suffix]
+
+
+def _is_path(source):
+    return isinstance(source, (str, os.PathLike))
+
+
+def _array_columns(count):
+    """열 이름이 없는 배열 형식의 컬럼 이름 (col_0, col_1, …)"""
+    return [f"col_{k}" for k in range(count)]
+
+
+def _npy_layout(stream):
+    """.npy 헤더만 읽어 (shape, fortran_order, dtype, 데이터 시작 위치) 반환"""
+    version = np.lib.format.read_magic(stream)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(stream)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(stream)
+    return shape, fortran_order, dtype, stream.tell()
+
+
+def open_array(source, raw_dtype='float64', raw_columns=2):
+    """.npy/원시 float 배열을 (n, 열) 2D 배열로 열기 (데이터 복사 없음)
+
+    로컬 경로는 np.load(mmap_mode='r') / np.memmap 으로 매핑하여 접근한 구간만 읽고,
+    업로드 파일은 업로드 버퍼 위에 np.frombuffer 로 배열을 만듭니다.
+    """
+    kind = detect_speed_format(source)
+    if kind == 'npy' and _is_path(source):
+        array = np.load(source, mmap_mode='r')
+    elif kind == 'npy':
+        source.seek(0)
+        shape, fortran_order, dtype, offset = _npy_layout(source)
+        if dtype.hasobject:
+            raise ValueError("객체 배열(.npy)은 지원하지 않습니다.")
+        array = np.frombuffer(source.getbuffer(), dtype=dtype, count=int(np.prod(shape)), offset=offset)
+        array = array.reshape(shape, order='F' if fortran_order else 'C')
+    else:
+        dtype = np.dtype(RAW_DTYPES[raw_dtype])
+        if _is_path(source):
+            array = np.memmap(source, dtype=dtype, mode='r')
+        else:
+            array = np.frombuffer(source.getbuffer(), dtype=dtype)
+        if len(array) % raw_columns:
+            raise ValueError(f"원시 배열 길이({len(array):,})가 열 개수({raw_columns})의 배수가 아닙니다.")
+        array = array.reshape(-1, raw_columns)
+    if array.ndim > 2:
+        raise ValueError(f"1차원 또는 2차원 배열만 지원합니다: {array.shape}")
+    return array.reshape(-1, 1) if array.ndim == 1 else array
+
+
+def read_speed_columns(source, raw_dtype='float64', raw_columns=2):
+    """데이터를 모두 읽지 않고 컬럼 이름 목록만 확인 (배열 형식은 col_0, col_1, …)"""
+    kind = detect_speed_format(source)
+    if kind in ('npy', 'raw'):
+        return _array_columns(open_array(source, raw_dtype, raw_columns).shape[1])
+
+    from apps.analysis.linearity_stream import read_columns
+
+    if kind == 'excel':
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        columns = list(pd.read_excel(source, sheet_name=0, nrows=0).columns)
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        return columns
+    return [str(col) for col in read_columns(source)]
+
+
+def _read_csv(source, columns):
+    """CSV 빠른 경로 (pyarrow 파서가 있으면 사용, 없으면 C 파서 + 고정 dtype)"""
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    dtypes = {col: 'float64' for col in columns}
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return pd.read_csv(source, usecols=columns, dtype=dtypes, engine='c')
+    return pd.read_csv(source, usecols=columns, dtype=dtypes, engine='pyarrow')
+
+
+def _mapped_columns(time_column, velocity_column):
+    return [col for col in (time_column, velocity_column) if col is not None]
+
+
+def _frame_from_arrays(time, velocity):
+    return pd.DataFrame({TIME_COLUMN: time, VELOCITY_COLUMN: velocity})
+
+
+def _sample_time(count, sample_rate, start=0):
+    """시간 컬럼이 없는 로그의 샘플 번호 기반 시간 (초)"""
+    if not sample_rate:
+        raise ValueError("시간 컬럼이 없으면 샘플링 주파수(Hz)를 지정해야 합니다.")
+    return (start + np.arange(count)) / float(sample_rate)
+
+
+def load_channels(source, time_column=TIME_COLUMN, channel_columns=(VELOCITY_COLUMN,), sample_rate=None,
+                  raw_dtype='float64', raw_columns=2):
+    """시간 컬럼과 여러 채널 컬럼을 (시간 배열, 채널 DataFrame) 으로 읽기
+
+    time_column 이 None 이면 sample_rate(Hz) 로 시간을 생성합니다.
+    필요한 컬럼만 읽으며, 배열 형식은 열 이름 col_0, col_1, … 로 지정합니다.
+    """
+    kind = detect_speed_format(source)
+    channel_columns = list(channel_columns)
+    columns = list(dict.fromkeys(_mapped_columns(time_column, None) + channel_columns))
+
+    if kind in ('npy', 'raw'):
+        array = open_array(source, raw_dtype, raw_columns)
+        index = {name: k for k, name in enumerate(_array_columns(array.shape[1]))}
+        missing = [col for col in columns if col not in index]
+        if missing:
+            raise ValueError(f"배열에 해당 열이 없습니다: {', '.join(missing)}")
+        time = array[:, index[time_column]] if time_column is not None else _sample_time(len(array), sample_rate)
+        channels = pd.DataFrame({col: np.asarray(array[:, index[col]], dtype=float) for col in channel_columns})
+        return np.asarray(time, dtype=float), channels
+
+    # 헤더만 읽어 누락 컬럼을 먼저 확인 (파서별 오류 대신 같은 메시지)
+    missing = [col for col in columns if col not in read_speed_columns(source)]
+    if missing:
+        raise ValueError(f"필수 컬럼이 누락되었습니다: {', '.join(missing)}")
+
+    if kind == 'csv':
+        data = _read_csv(source, columns)
+    elif kind == 'parquet':
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        data = pd.read_parquet(source, columns=columns)
+    else:
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        data = pd.read_excel(source, sheet_name=0, usecols=columns)
+
+    time = data[time_column] if time_column is not None else _sample_time(len(data), sample_rate)
+    channels = pd.DataFrame({col: data[col].to_numpy(dtype=float) for col in channel_columns})
+    return np.asarray(time, dtype=float), channels
+
+
+def load_speed_log(source, time_column=TIME_COLUMN, velocity_column=VELOCITY_COLUMN, sample_rate=None,
+                   raw_dtype='float64', raw_columns=2):
+    """속도 로그를 Time_sec/Velocity_m/s 두 컬럼 DataFrame 으로 읽기 (load_channels 참고)"""
+    time, channels = load_channels(source, time_column, [velocity_column], sample_rate, raw_dtype, raw_columns)
+    return _frame_from_arrays(time, channels[velocity_column].to_numpy())
+
+
+def iter_speed_chunks(source, time_column=TIME_COLUMN, velocity_column=VELOCITY_COLUMN, sample_rate=None,
+                      chunksize=DEFAULT_CHUNKSIZE, raw_dtype='float64', raw_columns=2):
+    """(시간, 속도) 배열 청크 반복자 (시간/속도가 NaN 인 샘플 제외)
+
+    CSV/Parquet 는 지정 컬럼만 청크 단위로 읽고, 배열 형식은 메모리 매핑 구간을 잘라 읽습니다.
+    """
+    kind = detect_speed_format(source)
+    columns = _mapped_columns(time_column, velocity_column)
+    if kind == 'excel':
+        raise ValueError("엑셀 파일은 스트리밍 모드를 지원하지 않습니다. CSV/Parquet/배열 파일을 사용하세요.")
+
+    if kind in ('npy', 'raw'):
+        array = open_array(source, raw_dtype, raw_columns)
+        index = {name: k for k, name in enumerate(_array_columns(array.shape[1]))}
+        missing = [col for col in columns if col not in index]
+        if missing:
+            raise ValueError(f"배열에 해당 열이 없습니다: {', '.join(missing)}")
+        blocks = ((start, array[start:start + chunksize]) for start in range(0, len(array), chunksize))
+        pairs = (
+            (block[:, index[time_column]] if time_column is not None else _sample_time(len(block), sample_rate, start),
+             block[:, index[velocity_column]])
+            for start, block in blocks
+        )
+    else:
+        from apps.analysis.linearity_stream import iter_frames
+
+        missing = [col for col in columns if col not in read_speed_columns(source)]
+        if missing:
+            raise ValueError(f"필수 컬럼이 누락되었습니다: {', '.join(missing)}")
+        pairs = _frame_pairs(iter_frames(source, columns, chunksize), time_column, velocity_column, sample_rate)
+
+    for time, velocity in pairs:
+        time = np.asarray(time, dtype=float)
+        velocity = np.asarray(velocity, dtype=float)
+        valid = ~(np.isnan(time) | np.isnan(velocity))
+        yield (time, velocity) if valid.all() else (time[valid], velocity[valid])
+
+
+def _frame_pairs(frames, time_column, velocity_column, sample_rate):
+    """DataFrame 청크를 (시간, 속도) 쌍으로 변환 (시간 컬럼이 없으면 누적 샘플 번호로 생성)"""
+    start = 0
+    for frame in frames:
+        velocity = frame[velocity_column].to_numpy(dtype=float)
+        if time_column is None:
+            time = _sample_time(len(frame), sample_rate, start)
+        else:
+            time = frame[time_column].to_numpy(dtype=float)
+        start += len(frame)
+        yield time, velocity
@@ -0,0 +1,227 @@
+"""
+실시간 속도 로그 추적
+기록 중인 CSV/원시 바이너리 로그에서 새로 추가된 바이트만 읽어 운동학을 이어서 계산합니다.
+"""
+import csv
+import os
+import threading
+import weakref
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from apps.analysis.speed_engine import (
+    RESULT_COLUMNS, TIME_COLUMN, VELOCITY_COLUMN, KinematicsStream, KinematicsSummary
+)
+from apps.analysis.speed_io import RAW_DTYPES, detect_speed_format
+
+# 한 번의 갱신에서 읽을 최대 바이트 (남은 데이터는 다음 갱신에서 이어 읽음)
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+INITIAL_CAPACITY = 65_536
+
+
+class _ChangeFlag:
+    """watchdog 파일 변경 알림 (watchdog 이 없으면 항상 변경된 것으로 간주)
+
+    감시 스레드는 이 객체를 참조하지 않으므로, 세션이 끝나 소스가 버려지면 finalize 로 스레드를 멈춥니다.
+    """
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self.event = threading.Event()
+        self.event.set()
+        self.observer = None
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return
+
+        target, event = self.path, self.event
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, change):
+                paths = (change.src_path, getattr(change, 'dest_path', ''))
+                if any(path and os.path.abspath(path) == target for path in paths):
+                    event.set()
+
+        self.observer = Observer()
+        self.observer.schedule(Handler(), os.path.dirname(self.path) or '.', recursive=False)
+        self.observer.daemon = True
+        self.observer.start()
+        self._finalizer = weakref.finalize(self, _stop_observer, self.observer)
+
+    def consume(self):
+        """마지막 확인 이후 변경 여부 (확인 후 초기화)"""
+        if self.observer is None:
+            return True
+        if not self.event.is_set():
+            return False
+        self.event.clear()
+        return True
+
+    def set(self):
+        self.event.set()
+
+    def close(self):
+        if self.observer is not None:
+            self._finalizer()
+            self.observer = None
+
+
+def _stop_observer(observer):
+    observer.stop()
+    observer.join(timeout=1.0)
+
+
+class SpeedTailSource:
+    """증가하는 속도 로그(CSV 또는 원시 float 배열)의 새로 추가된 샘플 읽기
+
+    마지막으로 읽은 바이트 위치를 기억하여 추가된 바이트만 읽고, 완성되지 않은 마지막 줄/레코드는
+    다음 갱신까지 보관합니다. 파일이 작아지면 새 기록으로 보고 처음부터 다시 읽습니다.
+    """
+
+    def __init__(self, path, time_column=TIME_COLUMN, velocity_column=VELOCITY_COLUMN, sample_rate=None,
+                 raw_dtype='float64', raw_columns=2):
+        self.path = path
+        self.kind = detect_speed_format(path)
+        if self.kind not in ('csv', 'raw'):
+            raise ValueError("실시간 모드는 CSV 또는 원시 바이너리(.bin/.raw/.f32/.f64) 로그만 지원합니다.")
+        if time_column is None and not sample_rate:
+            raise ValueError("시간 컬럼이 없으면 샘플링 주파수(Hz)를 지정해야 합니다.")
+        self.time_column = time_column
+        self.velocity_column = velocity_column
+        self.sample_rate = sample_rate
+        self.dtype = np.dtype(RAW_DTYPES[raw_dtype])
+        self.raw_columns = raw_columns
+        self.changes = _ChangeFlag(path)
+        self._reset()
+
+    def _reset(self):
+        self.offset = 0
+        self.partial = b''
+        self.positions = None
+        self.rows = 0
+
+    def poll(self, max_bytes=DEFAULT_MAX_BYTES):
+        """추가된 (시간, 속도) 배열과 파일 재작성 여부 (변경이 없으면 빈 배열)"""
+        empty = (np.empty(0), np.empty(0), False)
+        if not self.changes.consume() or not os.path.exists(self.path):
+            return empty
+
+        restarted = os.path.getsize(self.path) < self.offset
+        if restarted:
+            self._reset()
+
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            chunk = f.read(max_bytes)
+        self.offset += len(chunk)
+        if len(chunk) == max_bytes:
+            # 남은 바이트가 있을 수 있으므로 다음 갱신에서 계속 읽음
+            self.changes.set()
+
+        data = self.partial + chunk
+        if self.kind == 'csv':
+            time, velocity = self._parse_csv(data)
+        else:
+            time, velocity = self._parse_raw(data)
+        valid = ~(np.isnan(time) | np.isnan(velocity))
+        return time[valid], velocity[valid], restarted
+
+    def _parse_csv(self, data):
+        """완전한 줄만 파싱 (첫 줄은 헤더)"""
+        end = data.rfind(b'\n') + 1
+        self.partial = data[end:]
+        data = data[:end]
+        if self.positions is None:
+            header_end = data.find(b'\n') + 1
+            if header_end == 0:
+                self.partial = data + self.partial
+                return np.empty(0), np.empty(0)
+            self.positions = self._column_positions(data[:header_end])
+            data = data[header_end:]
+        if not data.strip():
+            return np.empty(0), np.empty(0)
+
+        frame = pd.read_csv(BytesIO(data), header=None, usecols=sorted(set(self.positions.values())),
+                            engine='c', float_precision='round_trip', on_bad_lines='skip')
+
+        def column(name):
+            return pd.to_numeric(frame[self.positions[name]], errors='coerce').to_numpy(dtype=float)
+
+        return self._pair(column(self.time_column) if self.time_column else None, column(self.velocity_column))
+
+    def _column_positions(self, header):
+        """헤더 줄에서 컬럼 위치 (따옴표/공백이 포함된 헤더도 csv 모듈로 해석)"""
+        row = next(csv.reader([header.decode('utf-8-sig', errors='ignore').strip()], skipinitialspace=True), [])
+        names = [name.strip() for name in row]
+        required = [name for name in (self.time_column, self.velocity_column) if name is not None]
+        missing = [name for name in required if name not in names]
+        if missing:
+            raise ValueError(f"필수 컬럼이 누락되었습니다: {', '.join(missing)}")
+        return {name: names.index(name) for name in required}
+
+    def _parse_raw(self, data):
+        """완전한 레코드(샘플당 raw_columns 개 값)만 해석"""
+        record = self.dtype.itemsize * self.raw_columns
+        end = len(data) // record * record
+        self.partial = data[end:]
+        values = np.frombuffer(data[:end], dtype=self.dtype).reshape(-1, self.raw_columns)
+        column = {f"col_{k}": k for k in range(self.raw_columns)}
+        time = values[:, column[self.time_column]] if self.time_column else None
+        return self._pair(time, values[:, column[self.velocity_column]])
+
+    def _pair(self, time, velocity):
+        """시간 컬럼이 없으면 누적 샘플 번호로 시간 생성"""
+        if time is None:
+            time = (self.rows + np.arange(len(velocity))) / float(self.sample_rate)
+        self.rows += len(velocity)
+        return np.asarray(time, dtype=float), np.asarray(velocity, dtype=float)
+
+    def close(self):
+        self.changes.close()
+
+
+class LiveKinematics:
+    """추가된 샘플로 운동학과 누적 통계를 이어서 계산
+
+    KinematicsStream 이 직전 경계의 HALO 샘플만 다시 계산하므로 갱신 비용은 새 샘플 수에 비례하고,
+    결과는 전체 로그를 한 번에 계산한 값과 같습니다 (마지막 HALO 샘플은 다음 샘플이 들어오면 확정).
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.stream = KinematicsStream()
+        self.summary = KinematicsSummary()
+        self.values = np.empty((INITIAL_CAPACITY, len(RESULT_COLUMNS)))
+        self.size = 0
+
+    def push(self, time, velocity):
+        """새 샘플 반영 후 확정된 샘플 수 반환"""
+        if len(time) == 0:
+            return 0
+        frame = self.stream.update(time, velocity)
+        if len(frame) == 0:
+            return 0
+        self.summary.update(frame)
+
+        # 용량 부족 시 두 배로 늘려 평균 O(1) 추가
+        needed = self.size + len(frame)
+        if needed > len(self.values):
+            grown = np.empty((max(needed, 2 * len(self.values)), len(RESULT_COLUMNS)))
+            grown[:self.size] = self.values[:self.size]
+            self.values = grown
+        self.values[self.size:needed] = frame.to_numpy()
+        self.size = needed
+        return len(frame)
+
+    def frame(self):
+        """확정된 전체 샘플 DataFrame (복사 없음)"""
+        return pd.DataFrame(self.values[:self.size], columns=RESULT_COLUMNS, copy=False)
+
+    def statistics(self):
+        return self.summary.statistics()
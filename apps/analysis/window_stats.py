@@ -0,0 +1,270 @@
+"""
+시간 구간 통계 인덱스
+분석 시 한 번 만든 누적합/희소 테이블로 임의 시간 구간의 통계를 데이터 복사 없이 O(1) 에 계산합니다.
+백분위수는 블록별 KLL 스케치 트리로 구간 길이와 무관한 비용에 근사합니다.
+"""
+import numpy as np
+
+from apps.analysis.quantiles import QuantileSketch, percentile_table, sketch_info
+from apps.analysis.speed_engine import ACC_THRESHOLD, TARGET_SPEED
+
+# 희소 테이블 블록 크기 (구간 양 끝의 부분 블록은 최대 이 크기만큼 직접 탐색)
+BLOCK_SIZE = 256
+# 백분위수 스케치 블록 크기와 스케치 k (블록당 보관 값 약 3k 개)
+SKETCH_BLOCK_SIZE = 16_384
+SKETCH_K = 1024
+# 이 길이 이하 구간의 백분위수는 np.percentile 로 정확히 계산
+EXACT_PERCENTILE_WINDOW = 4 * SKETCH_BLOCK_SIZE
+
+
+def prefix_sum(values):
+    """앞에 0 을 붙인 누적합 (구간 [lo, hi) 합 = P[hi] - P[lo])"""
+    result = np.empty(len(values) + 1)
+    result[0] = 0.0
+    np.cumsum(values, out=result[1:])
+    return result
+
+
+class RangeExtrema:
+    """블록 희소 테이블 구간 최솟값/최댓값
+
+    BLOCK_SIZE 블록별 극값에 대해서만 희소 테이블을 만들어 메모리는 O(n) 에 가깝게 유지하고,
+    질의는 테이블 조회 2회와 양 끝 부분 블록(최대 2 x BLOCK_SIZE 샘플) 탐색으로 처리합니다.
+    """
+
+    def __init__(self, values, block_size=BLOCK_SIZE):
+        self.values = np.asarray(values, dtype=float)
+        self.block_size = block_size
+        n_blocks = -(-len(self.values) // block_size)
+        padded = np.empty(n_blocks * block_size)
+        padded[:len(self.values)] = self.values
+
+        padded[len(self.values):] = np.inf
+        self.min_levels = self._build(padded.reshape(n_blocks, block_size).min(axis=1), np.minimum)
+        padded[len(self.values):] = -np.inf
+        self.max_levels = self._build(padded.reshape(n_blocks, block_size).max(axis=1), np.maximum)
+
+    @staticmethod
+    def _build(blocks, combine):
+        levels = [blocks]
+        span = 1
+        while 2 * span <= len(blocks):
+            previous = levels[-1]
+            levels.append(combine(previous[:-span], previous[span:]))
+            span *= 2
+        return levels
+
+    @staticmethod
+    def _lookup(levels, first, last, combine):
+        """블록 [first, last) 의 극값"""
+        level = int(np.log2(last - first))
+        table = levels[level]
+        return combine(table[first], table[last - (1 << level)])
+
+    def query(self, lo, hi):
+        """샘플 [lo, hi) 의 (최솟값, 최댓값)"""
+        if hi <= lo:
+            raise ValueError("빈 구간입니다.")
+        first, last = -(-lo // self.block_size), hi // self.block_size
+        if first >= last:
+            part = self.values[lo:hi]
+            return part.min(), part.max()
+
+        low = self._lookup(self.min_levels, first, last, min)
+        high = self._lookup(self.max_levels, first, last, max)
+        for part in (self.values[lo:first * self.block_size], self.values[last * self.block_size:hi]):
+            if len(part):
+                low, high = min(low, part.min()), max(high, part.max())
+        return low, high
+
+
+class RangeQuantiles:
+    """블록별 KLL 스케치 트리 구간 분위수 스케치
+
+    SKETCH_BLOCK_SIZE 블록마다 스케치를 만들고 이웃한 두 노드를 병합해 위 단계를 쌓습니다 (메모리 약 6k·블록 수).
+    질의는 구간 안의 완전한 블록을 겹치지 않는 O(log 블록 수) 개 노드로 나눠 병합하고 양 끝 부분 블록
+    (최대 2 x SKETCH_BLOCK_SIZE 샘플) 값을 더하므로 비용이 구간 길이와 무관합니다.
+    """
+
+    def __init__(self, values, block_size=SKETCH_BLOCK_SIZE, k=SKETCH_K):
+        self.values = np.asarray(values, dtype=float)
+        self.block_size = block_size
+        self.k = k
+        n_blocks = len(self.values) // block_size
+        self.levels = [[QuantileSketch(k, seed=b).update(self.values[b * block_size:(b + 1) * block_size])
+                        for b in range(n_blocks)]]
+        while len(self.levels[-1]) > 1:
+            below = self.levels[-1]
+            self.levels.append([QuantileSketch(k, seed=b).merge(below[2 * b]).merge(below[2 * b + 1])
+                                for b in range(len(below) // 2)])
+
+    def query(self, lo, hi):
+        """샘플 [lo, hi) 의 분위수 스케치"""
+        first, last = -(-lo // self.block_size), hi // self.block_size
+        sketch = QuantileSketch(self.k, seed=lo)
+        if first >= last:
+            return sketch.update(self.values[lo:hi])
+
+        block = first
+        while block < last:
+            # block 에서 시작하고 last 를 넘지 않는 가장 큰 트리 노드
+            level = 0
+            while (level + 1 < len(self.levels) and block % (2 << level) == 0
+                   and block + (2 << level) <= last):
+                level += 1
+            sketch.merge(self.levels[level][block >> level])
+            block += 1 << level
+        sketch.update(self.values[lo:first * self.block_size])
+        return sketch.update(self.values[last * self.block_size:hi])
+
+
+class _Moments:
+    """중심화 누적합 기반 구간 평균/표준편차/RMS"""
+
+    def __init__(self, values):
+        self.center = float(np.mean(values)) if len(values) else 0.0
+        shifted = np.asarray(values, dtype=float) - self.center
+        self.sums = prefix_sum(shifted)
+        self.squares = prefix_sum(shifted * shifted)
+
+    def query(self, lo, hi):
+        """샘플 [lo, hi) 의 (평균, 표준편차(ddof=1), RMS)"""
+        count = hi - lo
+        total = self.sums[hi] - self.sums[lo]
+        shifted_mean = total / count
+        m2 = max(self.squares[hi] - self.squares[lo] - total * shifted_mean, 0.0)
+        mean = self.center + shifted_mean
+        std = np.sqrt(m2 / (count - 1)) if count > 1 else np.nan
+        rms = np.sqrt(max(m2 / count + mean * mean, 0.0))
+        return mean, std, rms
+
+
+class WindowIndex:
+    """운동학 DataFrame 의 시간 구간 통계 인덱스
+
+    statistics() 는 calculate_statistics(df.iloc[lo:hi]) 와 같은 구조/값을 반환합니다.
+    운동 상태 시간은 전체 np.gradient(time) 가중치 누적합에 구간 양 끝 샘플의 한쪽 차분 보정을 더해 계산합니다.
+    백분위수는 EXACT_PERCENTILE_WINDOW 샘플 이하 구간만 np.percentile 로 정확히 구하고, 더 긴 구간은
+    RangeQuantiles 스케치 근사값('sketch' 에 k 와 보관 값 개수 표시)이므로 질의 비용은 구간 길이와 무관합니다.
+    """
+
+    def __init__(self, frame):
+        self.time = frame['Time_sec'].to_numpy(dtype=float)
+        self.distance = frame['Distance_m'].to_numpy(dtype=float)
+        velocity = frame['Velocity_m/s'].to_numpy(dtype=float)
+        acceleration = frame['Acceleration_m/s2'].to_numpy(dtype=float)
+        jerk = frame['Jerk_m/s3'].to_numpy(dtype=float)
+
+        self.velocity = _Moments(velocity)
+        self.acceleration = _Moments(acceleration)
+        self.values = {'velocity': velocity, 'acceleration': acceleration, 'jerk': jerk}
+        # 긴 구간 백분위수용 스케치 트리 (첫 질의 때 생성)
+        self.quantiles = None
+        self.extrema = {
+            'velocity': RangeExtrema(velocity),
+            'acceleration': RangeExtrema(acceleration),
+            'jerk': RangeExtrema(jerk)
+        }
+
+        # 가속/감속 상태별 샘플 수와 시간 가중치 누적합 (등속은 나머지)
+        self.accelerating = acceleration > ACC_THRESHOLD
+        self.decelerating = acceleration < -ACC_THRESHOLD
+        self.dt = np.gradient(self.time) if len(self.time) > 1 else np.zeros(len(self.time))
+        self.acc_counts = prefix_sum(self.accelerating)
+        self.dec_counts = prefix_sum(self.decelerating)
+        self.acc_times = prefix_sum(np.where(self.accelerating, self.dt, 0.0))
+        self.dec_times = prefix_sum(np.where(self.decelerating, self.dt, 0.0))
+
+        # 각 샘플 이후 처음으로 목표 속도에 도달하는 샘플 번호 (없으면 n)
+        n = len(velocity)
+        reached = np.where(velocity >= TARGET_SPEED, np.arange(n), n)
+        self.next_target = np.minimum.accumulate(reached[::-1])[::-1] if n else reached
+
+    def __len__(self):
+        return len(self.time)
+
+    def window(self, start=None, end=None):
+        """시간 [start, end] 에 해당하는 샘플 슬라이스 (이진 탐색)"""
+        lo = 0 if start is None else int(np.searchsorted(self.time, start, side='left'))
+        hi = len(self.time) if end is None else int(np.searchsorted(self.time, end, side='right'))
+        return slice(lo, max(lo, hi))
+
+    def _state_times(self, lo, hi):
+        """구간 [lo, hi) 의 가속/감속/등속 시간 (구간 배열에 np.gradient 를 적용한 것과 같음)"""
+        time = self.time
+        acc = self.acc_times[hi] - self.acc_times[lo]
+        dec = self.dec_times[hi] - self.dec_times[lo]
+        # 구간 양 끝은 한쪽 차분으로 바뀜
+        for index, edge_dt in ((lo, time[lo + 1] - time[lo]), (hi - 1, time[hi - 1] - time[hi - 2])):
+            correction = edge_dt - self.dt[index]
+            if self.accelerating[index]:
+                acc += correction
+            elif self.decelerating[index]:
+                dec += correction
+        total = (time[lo + 1] - time[lo]) + (time[hi - 1] - time[hi - 2]) \
+            + (time[hi - 1] + time[hi - 2] - time[lo + 1] - time[lo]) / 2
+        return acc, dec, total - acc - dec
+
+    def statistics(self, lo=0, hi=None):
+        """샘플 [lo, hi) 통계 (calculate_statistics 와 같은 구조)"""
+        hi = len(self) if hi is None else hi
+        count = hi - lo
+        if count < 2:
+            raise ValueError("구간 통계에는 최소 2개 이상의 데이터 포인트가 필요합니다.")
+
+        v_mean, v_std, v_rms = self.velocity.query(lo, hi)
+        a_mean, a_std, a_rms = self.acceleration.query(lo, hi)
+        v_min, v_max = self.extrema['velocity'].query(lo, hi)
+        a_min, a_max = self.extrema['acceleration'].query(lo, hi)
+        j_min, j_max = self.extrema['jerk'].query(lo, hi)
+
+        acc_time, dec_time, constant_time = self._state_times(lo, hi)
+        acc_count = self.acc_counts[hi] - self.acc_counts[lo]
+        dec_count = self.dec_counts[hi] - self.dec_counts[lo]
+        target = self.next_target[lo]
+
+        return {
+            'basic': {
+                'total_time': self.time[hi - 1] - self.time[lo],
+                'total_distance': self.distance[hi - 1],
+                'max_velocity': v_max,
+                'min_velocity': v_min,
+                'avg_velocity': v_mean,
+                'max_acceleration': a_max,
+                'min_acceleration': a_min,
+                'avg_acceleration': a_mean,
+                'max_jerk': j_max,
+                'min_jerk': j_min
+            },
+            'motion_states': {
+                'accelerating_time': acc_time,
+                'decelerating_time': dec_time,
+                'constant_speed_time': constant_time,
+                'accelerating_ratio': acc_count / count * 100,
+                'decelerating_ratio': dec_count / count * 100,
+                'constant_speed_ratio': (count - acc_count - dec_count) / count * 100
+            },
+            'performance': {
+                'zero_to_60kmh_time': self.time[target] if target < hi else None,
+                'rms_acceleration': a_rms,
+                'rms_velocity': v_rms,
+                'efficiency_ratio': v_mean / v_max * 100,
+                'velocity_std': v_std,
+                'acceleration_std': a_std
+            },
+            **self.percentiles(lo, hi)
+        }
+
+    def percentiles(self, lo, hi):
+        """샘플 [lo, hi) 백분위수 {'percentiles': ...} (근사값이면 'sketch' 요약 포함)"""
+        if hi - lo <= EXACT_PERCENTILE_WINDOW:
+            return {'percentiles': percentile_table({name: values[lo:hi] for name, values in self.values.items()})}
+        if self.quantiles is None:
+            self.quantiles = {name: RangeQuantiles(values) for name, values in self.values.items()}
+        sketches = {name: tree.query(lo, hi) for name, tree in self.quantiles.items()}
+        return {'percentiles': percentile_table(sketches), 'sketch': sketch_info(sketches)}
+
+    def time_statistics(self, start=None, end=None):
+        """시간 [start, end] 구간 통계"""
+        window = self.window(start, end)
+        return self.statistics(window.start, window.stop)
@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+SPsystems 다기능 분석 도구 - 분석 엔진 벤치마크 스크립트
+기존 구현 대비 수치 엔진의 처리 시간을 측정합니다.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from apps.analysis import linearity_engine  # noqa: E402
+from apps.analysis.form_fitting import fit_cylinders  # noqa: E402
+from apps.analysis.linearity_bootstrap import bootstrap_intervals  # noqa: E402
+from apps.analysis.registration import register_batch  # noqa: E402
+from apps.analysis import (  # noqa: E402
+    filters, motion_segments, quantiles, spectral, speed_batch, speed_engine, speed_export, speed_io
+)
+from apps.analysis.robust_fit import ransac_line  # noqa: E402
+
+
+def make_rail_points(n_points, noise=0.01, seed=0):
+    """직선 레일 측정 점군 생성"""
+    rng = np.random.default_rng(seed)
+    t = np.linspace(0, 2000, n_points)
+    direction = np.array([1.0, 0.02, -0.01])
+    direction /= np.linalg.norm(direction)
+    origin = np.array([150.0, 320.0, 45.0])
+    return origin + t[:, None] * direction + rng.normal(0, noise, (n_points, 3))
+
+
+def add_gross_outliers(points, fraction, seed=1):
+    """측정 오류를 모사한 큰 이상치 (직선에서 0.5~5mm 이탈) 추가"""
+    rng = np.random.default_rng(seed)
+    points = points.copy()
+    count = int(len(points) * fraction)
+    index = rng.choice(len(points), size=count, replace=False)
+    offsets = rng.normal(size=(count, 3))
+    offsets /= np.linalg.norm(offsets, axis=1, keepdims=True)
+    points[index] += offsets * rng.uniform(0.5, 5.0, count)[:, None]
+    outlier_mask = np.zeros(len(points), dtype=bool)
+    outlier_mask[index] = True
+    return points, outlier_mask
+
+
+def legacy_sigma_filter(points):
+    """기존 3σ 경로: 좌표 컬럼별로 평균/표준편차를 다시 계산하며 순차 필터링"""
+    import pandas as pd
+
+    data = pd.DataFrame(points, columns=['X1_x', 'X1_y', 'X1_z'])
+    for col in data.columns:
+        mean = data[col].mean()
+        std = data[col].std()
+        data = data[abs(data[col] - mean) <= 3 * std]
+    mask = np.zeros(len(points), dtype=bool)
+    mask[data.index.to_numpy()] = True
+    return mask
+
+
+def robust_filter(points):
+    """강건 적합 경로: RANSAC 직선 거리 기준 단일 마스크"""
+    return ransac_line(points)['inlier_mask']
+
+
+def legacy_linearity(points):
+    """기존 구현: sklearn PCA + 점별 파이썬 루프 거리 계산"""
+    from sklearn.decomposition import PCA
+
+    pca = PCA(n_components=1)
+    pca.fit(points)
+    direction_vector = pca.components_[0]
+    point_on_line = pca.mean_
+
+    distances = []
+    for point in points:
+        proj = point_on_line + np.dot(point - point_on_line, direction_vector) * direction_vector
+        distances.append(np.linalg.norm(point - proj))
+    return np.mean(distances), np.max(distances)
+
+
+def engine_linearity(points):
+    """수치 엔진: 공분산 고유값 분해 + 일괄 거리 계산"""
+    pca_results = linearity_engine.fit_lines({'X1': points})
+    metrics = linearity_engine.compute_linearity_metrics({'X1': points}, pca_results)
+    return metrics['linearity']['X1']['mean_distance'], metrics['linearity']['X1']['max_distance']
+
+
+def timed(func, *args, repeat=1):
+    """최소 실행 시간(초) 측정"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def bench_linearity(args):
+    """진직도 계산 벤치마크"""
+    points = make_rail_points(args.points)
+
+    engine_time, engine_result = timed(engine_linearity, points, repeat=3)
+    print(f"[engine] {args.points:,} 점: {engine_time:.3f}초 "
+          f"(평균 {engine_result[0]:.6f}, 최대 {engine_result[1]:.6f})")
+
+    if args.skip_legacy:
+        return
+
+    legacy_time, legacy_result = timed(legacy_linearity, points)
+    print(f"[legacy] {args.points:,} 점: {legacy_time:.3f}초 "
+          f"(평균 {legacy_result[0]:.6f}, 최대 {legacy_result[1]:.6f})")
+    print(f"속도 향상: {legacy_time / engine_time:.1f}x")
+
+
+def bench_robust(args):
+    """이상치 제거 벤치마크: 기존 3σ 좌표 필터 vs RANSAC 직선 거리 필터"""
+    clean = make_rail_points(args.points)
+    true_direction = np.array([1.0, 0.02, -0.01]) / np.linalg.norm([1.0, 0.02, -0.01])
+
+    print(f"{'이상치':>6} {'방법':>8} {'시간(s)':>8} {'제거된 이상치':>12} "
+          f"{'잘못 제거':>10} {'방향 오차(°)':>12} {'최대 거리':>10}")
+    for fraction in (0.01, 0.05, 0.10):
+        points, outlier_mask = add_gross_outliers(clean, fraction)
+        for name, method in (('3sigma', legacy_sigma_filter), ('ransac', robust_filter)):
+            elapsed, keep = timed(method, points)
+            fit = linearity_engine.fit_lines({'X1': points[keep]})['X1']
+            error = np.degrees(np.arccos(min(1.0, abs(fit['direction_vector'] @ true_direction))))
+            max_distance = linearity_engine.line_distances(
+                points[keep], fit['point_on_line'], fit['direction_vector']).max()
+            print(f"{fraction:>6.0%} {name:>8} {elapsed:>8.3f} "
+                  f"{(~keep & outlier_mask).sum():>6}/{outlier_mask.sum():<6} "
+                  f"{(~keep & ~outlier_mask).sum():>10} {error:>12.6f} {max_distance:>10.4f}")
+
+
+def bench_bootstrap(args):
+    """4축 방향/각도 부트스트랩 신뢰구간 (재표본 10,000회) 벤치마크"""
+    directions = {'X1': [1.0, 0.0, 0.0], 'X2': [1.0, 0.0004, 0.0], 'Y': [0.0, 1.0, 0.0], 'Z': [0.0, 0.0, 1.0]}
+    for n_points in (50, 1000, args.points):
+        data_points = {}
+        for k, (axis, direction) in enumerate(directions.items()):
+            direction = np.asarray(direction) / np.linalg.norm(direction)
+            t = np.linspace(-1000, 1000, n_points)
+            data_points[axis] = t[:, None] * direction + np.random.default_rng(k).normal(0, 0.01, (n_points, 3))
+        pca_results = linearity_engine.fit_lines(data_points)
+
+        elapsed, intervals = timed(bootstrap_intervals, data_points, pca_results, 10_000)
+        low, high = intervals['angles']['X1_X2']['parallel']
+        print(f"[bootstrap] {n_points:,} 점 × 4축, 재표본 10,000회: {elapsed:.3f}초 "
+              f"(X1-X2 평행도 95% CI [{low:.4f}°, {high:.4f}°])")
+
+
+def bench_registration(args):
+    """다중 회차 Kabsch 일괄 정합 벤치마크 (회차별 무작위 트래커 위치)"""
+    rng = np.random.default_rng(0)
+    n_targets = min(args.points, 4000)
+    reference = rng.uniform(-1000, 1000, (n_targets, 3))
+    for n_runs in (10, 100, 500):
+        q = np.linalg.qr(rng.normal(size=(n_runs, 3, 3)))[0]
+        rotations = q * np.sign(np.linalg.det(q))[:, None, None]
+        translations = rng.normal(0, 500, (n_runs, 3))
+        sources = np.einsum('rji,rnj->rni', rotations, reference[None] - translations[:, None])
+        sources += rng.normal(0, 0.01, sources.shape)
+
+        for iterations in (0, 2):
+            elapsed, result = timed(register_batch, sources, reference, iterations)
+            error = np.abs(result['rotation'] - rotations).max()
+            print(f"[registration] {n_runs}회차 × {n_targets:,} 대응점, 반복 {iterations}: "
+                  f"{elapsed:.3f}초 (회전 행렬 최대 오차 {error:.2e})")
+
+
+def bench_form(args):
+    """원통 특징 일괄 최소제곱 적합 벤치마크 (특징별 무작위 축/반지름/길이)"""
+    rng = np.random.default_rng(0)
+    n_points = min(args.points, 500)
+    for n_features in (10, 100, 500):
+        point_sets, radii = [], []
+        for _ in range(n_features):
+            axis = rng.normal(size=3)
+            axis /= np.linalg.norm(axis)
+            basis = linearity_engine.orthogonal_basis(axis)
+            radius = rng.uniform(5, 50)
+            theta = rng.uniform(0, 2 * np.pi, n_points)
+            t = rng.uniform(0, rng.uniform(0.3, 5) * radius, n_points)
+            r = radius + rng.normal(0, 0.002, n_points)
+            point_sets.append(rng.normal(0, 100, 3) + t[:, None] * axis
+                              + (r * np.cos(theta))[:, None] * basis[:, 0] + (r * np.sin(theta))[:, None] * basis[:, 1])
+            radii.append(radius)
+
+        elapsed, fits = timed(fit_cylinders, point_sets)
+        error = max(abs(fit['radius'] - radius) for fit, radius in zip(fits, radii))
+        print(f"[form] 원통 {n_features}개 × {n_points:,} 점: {elapsed:.3f}초 (반지름 최대 오차 {error:.2e})")
+
+
+def legacy_kinematics(time, velocity):
+    """기존 구현: 샘플별 파이썬 루프 사다리꼴 적분"""
+    acceleration = np.gradient(velocity, time)
+    distance = np.zeros_like(time)
+    for i in range(1, len(time)):
+        dt = time[i] - time[i - 1]
+        distance[i] = distance[i - 1] + (velocity[i - 1] + velocity[i]) * dt / 2
+    jerk = np.gradient(acceleration, time)
+    return distance[-1], jerk
+
+
+def stream_kinematics(time, velocity, chunksize):
+    """청크 스트리밍 운동학 + 통계 누적"""
+    summary = speed_engine.KinematicsSummary()
+    chunks = ((time[i:i + chunksize], velocity[i:i + chunksize]) for i in range(0, len(time), chunksize))
+    for frame in speed_engine.iter_kinematics(chunks):
+        summary.update(frame)
+    return summary.statistics()['basic']['total_distance']
+
+
+def bench_speed(args):
+    """속도 로그 운동학(가속도/이동거리/저크) 계산 벤치마크 (1kHz 샘플링)"""
+    time = np.arange(args.points) * 1e-3
+    velocity = 10 + 5 * np.sin(time) + np.random.default_rng(0).normal(0, 0.01, args.points)
+
+    engine_time, frame = timed(speed_engine.compute_kinematics, time, velocity, repeat=3)
+    print(f"[engine] {args.points:,} 샘플: {engine_time:.3f}초 (이동거리 {frame['Distance_m'].iat[-1]:.3f} m)")
+
+    stream_time, distance = timed(stream_kinematics, time, velocity, speed_engine.DEFAULT_CHUNKSIZE)
+    print(f"[stream] {args.points:,} 샘플, 청크 {speed_engine.DEFAULT_CHUNKSIZE:,}: {stream_time:.3f}초 "
+          f"(이동거리 {distance:.3f} m)")
+
+    if args.skip_legacy:
+        return
+
+    legacy_time, (legacy_distance, _) = timed(legacy_kinematics, time, velocity)
+    print(f"[legacy] {args.points:,} 샘플: {legacy_time:.3f}초 (이동거리 {legacy_distance:.3f} m)")
+    print(f"속도 향상: {legacy_time / engine_time:.1f}x")
+
+
+def bench_speed_io(args):
+    """속도 로그 형식별 읽기 벤치마크 (.npy 메모리 매핑 / 원시 float / Parquet / CSV)"""
+    time = np.arange(args.points) * 1e-3
+    velocity = 10 + 5 * np.sin(time)
+    frame = pd.DataFrame({'Time_sec': time, 'Velocity_m/s': velocity})
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = {
+            'npy': os.path.join(directory, 'log.npy'),
+            'raw': os.path.join(directory, 'log.f64'),
+            'parquet': os.path.join(directory, 'log.parquet'),
+            'csv': os.path.join(directory, 'log.csv'),
+        }
+        np.save(paths['npy'], np.column_stack([time, velocity]))
+        np.column_stack([time, velocity]).tofile(paths['raw'])
+        frame.to_parquet(paths['parquet'])
+        frame.to_csv(paths['csv'], index=False)
+
+        for kind, path in paths.items():
+            columns = ('col_0', 'col_1') if kind in ('npy', 'raw') else ('Time_sec', 'Velocity_m/s')
+            elapsed, data = timed(speed_io.load_speed_log, path, *columns)
+            print(f"[{kind}] {len(data):,} 샘플: {elapsed:.3f}초")
+
+        if not args.skip_legacy:
+            legacy_time, _ = timed(pd.read_csv, paths['csv'])
+            print(f"[legacy csv] {args.points:,} 샘플: {legacy_time:.3f}초")
+
+
+def stream_filter(time, velocity, smoother, chunksize):
+    """청크 스트리밍 필터 (출력 샘플 수 반환)"""
+    chunks = ((time[i:i + chunksize], velocity[i:i + chunksize]) for i in range(0, len(time), chunksize))
+    return sum(len(values) for _, values in filters.iter_filtered(chunks, smoother))
+
+
+def bench_filters(args):
+    """스무딩/미분 필터 처리량 벤치마크 (1kHz 샘플링, 전체 배열 / 청크 스트리밍)"""
+    time = np.arange(args.points) * 1e-3
+    velocity = 10 + 5 * np.sin(time) + np.random.default_rng(0).normal(0, 0.01, args.points)
+    smoothers = {
+        'moving_average(5)': filters.MovingAverage(5),
+        'savgol(21, 3)': filters.SavitzkyGolay(21, 3),
+        'butterworth(10Hz, 4)': filters.Butterworth(10.0, 1000.0, 4),
+    }
+    chunksize = speed_engine.DEFAULT_CHUNKSIZE // 10
+
+    for name, smoother in smoothers.items():
+        elapsed, _ = timed(smoother.apply, velocity, repeat=3)
+        stream_time, _ = timed(stream_filter, time, velocity, smoother, chunksize)
+        print(f"[{name}] 커널 {2 * smoother.halo + 1:,} 샘플: {args.points / elapsed / 1e6:.1f} M샘플/초 "
+              f"(청크 {chunksize:,}: {args.points / stream_time / 1e6:.1f} M샘플/초)")
+
+    savgol = smoothers['savgol(21, 3)']
+    elapsed, _ = timed(speed_engine.compute_kinematics, time, velocity, 0.0, savgol, repeat=3)
+    print(f"[savgol kinematics] 평활 속도 + 해석적 가속도/저크: {args.points / elapsed / 1e6:.1f} M샘플/초")
+
+    if not args.skip_legacy:
+        legacy_time, _ = timed(lambda: pd.Series(velocity).rolling(5, center=True, min_periods=1).mean())
+        print(f"[legacy rolling(5)] {args.points / legacy_time / 1e6:.1f} M샘플/초")
+
+
+def bench_segments(args):
+    """운동 구간표(히스테리시스 + 런 길이 부호화 + 구간 통계) 벤치마크"""
+    time = np.arange(args.points) * 1e-3
+    velocity = 10 + 5 * np.sin(3 * time) + np.random.default_rng(0).normal(0, 5e-4, args.points)
+    frame = speed_engine.compute_kinematics(time, velocity)
+
+    for hysteresis in (0.0, 0.05):
+        elapsed, table = timed(motion_segments.segment_table, frame, speed_engine.ACC_THRESHOLD, hysteresis, repeat=3)
+        print(f"[segments] {args.points:,} 샘플, 히스테리시스 {hysteresis}: 구간 {len(table):,}개 {elapsed:.3f}초")
+
+
+def bench_spectral(args):
+    """가속도/저크 청크 Welch PSD + 스펙트로그램 벤치마크 (불균일 1kHz 샘플 → 등간격 재표본화)"""
+    rng = np.random.default_rng(0)
+    time = np.cumsum(rng.uniform(0.0009, 0.0011, args.points))
+    velocity = 10 + 0.01 * np.sin(2 * np.pi * 37.0 * time) + rng.normal(0, 1e-4, args.points)
+    frame = speed_engine.compute_kinematics(time, velocity)
+
+    for nperseg in (1024, 8192):
+        elapsed, result = timed(lambda: spectral.spectral_analysis(frame, nperseg=nperseg), repeat=3)
+        peak = result['frequencies'][np.argmax(result['psd'][0][1:]) + 1]
+        print(f"[spectral] {args.points:,} 샘플, 세그먼트 {nperseg}: {elapsed:.3f}초 "
+              f"(스펙트로그램 {result['spectrogram'].shape[2]}열, 피크 {peak:.2f} Hz)")
+
+
+def legacy_excel_export(frame):
+    """기존 Excel 내보내기 (pd.ExcelWriter 로 전체 워크북을 메모리에 구성)"""
+    buffer = BytesIO()
+    with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
+        frame.to_excel(writer, sheet_name='Analysis Results', index=False)
+    return buffer.getvalue()
+
+
+def bench_export(args):
+    """분석 결과 내보내기 형식별 생성 시간/파일 크기 벤치마크"""
+    time = np.arange(args.points) * 1e-3
+    velocity = 10 + 5 * np.sin(time) + np.random.default_rng(0).normal(0, 0.01, args.points)
+    frame = speed_engine.compute_kinematics(time, velocity)
+
+    for fmt in speed_export.available_formats():
+        elapsed, payload = timed(speed_export.export_bytes, frame, fmt)
+        print(f"[{fmt}] {args.points:,} 행: {elapsed:.3f}초 ({len(payload) / 1e6:.1f} MB)")
+
+    if args.skip_legacy or args.points > speed_export.EXCEL_MAX_ROWS:
+        return
+
+    legacy_time, payload = timed(legacy_excel_export, frame)
+    print(f"[legacy excel] {args.points:,} 행: {legacy_time:.3f}초 ({len(payload) / 1e6:.1f} MB)")
+
+
+def bench_runs(args, run_count=20):
+    """다중 주행 비교 벤치마크 (회차당 args.points 샘플 .npy, 순차 대비 프로세스 풀)"""
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as directory:
+        inputs = []
+        for k in range(run_count):
+            time = np.arange(args.points) * 1e-3
+            tau = np.clip(time - rng.uniform(0.1, 0.5), 0, None)
+            velocity = 2 * (1 - np.exp(-5 * tau) * np.cos(20 * tau)) + rng.normal(0, 1e-4, args.points)
+            path = os.path.join(directory, f"run_{k}.npy")
+            np.save(path, np.column_stack([time, velocity]))
+            inputs.append((f"run_{k}", path))
+        mapping = {'time_column': 'col_0', 'velocity_column': 'col_1'}
+
+        for workers in (1, os.cpu_count() or 1):
+            elapsed, comparison = timed(lambda: speed_batch.run_comparison(inputs, mapping, max_workers=workers))
+            spread = comparison['matrix']['motion_start'].std()
+            print(f"[runs] {run_count}회차 x {args.points:,} 샘플, 프로세스 {workers}: {elapsed:.3f}초 "
+                  f"(공통 시간축 {len(comparison['time']):,}점, 시작 시각 표준편차 {spread:.3f}초)")
+
+
+def sketch_stream(values, chunksize, k):
+    sketch = quantiles.QuantileSketch(k)
+    for start in range(0, len(values), chunksize):
+        sketch.update(values[start:start + chunksize])
+    return sketch
+
+
+def bench_quantiles(args):
+    """KLL 분위수 스케치 청크 갱신 벤치마크 (정확한 np.percentile 대비 순위 오차)"""
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(0, 1, args.points) + np.sin(np.arange(args.points) / 1e5)
+    q = np.array([0.5, 0.95, 0.99])
+
+    exact_time, exact = timed(np.percentile, values, q * 100)
+    print(f"[exact] {args.points:,} 값 np.percentile: {exact_time:.3f}초")
+    ordered = np.sort(values)
+    for k in (512, 2048):
+        elapsed, sketch = timed(sketch_stream, values, speed_engine.DEFAULT_CHUNKSIZE, k)
+        error = np.abs(np.searchsorted(ordered, sketch.quantiles(q)) / args.points - q).max()
+        print(f"[sketch] k={k}, 청크 {speed_engine.DEFAULT_CHUNKSIZE:,}: {elapsed:.3f}초 "
+              f"(보관 값 {sketch.size:,}개, 최대 순위 오차 {error * 100:.3f}%)")
+
+
+BENCHMARKS = {
+    'linearity': bench_linearity,
+    'robust': bench_robust,
+    'bootstrap': bench_bootstrap,
+    'registration': bench_registration,
+    'form': bench_form,
+    'speed': bench_speed,
+    'speed_io': bench_speed_io,
+    'filters': bench_filters,
+    'segments': bench_segments,
+    'spectral': bench_spectral,
+    'export': bench_export,
+    'runs': bench_runs,
+    'quantiles': bench_quantiles,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='분석 엔진 벤치마크')
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS), help='실행할 벤치마크')
+    parser.add_argument('--points', type=int, default=1_000_000, help='데이터 점 개수')
+    parser.add_argument('--skip-legacy', action='store_true', help='기존 구현 측정 생략')
+    args = parser.parse_args()
+
+    BENCHMARKS[args.benchmark](args)
+
+
+if __name__ == '__main__':
+    main()
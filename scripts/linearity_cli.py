@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+SPsystems 다기능 분석 도구 - 3D 선형성 분석 명령줄 도구
+Streamlit/Plotly 없이 측정 파일(CSV/Parquet/Excel)의 진직도·평행도·수직도 지표를
+UI와 동일한 파이프라인(linearity_batch.analyze_frame)으로 계산하여 JSON 또는 Parquet으로 저장합니다.
+
+사용 예:
+    python scripts/linearity_cli.py data/run_01.xlsx
+    python scripts/linearity_cli.py data/runs/ --min-zone -o metrics.parquet
+    python scripts/linearity_cli.py data/run_01.xlsx --machine GANTRY-01 > /dev/null
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from apps.analysis.linearity_batch import (  # noqa: E402
+    collect_measurement_paths, metrics_table, read_measurement, run_batch
+)
+from apps.analysis.linearity_store import DEFAULT_STORE_PATH, LinearityStore  # noqa: E402
+from apps.analysis.robust_fit import DEFAULT_MAX_HYPOTHESES  # noqa: E402
+
+OUTPUT_FORMATS = ('json', 'parquet')
+
+
+def output_format(args):
+    """출력 형식 결정 (지정값 → 출력 파일 확장자 → JSON)"""
+    if args.format:
+        return args.format
+    if args.output and args.output.lower().endswith('.parquet'):
+        return 'parquet'
+    return 'json'
+
+
+def json_safe(value):
+    """JSON 표준 값으로 변환 (NaN/무한대는 null, NumPy 배열/스칼라는 리스트/파이썬 수)"""
+    if isinstance(value, dict):
+        return {str(key): json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [json_safe(item) for item in value]
+    if hasattr(value, 'tolist'):
+        return json_safe(value.tolist())
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def write_json(results, output):
+    """회차별 결과를 JSON으로 저장 (output 이 없으면 표준 출력)"""
+    text = json.dumps({'runs': json_safe(results)}, ensure_ascii=False, indent=2, allow_nan=False)
+    if output:
+        Path(output).write_text(text + '\n', encoding='utf-8')
+    else:
+        print(text)
+
+
+def write_parquet(results, output):
+    """회차별 지표를 긴 테이블 Parquet 파일로 저장"""
+    if not output:
+        raise ValueError("Parquet 출력에는 --output 경로가 필요합니다.")
+    metrics_table(results).to_parquet(output, index=False)
+
+
+def record_history(machine, store_path, results):
+    """분석에 성공한 회차를 측정 이력 저장소에 추가"""
+    store = LinearityStore(store_path)
+    for result in results:
+        if result['linearity_metrics'] is not None:
+            store.record_run(machine, result['linearity_metrics'], source=result['run'])
+
+
+def registration_options(args):
+    """--align-to 옵션으로 좌표 정합 설정 구성 (기준 파일을 읽을 수 없으면 OSError/ValueError)"""
+    if not args.align_to:
+        return None
+    reference = 0 if args.align_to == 'first' else read_measurement(args.align_to, args.align_to)
+    return {'reference': reference, 'iterations': args.align_iterations}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='3D 선형성 분석 (Streamlit 없이 실행)')
+    parser.add_argument('paths', nargs='+', help='측정 파일 또는 디렉토리 (CSV/Parquet/Excel)')
+    parser.add_argument('-o', '--output', help='결과 파일 경로 (생략 시 JSON을 표준 출력)')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, help='출력 형식 (기본: 확장자로 판단)')
+    parser.add_argument('--fill-strategy', choices=['mean', 'zero', 'drop'], default='mean',
+                        help='NaN 처리 방법')
+    parser.add_argument('--min-zone', action='store_true', help='최소 영역(ISO 1101) 진직도 계산')
+    parser.add_argument('--sigma-outliers', action='store_true',
+                        help='좌표 컬럼별 3σ 기준 이상치 행 제거 (UI의 "3σ 기준 (좌표별)" 옵션)')
+    parser.add_argument('--robust', action='store_true', help='RANSAC 강건 적합으로 이상치 제거')
+    parser.add_argument('--max-hypotheses', type=int, default=DEFAULT_MAX_HYPOTHESES,
+                        help='강건 적합 최대 가설 수')
+    parser.add_argument('--bootstrap', type=int, default=0, metavar='N',
+                        help='방향/각도 부트스트랩 신뢰구간 재표본 수 (0: 계산 안 함)')
+    parser.add_argument('--align-to', metavar='PATH|first',
+                        help='좌표 정합 기준 (기준/공칭 점 파일 경로 또는 첫 번째 회차 first)')
+    parser.add_argument('--align-iterations', type=int, default=2, help='재정합 반복 수')
+    parser.add_argument('--machine', help='장비 ID (지정 시 결과를 측정 이력 저장소에 추가)')
+    parser.add_argument('--store', default=DEFAULT_STORE_PATH, help='측정 이력 저장소 경로 (SQLite)')
+    parser.add_argument('--workers', type=int, default=None, help='병렬 작업 프로세스 수')
+    args = parser.parse_args(argv)
+
+    try:
+        paths = collect_measurement_paths(args.paths)
+    except FileNotFoundError as e:
+        parser.error(str(e))
+    if not paths:
+        parser.error("분석할 측정 파일이 없습니다.")
+
+    robust_options = {'max_hypotheses': args.max_hypotheses} if args.robust else None
+    inputs = [(os.path.relpath(path), path) for path in paths]
+    try:
+        results = run_batch(inputs, fill_strategy=args.fill_strategy, min_zone=args.min_zone,
+                            max_workers=args.workers, robust_options=robust_options,
+                            bootstrap=args.bootstrap, registration=registration_options(args),
+                            sigma_outliers=args.sigma_outliers)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+
+    if output_format(args) == 'parquet':
+        write_parquet(results, args.output)
+    else:
+        write_json(results, args.output)
+
+    if args.machine:
+        record_history(args.machine, args.store, results)
+
+    failed = [result for result in results if result['error']]
+    for result in failed:
+        print(f"❌ {result['run']}: {result['error']}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
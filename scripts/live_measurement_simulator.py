@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+SPsystems 다기능 분석 도구 - 실시간 측정 장비 모사 스크립트
+갠트리 축 측정점을 일정 주기로 CSV 파일에 추가하거나 로컬 TCP 소켓으로 전송합니다.
+주기적으로 심(shim) 조정을 모사하여 축 방향이 조금씩 바뀝니다.
+
+사용 예:
+    python scripts/live_measurement_simulator.py --csv data/live_measurement.csv --rate 200
+    python scripts/live_measurement_simulator.py --port 5757 --rate 500
+"""
+
+import argparse
+import socket
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from apps.analysis.linearity_live import DEFAULT_PORT  # noqa: E402
+
+AXIS_DIRECTIONS = {
+    'X1': np.array([1.0, 0.0, 0.0]),
+    'X2': np.array([1.0, 0.0, 0.0]),
+    'Y': np.array([0.0, 1.0, 0.0]),
+    'Z': np.array([0.0, 0.0, 1.0])
+}
+AXIS_ORIGINS = {
+    'X1': np.array([0.0, 0.0, 0.0]),
+    'X2': np.array([0.0, 1500.0, 0.0]),
+    'Y': np.array([0.0, 0.0, 0.0]),
+    'Z': np.array([0.0, 0.0, 0.0])
+}
+
+
+def measurement_rows(rng, noise, shim_period, stroke=2000.0):
+    """측정 행 생성기 (축별 한 점씩, 심 조정 주기마다 X2 기울기 감소)"""
+    misalignment = 0.002
+    start = time.monotonic()
+    while True:
+        adjustments = int((time.monotonic() - start) // shim_period)
+        tilt = misalignment * 0.5 ** adjustments
+        row = {}
+        for axis, direction in AXIS_DIRECTIONS.items():
+            if axis == 'X2':
+                direction = direction + np.array([0.0, tilt, 0.0])
+                direction = direction / np.linalg.norm(direction)
+            t = rng.uniform(0, stroke)
+            row[axis] = AXIS_ORIGINS[axis] + t * direction + rng.normal(0, noise, 3)
+        yield row
+
+
+def run_csv(path, rows, rate):
+    """CSV 파일에 행 추가 (헤더 포함, 행마다 flush)"""
+    columns = [f"{axis}_{c}" for axis in AXIS_DIRECTIONS for c in 'xyz']
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(','.join(columns) + '\n')
+        f.flush()
+        for row in rows:
+            f.write(','.join(f"{v:.6f}" for axis in AXIS_DIRECTIONS for v in row[axis]) + '\n')
+            f.flush()
+            time.sleep(1.0 / rate)
+
+
+def run_socket(port, rows, rate):
+    """로컬 TCP 소켓으로 'AXIS,x,y,z' 줄 전송"""
+    with socket.create_connection(('127.0.0.1', port)) as connection:
+        for row in rows:
+            payload = ''.join(f"{axis},{p[0]:.6f},{p[1]:.6f},{p[2]:.6f}\n" for axis, p in row.items())
+            connection.sendall(payload.encode('utf-8'))
+            time.sleep(1.0 / rate)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='실시간 측정 장비 모사')
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--csv', help='측정점을 추가할 CSV 파일 경로')
+    target.add_argument('--port', type=int, nargs='?', const=DEFAULT_PORT, help='전송할 로컬 TCP 포트')
+    parser.add_argument('--rate', type=float, default=200.0, help='초당 측정 행 수')
+    parser.add_argument('--noise', type=float, default=0.005, help='측정 잡음 표준편차')
+    parser.add_argument('--shim-period', type=float, default=10.0, help='심 조정 주기 (초)')
+    args = parser.parse_args()
+
+    rows = measurement_rows(np.random.default_rng(), args.noise, args.shim_period)
+    try:
+        if args.csv:
+            run_csv(args.csv, rows, args.rate)
+        else:
+            run_socket(args.port, rows, args.rate)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
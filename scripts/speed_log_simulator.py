@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+SPsystems 다기능 분석 도구 - 속도 로그 기록 모사 스크립트
+시험대 가속/감속 주행의 시간-속도 샘플을 일정 주기로 CSV 또는 원시 float64 파일에 추가합니다.
+
+사용 예:
+    python scripts/speed_log_simulator.py --csv data/live_speed.csv --rate 1000
+    python scripts/speed_log_simulator.py --raw data/live_speed.f64 --rate 5000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+
+def speed_blocks(rng, rate, block, noise):
+    """(시간, 속도) 블록 생성기 (가속 - 등속 - 감속 반복 주행)"""
+    start = 0
+    while True:
+        t = (start + np.arange(block)) / rate
+        phase = t % 30.0
+        profile = np.clip(np.minimum(phase, 25.0 - phase) * 2.0, 0.0, 20.0)
+        yield t, profile + rng.normal(0, noise, block)
+        start += block
+
+
+def main():
+    parser = argparse.ArgumentParser(description='속도 로그 기록 모사')
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--csv', help='샘플을 추가할 CSV 파일 경로 (Time_sec, Velocity_m/s)')
+    target.add_argument('--raw', help='샘플을 추가할 원시 float64 파일 경로 (샘플당 시간, 속도 2개 값)')
+    parser.add_argument('--rate', type=float, default=1000.0, help='초당 샘플 수')
+    parser.add_argument('--flush', type=float, default=0.1, help='파일에 추가하는 주기 (초)')
+    parser.add_argument('--noise', type=float, default=0.02, help='속도 잡음 표준편차 (m/s)')
+    args = parser.parse_args()
+
+    block = max(1, int(args.rate * args.flush))
+    blocks = speed_blocks(np.random.default_rng(), args.rate, block, args.noise)
+    path = args.csv or args.raw
+    try:
+        with open(path, 'w' if args.csv else 'wb') as f:
+            if args.csv:
+                f.write('Time_sec,Velocity_m/s\n')
+            for t, velocity in blocks:
+                if args.csv:
+                    f.write(''.join(f"{a:.6f},{b:.6f}\n" for a, b in zip(t, velocity)))
+                else:
+                    f.write(np.column_stack([t, velocity]).astype('<f8').tobytes())
+                f.flush()
+                time.sleep(args.flush)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,694 @@
+"""
+3D 선형성 분석 엔진 테스트
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from apps.analysis import linearity_engine  # noqa: E402
+
+
+def make_line(n_points, direction, origin=(0.0, 0.0, 0.0), noise=0.01, seed=0):
+    """잡음이 섞인 직선 점군 생성"""
+    rng = np.random.default_rng(seed)
+    direction = np.asarray(direction, dtype=float)
+    direction /= np.linalg.norm(direction)
+    t = np.linspace(-500, 500, n_points)
+    return np.asarray(origin) + t[:, None] * direction + rng.normal(0, noise, (n_points, 3))
+
+
+@pytest.fixture
+def data_points():
+    """X1/Y/Z 축 측정 점군"""
+    return {
+        'X1': make_line(400, [1, 0.001, 0], origin=(1000, 200, 50), seed=1),
+        'Y': make_line(300, [0, 1, 0.002], origin=(-300, 0, 10), seed=2),
+        'Z': make_line(200, [0.001, 0, 1], seed=3),
+    }
+
+
+class TestLineFit:
+    """직선 적합 테스트"""
+
+    def test_matches_sklearn_pca(self, data_points):
+        """공분산 고유값 분해 결과가 sklearn PCA와 일치하는지 확인"""
+        PCA = pytest.importorskip("sklearn.decomposition").PCA
+        results = linearity_engine.fit_lines(data_points)
+
+        for axis, points in data_points.items():
+            pca = PCA(n_components=1).fit(points)
+            direction = results[axis]['direction_vector']
+            assert abs(np.dot(direction, pca.components_[0])) == pytest.approx(1.0, abs=1e-12)
+            np.testing.assert_allclose(results[axis]['point_on_line'], pca.mean_)
+            assert results[axis]['explained_variance_ratio'] == pytest.approx(
+                pca.explained_variance_ratio_[0])
+            assert results[axis]['singular_values'] == pytest.approx(pca.singular_values_[0])
+
+    def test_skips_axes_with_too_few_points(self):
+        """점이 2개 미만인 축은 적합하지 않는지 확인"""
+        results = linearity_engine.fit_lines({'X1': np.zeros((1, 3)), 'Y': make_line(10, [0, 1, 0])})
+        assert list(results) == ['Y']
+
+
+class TestLinearityMetrics:
+    """선형성 지표 테스트"""
+
+    def test_distances_match_loop(self, data_points):
+        """일괄 거리 계산이 점별 루프 계산과 일치하는지 확인"""
+        results = linearity_engine.fit_lines(data_points)
+        points = data_points['X1']
+        p0 = results['X1']['point_on_line']
+        d = results['X1']['direction_vector']
+
+        expected = [np.linalg.norm(p - (p0 + np.dot(p - p0, d) * d)) for p in points]
+        np.testing.assert_allclose(linearity_engine.line_distances(points, p0, d), expected, atol=1e-9)
+
+    def test_metric_structure_and_angles(self, data_points):
+        """지표 구조와 축 간 각도 확인"""
+        results = linearity_engine.fit_lines(data_points)
+        metrics = linearity_engine.compute_linearity_metrics(data_points, results)
+
+        assert set(metrics['linearity']) == {'X1', 'Y', 'Z'}
+        assert set(metrics['parallelism']) == {'X1_Y', 'X1_Z', 'Y_Z'}
+        assert metrics['perpendicularity']['X1_Y']['angle_deg'] == pytest.approx(90, abs=0.2)
+        assert metrics['linearity']['X1']['max_distance'] < 0.1
+
+
+class TestStreamingAnalysis:
+    """스트리밍 선형성 분석 테스트"""
+
+    def test_moments_merge_matches_full_fit(self, data_points):
+        """청크별 누적값 병합 결과가 전체 적합과 일치하는지 확인"""
+        points = data_points['X1']
+        merged = linearity_engine.AxisMoments()
+        for chunk in np.array_split(points, 7):
+            merged.merge(linearity_engine.AxisMoments().update(chunk))
+
+        expected = linearity_engine.fit_lines({'X1': points})['X1']
+        fit = merged.fit()
+        np.testing.assert_allclose(fit['point_on_line'], expected['point_on_line'])
+        np.testing.assert_allclose(fit['direction_vector'], expected['direction_vector'], atol=1e-12)
+
+    def test_stream_matches_in_memory(self, data_points, tmp_path):
+        """CSV 스트리밍 결과가 메모리 내 분석과 일치하는지 확인"""
+        import pandas as pd
+        from apps.analysis.linearity_stream import stream_linearity_analysis
+
+        frame = pd.DataFrame({
+            f"{axis}_{c}": pd.Series(points[:, k])
+            for axis, points in data_points.items() for k, c in enumerate('xyz')
+        })
+        path = tmp_path / "rail.csv"
+        frame.to_csv(path, index=False)
+
+        results = stream_linearity_analysis(str(path), chunksize=64, sample_size=50)
+        expected = linearity_engine.compute_linearity_metrics(
+            data_points, linearity_engine.fit_lines(data_points))
+
+        for axis in data_points:
+            for key, value in expected['linearity'][axis].items():
+                assert results['linearity_metrics']['linearity'][axis][key] == pytest.approx(value)
+            assert len(results['data_points'][axis]) == 50
+        assert results['point_counts'] == {axis: len(p) for axis, p in data_points.items()}
+
+
+class TestMinimumZone:
+    """최소 영역 진직도 테스트"""
+
+    def test_recovers_cylinder_diameter(self):
+        """원통 내부/표면 점군에서 원통 지름을 복원하는지 확인"""
+        rng = np.random.default_rng(4)
+        n, radius = 5000, 0.02
+        direction = np.array([1.0, 0.3, 0.1]) / np.linalg.norm([1.0, 0.3, 0.1])
+        basis = linearity_engine.orthogonal_basis(direction)
+        r = radius * np.sqrt(rng.uniform(0, 1, n))
+        r[:40] = radius
+        theta = rng.uniform(0, 2 * np.pi, n)
+        points = (np.array([100.0, 200.0, 300.0]) + rng.uniform(0, 2000, n)[:, None] * direction
+                  + (r * np.cos(theta))[:, None] * basis[:, 0] + (r * np.sin(theta))[:, None] * basis[:, 1])
+
+        from apps.analysis.minimum_zone import minimum_zone_straightness
+        fit = linearity_engine.fit_lines({'X1': points})['X1']
+        zone = minimum_zone_straightness(points, fit)
+        assert zone['min_zone_straightness'] == pytest.approx(2 * radius, rel=1e-4)
+
+    def test_not_larger_than_pca_zone(self, data_points):
+        """최소 영역 진직도가 PCA 기준 영역 이하인지 확인"""
+        results = linearity_engine.fit_lines(data_points)
+        metrics = linearity_engine.compute_linearity_metrics(data_points, results, min_zone=True)
+        for values in metrics['linearity'].values():
+            assert values['min_zone_straightness'] <= values['pca_zone'] * (1 + 1e-9)
+
+
+class TestRobustFit:
+    """강건 직선 적합 테스트"""
+
+    def test_rejects_gross_outliers_by_line_distance(self):
+        """직선에서 크게 벗어난 점만 제거하는지 확인"""
+        from apps.analysis.robust_fit import ransac_line
+
+        rng = np.random.default_rng(5)
+        points = make_line(5000, [1, 0.02, -0.01], origin=(150, 320, 45), seed=6)
+        outliers = rng.choice(len(points), size=500, replace=False)
+        points[outliers] += rng.choice([-1, 1], size=(500, 3)) * rng.uniform(0.5, 5, (500, 3))
+
+        result = ransac_line(points, time_budget=5.0)
+        expected = np.zeros(len(points), dtype=bool)
+        expected[outliers] = True
+
+        assert not result['inlier_mask'][outliers].any()
+        assert result['inlier_mask'][~expected].mean() > 0.99
+        assert result['hypotheses'] <= 2048
+
+    def test_exact_line_keeps_all_inliers(self):
+        """잡음 없는 직선(중앙값 거리 0)에서도 반올림 오차만 있는 정상점을 모두 남기는지 확인"""
+        from apps.analysis.robust_fit import ransac_line
+
+        t = np.linspace(-100, 100, 2000)[:, None]
+        points = np.array([150.3, 320.7, 45.1]) + t * np.array([0.8, 0.36, -0.48])
+        points[::100] += 2.0
+
+        result = ransac_line(points)
+        assert result['threshold'] > 0
+        assert result['inlier_mask'].sum() == len(points) - 20
+        assert not result['inlier_mask'][::100].any()
+
+
+class TestBatchAnalysis:
+    """다중 측정 배치 평가 테스트"""
+
+    def test_zip_batch_comparison(self, data_points):
+        """ZIP 내 측정 파일을 병렬 분석하여 회차 순서대로 비교하는지 확인"""
+        import io
+        import zipfile
+        import pandas as pd
+        from apps.analysis.linearity_batch import batch_comparison_table, expand_inputs, run_batch
+
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, 'w') as zf:
+            for run in (10, 2, 1):
+                frame = pd.DataFrame({
+                    f"{axis}_{c}": pd.Series(points[:, k] * run)
+                    for axis, points in data_points.items() for k, c in enumerate('xyz')
+                })
+                zf.writestr(f"run_{run}.csv", frame.to_csv(index=False))
+        inputs = expand_inputs([("runs.zip", archive.getvalue()), ("notes.txt", b"")])
+
+        results = run_batch(inputs, max_workers=2)
+        table = batch_comparison_table(results)
+
+        assert [r['run'] for r in results] == ['run_1.csv', 'run_2.csv', 'run_10.csv']
+        assert all(r['error'] is None for r in results)
+        assert list(table.index) == ['run_1.csv', 'run_2.csv', 'run_10.csv']
+        assert '수직도 각도 (도) X1_Y' in table.columns
+
+
+class TestVoxelDownsample:
+    """3D 시각화 복셀 다운샘플링 테스트"""
+
+    def test_budget_and_worst_points(self):
+        """표시 점 예산을 지키면서 잔차 상위 점을 항상 포함하는지 확인"""
+        points = make_line(50_000, [1, 0.01, 0], noise=0.05, seed=7)
+        fit = linearity_engine.fit_lines({'X1': points})['X1']
+        residuals = linearity_engine.line_distances(points, fit['point_on_line'], fit['direction_vector'])
+
+        index = linearity_engine.voxel_downsample(points, 2000, residuals, keep_worst=100)
+        worst = np.argsort(residuals)[-100:]
+
+        assert len(index) <= 2000 + 100
+        assert len(index) > 1000
+        assert np.isin(worst, index).all()
+        assert np.all(np.diff(index) > 0)
+
+    def test_small_input_is_kept(self):
+        """예산 이하의 점군은 그대로 유지하는지 확인"""
+        points = make_line(50, [0, 1, 0])
+        np.testing.assert_array_equal(linearity_engine.voxel_downsample(points, 100), np.arange(50))
+
+
+class TestHeadlessCli:
+    """Streamlit 없는 명령줄 분석 테스트"""
+
+    def test_directory_to_json_and_parquet(self, data_points, tmp_path):
+        """디렉토리 입력을 UI와 같은 지표로 JSON/Parquet 출력하는지 확인"""
+        import json
+        import pandas as pd
+        sys.path.insert(0, str(project_root / "scripts"))
+        import linearity_cli
+
+        runs = tmp_path / "runs"
+        runs.mkdir()
+        frame = pd.DataFrame({
+            f"{axis}_{c}": pd.Series(points[:, k])
+            for axis, points in data_points.items() for k, c in enumerate('xyz')
+        })
+        frame.to_csv(runs / "run_2.csv", index=False)
+        frame.to_parquet(runs / "run_10.parquet", index=False)
+
+        json_path = tmp_path / "metrics.json"
+        assert linearity_cli.main([str(runs), "-o", str(json_path)]) == 0
+        payload = json.loads(json_path.read_text(encoding='utf-8'))
+        expected = linearity_engine.compute_linearity_metrics(
+            data_points, linearity_engine.fit_lines(data_points))
+
+        assert [Path(r['run']).name for r in payload['runs']] == ['run_2.csv', 'run_10.parquet']
+        for run in payload['runs']:
+            assert run['linearity_metrics']['linearity']['X1']['max_distance'] == pytest.approx(
+                expected['linearity']['X1']['max_distance'])
+
+        parquet_path = tmp_path / "metrics.parquet"
+        assert linearity_cli.main([str(runs), "-o", str(parquet_path)]) == 0
+        table = pd.read_parquet(parquet_path)
+        assert set(table['group']) == {'linearity', 'parallelism', 'perpendicularity'}
+
+    def test_registration_to_json(self, data_points, tmp_path):
+        """좌표 정합 결과가 내부 배열 없이 JSON 으로 출력되는지 확인"""
+        import json
+        import pandas as pd
+        sys.path.insert(0, str(project_root / "scripts"))
+        import linearity_cli
+
+        paths = []
+        for k, offset in enumerate((0.0, 25.0)):
+            frame = pd.DataFrame({
+                f"{axis}_{c}": pd.Series(points[:, j] + offset)
+                for axis, points in data_points.items() for j, c in enumerate('xyz')
+            })
+            paths.append(tmp_path / f"run_{k}.csv")
+            frame.to_csv(paths[-1], index=False)
+
+        json_path = tmp_path / "aligned.json"
+        assert linearity_cli.main([*map(str, paths), "--align-to", "first", "--workers", "1",
+                                   "-o", str(json_path)]) == 0
+        payload = json.loads(json_path.read_text(encoding='utf-8'))
+        moved = payload['runs'][1]
+        assert 'pca_results' not in moved and 'registration_frame' not in moved
+        assert moved['linearity_metrics']['registration']['frame']['translation'] == pytest.approx(
+            25.0 * np.sqrt(3), rel=1e-3)
+
+    def test_registration_errors_and_nan(self, data_points, tmp_path):
+        """대응점이 부족한 회차의 NaN 은 null 로 쓰고, 대응 불가 입력은 메시지와 함께 실패 코드를 반환하는지 확인"""
+        import json
+        import pandas as pd
+        sys.path.insert(0, str(project_root / "scripts"))
+        import linearity_cli
+
+        frame = pd.DataFrame({
+            f"{axis}_{c}": pd.Series(points[:, j])
+            for axis, points in data_points.items() for j, c in enumerate('xyz')
+        })
+        frame.insert(0, 'Point', [f"P{k}" for k in range(len(frame))])
+        frame.to_csv(tmp_path / "run_0.csv", index=False)
+        frame.iloc[:1].assign(Point='other').to_csv(tmp_path / "run_1.csv", index=False)
+        json_path = tmp_path / "aligned.json"
+        assert linearity_cli.main([str(tmp_path / "run_0.csv"), str(tmp_path / "run_1.csv"),
+                                   "--align-to", "first", "--workers", "1", "-o", str(json_path)]) == 0
+        text = json_path.read_text(encoding='utf-8')
+        assert 'NaN' not in text
+        assert json.loads(text)['runs'][1]['linearity_metrics']['registration']['frame']['rms'] is None
+
+        frame.drop(columns='Point').to_csv(tmp_path / "run_1.csv", index=False)
+        assert linearity_cli.main([str(tmp_path / "run_0.csv"), str(tmp_path / "run_1.csv"),
+                                   "--align-to", "first", "--workers", "1", "-o", str(json_path)]) == 2
+
+    def test_sigma_outliers_match_shared_pipeline(self, data_points, tmp_path):
+        """--sigma-outliers 결과가 UI와 같은 analyze_frame(3σ 제거) 결과와 같은지 확인"""
+        import json
+        import pandas as pd
+        sys.path.insert(0, str(project_root / "scripts"))
+        import linearity_cli
+        from apps.analysis.linearity_batch import analyze_frame
+
+        frame = pd.DataFrame({f"X1_{c}": data_points['X1'][:, k] for k, c in enumerate('xyz')})
+        frame.loc[::97, 'X1_y'] += 50.0
+        frame.to_csv(tmp_path / "run.csv", index=False)
+
+        json_path = tmp_path / "metrics.json"
+        maxima = []
+        for flags in ([], ["--sigma-outliers"]):
+            assert linearity_cli.main([str(tmp_path / "run.csv"), *flags, "-o", str(json_path)]) == 0
+            run = json.loads(json_path.read_text(encoding='utf-8'))['runs'][0]
+            maxima.append(run['linearity_metrics']['linearity']['X1']['max_distance'])
+
+        expected = analyze_frame(frame.copy(), sigma_outliers=True)
+        assert expected['outliers_removed'] >= len(frame.iloc[::97])
+        assert maxima[1] == pytest.approx(expected['linearity_metrics']['linearity']['X1']['max_distance'])
+        assert maxima[1] < maxima[0]
+
+    def test_does_not_import_streamlit(self):
+        """명령줄 시작 경로가 Streamlit/Plotly 를 불러오지 않는지 확인"""
+        import subprocess
+
+        code = ("import sys; sys.path.insert(0, 'scripts'); import linearity_cli; "
+                "print(any(m.split('.')[0] in ('streamlit', 'plotly') for m in sys.modules))")
+        output = subprocess.run([sys.executable, "-c", code], cwd=project_root,
+                                capture_output=True, text=True, check=True).stdout
+        assert output.strip() == 'False'
+
+
+class TestBootstrapIntervals:
+    """방향/각도 부트스트랩 신뢰구간 테스트"""
+
+    def test_intervals_cover_estimates(self, data_points):
+        """신뢰구간이 점 추정값을 포함하고 지표 테이블에 추가되는지 확인"""
+        results = linearity_engine.fit_lines(data_points)
+        metrics = linearity_engine.compute_linearity_metrics(data_points, results, bootstrap=2000)
+
+        for group in ('parallelism', 'perpendicularity'):
+            for values in metrics[group].values():
+                assert values['angle_ci_low'] <= values['angle_deg'] <= values['angle_ci_high']
+        for values in metrics['linearity'].values():
+            assert 0 < values['direction_ci_deg'] < 0.01
+
+    def test_anti_aligned_directions(self):
+        """적합 방향 내적이 음수여도 각도 신뢰구간이 점 추정값을 포함하는지 확인"""
+        points = {'X1': make_line(500, [1, 0.01, 0], noise=0.001, seed=12),
+                  'Y': make_line(500, [-0.02, 1, 0], noise=0.001, seed=13)}
+        results = linearity_engine.fit_lines(points)
+        # 방향 벡터 부호는 임의이므로 두 방향의 내적이 음수가 되도록 고정
+        if np.dot(results['X1']['direction_vector'], results['Y']['direction_vector']) > 0:
+            results['Y']['direction_vector'] = -np.asarray(results['Y']['direction_vector'])
+        metrics = linearity_engine.compute_linearity_metrics(points, results, bootstrap=500)
+
+        for group in ('parallelism', 'perpendicularity'):
+            values = metrics[group]['X1_Y']
+            assert values['angle_ci_low'] <= values['angle_deg'] <= values['angle_ci_high']
+        assert metrics['perpendicularity']['X1_Y']['angle_ci_high'] < 90
+
+    def test_interval_width_shrinks_with_points(self):
+        """측정점이 많을수록 각도 신뢰구간이 좁아지는지 확인"""
+        from apps.analysis.linearity_bootstrap import bootstrap_intervals
+
+        widths = []
+        for n in (20, 2000):
+            points = {'X1': make_line(n, [1, 0, 0], noise=0.05, seed=8),
+                      'Y': make_line(n, [0, 1, 0], noise=0.05, seed=9)}
+            intervals = bootstrap_intervals(points, linearity_engine.fit_lines(points), n_resamples=2000)
+            low, high = intervals['angles']['X1_Y']['perpendicular']
+            assert low <= 90 <= high
+            widths.append(high - low)
+        assert widths[1] < widths[0] / 3
+
+
+class TestHistoryStore:
+    """측정 이력 저장소 테스트"""
+
+    def test_drift_query_by_machine_axis_and_time(self, data_points, tmp_path):
+        """장비/축/기간 조건으로 이력을 조회하고 추세를 요약하는지 확인"""
+        from apps.analysis.linearity_store import LinearityStore, drift_summary
+
+        store = LinearityStore(tmp_path / "history.sqlite")
+        results = linearity_engine.fit_lines(data_points)
+        metrics = linearity_engine.compute_linearity_metrics(data_points, results)
+        for month in range(1, 7):
+            metrics['linearity']['X1']['max_distance'] = 0.01 * month
+            store.record_run('M1', metrics, results, measured_at=f"2026-{month:02d}-01")
+        store.record_run('M2', metrics, measured_at="2026-03-01")
+
+        history = store.query_drift('M1', targets=['X1'], metrics=['max_distance'], since="2026-03-01")
+        assert list(history['value']) == pytest.approx([0.03, 0.04, 0.05, 0.06])
+        assert store.machines() == ['M1', 'M2']
+
+        summary = drift_summary(history)
+        assert summary.loc[0, 'change'] == pytest.approx(0.03)
+        assert summary.loc[0, 'slope_per_month'] == pytest.approx(0.01, rel=0.05)
+
+        run_id = history['run_id'].iloc[-1]
+        np.testing.assert_allclose(store.lines(run_id)['Y']['direction_vector'], results['Y']['direction_vector'])
+        store.delete_run(run_id)
+        assert store.lines(run_id) == {}
+        assert len(store.runs('M1')) == 5
+
+    def test_open_existing_and_trend_index(self, tmp_path):
+        """없는 저장소는 만들지 않고, 대상 조건이 없는 추세 조회도 인덱스를 사용하는지 확인"""
+        import sqlite3
+        from apps.analysis.linearity_store import LinearityStore
+
+        path = tmp_path / "history.sqlite"
+        assert LinearityStore.open(path) is None
+        assert not path.exists()
+
+        LinearityStore(path)
+        assert LinearityStore.open(path) is not None
+        with sqlite3.connect(path) as connection:
+            plan = connection.execute(
+                'EXPLAIN QUERY PLAN SELECT m.run_id FROM metrics m JOIN runs r ON r.run_id = m.run_id '
+                'WHERE m.machine_id = ? AND m.metric IN (?) AND m.metric_group IN (?) AND m.measured_at >= ? '
+                'ORDER BY m.measured_at, m.run_id', ('M1', 'max_distance', 'linearity', '2026-01-01')
+            ).fetchall()
+        assert any('idx_metrics_drift' in row[-1] for row in plan)
+
+
+def random_rotation(rng):
+    """무작위 회전 행렬 (QR 분해, det=+1)"""
+    q, r = np.linalg.qr(rng.normal(size=(3, 3)))
+    q *= np.sign(np.diag(r))
+    return q * np.sign(np.linalg.det(q))
+
+
+class TestRegistration:
+    """Kabsch 좌표 정합 테스트"""
+
+    def test_batched_kabsch_recovers_transforms(self):
+        """여러 회차의 강체 변환을 한 번에 복원하고 반복 정합으로 이동된 목표점을 제외하는지 확인"""
+        from apps.analysis.registration import register_batch
+
+        rng = np.random.default_rng(10)
+        reference = rng.uniform(-1000, 1000, (500, 3))
+        rotations = np.stack([random_rotation(rng) for _ in range(50)])
+        translations = rng.normal(0, 300, (50, 3))
+        # 기준 = R · source + t 가 되도록 source 생성
+        sources = np.einsum('rji,rnj->rni', rotations, reference[None] - translations[:, None])
+        sources += rng.normal(0, 0.005, sources.shape)
+        sources[:, :10] += 2.0
+        sources[3, 20:30] = np.nan
+
+        plain = register_batch(sources, reference)
+        refined = register_batch(sources, reference, iterations=2)
+
+        assert np.abs(refined['rotation'] - rotations).max() < 1e-5
+        assert np.abs(refined['translation'] - translations).max() < 1e-2
+        assert np.all(refined['rms'] < plain['rms'])
+        assert refined['matched'][3] == 480
+        np.testing.assert_allclose(np.linalg.det(refined['rotation']), 1.0)
+
+    def test_batch_alignment_metrics(self, data_points):
+        """배치 분석에서 기준 회차 대비 방향/위치 편차가 정합 후 0에 가까운지 확인"""
+        import pandas as pd
+        from apps.analysis.linearity_batch import run_batch
+
+        rng = np.random.default_rng(11)
+        rotation, translation = random_rotation(rng), np.array([50.0, -20.0, 10.0])
+        frames = []
+        for transform in (False, True):
+            frame = {}
+            for axis, points in data_points.items():
+                moved = points @ rotation.T + translation if transform else points
+                for k, c in enumerate('xyz'):
+                    frame[f"{axis}_{c}"] = pd.Series(moved[:, k])
+            frames.append(pd.DataFrame(frame))
+        inputs = [(f"run_{k}.csv", frame.to_csv(index=False).encode()) for k, frame in enumerate(frames)]
+
+        results = run_batch(inputs, max_workers=1, registration={'reference': 0, 'iterations': 1})
+        moved = results[1]['linearity_metrics']
+        assert moved['registration']['frame']['rotation_deg'] > 1
+        assert moved['registration']['frame']['rms'] < 1e-6
+        for values in moved['alignment'].values():
+            assert values['direction_deviation_deg'] < 1e-6
+            assert values['line_offset'] < 1e-6
+        assert 'registration_frame' not in results[1]
+
+    def test_matches_targets_by_id(self, data_points):
+        """목표점 ID 컬럼이 있으면 행 순서/개수가 다른 회차도 같은 ID 끼리 정합하는지 확인"""
+        import pandas as pd
+        from apps.analysis.linearity_batch import run_batch
+
+        rng = np.random.default_rng(13)
+        rotation, translation = random_rotation(rng), np.array([-30.0, 5.0, 80.0])
+        frames = []
+        for transform in (False, True):
+            frame = {'Target': pd.Series([f"T{k}" for k in range(400)])}
+            for axis, points in data_points.items():
+                moved = points @ rotation.T + translation if transform else points
+                for k, c in enumerate('xyz'):
+                    frame[f"{axis}_{c}"] = pd.Series(moved[:, k])
+            frames.append(pd.DataFrame(frame))
+        # 두 번째 회차는 행을 섞고 일부 목표점을 빠뜨림
+        frames[1] = frames[1].sample(frac=1.0, random_state=0).iloc[:350]
+        inputs = [(f"run_{k}.csv", frame.to_csv(index=False).encode()) for k, frame in enumerate(frames)]
+
+        results = run_batch(inputs, max_workers=1, registration={'reference': 0})
+        frame_metrics = results[1]['linearity_metrics']['registration']['frame']
+        assert frame_metrics['rms'] < 1e-6
+        assert frame_metrics['matched'] < 900
+
+        frames[0] = frames[0].drop(columns='Target')
+        inputs = [(f"run_{k}.csv", frame.to_csv(index=False).encode()) for k, frame in enumerate(frames)]
+        with pytest.raises(ValueError):
+            run_batch(inputs, max_workers=1, registration={'reference': 0})
+
+
+class TestLiveLineFit:
+    """실시간 직선 적합 테스트"""
+
+    def test_rank_one_window_matches_refit(self):
+        """랭크 1 갱신/역갱신 결과가 최근 구간 점의 전체 적합과 일치하는지 확인"""
+        from apps.analysis.linearity_live import LiveLineFit
+
+        points = make_line(1500, [1, 0.01, 0.002], noise=0.05, seed=12)
+        live = LiveLineFit(window=1000)
+        for point in points:
+            live.push('X1', point)
+
+        snapshot = live.snapshot()
+        expected = linearity_engine.fit_lines({'X1': points[-1000:]})['X1']
+        fit = snapshot['pca_results']['X1']
+        np.testing.assert_allclose(fit['point_on_line'], expected['point_on_line'], atol=1e-9)
+        np.testing.assert_allclose(fit['direction_vector'], expected['direction_vector'], atol=1e-9)
+        assert snapshot['point_counts']['X1'] == 1000
+        assert snapshot['total_points']['X1'] == 1500
+
+    def test_csv_tail_reads_only_complete_rows(self, tmp_path):
+        """증가하는 CSV 파일에서 완성된 행만 읽는지 확인"""
+        from apps.analysis.linearity_live import CsvTailSource
+
+        path = tmp_path / "live.csv"
+        path.write_text("X1_x,X1_y,X1_z,Y_x,Y_y,Y_z\n1,2,3,4,5,6\n7,8,")
+        source = CsvTailSource(str(path))
+        events = source.poll()
+        assert [axis for axis, _ in events] == ['X1', 'Y']
+        np.testing.assert_array_equal(events[1][1], [4, 5, 6])
+
+        with open(path, 'a') as f:
+            f.write("9,10,11,12\n")
+        events = source.poll()
+        assert [axis for axis, _ in events] == ['X1', 'Y']
+        np.testing.assert_array_equal(events[0][1], [7, 8, 9])
+        assert source.poll() == []
+
+    def test_sources_release_resources(self, tmp_path):
+        """따옴표 헤더를 해석하고, 소켓 소스는 닫거나 버리면 대기 소켓을 해제하는지 확인"""
+        import gc
+        import socket
+        from apps.analysis.linearity_live import CsvTailSource, SocketSource
+
+        path = tmp_path / "live.csv"
+        path.write_text('"X1_x", "X1_y" ,X1_z\n1,2,3\n')
+        assert [axis for axis, _ in CsvTailSource(str(path)).poll()] == ['X1']
+
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            port = probe.getsockname()[1]
+        for release in ('close', 'drop'):
+            source = SocketSource(port)
+            server = source.server
+            if release == 'close':
+                source.close()
+                source.close()
+            else:
+                del source
+                gc.collect()
+            assert server.fileno() == -1
+
+
+def make_cylinder(n_points, axis, origin, radius, length, form_amplitude=0.0, seed=0):
+    """축 방향/반지름이 주어진 원통 표면 점군 (3엽 형상 오차 포함)"""
+    rng = np.random.default_rng(seed)
+    axis = np.asarray(axis, dtype=float)
+    axis /= np.linalg.norm(axis)
+    basis = linearity_engine.orthogonal_basis(axis)
+    theta = np.linspace(0, 2 * np.pi, n_points, endpoint=False)
+    t = rng.uniform(0, length, n_points)
+    r = radius + form_amplitude * np.cos(3 * theta)
+    return (np.asarray(origin) + t[:, None] * axis
+            + (r * np.cos(theta))[:, None] * basis[:, 0] + (r * np.sin(theta))[:, None] * basis[:, 1])
+
+
+class TestFormFitting:
+    """평면/원/원통 형상 적합 테스트"""
+
+    def test_discovers_feature_columns(self):
+        """PLANE/CIRCLE/CYL 접두어 특징 컬럼만 좌표가 모두 있을 때 탐색되는지 확인"""
+        from apps.analysis.form_fitting import discover_features
+
+        columns = ['X1_x', 'X1_y', 'X1_z', 'PLANE1_x', 'PLANE1_y', 'PLANE1_z',
+                   'CYL_A_x', 'CYL_A_y', 'CYL_A_z', 'circle2_x', 'circle2_y', 'circle2_z', 'CYL9_x']
+        assert discover_features(columns) == {'PLANE1': 'plane', 'CYL_A': 'cylinder', 'circle2': 'circle'}
+
+    def test_plane_and_circle_form_errors(self):
+        """평면 법선/평면도와 원호 중심/반지름/진원도 복원 확인"""
+        from apps.analysis.form_fitting import fit_circles, fit_planes
+
+        rng = np.random.default_rng(20)
+        normal = np.array([0.1, -0.2, 1.0]) / np.linalg.norm([0.1, -0.2, 1.0])
+        basis = linearity_engine.orthogonal_basis(normal)
+        uv = rng.uniform(-50, 50, (500, 2))
+        height = np.where(uv[:, 0] > 0, 0.01, -0.01)
+        plane = uv @ basis.T + height[:, None] * normal
+        fit = fit_planes([plane, plane[:10]])[0]
+        assert abs(np.dot(fit['normal'], normal)) == pytest.approx(1.0, abs=1e-6)
+        assert fit['form_error'] == pytest.approx(0.02, abs=1e-3)
+
+        theta = np.linspace(0, np.pi, 200)  # 반원 호
+        r = 25.0 + 0.005 * np.cos(4 * theta)
+        center = np.array([10.0, -5.0, 3.0])
+        circle = center + (r * np.cos(theta))[:, None] * basis[:, 0] + (r * np.sin(theta))[:, None] * basis[:, 1]
+        fit = fit_circles([circle, plane])[0]
+        np.testing.assert_allclose(fit['center'], center, atol=5e-3)
+        assert fit['radius'] == pytest.approx(25.0, abs=5e-3)
+        assert fit['form_error'] == pytest.approx(0.01, abs=1e-3)
+
+    def test_batched_cylinders_recover_axis_and_radius(self):
+        """길고 짧은 원통을 한 배치로 적합하여 축 방향/반지름/원통도 복원 확인"""
+        from apps.analysis.form_fitting import fit_cylinders
+
+        specs = [([1, 0.2, 0.1], 20.0, 200.0), ([0.3, 1, -0.5], 40.0, 70.0), ([0, 0, 1], 30.0, 15.0)]
+        point_sets = [make_cylinder(300 + 50 * k, axis, (k * 100, 5, -20), radius, length, 0.01, seed=k)
+                      for k, (axis, radius, length) in enumerate(specs)]
+        fits = fit_cylinders(point_sets)
+
+        for fit, (axis, radius, _) in zip(fits, specs):
+            axis = np.asarray(axis, dtype=float) / np.linalg.norm(axis)
+            assert abs(np.dot(fit['axis_direction'], axis)) == pytest.approx(1.0, abs=1e-6)
+            assert fit['radius'] == pytest.approx(radius, abs=1e-3)
+            # 최소제곱 해는 참 형상보다 RMS 가 작고, 잔차 범위는 3엽 형상 오차(0.02) 이상
+            assert fit['rms'] <= 0.01 / np.sqrt(2)
+            assert 0.02 - 1e-9 <= fit['form_error'] < 0.025
+
+    def test_batch_measurement_includes_form_group(self, data_points):
+        """측정 파일에 특징 컬럼이 있으면 배치 지표에 'form' 그룹이 추가되는지 확인"""
+        pd = pytest.importorskip("pandas")
+        from apps.analysis.linearity_batch import analyze_measurement
+
+        frame = {f"X1_{c}": data_points['X1'][:, k] for k, c in enumerate('xyz')}
+        cylinder = make_cylinder(400, [0, 0, 1], (0, 0, 0), 12.5, 40.0)
+        frame.update({f"CYL1_{c}": cylinder[:, k] for k, c in enumerate('xyz')})
+        result = analyze_measurement("run.csv", pd.DataFrame(frame).to_csv(index=False).encode())
+
+        assert result['error'] is None
+        assert set(result['linearity_metrics']['form']['CYL1']) == {'form_error', 'rms', 'radius'}
+        assert result['linearity_metrics']['form']['CYL1']['radius'] == pytest.approx(12.5, abs=1e-6)
+        assert 'X1' in result['linearity_metrics']['linearity']
+
+    @pytest.mark.parametrize("fill_strategy", ['mean', 'zero', 'drop'])
+    def test_fill_strategy_leaves_feature_points_untouched(self, data_points, fill_strategy):
+        """축보다 짧은 특징 컬럼의 빈 칸이 채워지거나 축 행을 지우지 않는지 확인"""
+        pd = pytest.importorskip("pandas")
+        from apps.analysis.linearity_batch import analyze_measurement
+
+        frame = pd.DataFrame({f"X1_{c}": data_points['X1'][:, k] for k, c in enumerate('xyz')})
+        cylinder = make_cylinder(40, [0, 0, 1], (0, 0, 0), 12.5, 40.0)
+        for k, c in enumerate('xyz'):
+            frame[f"CYL1_{c}"] = pd.Series(cylinder[:, k])
+        result = analyze_measurement("run.csv", frame.to_csv(index=False).encode(), fill_strategy=fill_strategy)
+
+        assert len(frame) > len(cylinder)
+        assert result['error'] is None and result['rows'] == len(frame)
+        assert result['linearity_metrics']['form']['CYL1']['radius'] == pytest.approx(12.5, abs=1e-6)
+        assert result['linearity_metrics']['form']['CYL1']['form_error'] < 1e-6
@@ -157,5 +157,63 @@ class TestConfiguration:
         for pattern in required_patterns:
             assert pattern in gitignore_content, f".gitignore에 {pattern} 패턴이 없습니다"
 
+class TestPerformanceUtils:
+    """성능 유틸리티 테스트"""
+    
+    def test_bounded_cache_evicts_least_recently_used(self):
+        """항목 수 한도를 넘으면 가장 오래 사용하지 않은 항목이 제거되는지 확인"""
+        from utils.performance import BoundedCache
+        
+        cache = BoundedCache(max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        assert cache.get('a') == 1
+        cache.put('c', 3)
+        
+        assert 'a' in cache and 'c' in cache and 'b' not in cache
+        assert cache.hits == 1
+    
+    def test_bounded_cache_respects_byte_limit(self):
+        """메모리 한도를 넘는 항목이 제거되는지 확인"""
+        import numpy as np
+        from utils.performance import BoundedCache
+        
+        cache = BoundedCache(max_entries=10, max_bytes=1000)
+        cache.put('small', np.zeros(50))
+        cache.put('large', {'points': np.zeros(100)})
+        
+        assert 'small' not in cache and 'large' in cache
+        assert cache.total_bytes == 800
+    
+    def test_estimate_size_counts_string_columns(self):
+        """문자열 컬럼 크기가 포인터 크기가 아닌 실제 값 크기로 계산되는지 확인"""
+        import pandas as pd
+        from utils.performance import estimate_size
+        
+        frame = pd.DataFrame({'name': ['x' * 1000] * 100})
+        assert estimate_size(frame) > 100 * 1000
+
+class TestDataPaths:
+    """서버 로컬 파일 경로 제한 테스트"""
+    
+    def test_resolves_inside_data_dir(self, tmp_path):
+        """데이터 루트 안의 상대/절대 경로는 허용하는지 확인"""
+        from utils.data_processing import resolve_data_path
+        
+        (tmp_path / "runs").mkdir()
+        assert resolve_data_path("runs/log.csv", tmp_path) == str(tmp_path.resolve() / "runs" / "log.csv")
+        assert resolve_data_path(str(tmp_path / "log.csv"), tmp_path) == str(tmp_path.resolve() / "log.csv")
+    
+    def test_rejects_paths_outside_data_dir(self, tmp_path):
+        """상위 경로, 다른 절대 경로, 루트 밖을 가리키는 심볼릭 링크를 거부하는지 확인"""
+        from utils.data_processing import resolve_data_path
+        
+        root = tmp_path / "data"
+        root.mkdir()
+        (root / "escape").symlink_to(tmp_path)
+        for path in ("../secret.csv", "/etc/passwd", "escape/secret.csv"):
+            with pytest.raises(ValueError):
+                resolve_data_path(path, root)
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
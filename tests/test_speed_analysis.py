@@ -0,0 +1,796 @@
+"""
+속도/가속도 운동학 엔진 테스트
+"""
+import sys
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from apps.analysis import (  # noqa: E402
+    downsampling, filters, motion_segments, quantiles, spectral, speed_batch, speed_engine, speed_export, speed_io,
+    speed_live, window_stats
+)
+
+
+def make_speed_log(n_samples, noise=0.05, seed=0):
+    """불균일 샘플 간격의 가속/감속 반복 속도 로그 생성"""
+    rng = np.random.default_rng(seed)
+    time = np.cumsum(rng.uniform(0.0005, 0.0015, n_samples))
+    velocity = 10 + 12 * np.sin(time / 3) + rng.normal(0, noise, n_samples)
+    return time, velocity
+
+
+def legacy_statistics(frame):
+    """기존 UI 통계 계산 (calculate_statistics)"""
+    pytest.importorskip("streamlit")
+    from apps.analysis.speed_analysis import calculate_statistics
+    return calculate_statistics(frame)
+
+
+class TestKinematics:
+    """벡터화 운동학 계산 테스트"""
+
+    def test_matches_loop_integration(self):
+        """누적 사다리꼴 적분과 미분이 기존 파이썬 루프 결과와 일치하는지 확인"""
+        time, velocity = make_speed_log(5_000)
+        frame = speed_engine.compute_kinematics(time, velocity)
+
+        distance = np.zeros_like(time)
+        for i in range(1, len(time)):
+            distance[i] = distance[i - 1] + (velocity[i - 1] + velocity[i]) * (time[i] - time[i - 1]) / 2
+        acceleration = np.gradient(velocity, time)
+
+        assert list(frame.columns) == speed_engine.RESULT_COLUMNS
+        np.testing.assert_allclose(frame['Distance_m'], distance, rtol=1e-12, atol=1e-12)
+        np.testing.assert_array_equal(frame['Acceleration_m/s2'], acceleration)
+        np.testing.assert_array_equal(frame['Jerk_m/s3'], np.gradient(acceleration, time))
+
+    @pytest.mark.parametrize("chunksize", [1, 3, 997, 20_000])
+    def test_stream_matches_full_computation(self, chunksize):
+        """겹침 구간 청크 계산이 청크 크기와 무관하게 전체 계산과 일치하는지 확인"""
+        time, velocity = make_speed_log(6_001)
+        expected = speed_engine.compute_kinematics(time, velocity)
+
+        chunks = ((time[i:i + chunksize], velocity[i:i + chunksize]) for i in range(0, len(time), chunksize))
+        frames = list(speed_engine.iter_kinematics(chunks))
+        result = pd.concat(frames, ignore_index=True)
+
+        assert len(result) == len(expected)
+        for column in ('Velocity_m/s', 'Acceleration_m/s2', 'Jerk_m/s3'):
+            np.testing.assert_array_equal(result[column], expected[column])
+        np.testing.assert_allclose(result['Distance_m'], expected['Distance_m'], rtol=1e-12)
+
+    def test_summary_matches_statistics(self):
+        """청크 누적 통계가 전체 DataFrame 통계와 일치하는지 확인"""
+        time, velocity = make_speed_log(30_000)
+        frame = speed_engine.compute_kinematics(time, velocity)
+        expected = legacy_statistics(frame)
+
+        summary = speed_engine.KinematicsSummary()
+        for start in range(0, len(frame), 7_000):
+            summary.update(frame.iloc[start:start + 7_000])
+        statistics = summary.statistics()
+
+        for group, values in expected.items():
+            if group == 'percentiles':
+                continue
+            for key, value in values.items():
+                assert statistics[group][key] == pytest.approx(value, rel=1e-9, abs=1e-9), (group, key)
+        # 백분위수는 스케치 근사값이므로 순위 오차로 비교
+        for name, column in quantiles.PERCENTILE_COLUMNS.items():
+            values = frame[column].to_numpy()
+            for p in quantiles.PERCENTILES:
+                rank = np.mean(values <= statistics['percentiles'][name][f"p{p}"])
+                assert rank == pytest.approx(p / 100, abs=5e-3), (name, p)
+
+
+class TestStreamingSpeedAnalysis:
+    """CSV 스트리밍 분석 테스트"""
+
+    def test_csv_stream_with_missing_rows(self, tmp_path):
+        """결측 행을 제외하고 전체 샘플 통계와 등간격 표본을 반환하는지 확인"""
+        time, velocity = make_speed_log(50_000, seed=3)
+        frame = pd.DataFrame({'Time_sec': time, 'Velocity_m/s': velocity, 'Note': 'run'})
+        frame.loc[[10, 20_000], 'Velocity_m/s'] = np.nan
+        path = tmp_path / "log.csv"
+        frame.to_csv(path, index=False)
+
+        results = speed_engine.stream_speed_analysis(str(path), chunksize=8_000, preview_size=10_000)
+
+        valid = frame.dropna()
+        expected = legacy_statistics(speed_engine.compute_kinematics(valid['Time_sec'], valid['Velocity_m/s']))
+        assert results['sample_count'] == len(valid)
+        assert results['statistics']['basic']['total_distance'] == pytest.approx(
+            expected['basic']['total_distance'], rel=1e-12)
+        assert results['statistics']['basic']['max_jerk'] == pytest.approx(expected['basic']['max_jerk'])
+        assert len(results['data']) <= 10_000
+        np.testing.assert_allclose(results['data']['Time_sec'],
+                                   valid['Time_sec'].to_numpy()[::results['preview_stride']], rtol=1e-12)
+
+    @pytest.mark.parametrize("smoothing", [
+        {'method': 'savgol', 'window': 31, 'polyorder': 3},
+        {'method': 'butterworth', 'cutoff_hz': 20.0, 'order': 4}
+    ])
+    def test_smoothing_uses_whole_stream_spacing(self, tmp_path, smoothing):
+        """첫 청크만 샘플 간격이 달라도 필터/미분 척도가 전체 로드 결과와 같은지 확인"""
+        time = np.concatenate([np.arange(3_000) * 2e-3, 6.0 + np.arange(27_000) * 5e-4])
+        velocity = 10 + 5 * np.sin(time) + np.random.default_rng(7).normal(0, 0.02, len(time))
+        path = tmp_path / "log.csv"
+        pd.DataFrame({'Time_sec': time, 'Velocity_m/s': velocity}).to_csv(path, index=False)
+
+        results = speed_engine.stream_speed_analysis(str(path), chunksize=2_000, smoothing=smoothing)
+
+        data = speed_engine.preprocess_speed_data(pd.DataFrame({'Time_sec': time, 'Velocity_m/s': velocity}),
+                                                  "해당 행 제거", smoothing)
+        frame = speed_engine.compute_kinematics(data['Time_sec'].to_numpy(), data['Velocity_m/s'].to_numpy(),
+                                                savgol=filters.derivative_filter(smoothing))
+        for key, column in (('max_acceleration', 'Acceleration_m/s2'), ('min_acceleration', 'Acceleration_m/s2'),
+                            ('max_jerk', 'Jerk_m/s3')):
+            assert results['statistics']['basic'][key] == pytest.approx(
+                getattr(frame[column], key[:3])(), rel=1e-6), key
+
+    def test_missing_columns(self, tmp_path):
+        """필수 컬럼이 없으면 오류를 발생시키는지 확인"""
+        path = tmp_path / "log.csv"
+        pd.DataFrame({'Time_sec': [0.0, 1.0]}).to_csv(path, index=False)
+        with pytest.raises(ValueError, match="Velocity_m/s"):
+            speed_engine.stream_speed_analysis(str(path))
+
+
+class TestSpeedLogInput:
+    """속도 로그 형식별 입력/컬럼 지정 테스트"""
+
+    def test_npy_is_memory_mapped(self, tmp_path):
+        """로컬 .npy 파일을 복사 없이 메모리 매핑하고 열 번호로 지정하는지 확인"""
+        time, velocity = make_speed_log(10_000)
+        path = tmp_path / "log.npy"
+        np.save(path, np.column_stack([velocity, time]))
+
+        array = speed_io.open_array(str(path))
+        data = speed_io.load_speed_log(str(path), time_column='col_1', velocity_column='col_0')
+
+        assert isinstance(array, np.memmap)
+        assert speed_io.read_speed_columns(str(path)) == ['col_0', 'col_1']
+        np.testing.assert_array_equal(data['Time_sec'], time)
+        np.testing.assert_array_equal(data['Velocity_m/s'], velocity)
+
+    def test_uploaded_npy_and_raw_float32(self, tmp_path):
+        """업로드 .npy 와 시간 컬럼 없는 float32 원시 배열(샘플링 주파수)을 읽는지 확인"""
+        time, velocity = make_speed_log(5_000)
+        upload = BytesIO()
+        np.save(upload, np.asfortranarray(np.column_stack([time, velocity])))
+        upload.name = "log.npy"
+        data = speed_io.load_speed_log(upload, time_column='col_0', velocity_column='col_1')
+        np.testing.assert_array_equal(data['Velocity_m/s'], velocity)
+
+        path = tmp_path / "log.f32"
+        velocity.astype('<f4').tofile(path)
+        data = speed_io.load_speed_log(str(path), time_column=None, velocity_column='col_0', sample_rate=1000,
+                                       raw_dtype='float32', raw_columns=1)
+        np.testing.assert_allclose(data['Time_sec'], np.arange(len(velocity)) / 1000)
+        np.testing.assert_array_equal(data['Velocity_m/s'], velocity.astype('<f4'))
+
+    @pytest.mark.parametrize("suffix", ["csv", "parquet"])
+    def test_column_mapping(self, tmp_path, suffix):
+        """다른 이름의 컬럼을 Time_sec/Velocity_m/s 로 지정하여 읽는지 확인"""
+        time, velocity = make_speed_log(3_000)
+        frame = pd.DataFrame({'t [s]': time, 'speed': velocity, 'Note': 'run'})
+        path = tmp_path / f"log.{suffix}"
+        if suffix == "parquet":
+            pytest.importorskip("pyarrow")
+            frame.to_parquet(path)
+        else:
+            frame.to_csv(path, index=False)
+
+        data = speed_io.load_speed_log(str(path), time_column='t [s]', velocity_column='speed')
+
+        assert list(data.columns) == ['Time_sec', 'Velocity_m/s']
+        np.testing.assert_allclose(data['Time_sec'], time, rtol=1e-12)
+        with pytest.raises(ValueError, match="Velocity_m/s"):
+            speed_io.load_speed_log(str(path))
+
+    def test_stream_raw_array_without_time(self, tmp_path):
+        """원시 배열 스트리밍이 청크 경계와 무관하게 샘플 번호 기반 시간을 이어가는지 확인"""
+        _, velocity = make_speed_log(20_000)
+        path = tmp_path / "log.bin"
+        velocity.tofile(path)
+        mapping = {'time_column': None, 'velocity_column': 'col_0', 'sample_rate': 500, 'raw_columns': 1}
+
+        results = speed_engine.stream_speed_analysis(str(path), chunksize=3_000, mapping=mapping)
+
+        expected = speed_engine.compute_kinematics(np.arange(len(velocity)) / 500, velocity)
+        assert results['sample_count'] == len(velocity)
+        assert results['statistics']['basic']['total_distance'] == pytest.approx(
+            expected['Distance_m'].iat[-1], rel=1e-12)
+
+
+class TestDownsampling:
+    """차트 다운샘플링 테스트"""
+
+    @pytest.mark.parametrize("method", ["minmax", "lttb"])
+    def test_point_budget_and_endpoints(self, method):
+        """점 수 제한과 양 끝점 보존, 인덱스 정렬을 확인"""
+        time, velocity = make_speed_log(200_000)
+        index = downsampling.METHODS[method](time, velocity, 2_000)
+
+        assert len(index) <= 2_000
+        assert index[0] == 0 and index[-1] == len(time) - 1
+        assert np.all(np.diff(index) > 0)
+
+    def test_minmax_keeps_single_sample_spikes(self):
+        """한 샘플짜리 저크 스파이크와 모든 버킷의 극값이 남는지 확인"""
+        time, velocity = make_speed_log(500_000, seed=5)
+        jerk = speed_engine.compute_kinematics(time, velocity)['Jerk_m/s3'].to_numpy().copy()
+        jerk[[123_457, 400_001]] = [1e6, -1e6]
+
+        index = downsampling.minmax_indices(time, jerk, 1_000)
+
+        assert {123_457, 400_001} <= set(index.tolist())
+        assert jerk[index].max() == jerk.max() and jerk[index].min() == jerk.min()
+
+    def test_window_reaggregates_at_full_resolution(self):
+        """좁은 시간 구간은 원본 샘플을 그대로 사용하는지 확인"""
+        time, velocity = make_speed_log(100_000)
+        window = downsampling.window_slice(time, time[5_000], time[5_999])
+
+        assert (window.start, window.stop) == (5_000, 6_000)
+        np.testing.assert_array_equal(downsampling.minmax_indices(time[window], velocity[window]),
+                                      np.arange(1_000))
+
+
+class TestWindowStatistics:
+    """시간 구간 통계 인덱스 테스트"""
+
+    def test_range_extrema_matches_brute_force(self):
+        """블록 경계를 걸치는 임의 구간의 최솟값/최댓값이 직접 계산과 같은지 확인"""
+        values = np.random.default_rng(1).normal(size=10_000)
+        extrema = window_stats.RangeExtrema(values, block_size=64)
+        bounds = np.sort(np.random.default_rng(2).integers(0, 10_001, (200, 2)), axis=1)
+        for lo, hi in [(0, 10_000), (63, 65), (64, 128), (5, 6)] + bounds.tolist():
+            if hi > lo:
+                assert extrema.query(lo, hi) == (values[lo:hi].min(), values[lo:hi].max())
+
+    @pytest.mark.parametrize("window", [(0, 60_000), (0, 2), (517, 519), (1_000, 1_300), (12_345, 59_000)])
+    def test_matches_statistics_on_slice(self, window):
+        """구간 통계가 잘라낸 DataFrame 에 calculate_statistics 를 적용한 결과와 같은지 확인"""
+        time, velocity = make_speed_log(60_000, seed=4)
+        frame = speed_engine.compute_kinematics(time, velocity)
+        index = window_stats.WindowIndex(frame)
+        lo, hi = window
+
+        statistics = index.statistics(lo, hi)
+        expected = legacy_statistics(frame.iloc[lo:hi])
+
+        for group, values in expected.items():
+            for key, value in values.items():
+                if value is None:
+                    assert statistics[group][key] is None, (group, key)
+                else:
+                    assert statistics[group][key] == pytest.approx(value, rel=1e-6, abs=1e-9), (group, key)
+
+    def test_range_quantiles_rank_error(self):
+        """블록 스케치 트리 구간 분위수가 구간 샘플 수를 보존하고 k 에 따른 순위 오차 이내인지 확인"""
+        values = np.random.default_rng(3).lognormal(0, 1, 200_000)
+        tree = window_stats.RangeQuantiles(values, block_size=1_000, k=256)
+        q = np.array([0.5, 0.95, 0.99])
+        for lo, hi in [(0, 200_000), (999, 1_001), (1_000, 9_000), (12_345, 187_654), (500, 199_999)]:
+            sketch = tree.query(lo, hi)
+            window = np.sort(values[lo:hi])
+            ranks = np.searchsorted(window, sketch.quantiles(q)) / len(window)
+            assert sketch.count == hi - lo
+            assert sketch.quantiles([0.0, 1.0]).tolist() == [window[0], window[-1]]
+            if hi - lo > 1_000:
+                assert np.abs(ranks - q).max() <= quantiles.rank_error(256)
+
+    def test_long_window_percentiles_use_sketches(self):
+        """정확 계산 한도를 넘는 구간은 스케치 근사값과 k 를 함께 반환하는지 확인"""
+        time, velocity = make_speed_log(window_stats.EXACT_PERCENTILE_WINDOW + 30_000, seed=5)
+        frame = speed_engine.compute_kinematics(time, velocity)
+        index = window_stats.WindowIndex(frame)
+
+        assert 'sketch' not in index.statistics(0, window_stats.EXACT_PERCENTILE_WINDOW)
+        statistics = index.statistics(10, len(frame))
+        assert statistics['sketch']['k'] == window_stats.SKETCH_K
+        for name, column in quantiles.PERCENTILE_COLUMNS.items():
+            values = frame[column].to_numpy()[10:]
+            for p in quantiles.PERCENTILES:
+                rank = np.mean(values <= statistics['percentiles'][name][f"p{p}"])
+                assert rank == pytest.approx(p / 100, abs=quantiles.rank_error(window_stats.SKETCH_K)), (name, p)
+
+    def test_time_window(self):
+        """시간 구간이 양 끝 샘플을 포함하는 슬라이스로 변환되는지 확인"""
+        time, velocity = make_speed_log(1_000)
+        index = window_stats.WindowIndex(speed_engine.compute_kinematics(time, velocity))
+
+        window = index.window(time[100], time[199])
+
+        assert (window.start, window.stop) == (100, 200)
+        with pytest.raises(ValueError):
+            index.time_statistics(time[10], time[10])
+
+
+def poll_all(source):
+    """파일 변경 알림을 기다리지 않고 추가된 샘플 읽기"""
+    source.changes.set()
+    return source.poll()
+
+
+class TestLiveTail:
+    """증가하는 로그 실시간 추적 테스트"""
+
+    def test_csv_appends_match_full_computation(self, tmp_path):
+        """임의 위치에서 끊겨 추가되는 CSV 를 이어서 계산한 결과가 전체 계산과 같은지 확인"""
+        time, velocity = make_speed_log(5_000, seed=6)
+        text = ''.join(f"run,{t!r},{v!r}\n" for t, v in zip(time.tolist(), velocity.tolist()))
+        path = tmp_path / "live.csv"
+        path.write_text("Note,Time_sec,Velocity_m/s\n")
+
+        source = speed_live.SpeedTailSource(str(path))
+        live = speed_live.LiveKinematics()
+        cuts = np.sort(np.random.default_rng(0).integers(0, len(text), 40))
+        try:
+            for start, stop in zip(np.r_[0, cuts], np.r_[cuts, len(text)]):
+                with open(path, 'a') as f:
+                    f.write(text[start:stop])
+                time_chunk, velocity_chunk, restarted = poll_all(source)
+                assert not restarted
+                live.push(time_chunk, velocity_chunk)
+        finally:
+            source.close()
+
+        expected = speed_engine.compute_kinematics(time, velocity)
+        result = live.frame()
+        assert len(result) == len(time) - speed_engine.HALO
+        np.testing.assert_array_equal(result['Jerk_m/s3'], expected['Jerk_m/s3'][:len(result)])
+        np.testing.assert_allclose(result['Distance_m'], expected['Distance_m'][:len(result)], rtol=1e-12)
+
+    def test_raw_partial_records_and_restart(self, tmp_path):
+        """원시 배열의 불완전한 레코드는 다음 갱신까지 보관하고 파일 재작성 시 처음부터 읽는지 확인"""
+        velocity = np.arange(10, dtype='<f4')
+        path = tmp_path / "live.f32"
+        payload = velocity.tobytes()
+        path.write_bytes(payload[:10])
+
+        source = speed_live.SpeedTailSource(str(path), time_column=None, velocity_column='col_0',
+                                            sample_rate=100, raw_dtype='float32', raw_columns=1)
+        try:
+            first = poll_all(source)
+            with open(path, 'ab') as f:
+                f.write(payload[10:])
+            second = poll_all(source)
+            path.write_bytes(payload[:8])
+            third = poll_all(source)
+        finally:
+            source.close()
+
+        np.testing.assert_array_equal(first[1], [0, 1])
+        np.testing.assert_array_equal(second[0], np.arange(2, 10) / 100)
+        assert third[2] and third[1].tolist() == [0, 1]
+
+    def test_quoted_header_and_abandoned_source(self, tmp_path):
+        """따옴표/공백이 있는 헤더를 해석하고, 닫지 않고 버린 소스의 감시 스레드가 멈추는지 확인"""
+        import gc
+        import threading
+
+        path = tmp_path / "live.csv"
+        path.write_text('"Note, run", "Time_sec" ,Velocity_m/s\n"a, b",0.0,1.5\n"c",0.1,2.5\n')
+        before = threading.active_count()
+        source = speed_live.SpeedTailSource(str(path))
+        time_chunk, velocity_chunk, _ = poll_all(source)
+        np.testing.assert_array_equal(time_chunk, [0.0, 0.1])
+        np.testing.assert_array_equal(velocity_chunk, [1.5, 2.5])
+
+        observer = source.changes.observer
+        del source
+        gc.collect()
+        assert observer is None or not observer.is_alive()
+        assert threading.active_count() <= before
+
+
+class TestMultiAxis:
+    """다축 채널 일괄 분석 테스트"""
+
+    def test_axes_match_single_axis_analysis(self):
+        """2D 일괄 계산과 축별 통계가 축마다 단일 축으로 분석한 결과와 같은지 확인"""
+        time, _ = make_speed_log(20_000)
+        rng = np.random.default_rng(7)
+        channels = 8 + 10 * np.sin(time[:, None] / 2 + np.arange(6)) + rng.normal(0, 0.05, (len(time), 6))
+        axes = [f"J{k}" for k in range(6)]
+
+        kinematics = speed_engine.compute_axes_kinematics(time, channels)
+        table = speed_engine.axis_statistics(kinematics, axes)
+
+        for k, axis in enumerate(axes):
+            expected = speed_engine.compute_kinematics(time, channels[:, k])
+            np.testing.assert_array_equal(speed_engine.axis_frame(kinematics, k), expected)
+            statistics = legacy_statistics(expected)
+            flattened = {f"{name}_{key}": value for name, values in statistics.pop('percentiles').items()
+                         for key, value in values.items()}
+            for values in list(statistics.values()) + [flattened]:
+                for key, value in values.items():
+                    if value is None:
+                        assert np.isnan(table.loc[axis, key])
+                    else:
+                        assert table.loc[axis, key] == pytest.approx(value, rel=1e-9, abs=1e-12), (axis, key)
+
+    def test_position_channels(self, tmp_path):
+        """위치 채널을 지정 컬럼으로 읽어 미분한 속도와 시작 위치 대비 변위를 계산하는지 확인"""
+        time = np.linspace(0, 2, 2_001)
+        frame = pd.DataFrame({'t': time, 'X': 3 * time ** 2, 'Y': -time, 'Note': 'run'})
+        path = tmp_path / "axes.csv"
+        frame.to_csv(path, index=False)
+
+        time_values, channels = speed_io.load_channels(str(path), 't', ['X', 'Y'])
+        kinematics = speed_engine.compute_axes_kinematics(time_values, channels.to_numpy(), 'position')
+
+        assert list(channels.columns) == ['X', 'Y']
+        np.testing.assert_allclose(kinematics['velocity'][1:-1], np.column_stack([6 * time, -np.ones_like(time)])[1:-1],
+                                   atol=1e-9)
+        np.testing.assert_allclose(kinematics['distance'][-1], [12.0, -2.0], atol=1e-9)
+
+
+class TestSmoothingFilters:
+    """평활화/미분 필터 테스트"""
+
+    def test_savgol_matches_polynomial_fit(self):
+        """Savitzky-Golay 평활값/미분이 창별 다항식 최소제곱 적합과 일치하는지 확인 (양 끝 포함)"""
+        rng = np.random.default_rng(3)
+        values = np.cumsum(rng.normal(0, 1, 500))
+        savgol = filters.SavitzkyGolay(11, 3)
+
+        for position, window in ((250, slice(245, 256)), (2, slice(0, 11)), (497, slice(489, 500))):
+            offsets = np.arange(window.start, window.stop) - position
+            fit = np.polyfit(offsets, values[window], 3)
+            assert savgol.apply(values)[position] == pytest.approx(np.polyval(fit, 0), abs=1e-9)
+            slope = np.polyval(np.polyder(fit), 0) / 0.5
+            assert savgol.apply(values, 1, 0.5)[position] == pytest.approx(slope, abs=1e-9)
+            assert savgol.apply(values, 2)[position] == pytest.approx(np.polyval(np.polyder(fit, 2), 0), abs=1e-9)
+
+    def test_savgol_kinematics_reduce_derivative_noise(self):
+        """해석적 미분 가속도/저크가 np.gradient 보다 참값에 가깝고, 다항식은 정확히 미분되는지 확인"""
+        time = np.arange(20_000) * 1e-3
+        velocity = 5 * np.sin(time) + np.random.default_rng(0).normal(0, 0.01, len(time))
+        savgol = filters.SavitzkyGolay(51, 3)
+
+        plain = speed_engine.compute_kinematics(time, velocity)
+        smooth = speed_engine.compute_kinematics(time, velocity, savgol=savgol)
+        truth = 5 * np.cos(time)
+        assert np.std(smooth['Acceleration_m/s2'] - truth) < np.std(plain['Acceleration_m/s2'] - truth) / 10
+
+        cubic = speed_engine.compute_kinematics(time, time ** 3, savgol=savgol)
+        np.testing.assert_allclose(cubic['Acceleration_m/s2'], 3 * time ** 2, atol=1e-6)
+        np.testing.assert_allclose(cubic['Jerk_m/s3'], 6 * time, atol=1e-4)
+
+    def test_butterworth_response(self):
+        """영위상 Butterworth 가 통과 대역은 지연 없이 유지하고 저지 대역을 감쇠하는지 확인"""
+        time = np.arange(10_000) / 1000.0
+        slow, fast = np.sin(2 * np.pi * 1.0 * time), np.sin(2 * np.pi * 100.0 * time)
+        butter = filters.Butterworth(10.0, 1000.0, 4)
+
+        output = butter.apply(slow + fast)
+        interior = slice(butter.halo, -butter.halo)
+        assert np.abs(output - slow)[interior].max() < 1e-3
+        assert butter.kernel.sum() == pytest.approx(1.0)
+        np.testing.assert_allclose(butter.kernel, butter.kernel[::-1])
+
+    def test_moving_average_matches_rolling(self):
+        """이동 평균이 기존 rolling(center=True, min_periods=1) 결과와 같은지 확인"""
+        values = np.random.default_rng(1).normal(0, 1, (1_000, 3))
+        expected = pd.DataFrame(values).rolling(7, center=True, min_periods=1).mean().to_numpy()
+        np.testing.assert_allclose(filters.MovingAverage(7).apply(values), expected, atol=1e-12)
+        np.testing.assert_allclose(filters.MovingAverage(7).apply(values[:5]),
+                                   pd.DataFrame(values[:5]).rolling(7, center=True, min_periods=1).mean(), atol=1e-12)
+
+    @pytest.mark.parametrize("smoother", [
+        filters.MovingAverage(9), filters.SavitzkyGolay(21, 3), filters.Butterworth(20.0, 1000.0, 4)
+    ])
+    def test_stream_matches_full_array(self, smoother):
+        """청크 스트리밍 필터 출력이 전체 배열 필터 결과와 같은지 확인"""
+        time, velocity = make_speed_log(30_000)
+        chunks = ((time[i:i + 2_345], velocity[i:i + 2_345]) for i in range(0, len(time), 2_345))
+        output = list(filters.iter_filtered(chunks, smoother))
+
+        np.testing.assert_array_equal(np.concatenate([t for t, _ in output]), time)
+        np.testing.assert_allclose(np.concatenate([v for _, v in output]), smoother.apply(velocity), atol=1e-10)
+
+    def test_savgol_kinematics_stream(self):
+        """Savitzky-Golay 운동학 스트리밍 결과가 전체 계산과 같은지 확인"""
+        time = np.arange(25_000) * 1e-3
+        velocity = 10 + 5 * np.sin(time) + np.random.default_rng(2).normal(0, 0.02, len(time))
+        savgol = filters.SavitzkyGolay(31, 3)
+        chunks = ((time[i:i + 1_000], velocity[i:i + 1_000]) for i in range(0, len(time), 1_000))
+
+        streamed = pd.concat(list(speed_engine.iter_kinematics(chunks, savgol)), ignore_index=True)
+        expected = speed_engine.compute_kinematics(time, velocity, savgol=savgol)
+        np.testing.assert_allclose(streamed.to_numpy(), expected.to_numpy(), rtol=1e-10, atol=1e-9)
+
+
+class TestMotionSegments:
+    """운동 구간 런 길이 부호화 테스트"""
+
+    def test_segments_match_state_masks(self):
+        """히스테리시스가 없으면 구간이 기존 상태 마스크와 같고, 구간 통계가 직접 계산과 일치하는지 확인"""
+        time, velocity = make_speed_log(20_000)
+        frame = speed_engine.compute_kinematics(time, velocity)
+        acceleration = frame['Acceleration_m/s2'].to_numpy()
+        table = motion_segments.segment_table(frame)
+
+        states = np.repeat(table['state'].to_numpy(), table['samples'].to_numpy())
+        expected = np.where(acceleration > 0.1, 0, np.where(acceleration < -0.1, 1, 2))
+        np.testing.assert_array_equal(states, expected)
+        assert (table['state'].to_numpy()[1:] != table['state'].to_numpy()[:-1]).all()
+        np.testing.assert_array_equal(table['start_index'].to_numpy()[1:], table['end_index'].to_numpy()[:-1])
+        assert table['duration'].sum() == pytest.approx(time[-1] - time[0])
+
+        for row in table.iloc[::max(1, len(table) // 25)].itertuples():
+            segment = frame.iloc[row.start_index:row.end_index]
+            jerk = segment['Jerk_m/s3'].to_numpy()
+            assert row.peak_jerk == jerk[np.argmax(np.abs(jerk))]
+            assert row.rms_acceleration == pytest.approx(np.sqrt(np.mean(segment['Acceleration_m/s2'] ** 2)))
+
+    def test_hysteresis_suppresses_chatter(self):
+        """기준값 부근에서 떨리는 가속도가 히스테리시스로 하나의 구간이 되는지 확인"""
+        acceleration = np.array([0.0, 0.2, 0.09, 0.11, 0.08, 0.12, 0.02, -0.2, -0.07, -0.15, 0.0])
+
+        assert len(motion_segments.run_lengths(motion_segments.motion_states(acceleration))[0]) == 11
+        states = motion_segments.motion_states(acceleration, hysteresis=0.05)
+        starts, ends, values = motion_segments.run_lengths(states)
+        np.testing.assert_array_equal(values, [2, 0, 2, 1, 2])
+        np.testing.assert_array_equal(starts, [0, 1, 6, 7, 10])
+
+
+class TestSpectral:
+    """Welch PSD / 스펙트로그램 테스트"""
+
+    def test_psd_peak_and_power(self):
+        """불균일 샘플 정현파의 PSD 피크 주파수와 전력(Parseval), 청크 크기 무관성 확인"""
+        rng = np.random.default_rng(4)
+        time = np.cumsum(rng.uniform(0.0009, 0.0011, 400_000))
+        acceleration = np.sin(2 * np.pi * 37.0 * time) + 0.1 * rng.normal(size=len(time))
+        frame = pd.DataFrame({'Time_sec': time, 'Acceleration_m/s2': acceleration, 'Jerk_m/s3': acceleration})
+
+        result = spectral.spectral_analysis(frame, chunksize=65_432, sample_rate=1000.0, nperseg=2048)
+        frequencies, psd = result['frequencies'], result['psd'][0]
+        assert frequencies[np.argmax(psd)] == pytest.approx(37.0, abs=frequencies[1])
+        assert psd.sum() * frequencies[1] == pytest.approx(acceleration.var(), rel=0.05)
+
+        whole = spectral.spectral_analysis(frame, chunksize=len(frame), sample_rate=1000.0, nperseg=2048)
+        np.testing.assert_allclose(whole['psd'], result['psd'], rtol=1e-10)
+        assert result['spectrogram'].shape[:2] == (2, len(frequencies))
+
+    def test_resampler_chunks_match_interp(self):
+        """청크 단위 등간격 재표본화가 전체 배열 np.interp 와 같은지 확인"""
+        time, velocity = make_speed_log(10_000)
+        resampler = spectral.UniformResampler(800.0)
+        parts = [resampler.update(time[i:i + 777], velocity[i:i + 777]) for i in range(0, len(time), 777)]
+        grid = np.concatenate([g for g, _ in parts])
+        values = np.concatenate([v for _, v in parts])[:, 0]
+
+        expected_grid = time[0] + np.arange(int(np.floor((time[-1] - time[0]) * 800.0)) + 1) / 800.0
+        np.testing.assert_allclose(grid, expected_grid)
+        np.testing.assert_allclose(values, np.interp(expected_grid, time, velocity), atol=1e-12)
+
+    def test_spectrogram_columns_are_bounded(self):
+        """스펙트로그램 열 수가 한도 이하로 병합되고 전체 세그먼트 평균이 PSD 와 같은지 확인"""
+        accumulator = spectral.SpectralAccumulator(1000.0, 1, nperseg=64, max_columns=50)
+        values = np.random.default_rng(5).normal(size=(100_000, 1))
+        for start in range(0, len(values), 3_001):
+            accumulator.update(values[start:start + 3_001])
+        result = accumulator.result()
+
+        assert len(result['times']) <= 51
+        assert np.all(np.diff(result['times']) > 0)
+        assert result['segments'] == (len(values) - 64) // 32 + 1
+
+    def test_streaming_spectra(self, tmp_path):
+        """스트리밍 분석의 주파수 분석 결과가 메모리 내 분석과 같은지 확인"""
+        time = np.arange(50_000) / 1000.0
+        velocity = 10 + np.sin(2 * np.pi * 12.0 * time)
+        path = tmp_path / "vibration.npy"
+        np.save(path, np.column_stack([time, velocity]))
+        mapping = {'time_column': 'col_0', 'velocity_column': 'col_1'}
+
+        results = speed_engine.stream_speed_analysis(str(path), chunksize=7_000, mapping=mapping,
+                                                     spectral={'nperseg': 512})
+        streamed = next(iter(results['spectra'].values()))
+        expected = spectral.spectral_analysis(speed_engine.compute_kinematics(time, velocity), nperseg=512)
+        np.testing.assert_allclose(streamed['psd'], expected['psd'], rtol=1e-6, atol=1e-12)
+        assert streamed['frequencies'][np.argmax(streamed['psd'][0])] == pytest.approx(12.0, abs=2.0)
+
+
+class TestExport:
+    """내보내기 파일 생성 테스트"""
+
+    def kinematics(self, n_samples=5_000):
+        return speed_engine.compute_kinematics(*make_speed_log(n_samples))
+
+    def test_csv_round_trip(self):
+        """청크 단위 CSV/gzip CSV 가 전체 to_csv 와 같은 내용인지 확인"""
+        frame = self.kinematics()
+        expected = frame.to_csv(index=False).encode('utf-8')
+        assert speed_export.csv_bytes(frame, chunksize=777) == expected
+
+        payload = speed_export.csv_gzip_bytes(frame, chunksize=777)
+        assert payload == speed_export.csv_gzip_bytes(frame, chunksize=777)
+        restored = pd.read_csv(BytesIO(payload), compression='gzip')
+        pd.testing.assert_frame_equal(restored, frame, check_exact=False, rtol=1e-12)
+
+    def test_parquet_row_groups(self):
+        """Parquet 이 chunksize 행 그룹으로 나뉘고 값이 그대로 복원되는지 확인"""
+        pq = pytest.importorskip("pyarrow.parquet")
+        frame = self.kinematics()
+        payload = speed_export.parquet_bytes(frame, chunksize=1_000)
+
+        assert pq.ParquetFile(BytesIO(payload)).num_row_groups == 5
+        pd.testing.assert_frame_equal(pd.read_parquet(BytesIO(payload)), frame)
+
+    def test_excel_splits_sheets(self):
+        """Excel 행 제한을 넘는 데이터가 헤더를 포함한 다음 시트로 이어지는지 확인"""
+        openpyxl = pytest.importorskip("openpyxl")
+        frame = self.kinematics(250)
+        payload = speed_export.excel_bytes(frame, chunksize=40, max_rows=100)
+
+        workbook = openpyxl.load_workbook(BytesIO(payload), read_only=True)
+        assert workbook.sheetnames == ['Analysis Results', 'Analysis Results 2', 'Analysis Results 3']
+        rows = [row for sheet in workbook.worksheets for row in sheet.iter_rows(values_only=True)]
+        header = [row for row in rows if row[0] == 'Time_sec']
+        values = np.array([row for row in rows if row[0] != 'Time_sec'], dtype=float)
+
+        assert len(header) == 3 and list(header[0]) == list(frame.columns)
+        np.testing.assert_allclose(values, frame.to_numpy())
+
+
+def make_move(delay, sample_rate, duration=3.0, noise=1e-4, seed=0):
+    """delay 초 뒤 시작하는 감쇠 진동 계단 응답 속도 로그 (같은 동작의 회차 기록)"""
+    time = np.arange(0, duration, 1 / sample_rate)
+    tau = np.clip(time - delay, 0, None)
+    velocity = 2.0 * (1 - np.exp(-5 * tau) * (np.cos(20 * tau) + 0.25 * np.sin(20 * tau)))
+    return time, velocity + np.random.default_rng(seed).normal(0, noise, len(time))
+
+
+class TestRunComparison:
+    """다중 주행 비교 테스트"""
+
+    def test_interpolate_rows_matches_interp(self):
+        """여러 채널 일괄 보간이 채널별 np.interp 와 같고 범위 밖은 NaN 인지 확인"""
+        time, velocity = make_speed_log(5_000)
+        values = np.column_stack([velocity, velocity ** 2])
+        grid = np.linspace(time[0] - 0.1, time[-1] + 0.1, 3_001)
+        result = speed_batch.interpolate_rows(time, values, grid)
+
+        inside = (grid >= time[0]) & (grid <= time[-1])
+        for k in range(2):
+            np.testing.assert_allclose(result[inside, k], np.interp(grid[inside], time, values[:, k]), rtol=1e-12)
+        assert np.isnan(result[~inside]).all()
+
+    def test_motion_start_and_settling(self):
+        """운동 시작 시각이 지연에 따라 이동하고 정착 시간은 지연과 무관한지 확인"""
+        starts, settles = [], []
+        for delay in (0.2, 0.7):
+            time, velocity = make_move(delay, 1000.0)
+            start = speed_batch.motion_start(time, velocity)
+            starts.append(start)
+            settles.append(speed_batch.settling_time(time, velocity, start))
+
+        assert starts[1] - starts[0] == pytest.approx(0.5, abs=2e-3)
+        assert settles[0] == pytest.approx(settles[1], abs=2e-3)
+        # 감쇠 포락선 exp(-5t) 가 허용 범위(2%)보다 작아지는 시각 근처
+        assert 0.5 < settles[0] < -np.log(0.02) / 5 + 0.1
+
+    def test_runs_align_on_common_time_base(self, tmp_path):
+        """지연/샘플링 주파수가 다른 회차가 운동 시작 기준으로 겹치고, 실패 파일은 오류로 보고되는지 확인"""
+        inputs = []
+        for k, (delay, rate) in enumerate([(0.2, 1000.0), (0.5, 1000.0), (0.31, 800.0), (0.7, 1200.0)]):
+            path = tmp_path / f"run_{k}.npy"
+            np.save(path, np.column_stack(make_move(delay, rate, seed=k)))
+            inputs.append((path.name, str(path)))
+        (tmp_path / "broken.csv").write_text("a,b\n1,2\n")
+        inputs.append(("broken.csv", str(tmp_path / "broken.csv")))
+
+        mapping = {'time_column': 'col_0', 'velocity_column': 'col_1'}
+        comparison = speed_batch.run_comparison(inputs, mapping, max_workers=2, max_points=2_000)
+
+        assert [run['run'] for run in comparison['runs']] == [name for name, _ in inputs]
+        assert comparison['runs'][-1]['error'] is not None
+        assert list(comparison['matrix'].index) == comparison['names'] == [name for name, _ in inputs[:4]]
+        assert list(comparison['matrix'].columns) == list(speed_batch.RUN_METRICS)
+
+        grid, velocity = comparison['time'], comparison['curves']['Velocity_m/s']
+        assert velocity.shape == (4, len(grid)) and len(grid) <= 2_001
+        assert np.any(np.isclose(grid, 0.0))
+        overlap = ~np.isnan(velocity).any(axis=0)
+        assert np.ptp(velocity[:, overlap], axis=0).max() < 0.02
+        assert comparison['matrix']['settling_time'].std() < 5e-3
+
+    def test_curves_keep_single_sample_peaks(self, tmp_path):
+        """한 샘플짜리 속도 스파이크가 회차 곡선과 공통 시간축 곡선에 남는지 확인"""
+        time, velocity = make_move(0.2, 1000.0, duration=20.0)
+        velocity[12_345] += 5.0
+        path = tmp_path / "spike.npy"
+        np.save(path, np.column_stack([time, velocity]))
+
+        mapping = {'time_column': 'col_0', 'velocity_column': 'col_1'}
+        comparison = speed_batch.run_comparison([(path.name, str(path))], mapping, max_points=1_000)
+
+        run = comparison['runs'][0]
+        assert len(run['time']) <= 1_000
+        assert run['curves'][:, 0].max() == pytest.approx(velocity.max())
+        assert np.nanmax(comparison['curves']['Velocity_m/s']) == pytest.approx(velocity.max())
+        assert comparison['matrix']['max_velocity'].iloc[0] == pytest.approx(velocity.max())
+
+    def test_worker_does_not_import_streamlit(self):
+        """프로세스 풀 작업 모듈이 Streamlit UI 모듈을 불러오지 않는지 확인"""
+        import subprocess
+
+        code = "import sys; import apps.analysis.speed_batch; print('streamlit' in sys.modules)"
+        result = subprocess.run([sys.executable, '-c', code], cwd=project_root, capture_output=True, text=True,
+                                check=True)
+        assert result.stdout.strip() == 'False'
+
+
+class TestQuantileSketch:
+    """KLL 분위수 스케치 테스트"""
+
+    def test_exact_before_compaction(self):
+        """용량 이하 데이터는 np.percentile 과 정확히 같은지 확인"""
+        values = np.random.default_rng(0).normal(size=1_000)
+        sketch = quantiles.QuantileSketch(k=2048).update(values)
+        q = np.array([0.0, 0.01, 0.5, 0.95, 0.99, 1.0])
+        np.testing.assert_allclose(sketch.quantiles(q), np.quantile(values, q), rtol=1e-12)
+
+    @pytest.mark.parametrize("chunksize", [1_000, 250_000])
+    def test_rank_error_and_memory_are_bounded(self, chunksize):
+        """청크 크기와 관계없이 순위 오차와 보관 값 개수가 제한되는지 확인"""
+        rng = np.random.default_rng(1)
+        values = np.concatenate([rng.normal(0, 1, 500_000), rng.exponential(3, 500_000)])
+        rng.shuffle(values)
+        sketch = quantiles.QuantileSketch(k=512)
+        for start in range(0, len(values), chunksize):
+            sketch.update(values[start:start + chunksize])
+
+        q = np.array([0.01, 0.25, 0.5, 0.9, 0.95, 0.99])
+        ranks = np.searchsorted(np.sort(values), sketch.quantiles(q)) / len(values)
+        assert np.abs(ranks - q).max() < 0.01
+        assert sketch.count == len(values) and sketch.size < 3 * 512
+        assert sketch.quantiles([0.0, 1.0]).tolist() == [values.min(), values.max()]
+
+    def test_merge_matches_single_stream(self):
+        """파일별 스케치를 병합한 결과가 전체 데이터 분위수와 가까운지 확인"""
+        rng = np.random.default_rng(2)
+        parts = [rng.lognormal(k * 0.1, 1.0, 80_000) for k in range(6)]
+        merged = quantiles.merge_sketches([{'jerk': quantiles.QuantileSketch(k=512, seed=k).update(part)}
+                                           for k, part in enumerate(parts)])['jerk']
+        values = np.sort(np.concatenate(parts))
+
+        q = np.array([0.5, 0.95, 0.99])
+        ranks = np.searchsorted(values, merged.quantiles(q)) / len(values)
+        assert merged.count == len(values)
+        assert np.abs(ranks - q).max() < 0.01
+
+    def test_streaming_and_batch_percentiles(self, tmp_path):
+        """스트리밍 분석과 다중 회차 병합 백분위수가 정확한 백분위수와 순위 오차 이내인지 확인"""
+        time, velocity = make_speed_log(60_000, seed=5)
+        path = tmp_path / "log.npy"
+        np.save(path, np.column_stack([time, velocity]))
+        mapping = {'time_column': 'col_0', 'velocity_column': 'col_1'}
+
+        results = speed_engine.stream_speed_analysis(str(path), chunksize=7_000, mapping=mapping)
+        frame = speed_engine.compute_kinematics(time, velocity)
+        for name, column in quantiles.PERCENTILE_COLUMNS.items():
+            values = frame[column].to_numpy()
+            for p in quantiles.PERCENTILES:
+                rank = np.mean(values <= results['statistics']['percentiles'][name][f"p{p}"])
+                assert rank == pytest.approx(p / 100, abs=5e-3), (name, p)
+
+        comparison = speed_batch.run_comparison([("a.npy", str(path)), ("b.npy", str(path))], mapping,
+                                                max_workers=1)
+        expected = quantiles.frame_percentiles(frame)['velocity']
+        for key, value in comparison['percentiles']['velocity'].items():
+            assert np.mean(velocity <= value) == pytest.approx(np.mean(velocity <= expected[key]), abs=5e-3)
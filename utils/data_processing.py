@@ -1,17 +1,26 @@
+import os
+
 import pandas as pd
 import numpy as np
-import streamlit as st
 
-def preprocess_excel_data(df, required_columns=None, fill_strategy='mean'):
-    """데이터 전처리 공통 함수"""
+# 서버 로컬 파일 경로 입력을 허용하는 데이터 루트 (이 디렉토리 밖의 파일은 읽지 않음)
+DATA_DIR = os.environ.get('DATA_DIR', os.path.join(os.path.dirname(__file__), '..', 'data'))
+
+def preprocess_excel_data(df, required_columns=None, fill_strategy='mean', columns=None):
+    """데이터 전처리 공통 함수 (columns 를 주면 해당 컬럼의 NaN 만 처리)"""
     # NaN 처리
     if fill_strategy == 'mean':
         numeric_columns = df.select_dtypes(include=[np.number]).columns
+        if columns is not None:
+            numeric_columns = [col for col in numeric_columns if col in columns]
         df[numeric_columns] = df[numeric_columns].fillna(df[numeric_columns].mean())
     elif fill_strategy == 'zero':
-        df = df.fillna(0)
+        if columns is None:
+            df = df.fillna(0)
+        else:
+            df[list(columns)] = df[list(columns)].fillna(0)
     elif fill_strategy == 'drop':
-        df = df.dropna()
+        df = df.dropna(subset=columns)
     
     # 필수 컬럼 확인
     if required_columns:
@@ -21,12 +30,21 @@ def preprocess_excel_data(df, required_columns=None, fill_strategy='mean'):
     
     return df
 
+def resolve_data_path(path, data_dir=None):
+    """서버 로컬 파일 경로를 데이터 루트(DATA_DIR) 기준으로 해석 (심볼릭 링크 포함 루트 밖 경로는 ValueError)"""
+    root = os.path.realpath(data_dir or DATA_DIR)
+    resolved = os.path.realpath(os.path.join(root, os.path.expanduser(str(path).strip())))
+    if os.path.commonpath([root, resolved]) != root:
+        raise ValueError(f"데이터 디렉토리({root}) 밖의 파일은 열 수 없습니다: {path}")
+    return resolved
+
 def safe_operation(func):
     """함수 실행을 안전하게 감싸는 데코레이터"""
     def wrapper(*args, **kwargs):
         try:
             return func(*args, **kwargs)
         except Exception as e:
+            import streamlit as st
             st.error(f"작업 중 오류가 발생했습니다: {str(e)}")
             return None
     return wrapper
@@ -61,6 +79,7 @@ def format_number(value, decimals=2):
 def create_download_link(df, filename="data.xlsx"):
     """Excel 다운로드 링크 생성"""
     from io import BytesIO
+    import streamlit as st
     
     output = BytesIO()
     with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
@@ -1,6 +1,9 @@
 import streamlit as st
 import time
 import functools
+import hashlib
+import threading
+from collections import OrderedDict
 
 def timed_cache(seconds=600):
     """
@@ -31,6 +34,87 @@ def timed_cache(seconds=600):
     
     return decorator
 
+def estimate_size(value):
+    """캐시 항목의 대략적인 메모리 크기 (바이트, 문자열/object 컬럼은 실제 값 크기 포함)"""
+    if hasattr(value, 'memory_usage') and hasattr(value, 'columns'):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if hasattr(value, 'nbytes'):
+        return int(value.nbytes)
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(estimate_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(v) for v in value)
+    return 64
+
+class BoundedCache:
+    """항목 수와 메모리 크기가 제한된 LRU 캐시
+
+    한도를 넘으면 가장 오래 사용하지 않은 항목부터 제거합니다.
+    Streamlit 재실행 간 공유되므로 스레드 잠금으로 보호합니다.
+    """
+
+    def __init__(self, max_entries=8, max_bytes=512 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """항목 조회 (조회된 항목은 최근 사용으로 갱신)"""
+        with self._lock:
+            if key not in self._items:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(self, key, value):
+        """항목 저장 후 한도를 넘는 오래된 항목 제거"""
+        size = estimate_size(value)
+        with self._lock:
+            self._items[key] = value
+            self._sizes[key] = size
+            self._items.move_to_end(key)
+            while self._items and (len(self._items) > self.max_entries
+                                   or self.total_bytes > self.max_bytes):
+                oldest, _ = self._items.popitem(last=False)
+                self._sizes.pop(oldest, None)
+                if oldest == key:
+                    break
+        return value
+
+    def evict(self, key):
+        """특정 항목 제거"""
+        with self._lock:
+            self._items.pop(key, None)
+            self._sizes.pop(key, None)
+
+    def clear(self):
+        """전체 항목 제거"""
+        with self._lock:
+            self._items.clear()
+            self._sizes.clear()
+
+    @property
+    def total_bytes(self):
+        return sum(self._sizes.values())
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+def content_digest(payload):
+    """바이트 내용 해시 (캐시 키용)"""
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
 def lazy_load_data(file_path, loader_func, *args, **kwargs):
     """
     필요할 때만 데이터를 로드하고 세션에 캐싱